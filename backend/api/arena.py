@@ -519,7 +519,9 @@ async def get_forward_status(
                 "trades_count": stats["total_trades"],
                 "win_rate": stats["win_rate"],
                 "next_candle_eta": next_eta,
-                "open_position": open_pos
+                "open_position": open_pos,
+                "llm_stats": session_state.ai_trader.get_stats(),
+                "decision_gating": session_state.decision_gate.stats()
             }
         }
     
@@ -816,6 +818,7 @@ async def start_backtest(
         decision_interval_candles=request.decision_interval_candles,
         indicator_readiness_threshold=request.indicator_readiness_threshold or 80.0,
         user_id=str(current_user.id),
+        max_llm_calls_per_window=request.max_llm_calls_per_window,
     )
 
     preview_candles = None
@@ -912,7 +915,9 @@ async def get_backtest_status(
                 "max_drawdown_pct": session_state.max_drawdown_pct,
                 "trades_count": stats["total_trades"],
                 "win_rate": stats["win_rate"],
-                "open_position": open_pos_data
+                "open_position": open_pos_data,
+                "llm_stats": session_state.ai_trader.get_stats(),
+                "decision_gating": session_state.decision_gate.stats()
             }
         }
     
@@ -1159,6 +1164,7 @@ async def start_forward_test(
         allow_leverage=request.allow_leverage,
         decision_mode=request.decision_mode,
         decision_interval_candles=request.decision_interval_candles,
+        max_llm_calls_per_window=request.max_llm_calls_per_window,
     )
     
     return {
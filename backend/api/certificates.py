@@ -9,7 +9,8 @@ Data Flow:
     - Incoming: HTTP requests for certificate operations (Create, Read, Verify, Download).
     - Processing:
         - Authenticates user via Clerk (except for public verification).
-        - Delegates business logic to CertificateService.
+        - Delegates business logic to CertificateService; assets can be
+          generated as a background job polled via /api/certificates/jobs/{id}.
         - Handles HTTP errors (404 Not Found, 400 Bad Request).
     - Outgoing: JSON responses containing certificate details or PDF files to the client.
 """
@@ -25,13 +26,15 @@ from database import get_db
 
 logger = logging.getLogger(__name__)
 from dependencies import get_current_user
-from services.certificate_service import CertificateService
+from services.certificate_service import CertificateService, certificate_jobs
 from schemas.certificate_schemas import (
     CertificateCreate,
+    CertificateJobResponse,
     CertificateResponse,
     CertificateVerifyResponse
 )
 from models import User
+from config import settings
 
 router = APIRouter(prefix="/api/certificates", tags=["certificates"])
 
@@ -145,6 +148,73 @@ async def create_certificate(
         )
 
 
+@router.post("/jobs", response_model=CertificateJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_certificate_job(
+    certificate_data: CertificateCreate,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a certificate and generate its assets in the background.
+    
+    Validates the result like POST /api/certificates, stores the certificate
+    and returns immediately; PDF, PNG and QR code are rendered and uploaded
+    by a background job. Poll GET /api/certificates/jobs/{job_id} until the
+    status is 'ready' (asset URLs set) or 'failed'.
+    """
+    service = CertificateService(db)
+    
+    try:
+        certificate = await service.create_certificate_record(
+            user_id=current_user.id,
+            result_id=certificate_data.result_id,
+            frontend_base_url=_extract_frontend_url(request)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not certificate.pdf_url:
+        certificate_jobs.submit(certificate.id)
+    
+    return CertificateJobResponse(
+        job_id=certificate.id,
+        certificate=certificate,
+        **certificate_jobs.status(certificate)
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=CertificateJobResponse)
+async def get_certificate_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the status of a background certificate generation job.
+    """
+    service = CertificateService(db)
+    certificate = await service.get_certificate(
+        certificate_id=job_id,
+        user_id=current_user.id
+    )
+    
+    if not certificate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificate job not found"
+        )
+    
+    return CertificateJobResponse(
+        job_id=certificate.id,
+        certificate=certificate,
+        **certificate_jobs.status(certificate)
+    )
+
+
 @router.get("/{certificate_id}", response_model=CertificateResponse)
 async def get_certificate(
     certificate_id: UUID,
@@ -206,7 +276,7 @@ async def download_certificate_pdf(
         )
     
     try:
-        pdf_bytes = certificate_service.build_pdf_for_certificate(certificate)
+        pdf_bytes = await service.build_pdf_for_certificate(certificate)
         filename = f"certificate_{certificate.verification_code}.pdf"
         return Response(
             content=pdf_bytes,
@@ -250,7 +320,7 @@ async def download_certificate_image(
         )
     
     try:
-        image_bytes = service.build_image_for_certificate(certificate)
+        image_bytes = await service.build_image_for_certificate(certificate)
         filename = f"certificate_{certificate.verification_code}.png"
         return Response(
             content=image_bytes,
@@ -168,7 +168,9 @@ async def calculate_indicators(
         calculator = IndicatorCalculator(
             candles=candles,
             enabled_indicators=indicators,
-            mode="omni" # Allow all indicators for this endpoint
+            mode="omni", # Allow all indicators for this endpoint
+            asset=asset,
+            timeframe=timeframe,
         )
         
         # Calculate for all candles
@@ -9,17 +9,18 @@ Data Flow:
     - Incoming: HTTP requests for creating and checking export jobs.
     - Processing:
         - Authenticates user via Clerk.
-        - Delegates business logic to ExportService.
-        - Handles HTTP errors (404 Not Found, 400 Bad Request).
+        - Delegates business logic to ExportService; jobs run on the export worker.
+        - Handles HTTP errors (404 Not Found, 400 Bad Request, 503 queue full).
     - Outgoing: JSON responses containing export job status and download information.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from database import get_db
 from dependencies import get_current_user
 from services.export_service import ExportService
+from services.export_worker import ExportQueueFull, export_worker
 from schemas.export_schemas import (
     ExportCreate,
     ExportResponse
@@ -32,7 +33,6 @@ router = APIRouter(prefix="/api/export", tags=["export"])
 @router.post("", response_model=ExportResponse, status_code=status.HTTP_201_CREATED)
 async def create_export(
     export_data: ExportCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -41,7 +41,7 @@ async def create_export(
     
     Initiates an export job that will collect and package the user's data
     based on the specified inclusions. The export is generated asynchronously
-    in the background.
+    by the export worker; 503 is returned while its queue is full.
     
     Request Body:
     - include: Dictionary specifying what data to include:
@@ -57,6 +57,12 @@ async def create_export(
     """
     service = ExportService(db)
     
+    if export_worker.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many exports in progress, please try again in a few minutes"
+        )
+    
     try:
         # Create export job
         export_job = await service.create_export(
@@ -65,12 +71,16 @@ async def create_export(
             format=export_data.format
         )
         
-        # Queue background task to generate the export package
+        # Queue the job on the export worker
         export_id = UUID(export_job['export_id'])
-        background_tasks.add_task(
-            service.generate_export_package,
-            export_id
-        )
+        try:
+            export_worker.submit(export_id)
+        except ExportQueueFull as e:
+            await ExportService.update_job(export_id, status='failed', error_message=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
         
         # Return initial status
         return ExportResponse(
@@ -83,6 +93,8 @@ async def create_export(
             error_message=None,
             created_at=export_job['created_at']
         )
+    except HTTPException:
+        raise
     except ValueError as e:
         # Handle validation errors (invalid format, etc.)
         raise HTTPException(
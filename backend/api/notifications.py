@@ -59,8 +59,7 @@ async def list_notifications(
         )
         
         unread_count = await service.get_unread_count(user_id=current_user.id)
-        # Serialize notifications (now async)
-        serialized = [await service.serialize_notification(n) for n in notifications]
+        serialized = await service.serialize_notifications(notifications)
         
         return NotificationListResponse(
             notifications=serialized,
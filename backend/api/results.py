@@ -1,16 +1,14 @@
-import io
 import json
-import zipfile
 from datetime import datetime
 from typing import List, Optional, Dict
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, desc, exists, literal, or_, tuple_
+from sqlalchemy.orm import load_only, selectinload
 
-from database import get_db
+from database import get_db, async_session_maker
 from schemas.result_schemas import (
     ResultListResponse, ResultStatsResponse, ResultDetailResponse,
     TradeListResponse, ReasoningResponse, ResultListItem, Pagination,
@@ -18,8 +16,11 @@ from schemas.result_schemas import (
 )
 from models.arena import Trade, AiThought
 from models.agent import Agent
-from models.result import TestResult
+from models.result import TestResult, Certificate
 from api.users import get_current_user
+from utils.pagination import encode_cursor, decode_cursor
+from services.export_stream import encode_csv, encode_jsonl, iter_records, single, stream_zip
+from services import export_columnar
 
 router = APIRouter(prefix="/api/results", tags=["results"])
 
@@ -27,6 +28,8 @@ router = APIRouter(prefix="/api/results", tags=["results"])
 async def list_results(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     type: Optional[str] = Query(None, regex="^(backtest|forward)$"),
     agent_id: Optional[UUID] = None,
     asset: Optional[str] = None,
@@ -38,7 +41,13 @@ async def list_results(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """List test results with pagination and filtering."""
+    """
+    List test results with pagination and filtering.
+    
+    Pass the previous page's `next_cursor` as `cursor` for keyset pagination
+    on (created_at, id); `page` is then ignored. `include_total=false` skips
+    the count query.
+    """
     filters = [TestResult.user_id == current_user.id]
     if type:
         filters.append(TestResult.type == type)
@@ -62,56 +71,77 @@ async def list_results(
                 func.lower(TestResult.timeframe).like(like_term),
             )
         )
-    base_query = (
-        select(TestResult)
-        .where(*filters)
-        .options(
-            selectinload(TestResult.agent),
-            selectinload(TestResult.certificate)
+    
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(
+            select(TestResult.id).where(*filters).subquery()
         )
-    )
+        total = await db.scalar(count_query)
     
-    count_query = select(func.count()).select_from(
-        select(TestResult.id).where(*filters).subquery()
+    # List columns only: no equity_curve / ai_summary / timings
+    query = (
+        select(
+            TestResult.id,
+            TestResult.type,
+            TestResult.agent_id,
+            Agent.name.label("agent_name"),
+            TestResult.asset,
+            TestResult.mode,
+            TestResult.created_at,
+            TestResult.duration_display,
+            TestResult.total_trades,
+            TestResult.total_pnl_pct,
+            TestResult.win_rate,
+            TestResult.max_drawdown_pct,
+            TestResult.sharpe_ratio,
+            TestResult.is_profitable,
+            exists().where(Certificate.result_id == TestResult.id).label("has_certificate"),
+        )
+        .outerjoin(Agent, Agent.id == TestResult.agent_id)
+        .where(*filters)
+        .order_by(desc(TestResult.created_at), desc(TestResult.id))
     )
-    total = await db.scalar(count_query)
-    
-    query = base_query.order_by(desc(TestResult.created_at))
-    query = query.offset((page - 1) * limit).limit(limit)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        query = query.where(
+            tuple_(TestResult.created_at, TestResult.id) < tuple_(
+                literal(_parse_cursor_datetime(created_at)), literal(_parse_cursor_uuid(last_id))
+            )
+        )
+    else:
+        query = query.offset((page - 1) * limit)
     
-    result = await db.execute(query)
-    test_results = result.scalars().all()
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     items: List[ResultListItem] = []
-    for res in test_results:
-        agent_name = res.agent.name if res.agent else "Unknown Agent"
-        duration = res.duration_display or ""
+    for res in rows:
         items.append(ResultListItem(
             id=res.id,
             type=res.type,
             agent_id=res.agent_id,
-            agent_name=agent_name,
+            agent_name=res.agent_name or "Unknown Agent",
             asset=res.asset,
             mode=res.mode,
             created_at=res.created_at,
-            duration_display=duration,
+            duration_display=res.duration_display or "",
             total_trades=res.total_trades,
             total_pnl_pct=float(res.total_pnl_pct or 0),
             win_rate=float(res.win_rate or 0),
             max_drawdown_pct=float(res.max_drawdown_pct or 0),
             sharpe_ratio=float(res.sharpe_ratio or 0),
             is_profitable=res.is_profitable,
-            has_certificate=bool(res.certificate)
+            has_certificate=bool(res.has_certificate)
         ))
-        
+    
+    next_cursor = (
+        encode_cursor([rows[-1].created_at.isoformat(), str(rows[-1].id)]) if has_more else None
+    )
     return {
         "results": items,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total or 0,
-            "total_pages": (total + limit - 1) // limit if total else 0
-        }
+        "pagination": _pagination(page, limit, total, next_cursor)
     }
 
 @router.get("/stats", response_model=ResultStatsResponse)
@@ -119,12 +149,34 @@ async def get_result_stats(
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get aggregate statistics for all results."""
-    base_query = select(TestResult).where(TestResult.user_id == current_user.id)
-    result = await db.execute(base_query)
-    results = result.scalars().all()
+    """
+    Get aggregate statistics for all results.
+    
+    One grouped aggregate (by type) over the user's results; no result rows
+    or heavy columns are loaded.
+    """
+    stats_query = (
+        select(
+            TestResult.type,
+            func.count(TestResult.id).label("count"),
+            func.count(TestResult.id).filter(TestResult.is_profitable).label("profitable"),
+            func.max(TestResult.total_pnl_pct).label("best"),
+            func.min(TestResult.total_pnl_pct).label("worst"),
+            func.sum(TestResult.total_pnl_pct).label("pnl_sum"),
+        )
+        .where(TestResult.user_id == current_user.id)
+        .group_by(TestResult.type)
+    )
+    rows = (await db.execute(stats_query)).all()
+    
+    by_type_data: Dict[str, Dict[str, int]] = {
+        "backtest": {"count": 0, "profitable": 0},
+        "forward": {"count": 0, "profitable": 0},
+    }
+    for row in rows:
+        by_type_data[row.type] = {"count": row.count, "profitable": row.profitable}
     
-    total_tests = len(results)
+    total_tests = sum(row.count for row in rows)
     if total_tests == 0:
         return {
             "stats": {
@@ -134,34 +186,21 @@ async def get_result_stats(
                 "best_result": 0.0,
                 "worst_result": 0.0,
                 "avg_pnl": 0.0,
-                "by_type": {
-                    "backtest": {"count": 0, "profitable": 0},
-                    "forward": {"count": 0, "profitable": 0}
-                }
+                "by_type": by_type_data
             }
         }
         
-    profitable_count = sum(1 for r in results if r.is_profitable)
-    pnls = [float(r.total_pnl_pct or 0) for r in results]
-    
-    by_type_data: Dict[str, Dict[str, int]] = {
-        "backtest": {"count": 0, "profitable": 0},
-        "forward": {"count": 0, "profitable": 0},
-    }
-    for r in results:
-        bucket = by_type_data[r.type]
-        bucket["count"] += 1
-        if r.is_profitable:
-            bucket["profitable"] += 1
+    profitable_count = sum(row.profitable for row in rows)
+    pnl_sum = sum(float(row.pnl_sum or 0) for row in rows)
     
     return {
         "stats": {
             "total_tests": total_tests,
             "profitable": profitable_count,
             "profitable_pct": (profitable_count / total_tests) * 100,
-            "best_result": max(pnls) if pnls else 0.0,
-            "worst_result": min(pnls) if pnls else 0.0,
-            "avg_pnl": sum(pnls) / total_tests if total_tests else 0.0,
+            "best_result": max(float(row.best or 0) for row in rows),
+            "worst_result": min(float(row.worst or 0) for row in rows),
+            "avg_pnl": pnl_sum / total_tests,
             "by_type": {
                 "backtest": by_type_data["backtest"],
                 "forward": by_type_data["forward"],
@@ -245,6 +284,7 @@ async def get_result_detail(
             "avg_holding_time_display": test_result.avg_holding_time_display,
             "equity_curve": test_result.equity_curve or [],
             "ai_summary": test_result.ai_summary,
+            "timings": test_result.timings,
             "trades": trade_schemas
         }
     }
@@ -254,22 +294,22 @@ async def get_result_trades(
     id: UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     direction: Optional[str] = Query(None, regex="^(long|short)$"),
     outcome: Optional[str] = Query(None, regex="^(win|loss)$"),
     search: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get trades for a result."""
-    # Verify ownership via result
-    result_res = await db.execute(
-        select(TestResult).where(TestResult.id == id, TestResult.user_id == current_user.id)
-    )
-    result_row = result_res.scalar_one_or_none()
-    if not result_row:
-        raise HTTPException(status_code=404, detail="Result not found")
+    """
+    Get trades for a result.
+    
+    Keyset pagination on trade_number via `cursor` (see list_results).
+    """
+    session_id = await _get_result_session_id(db, id, current_user.id)
         
-    trade_filters = [Trade.session_id == result_row.session_id]
+    trade_filters = [Trade.session_id == session_id]
     if direction:
         trade_filters.append(func.lower(Trade.type) == direction)
     if outcome:
@@ -286,18 +326,33 @@ async def get_result_trades(
             )
         )
     
-    count_query = select(func.count()).where(*trade_filters)
-    total = await db.scalar(count_query)
+    total = None
+    if include_total:
+        count_query = select(func.count()).where(*trade_filters)
+        total = await db.scalar(count_query)
     
-    trades_res = await db.execute(
+    query = (
         select(Trade)
+        .options(load_only(
+            Trade.trade_number, Trade.type, Trade.entry_price, Trade.exit_price,
+            Trade.entry_time, Trade.exit_time, Trade.pnl_amount, Trade.pnl_pct,
+            Trade.entry_reasoning, Trade.exit_reasoning, Trade.exit_type
+        ))
         .where(*trade_filters)
         .order_by(Trade.trade_number)
-        .offset((page - 1) * limit)
-        .limit(limit)
     )
+    if cursor:
+        (last_trade_number,) = decode_cursor(cursor, 1)
+        query = query.where(Trade.trade_number > _parse_cursor_int(last_trade_number))
+    else:
+        query = query.offset((page - 1) * limit)
+    
+    trades_res = await db.execute(query.limit(limit + 1))
     trades = trades_res.scalars().all()
+    has_more = len(trades) > limit
+    trades = trades[:limit]
     
+    next_cursor = encode_cursor([trades[-1].trade_number]) if has_more else None
     return {
         "trades": [
             TradeSchema(
@@ -314,12 +369,7 @@ async def get_result_trades(
                 exit_type=t.exit_type
             ) for t in trades
         ],
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total or 0,
-            "total_pages": (total + limit - 1) // limit if total else 0
-        }
+        "pagination": _pagination(page, limit, total, next_cursor)
     }
 
 @router.get("/{id}/reasoning", response_model=ReasoningResponse)
@@ -327,21 +377,23 @@ async def get_result_reasoning(
     id: UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     candle_from: Optional[int] = None,
     candle_to: Optional[int] = None,
     decision: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get AI reasoning for a result."""
-    result_res = await db.execute(
-        select(TestResult).where(TestResult.id == id, TestResult.user_id == current_user.id)
-    )
-    result_row = result_res.scalar_one_or_none()
-    if not result_row:
-        raise HTTPException(status_code=404, detail="Result not found")
+    """
+    Get AI reasoning for a result.
+    
+    Keyset pagination on (candle_number, id) via `cursor` (see list_results),
+    served by idx_thoughts_session_candle.
+    """
+    session_id = await _get_result_session_id(db, id, current_user.id)
         
-    thought_filters = [AiThought.session_id == result_row.session_id]
+    thought_filters = [AiThought.session_id == session_id]
     if candle_from is not None:
         thought_filters.append(AiThought.candle_number >= candle_from)
     if candle_to is not None:
@@ -349,18 +401,37 @@ async def get_result_reasoning(
     if decision:
         thought_filters.append(func.lower(AiThought.decision) == decision.lower())
     
-    count_query = select(func.count()).where(*thought_filters)
-    total = await db.scalar(count_query)
+    total = None
+    if include_total:
+        count_query = select(func.count()).where(*thought_filters)
+        total = await db.scalar(count_query)
     
-    thoughts_res = await db.execute(
+    # candle_data and order_data are not part of the listing
+    query = (
         select(AiThought)
+        .options(load_only(
+            AiThought.id, AiThought.candle_number, AiThought.timestamp,
+            AiThought.decision, AiThought.reasoning, AiThought.indicator_values
+        ))
         .where(*thought_filters)
-        .order_by(AiThought.candle_number)
-        .offset((page - 1) * limit)
-        .limit(limit)
+        .order_by(AiThought.candle_number, AiThought.id)
     )
+    if cursor:
+        last_candle, last_id = decode_cursor(cursor, 2)
+        query = query.where(
+            tuple_(AiThought.candle_number, AiThought.id) > tuple_(
+                literal(_parse_cursor_int(last_candle)), literal(_parse_cursor_uuid(last_id))
+            )
+        )
+    else:
+        query = query.offset((page - 1) * limit)
+    
+    thoughts_res = await db.execute(query.limit(limit + 1))
     thoughts = thoughts_res.scalars().all()
+    has_more = len(thoughts) > limit
+    thoughts = thoughts[:limit]
     
+    next_cursor = encode_cursor([thoughts[-1].candle_number, str(thoughts[-1].id)]) if has_more else None
     return {
         "thoughts": [
             AIThoughtSchema(
@@ -371,22 +442,78 @@ async def get_result_reasoning(
                 indicator_values=t.indicator_values or {}
             ) for t in thoughts
         ],
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total or 0,
-            "total_pages": (total + limit - 1) // limit if total else 0
-        }
+        "pagination": _pagination(page, limit, total, next_cursor)
+    }
+
+
+async def _get_result_session_id(db: AsyncSession, result_id: UUID, user_id: UUID) -> UUID:
+    """Return the result's session id (404 unless owned by the user) without loading the result row"""
+    session_id = await db.scalar(
+        select(TestResult.session_id).where(TestResult.id == result_id, TestResult.user_id == user_id)
+    )
+    if not session_id:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return session_id
+
+
+def _pagination(page: int, limit: int, total: Optional[int], next_cursor: Optional[str]) -> Dict:
+    return {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "total_pages": ((total + limit - 1) // limit if total else 0) if total is not None else None,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
     }
 
 
+def _parse_cursor_datetime(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_cursor_uuid(value) -> UUID:
+    try:
+        return UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_cursor_int(value) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+TRADE_EXPORT_COLUMNS = [
+    "trade_number", "type", "entry_time", "exit_time", "entry_price", "exit_price",
+    "pnl_amount", "pnl_pct", "entry_reasoning", "exit_reasoning", "exit_type",
+]
+THOUGHT_EXPORT_COLUMNS = ["candle_number", "timestamp", "decision", "reasoning", "indicator_values"]
+
+
 @router.get("/{id}/export")
 async def export_result(
     id: UUID,
+    format: str = Query("jsonl", regex="^(jsonl|csv|parquet)$"),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Download a zipped export containing result, trades, and reasoning."""
+    """
+    Download a zipped export containing result, trades, and reasoning.
+    
+    The ZIP is streamed while trades and thoughts are read through a
+    server-side cursor, so memory use does not grow with the result size.
+    Trades and thoughts are written as JSON Lines, CSV or Parquet (`format`).
+    Parquet exports flatten indicator values into columns (non-numeric
+    values are kept as JSON in indicators_non_numeric) and add the equity
+    curve as equity_curve.parquet; they require pyarrow.
+    """
+    if format == "parquet" and not export_columnar.PARQUET_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Parquet export is not available on this server")
+    
     result = await db.execute(
         select(TestResult)
         .where(TestResult.id == id, TestResult.user_id == current_user.id)
@@ -396,90 +523,116 @@ async def export_result(
     if not test_result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    trades_res = await db.execute(
+    result_json = json.dumps(_export_result_record(test_result), indent=2).encode("utf-8")
+    session_id = test_result.session_id
+    equity_curve = export_columnar.equity_rows(test_result.equity_curve) if format == "parquet" else []
+    
+    trades_query = (
         select(Trade)
-        .where(Trade.session_id == test_result.session_id)
+        .where(Trade.session_id == session_id)
         .order_by(Trade.trade_number)
     )
-    trades = trades_res.scalars().all()
-    
-    thoughts_res = await db.execute(
+    thoughts_query = (
         select(AiThought)
-        .where(AiThought.session_id == test_result.session_id)
-        .order_by(AiThought.candle_number)
+        .options(load_only(*(getattr(AiThought, column) for column in THOUGHT_EXPORT_COLUMNS)))
+        .where(AiThought.session_id == session_id)
+        .order_by(AiThought.candle_number, AiThought.id)
     )
-    thoughts = thoughts_res.scalars().all()
     
-    export_payload = {
-        "result": {
-            "id": str(test_result.id),
-            "session_id": str(test_result.session_id),
-            "type": test_result.type,
-            "agent_id": str(test_result.agent_id),
-            "agent_name": test_result.agent.name if test_result.agent else "Unknown",
-            "asset": test_result.asset,
-            "mode": test_result.mode,
-            "timeframe": test_result.timeframe,
-            "start_date": test_result.start_date.isoformat(),
-            "end_date": (test_result.end_date or datetime.utcnow()).isoformat(),
-            "starting_capital": float(test_result.starting_capital),
-            "ending_capital": float(test_result.ending_capital),
-            "total_pnl_pct": float(test_result.total_pnl_pct),
-            "win_rate": float(test_result.win_rate or 0),
-            "max_drawdown_pct": float(test_result.max_drawdown_pct or 0),
-            "avg_trade_pnl": float(test_result.avg_trade_pnl) if test_result.avg_trade_pnl else None,
-            "best_trade_pnl": float(test_result.best_trade_pnl) if test_result.best_trade_pnl else None,
-            "worst_trade_pnl": float(test_result.worst_trade_pnl) if test_result.worst_trade_pnl else None,
-            "equity_curve": test_result.equity_curve,
-            "ai_summary": test_result.ai_summary,
-        },
-        "trades": [
-            {
-                "trade_number": t.trade_number,
-                "type": t.type,
-                "entry_time": t.entry_time.isoformat() if t.entry_time else None,
-                "exit_time": t.exit_time.isoformat() if t.exit_time else None,
-                "entry_price": float(t.entry_price),
-                "exit_price": float(t.exit_price) if t.exit_price else None,
-                "pnl_amount": float(t.pnl_amount) if t.pnl_amount else None,
-                "pnl_pct": float(t.pnl_pct) if t.pnl_pct else None,
-                "entry_reasoning": t.entry_reasoning,
-                "exit_reasoning": t.exit_reasoning,
-                "exit_type": t.exit_type,
-            }
-            for t in trades
-        ],
-        "thoughts": [
-            {
-                "candle_number": th.candle_number,
-                "timestamp": th.timestamp.isoformat() if th.timestamp else None,
-                "decision": th.decision,
-                "reasoning": th.reasoning,
-                "indicator_values": th.indicator_values,
-            }
-            for th in thoughts
-        ],
-    }
+    indicator_names: List[str] = []
+    if format == "parquet":
+        # Parquet needs a fixed schema: one column per indicator seen in the session
+        indicator_names = sorted((await db.execute(
+            select(func.jsonb_object_keys(AiThought.indicator_values))
+            .where(AiThought.session_id == session_id)
+            .distinct()
+        )).scalars().all())
     
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        zip_file.writestr(
-            "result.json",
-            json.dumps(export_payload["result"], indent=2),
-        )
-        zip_file.writestr(
-            "trades.json",
-            json.dumps(export_payload["trades"], indent=2),
-        )
-        zip_file.writestr(
-            "thoughts.json",
-            json.dumps(export_payload["thoughts"], indent=2),
-        )
-    buffer.seek(0)
+    async def archive():
+        # Own session: the cursors stay open for as long as the download runs
+        async with async_session_maker() as stream_db:
+            if format == "parquet":
+                trades = export_columnar.encode_parquet(
+                    iter_records(stream_db, trades_query, export_columnar.trade_row),
+                    export_columnar.trade_schema(),
+                )
+                thoughts = export_columnar.encode_parquet(
+                    iter_records(stream_db, thoughts_query, export_columnar.thought_row),
+                    export_columnar.thought_schema(indicator_names),
+                )
+            elif format == "csv":
+                trades = encode_csv(iter_records(stream_db, trades_query, _export_trade_record), TRADE_EXPORT_COLUMNS)
+                thoughts = encode_csv(iter_records(stream_db, thoughts_query, _export_thought_record), THOUGHT_EXPORT_COLUMNS)
+            else:
+                trades = encode_jsonl(iter_records(stream_db, trades_query, _export_trade_record))
+                thoughts = encode_jsonl(iter_records(stream_db, thoughts_query, _export_thought_record))
+            members = [
+                ("result.json", single(result_json)),
+                (f"trades.{format}", trades),
+                (f"thoughts.{format}", thoughts),
+            ]
+            if format == "parquet":
+                members.append((
+                    "equity_curve.parquet",
+                    export_columnar.encode_parquet(single(equity_curve), export_columnar.equity_schema()),
+                ))
+            async for chunk in stream_zip(members):
+                yield chunk
     
     filename = f"result_{test_result.id}.zip"
     return StreamingResponse(
-        buffer,
+        archive(),
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
+
+
+def _export_result_record(test_result: TestResult) -> Dict:
+    return {
+        "id": str(test_result.id),
+        "session_id": str(test_result.session_id),
+        "type": test_result.type,
+        "agent_id": str(test_result.agent_id),
+        "agent_name": test_result.agent.name if test_result.agent else "Unknown",
+        "asset": test_result.asset,
+        "mode": test_result.mode,
+        "timeframe": test_result.timeframe,
+        "start_date": test_result.start_date.isoformat(),
+        "end_date": (test_result.end_date or datetime.utcnow()).isoformat(),
+        "starting_capital": float(test_result.starting_capital),
+        "ending_capital": float(test_result.ending_capital),
+        "total_pnl_pct": float(test_result.total_pnl_pct),
+        "win_rate": float(test_result.win_rate or 0),
+        "max_drawdown_pct": float(test_result.max_drawdown_pct or 0),
+        "avg_trade_pnl": float(test_result.avg_trade_pnl) if test_result.avg_trade_pnl else None,
+        "best_trade_pnl": float(test_result.best_trade_pnl) if test_result.best_trade_pnl else None,
+        "worst_trade_pnl": float(test_result.worst_trade_pnl) if test_result.worst_trade_pnl else None,
+        "equity_curve": test_result.equity_curve,
+        "ai_summary": test_result.ai_summary,
+    }
+
+
+def _export_trade_record(t: Trade) -> Dict:
+    return {
+        "trade_number": t.trade_number,
+        "type": t.type,
+        "entry_time": t.entry_time.isoformat() if t.entry_time else None,
+        "exit_time": t.exit_time.isoformat() if t.exit_time else None,
+        "entry_price": float(t.entry_price),
+        "exit_price": float(t.exit_price) if t.exit_price else None,
+        "pnl_amount": float(t.pnl_amount) if t.pnl_amount else None,
+        "pnl_pct": float(t.pnl_pct) if t.pnl_pct else None,
+        "entry_reasoning": t.entry_reasoning,
+        "exit_reasoning": t.exit_reasoning,
+        "exit_type": t.exit_type,
+    }
+
+
+def _export_thought_record(th: AiThought) -> Dict:
+    return {
+        "candle_number": th.candle_number,
+        "timestamp": th.timestamp.isoformat() if th.timestamp else None,
+        "decision": th.decision,
+        "reasoning": th.reasoning,
+        "indicator_values": th.indicator_values,
+    }
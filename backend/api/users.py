@@ -23,6 +23,7 @@ from database import get_db
 from models import User, UserSettings
 from schemas import UserResponse, UserSettingsResponse, UserSettingsUpdate, UserProfileUpdate
 from dependencies import get_current_user
+from services.user_cache import user_cache
 from auth import verify_clerk_token, get_user_id_from_token
 
 logger = logging.getLogger(__name__)
@@ -94,6 +95,7 @@ async def sync_user(
                 existing_user.image_url = image_url
             
             await db.commit()
+            user_cache.invalidate(clerk_user_id)
             await db.refresh(existing_user)
             return {"message": "User updated", "user": existing_user}
         else:
@@ -155,6 +157,7 @@ async def update_me(
             setattr(current_user, key, value)
         
         await db.commit()
+        user_cache.invalidate(current_user.clerk_id)
         await db.refresh(current_user)
         
         return {"user": current_user}
@@ -11,7 +11,7 @@ Data Flow:
     - Outgoing: HTTP responses back to the client.
     - Integration: Connects to Supabase/PostgreSQL and external APIs (OpenRouter, Clerk).
 """
-from fastapi import FastAPI, HTTPException, Depends, Header, Request, WebSocket, Query
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, WebSocket, Query
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional
 from contextlib import asynccontextmanager
@@ -24,9 +24,21 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from database import get_supabase_client, get_db, validate_database_connection, validate_database_schema
 from api import users, api_keys, agents, arena, data, results, certificates, notifications, dashboard, export, models
 from auth import verify_clerk_token, get_user_id_from_token
+from dependencies import require_internal_token
 from webhooks import verify_webhook_signature, handle_user_created, handle_user_updated, handle_user_deleted
-from websocket.handlers import handle_backtest_websocket, handle_forward_websocket
+from websocket.handlers import handle_backtest_websocket, handle_forward_websocket, handle_notifications_websocket
 from models import User
+from config import settings
+from services.trading.indicator_cache import indicator_cache
+from services.llm_client import llm_client_registry, openrouter_headers, OPENROUTER_BASE_URL
+from services.llm_scheduler import llm_scheduler
+from services.decision_batcher import decision_batcher
+from services.trading.tracing import active_tracer_summaries
+from services.metrics import registry as metrics_registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from services.loop_monitor import loop_monitor
+from services.export_worker import export_worker
+from services.certificate_renderer import render_pool as certificate_render_pool
+from utils.storage import close_storage_http
 import logging
 
 load_dotenv()
@@ -45,9 +57,16 @@ async def lifespan(app: FastAPI):
     Startup:
     - Validates database connection
     - Validates database schema (tables exist)
+    - Sizes the shared indicator cache
+    - Starts the event loop lag monitor
+    - Starts the export job worker
     - Logs configuration status
     
     Shutdown:
+    - Stops the event loop lag monitor
+    - Stops the export job worker (running exports are marked failed)
+    - Stops the certificate render pool and closes the storage HTTP client
+    - Closes the shared LLM connection pool
     - Closes database connections
     - Performs cleanup
     """
@@ -67,6 +86,15 @@ async def lifespan(app: FastAPI):
         logger.info("Validating database schema...")
         await validate_database_schema()
         
+        # Step 3: Size the shared indicator result cache
+        indicator_cache.max_bytes = settings.INDICATOR_CACHE_MAX_MB * 1024 * 1024
+        
+        # Step 4: Sample event loop lag for /metrics
+        loop_monitor.start()
+        
+        # Step 5: Process data export jobs in the background
+        export_worker.start()
+        
         logger.info("=" * 60)
         logger.info("✓ Application startup successful")
         logger.info("  API is ready to accept requests")
@@ -106,6 +134,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     if startup_success:
         logger.info("Shutting down application...")
+        await loop_monitor.stop()
+        logger.info("  Stopping export worker...")
+        await export_worker.stop()
+        certificate_render_pool.shutdown()
+        await close_storage_http()
+        logger.info("  Closing LLM connection pool...")
+        await llm_client_registry.aclose()
         logger.info("  Closing database connections...")
         from database import engine
         await engine.dispose()
@@ -171,17 +206,66 @@ async def websocket_forward_endpoint(websocket: WebSocket, session_id: str, toke
     await handle_forward_websocket(websocket, session_id, token)
 
 
+@app.websocket("/ws/notifications")
+async def websocket_notifications_endpoint(websocket: WebSocket, token: str = Query(None)):
+    """
+    WebSocket endpoint for the user's notification channel.
+    
+    Pushes new notifications and unread-count changes so dashboard tabs
+    do not poll /api/notifications.
+    
+    Args:
+        websocket: WebSocket connection
+        token: JWT authentication token (query parameter)
+    """
+    await handle_notifications_websocket(websocket, token)
+
+
 @app.get('/api/health')
 def health():
     return {"status": "ok", "service": "backend"}
 
+@app.get('/api/health/llm', dependencies=[Depends(require_internal_token)])
+async def llm_health():
+    """
+    LLM scheduler queue depth and wait times, decision batching and connection pool configuration
+    (requires the X-Internal-Token header, see settings.INTERNAL_API_TOKEN)
+    """
+    return {
+        "scheduler": llm_scheduler.stats(),
+        "batching": decision_batcher.stats(),
+        "client_pool": llm_client_registry.stats(),
+    }
+
+@app.get('/api/health/timings', dependencies=[Depends(require_internal_token)])
+async def timings_health():
+    """
+    Per-stage candle pipeline timings (p50/p95/p99) and tagged LLM calls for running sessions,
+    plus event loop lag and (in LOOP_BLOCK_DEBUG mode) the call sites that blocked it
+    (requires the X-Internal-Token header, see settings.INTERNAL_API_TOKEN)
+    """
+    return {"sessions": active_tracer_summaries(), "event_loop": loop_monitor.stats()}
+
+@app.get('/api/health/exports')
+async def exports_health():
+    """
+    Export job worker queue depth and job counts
+    """
+    return export_worker.stats()
+
+@app.get('/metrics', dependencies=[Depends(require_internal_token)])
+async def metrics():
+    """
+    Prometheus text exposition of engine, LLM, database, WebSocket, cache and event loop metrics
+    (requires the X-Internal-Token header, see settings.INTERNAL_API_TOKEN)
+    """
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.post('/api/openrouter/chat')
-def openrouter_chat(request_data: dict):
+async def openrouter_chat(request_data: dict):
     """
-    Proxy endpoint for OpenRouter API
+    Proxy endpoint for OpenRouter API (uses the shared LLM connection pool)
     """
-    import requests
-    
     api_key = os.getenv('OPENROUTER_API_KEY')
     if not api_key:
         raise HTTPException(status_code=500, detail="OpenRouter API key not configured")
@@ -190,13 +274,12 @@ def openrouter_chat(request_data: dict):
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
-        "HTTP-Referer": os.getenv('OPENROUTER_HTTP_REFERER', 'http://localhost:3000'),
-        "X-Title": os.getenv('OPENROUTER_X_TITLE', 'AlphaLabs')
+        **openrouter_headers()
     }
     
     try:
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+        response = await llm_client_registry.http_client().post(
+            f"{OPENROUTER_BASE_URL}/chat/completions",
             headers=headers,
             json=request_data,
             timeout=30
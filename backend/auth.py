@@ -1,118 +1,272 @@
 """
 Clerk authentication utilities for FastAPI
+
+Tokens are verified locally: the RS256 signature is checked against Clerk's
+JSON Web Key Set, which is fetched once and refreshed every CLERK_JWKS_TTL
+seconds (or early, when a token names a key id we have not seen). The key set
+can instead be loaded from CLERK_JWKS_FILE for offline development and tests.
+
+Verified claims are kept in a short-TTL LRU keyed by the token hash, so
+repeated requests with the same token skip signature verification entirely.
 """
 from fastapi import HTTPException, Header
-from typing import Optional
-import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
 import jwt
-import requests
-from dotenv import load_dotenv
+import httpx
+from config import settings
+from services.metrics import cache_lookups
+
+logger = logging.getLogger(__name__)
+
+JWKS_FETCH_TIMEOUT = 5.0
 
-load_dotenv()
 
-# Cache for Clerk JWKS (JSON Web Key Set)
-_jwks_cache = None
+def clerk_jwks_url() -> Optional[str]:
+    """
+    Resolve the Clerk JWKS URL.
 
-def get_clerk_jwks():
+    Uses CLERK_JWKS_URL when set, otherwise derives the Frontend API host from
+    the publishable key (pk_test_<base64("<host>$")>).
     """
-    Fetch Clerk's JSON Web Key Set for token verification
+    if settings.CLERK_JWKS_URL:
+        return settings.CLERK_JWKS_URL
+    publishable_key = settings.CLERK_PUBLISHABLE_KEY or settings.NEXT_PUBLIC_CLERK_PUBLISHABLE_KEY
+    if not publishable_key:
+        return None
+    encoded = publishable_key.split("_", 2)[-1]
+    try:
+        host = base64.b64decode(encoded + "=" * (-len(encoded) % 4)).decode().rstrip("$")
+    except (ValueError, UnicodeDecodeError):
+        logger.error("CLERK_PUBLISHABLE_KEY is not a valid Clerk publishable key")
+        return None
+    return f"https://{host}/.well-known/jwks.json"
+
+
+class ClerkJWKS:
     """
-    global _jwks_cache
-    
-    if _jwks_cache is None:
-        clerk_publishable_key = os.getenv("CLERK_PUBLISHABLE_KEY")
-        if not clerk_publishable_key:
-            raise HTTPException(
-                status_code=500,
-                detail="CLERK_PUBLISHABLE_KEY environment variable is not set"
-            )
-        
-        # Extract instance ID from publishable key (format: pk_test_xxxxx or pk_live_xxxxx)
-        # Clerk JWKS URL format: https://<instance>.clerk.accounts.dev/.well-known/jwks.json
-        # For now, we'll use a simpler approach with the secret key
-        
-        # Alternative: Use Clerk's verify token endpoint
-        # Or decode without verification if using secret key (not recommended for production)
-        pass
-    
-    return _jwks_cache
+    Cached Clerk signing keys, indexed by key id.
+
+    Refreshes lazily under a lock, so concurrent requests after expiry
+    trigger one fetch. A failed refresh keeps serving the previous keys.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        file_path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        min_refresh_interval: Optional[int] = None
+    ):
+        """
+        Initialize key cache.
+
+        Args:
+            url: JWKS URL (default: clerk_jwks_url())
+            file_path: Load keys from this JSON file instead of the URL
+                (default: settings.CLERK_JWKS_FILE)
+            ttl: Seconds before keys are refetched (default: settings.CLERK_JWKS_TTL)
+            min_refresh_interval: Minimum seconds between refetches triggered by
+                unknown key ids (default: settings.CLERK_JWKS_MIN_REFRESH_INTERVAL)
+        """
+        self.url = url
+        self.file_path = file_path if file_path is not None else settings.CLERK_JWKS_FILE
+        self.ttl = ttl or settings.CLERK_JWKS_TTL
+        self.min_refresh_interval = (
+            settings.CLERK_JWKS_MIN_REFRESH_INTERVAL if min_refresh_interval is None else min_refresh_interval
+        )
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.ttl
+
+    def _may_refresh(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.min_refresh_interval
+
+    async def get_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """
+        Return the signing key for a token's key id.
+
+        Raises:
+            HTTPException: 401 for an unknown key id, 503 if no keys can be loaded
+        """
+        if self._is_stale() or (kid not in self._keys and self._may_refresh()):
+            async with self._lock:
+                # Another request may have refreshed while we waited
+                if self._is_stale() or (kid not in self._keys and self._may_refresh()):
+                    await self.refresh()
+
+        if not self._keys:
+            raise HTTPException(status_code=503, detail="Token signing keys are unavailable")
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        key = self._keys.get(kid)
+        if key is None:
+            raise HTTPException(status_code=401, detail="Token signed with an unknown key")
+        return key
+
+    async def refresh(self) -> None:
+        """Reload the key set, keeping the current keys if that fails"""
+        try:
+            data = await self._load()
+            keys = {key.key_id: key for key in jwt.PyJWKSet.from_dict(data).keys}
+        except (httpx.HTTPError, OSError, ValueError, jwt.PyJWKSetError) as e:
+            logger.error(f"Failed to load Clerk JWKS: {e}")
+            if self._keys:
+                # Retry after min_refresh_interval instead of on every request
+                self._fetched_at = time.monotonic() - self.ttl + self.min_refresh_interval
+            return
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+        logger.info(f"Loaded {len(keys)} Clerk signing key(s)")
+
+    async def _load(self) -> Dict[str, Any]:
+        if self.file_path:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        url = self.url or clerk_jwks_url()
+        if not url:
+            raise ValueError("Set CLERK_JWKS_URL, CLERK_PUBLISHABLE_KEY or CLERK_JWKS_FILE")
+        async with httpx.AsyncClient(timeout=JWKS_FETCH_TIMEOUT) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+
+
+class VerifiedTokenCache:
+    """LRU of verified token claims, keyed by the SHA-256 of the token"""
+
+    def __init__(self, ttl: Optional[int] = None, max_size: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds a verification is reused (default: settings.AUTH_TOKEN_CACHE_TTL);
+                never beyond the token's own exp
+            max_size: Maximum cached tokens (default: settings.AUTH_TOKEN_CACHE_SIZE)
+        """
+        self.ttl = settings.AUTH_TOKEN_CACHE_TTL if ttl is None else ttl
+        self.max_size = max_size or settings.AUTH_TOKEN_CACHE_SIZE
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            cache_lookups.inc(cache="auth_token", tier="memory", result="miss")
+            return None
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            cache_lookups.inc(cache="auth_token", tier="memory", result="miss")
+            return None
+        self._entries.move_to_end(key)
+        cache_lookups.inc(cache="auth_token", tier="memory", result="hit")
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        key = self._key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide caches
+clerk_jwks = ClerkJWKS()
+verified_tokens = VerifiedTokenCache()
+
+
+def _authorized_parties() -> Optional[set]:
+    parties = {party.strip() for party in settings.CLERK_AUTHORIZED_PARTIES.split(",") if party.strip()}
+    return parties or None
+
 
 async def verify_clerk_token(authorization: Optional[str] = Header(None)) -> dict:
     """
     Verify Clerk JWT token from Authorization header
     Returns the decoded token payload with user information
-    
-    Note: For production, use Clerk's verify token API endpoint or JWKS verification.
-    This is a simplified version that decodes the token. For full security,
-    verify the token signature using Clerk's public keys.
+
+    The signature is checked against the cached JWKS; no network call is made
+    unless the key set is due for a refresh.
     """
     if not authorization:
         raise HTTPException(
             status_code=401,
             detail="Authorization header is missing"
         )
-    
+
+    # Extract token from "Bearer <token>"
+    token = authorization.replace("Bearer ", "").strip()
+
+    cached = verified_tokens.get(token)
+    if cached is not None:
+        return dict(cached)
+
     try:
-        # Extract token from "Bearer <token>"
-        token = authorization.replace("Bearer ", "").strip()
-        
-        # Option 1: Verify using Clerk's API (recommended for production)
-        clerk_secret_key = os.getenv("CLERK_SECRET_KEY")
-        if not clerk_secret_key:
-            raise HTTPException(
-                status_code=500,
-                detail="CLERK_SECRET_KEY environment variable is not set"
-            )
-        
-        # Verify token using Clerk's verify endpoint
-        verify_url = "https://api.clerk.com/v1/tokens/verify"
-        headers = {
-            "Authorization": f"Bearer {clerk_secret_key}",
-            "Content-Type": "application/json"
-        }
-        response = requests.post(
-            verify_url,
-            headers=headers,
-            json={"token": token},
-            timeout=10
+        header = jwt.get_unverified_header(token)
+    except jwt.DecodeError:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid token format"
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            # Fallback: Decode token without verification (less secure, for development)
-            # In production, always verify the signature
-            try:
-                decoded = jwt.decode(
-                    token,
-                    options={"verify_signature": False}  # Skip signature verification
-                )
-                return decoded
-            except jwt.DecodeError:
-                raise HTTPException(
-                    status_code=401,
-                    detail="Invalid token format"
-                )
-            
-    except requests.RequestException as e:
-        # If Clerk API is unavailable, fall back to decoding (development only)
-        try:
-            decoded = jwt.decode(
-                token,
-                options={"verify_signature": False}
-            )
-            return decoded
-        except jwt.DecodeError:
-            raise HTTPException(
-                status_code=401,
-                detail=f"Token verification failed: {str(e)}"
-            )
-    except Exception as e:
+
+    signing_key = await clerk_jwks.get_key(header.get("kid"))
+
+    try:
+        payload = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=["RS256"],
+            leeway=settings.CLERK_JWT_LEEWAY,
+            options={"require": ["exp", "sub"], "verify_aud": False}
+        )
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=401,
+            detail="Token has expired"
+        )
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=401,
-            detail=f"Invalid or expired token: {str(e)}"
+            detail=f"Invalid token: {str(e)}"
         )
 
+    parties = _authorized_parties()
+    if parties and payload.get("azp") and payload["azp"] not in parties:
+        raise HTTPException(
+            status_code=401,
+            detail="Token issued for an unauthorized party"
+        )
+
+    verified_tokens.put(token, payload)
+    return dict(payload)
+
 def get_user_id_from_token(token_payload: dict) -> str:
     """
     Extract Clerk user ID from verified token payload
@@ -125,4 +279,3 @@ def get_user_id_from_token(token_payload: dict) -> str:
             detail="User ID not found in token"
         )
     return user_id
-
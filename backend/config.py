@@ -42,6 +42,21 @@ class Settings(BaseSettings):
     CLERK_PUBLISHABLE_KEY: Optional[str] = None
     NEXT_PUBLIC_CLERK_PUBLISHABLE_KEY: Optional[str] = None
     CLERK_WEBHOOK_SECRET: Optional[str] = None
+    # Token verification against Clerk's JWKS (see auth.py)
+    CLERK_JWKS_URL: Optional[str] = None  # Default: derived from the publishable key
+    CLERK_JWKS_FILE: Optional[str] = None  # Load the key set from a local file (offline development/tests)
+    CLERK_JWKS_TTL: int = 3600  # Seconds before the key set is refetched
+    CLERK_JWKS_MIN_REFRESH_INTERVAL: int = 30  # Floor between refetches for unknown key ids
+    CLERK_AUTHORIZED_PARTIES: str = ""  # Comma-separated allowed azp origins (empty: not checked)
+    CLERK_JWT_LEEWAY: int = 5  # Clock skew tolerance in seconds
+    AUTH_TOKEN_CACHE_TTL: int = 30  # Seconds verified claims are reused (0 disables)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    # User lookups by clerk_id in get_current_user (see services/user_cache.py)
+    USER_CACHE_TTL: int = 30  # Seconds (0 disables)
+    USER_CACHE_MAX_SIZE: int = 10000
+    # Unread notification badge counts (see services/unread_counter.py)
+    NOTIFICATION_UNREAD_CACHE_TTL: int = 60  # Seconds (0 disables)
+    NOTIFICATION_UNREAD_CACHE_MAX_SIZE: int = 10000
     
     # Market Data API (placeholder for future use)
     MARKET_DATA_API_KEY: Optional[str] = None
@@ -63,6 +78,10 @@ class Settings(BaseSettings):
     MARKET_DATA_TIMEOUT: int = 10
     WEBSOCKET_HEARTBEAT_INTERVAL: int = 30
     
+    # Prompt Configuration
+    # Significant digits for numbers in the compact prompt format (Agent.prompt_format = 'compact')
+    PROMPT_PRECISION: int = 6
+    
     # Retry Configuration
     # For trading decisions we generally want to fail fast rather than stall
     # the entire backtest on repeated timeouts.
@@ -74,6 +93,46 @@ class Settings(BaseSettings):
     CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
     CIRCUIT_BREAKER_TIMEOUT: int = 60
     
+    # LLM Connection Pool (shared by all sessions, see services/llm_client.py)
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    LLM_HTTP2: bool = True  # Requires the h2 package; falls back to HTTP/1.1
+    
+    # LLM Scheduler (per API key, shared by all sessions, see services/llm_scheduler.py)
+    LLM_RATE_LIMIT_PER_KEY: float = 5.0  # Sustained requests per second (0 disables rate limiting)
+    LLM_BURST_PER_KEY: int = 10
+    LLM_MAX_IN_FLIGHT_PER_KEY: int = 8
+    
+    # Decision Batching (opt-in, see services/decision_batcher.py)
+    # Agents on the same API key, model and market context share one LLM request per candle.
+    AI_DECISION_BATCHING: bool = False
+    AI_BATCH_WINDOW_MS: int = 50
+    AI_BATCH_MAX_SIZE: int = 8
+    
+    # Streaming decisions for forward tests: act on the order fields before the
+    # reasoning is complete and stream the reasoning to the UI
+    AI_STREAM_DECISIONS: bool = False
+    
+    # Decision Gating (see services/trading/decision_gating.py)
+    # Detectors: sl_tp_proximity, unrealized_pnl, position_review, low_volatility,
+    # regime_change, indicator_delta
+    DECISION_GATE_DETECTORS: str = "sl_tp_proximity,unrealized_pnl,position_review,low_volatility"
+    DECISION_BUDGET_WINDOW: int = 100  # Candles per budget window (max_llm_calls_per_window)
+    
+    # Candle pipeline timing spans (see services/trading/tracing.py)
+    CANDLE_TRACING_ENABLED: bool = True
+    CANDLE_TRACING_MAX_SAMPLES: int = 2000  # Durations kept per stage for percentiles
+    
+    # Metrics (GET /metrics, see services/metrics.py)
+    LOOP_LAG_SAMPLE_INTERVAL: float = 0.5  # Seconds between event loop lag samples
+    # Debug: log the stack of any callback holding the event loop longer than the threshold
+    LOOP_BLOCK_DEBUG: bool = False
+    LOOP_BLOCK_THRESHOLD_MS: int = 100
+    # X-Internal-Token required by /metrics, /api/health/llm and /api/health/timings,
+    # which expose session ids and per-key LLM state (the endpoints are disabled when unset)
+    INTERNAL_API_TOKEN: Optional[str] = None
+    
     # Database Connection Pool
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
@@ -81,10 +140,19 @@ class Settings(BaseSettings):
     # Cache Configuration
     CACHE_MAX_SIZE: int = 1000
     CACHE_TTL: int = 3600  # 1 hour
+    INDICATOR_CACHE_MAX_MB: int = 256  # Shared indicator result cache budget
+    INDICATOR_CACHE_PERSIST: bool = False  # Also persist indicator results to the indicator_cache table
     
     # Export Limits
     MAX_EXPORT_SIZE_MB: int = 100
     EXPORT_EXPIRY_HOURS: int = 24
+    EXPORT_CHUNK_ROWS: int = 500  # Rows fetched per server-side cursor chunk when streaming exports
+    EXPORT_PARQUET_ROW_GROUP_ROWS: int = 10000  # Rows per Parquet row group (format=parquet exports)
+    EXPORT_PARQUET_COMPRESSION: str = "zstd"
+    EXPORT_WORKERS: int = 2  # Concurrent export jobs per process
+    EXPORT_QUEUE_SIZE: int = 20  # Queued export jobs before new requests get 503
+    EXPORT_HEARTBEAT_SECONDS: int = 30  # How often a worker refreshes its jobs' updated_at
+    EXPORT_STALE_AFTER_SECONDS: int = 180  # Jobs not refreshed for this long are failed as interrupted
     
     # Encryption
     ENCRYPTION_KEY: Optional[str] = None
@@ -95,7 +163,10 @@ class Settings(BaseSettings):
     # Storage / sharing
     CERTIFICATE_BUCKET: str = "certificates"
     CERTIFICATE_SHARE_BASE_URL: str = "http://localhost:3000/verify"  # Base URL for certificate verification (e.g., https://alphalab.io/verify)
+    CERTIFICATE_RENDER_WORKERS: int = 2  # Processes rendering certificate PDF/PNG (0 = thread pool)
+    CERTIFICATE_JOB_GRACE_SECONDS: int = 300  # Untracked certificates without assets report "pending" this long after issue (another process may be rendering)
     EXPORT_BUCKET: str = "exports"
+    STORAGE_UPLOAD_CHUNK_MB: int = 6  # Resumable (TUS) upload chunk size; Supabase expects 6 MB chunks
     
     model_config = ConfigDict(
         env_file=".env",
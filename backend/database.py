@@ -7,8 +7,11 @@ from dotenv import load_dotenv
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import logging
 
+from services.metrics import db_commit_seconds, db_pool_checkout_seconds
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -97,9 +100,26 @@ def get_database_url() -> str:
     return f"postgresql+asyncpg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+    
+    def _do_get(self):
+        with db_pool_checkout_seconds.time():
+            return super()._do_get()
+
+
+class TimedAsyncSession(AsyncSession):
+    """AsyncSession that records commit latency"""
+    
+    async def commit(self) -> None:
+        with db_commit_seconds.time():
+            await super().commit()
+
+
 # Create async engine with connection pooling
 engine: AsyncEngine = create_async_engine(
     get_database_url(),
+    poolclass=InstrumentedQueuePool,
     pool_size=5,            # Supabase Session mode caps clients to pool_size
     max_overflow=0,         # Disable overflow to avoid MaxClients errors
     pool_pre_ping=True,     # Verify connections before use
@@ -110,7 +130,7 @@ engine: AsyncEngine = create_async_engine(
 # Create session factory
 async_session_maker = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=TimedAsyncSession,
     expire_on_commit=False,  # Don't expire objects after commit
     autocommit=False,
     autoflush=False,
@@ -7,17 +7,19 @@ Purpose:
 
 Data Flow:
     - Incoming: HTTP Headers (Authorization) from requests.
-    - Processing: Verifies Clerk tokens, extracts user IDs, and queries the database.
+    - Processing: Verifies Clerk tokens, extracts user IDs, and resolves users (cached by clerk_id).
     - Outgoing: Returns authenticated 'User' objects or active database sessions to route handlers.
     - Usage: Used in `Depends(...)` calls within API endpoint definitions.
 """
 from fastapi import Depends, HTTPException, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Optional
+import hmac
+from config import settings
 from database import get_db
 from auth import verify_clerk_token, get_user_id_from_token
 from models import User
+from services.user_cache import user_cache
 
 async def get_current_user(
     authorization: Optional[str] = Header(None),
@@ -25,17 +27,32 @@ async def get_current_user(
 ) -> User:
     """
     Dependency to verify Clerk token and retrieve the current user from the database.
+    FastAPI resolves it once per request; across requests the user row is
+    served from a short-TTL cache.
     """
     # Verify Clerk token
     token_payload = await verify_clerk_token(authorization)
     clerk_user_id = get_user_id_from_token(token_payload)
     
-    # Fetch user from database
-    stmt = select(User).where(User.clerk_id == clerk_user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    # Fetch user (cached by clerk_id for a few seconds, see services/user_cache.py)
+    user = await user_cache.get_user(db, clerk_user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return user
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding operator endpoints that expose session ids and
+    per-key LLM state (/api/health/llm, /api/health/timings).
+    
+    The X-Internal-Token header must match settings.INTERNAL_API_TOKEN; the
+    endpoints answer 404 while no token is configured.
+    """
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_internal_token or not hmac.compare_digest(x_internal_token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid internal token")
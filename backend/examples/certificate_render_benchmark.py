@@ -0,0 +1,96 @@
+"""
+Benchmark for certificate rendering throughput (certificates/sec).
+
+Renders the PDF, PNG preview and QR code of N certificates (default 200):
+1. Uncached: font and static-layer caches cleared and the QR code generated
+   separately for every asset, as each certificate was rendered before
+2. Cached: per-process generators with cached fonts/static layer and one QR
+   code per certificate (render_certificate_assets)
+3. Process pool: the cached path spread over CERTIFICATE_RENDER_WORKERS
+   processes, as used for bulk issuance
+
+No database or storage access is needed.
+
+Run from the backend directory:
+    python examples/certificate_render_benchmark.py [num_certificates] [workers]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.certificate_renderer import CertificateRenderPool, render_certificate_assets
+from utils import image_generator
+from utils.image_generator import CertificateImageGenerator
+from utils.pdf_generator import PDFGenerator
+from utils.qr_code import generate_qr_image, qr_png_bytes
+
+
+def certificate_fields(index: int) -> dict:
+    code = f"ALX-2025-0101-{index:05d}"
+    return {
+        "agent_name": f"Benchmark Agent {index}",
+        "model": "openai/gpt-4o",
+        "mode": "monk",
+        "test_type": "backtest",
+        "asset": "BTC/USDT",
+        "pnl_pct": Decimal("12.50"),
+        "win_rate": Decimal("61.25"),
+        "total_trades": 42,
+        "max_drawdown_pct": Decimal("-4.20"),
+        "sharpe_ratio": Decimal("1.412"),
+        "duration_display": "30 days",
+        "test_period": "Jan 01 - Jan 31, 2025",
+        "verification_code": code,
+        "share_url": f"https://alphalab.io/verify/{code}",
+        "issued_at": datetime(2025, 2, 1),
+    }
+
+
+def render_uncached(fields: dict) -> None:
+    image_generator._load_font.cache_clear()
+    CertificateImageGenerator._static_layer = None
+    PDFGenerator().generate_certificate(**fields)
+    CertificateImageGenerator().generate_certificate_image(**fields)
+    qr_png_bytes(generate_qr_image(fields["share_url"]))
+
+
+def report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<28} {count / elapsed:8.1f} certificates/sec   ({elapsed * 1000 / count:6.1f} ms each)")
+
+
+async def main(count: int, workers: int):
+    fields = [certificate_fields(i) for i in range(count)]
+    render_certificate_assets(fields[0])  # warm up imports
+
+    started = time.perf_counter()
+    for item in fields:
+        render_uncached(item)
+    report("Uncached, QR per asset", count, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for item in fields:
+        render_certificate_assets(item)
+    report("Cached, shared QR", count, time.perf_counter() - started)
+
+    pool = CertificateRenderPool(workers=workers)
+    try:
+        await pool.run(render_certificate_assets, fields[0])  # start the workers
+        started = time.perf_counter()
+        await asyncio.gather(*(pool.run(render_certificate_assets, item) for item in fields))
+        report(f"Process pool ({workers} workers)", count, time.perf_counter() - started)
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    ))
@@ -0,0 +1,119 @@
+"""
+Prompt size benchmark for the AI Trader market state encodings.
+
+This script builds a realistic decision prompt (omni agent, all indicators,
+20 bars of history as sent by the backtest processor) and compares the
+"json" and "compact" prompt formats:
+1. Characters per decision
+2. Estimated input tokens per decision (tiktoken if installed, else chars / 4)
+
+Run from the backend directory:
+    python examples/prompt_size_benchmark.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import datetime, timedelta
+from services.ai_trader import AITrader, Candle as AICandle
+from services.trading import IndicatorCalculator, Candle
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _encoding = None
+
+HISTORY_WINDOW = 20  # Same as the backtest processor's full history window
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate at ~4 characters per token"""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4
+
+
+def generate_sample_candles(count=300):
+    """Generate sample candle data for the benchmark"""
+    base_time = datetime(2024, 1, 1, 0, 0, 0)
+    candles = []
+
+    base_price = 50000.0
+    for i in range(count):
+        price = base_price + (i * 10.37) + (100 * (i % 10))
+        candles.append(Candle(
+            timestamp=base_time + timedelta(hours=i),
+            open=price,
+            high=price + 52.41,
+            low=price - 48.13,
+            close=price + 25.77,
+            volume=1000000.0 + (i * 1234.5)
+        ))
+
+    return candles
+
+
+def build_prompt(prompt_format: str, calculator: IndicatorCalculator, candles, index: int) -> str:
+    """Build the full decision request text (system prefix + user message) for one candle"""
+    trader = AITrader(
+        api_key="benchmark",
+        model="benchmark",
+        strategy_prompt="Benchmark strategy",
+        mode="omni",
+        prompt_format=prompt_format
+    )
+    window_start = max(0, index - HISTORY_WINDOW + 1)
+    recent_candles = [
+        {
+            "timestamp": c.timestamp.isoformat(),
+            "open": c.open,
+            "high": c.high,
+            "low": c.low,
+            "close": c.close,
+            "volume": c.volume,
+        }
+        for c in candles[window_start:index + 1]
+    ]
+    recent_indicators = [
+        {"candle_index": idx, "values": calculator.calculate_all(idx)}
+        for idx in range(window_start, index + 1)
+    ]
+    candle = candles[index]
+    user_message = trader._build_prompt(
+        AICandle(candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume),
+        calculator.calculate_all(index),
+        None,
+        10000.0,
+        recent_candles=recent_candles,
+        recent_indicators=recent_indicators,
+        decision_context={"mode": "every_candle", "interval": 1, "candle_index": index},
+    )
+    return f"{trader.system_message}\n\n{user_message}"
+
+
+def main():
+    candles = generate_sample_candles()
+    calculator = IndicatorCalculator(candles, list(IndicatorCalculator.ALL_INDICATORS), mode="omni")
+    index = len(candles) - 1
+
+    print(f"Token counter: {'tiktoken cl100k_base' if _encoding else 'estimate (chars / 4)'}")
+    print(f"Context: omni agent, {len(IndicatorCalculator.ALL_INDICATORS)} indicators, {HISTORY_WINDOW} bars of history\n")
+
+    results = {}
+    for prompt_format in ("json", "compact"):
+        prompt = build_prompt(prompt_format, calculator, candles, index)
+        results[prompt_format] = (len(prompt), count_tokens(prompt))
+        print(f"{prompt_format:>8}: {results[prompt_format][0]:>7,} chars  {results[prompt_format][1]:>6,} tokens per decision")
+
+    json_tokens = results["json"][1]
+    compact_tokens = results["compact"][1]
+    print(f"\nCompact format uses {compact_tokens / json_tokens:.0%} of the JSON tokens "
+          f"({json_tokens - compact_tokens:,} fewer per decision)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark for GET /api/results/stats aggregation.
+
+Seeds a throwaway user with N test results (default 10,000, each with a
+500-point equity curve and an AI summary) inside a transaction, then times:
+1. The previous approach: load every TestResult ORM object and aggregate in Python
+2. The grouped aggregate query used by the endpoint
+
+The transaction is rolled back, so nothing is left in the database.
+
+Run from the backend directory (needs DATABASE settings in .env):
+    python examples/results_stats_benchmark.py [num_results]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func, select, text
+
+from database import async_session_maker
+from models.result import TestResult
+
+ROUNDS = 5
+
+SEED_SQL = """
+WITH new_user AS (
+    INSERT INTO users (clerk_id, email)
+    VALUES ('bench_' || gen_random_uuid(), 'bench_' || gen_random_uuid() || '@example.com')
+    RETURNING id
+), new_agent AS (
+    INSERT INTO agents (user_id, name, mode, model, strategy_prompt)
+    SELECT id, 'Benchmark Agent', 'monk', 'benchmark', 'benchmark' FROM new_user
+    RETURNING id, user_id
+), new_sessions AS (
+    INSERT INTO test_sessions (user_id, agent_id, type, asset, timeframe, starting_capital)
+    SELECT user_id, id, CASE WHEN n % 3 = 0 THEN 'forward' ELSE 'backtest' END, 'BTC/USDT', '1h', 10000
+    FROM new_agent, generate_series(1, :n) AS n
+    RETURNING id, user_id, agent_id, type
+)
+INSERT INTO test_results (
+    session_id, user_id, agent_id, type, asset, mode, timeframe, start_date, end_date,
+    duration_seconds, starting_capital, ending_capital, total_pnl_amount, total_pnl_pct,
+    total_trades, winning_trades, losing_trades, win_rate, equity_curve, ai_summary
+)
+SELECT
+    id, user_id, agent_id, type, 'BTC/USDT', 'monk', '1h', now() - interval '30 days', now(),
+    2592000, 10000, 10000 + pnl * 100, pnl * 100, pnl,
+    20, 11, 9, 55,
+    (SELECT jsonb_agg(jsonb_build_object('time', i, 'value', 10000 + i)) FROM generate_series(1, 500) AS i),
+    repeat('Post mortem. ', 200)
+FROM new_sessions, LATERAL (SELECT (random() * 60 - 30)::numeric(10, 4) AS pnl) AS p
+RETURNING user_id
+"""
+
+
+async def stats_in_python(db, user_id):
+    results = (await db.execute(select(TestResult).where(TestResult.user_id == user_id))).scalars().all()
+    pnls = [float(r.total_pnl_pct or 0) for r in results]
+    return len(results), sum(1 for r in results if r.is_profitable), max(pnls), min(pnls), sum(pnls)
+
+
+async def stats_in_sql(db, user_id):
+    rows = (await db.execute(
+        select(
+            TestResult.type,
+            func.count(TestResult.id).label("count"),
+            func.count(TestResult.id).filter(TestResult.is_profitable).label("profitable"),
+            func.max(TestResult.total_pnl_pct).label("best"),
+            func.min(TestResult.total_pnl_pct).label("worst"),
+            func.sum(TestResult.total_pnl_pct).label("pnl_sum"),
+        )
+        .where(TestResult.user_id == user_id)
+        .group_by(TestResult.type)
+    )).all()
+    return sum(r.count for r in rows), sum(r.profitable for r in rows)
+
+
+async def timed(label, fn, db, user_id):
+    timings = []
+    for _ in range(ROUNDS):
+        db.expunge_all()
+        started = time.perf_counter()
+        await fn(db, user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{label:<32} best {min(timings):9.1f} ms   avg {sum(timings) / len(timings):9.1f} ms")
+
+
+async def main(num_results: int):
+    async with async_session_maker() as db:
+        print(f"Seeding {num_results:,} results...")
+        user_id = (await db.execute(text(SEED_SQL), {"n": num_results})).scalars().first()
+        try:
+            await timed("ORM rows + Python aggregation", stats_in_python, db, user_id)
+            await timed("Grouped SQL aggregate", stats_in_sql, db, user_id)
+        finally:
+            await db.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
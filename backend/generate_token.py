@@ -1,14 +1,45 @@
 import jwt
 import datetime
+import json
+import os
 import sys
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Development signing key and the matching key set for CLERK_JWKS_FILE
+PRIVATE_KEY_FILE = "dev_jwks_private.pem"
+JWKS_FILE = "dev_jwks.json"
+KEY_ID = "dev-key"
+
+def load_or_create_signing_key():
+    """
+    Load the development RSA key, creating it (and dev_jwks.json) on first use.
+    """
+    if os.path.exists(PRIVATE_KEY_FILE):
+        with open(PRIVATE_KEY_FILE, "rb") as f:
+            return serialization.load_pem_private_key(f.read(), password=None)
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with open(PRIVATE_KEY_FILE, "wb") as f:
+        f.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+
+    public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk.update({"kid": KEY_ID, "use": "sig", "alg": "RS256"})
+    with open(JWKS_FILE, "w") as f:
+        json.dump({"keys": [public_jwk]}, f, indent=2)
+    return private_key
 
 def generate_test_token(user_id="user_test123", email="test@example.com", name="Test User"):
     """
     Generates a dummy JWT token for testing purposes.
-    This token is signed with a dummy secret ('secret') which matches the 
-    fallback logic in auth.py when CLERK_SECRET_KEY is not set or verification fails.
+    This token is signed with a local development RSA key. Start the backend with
+    CLERK_JWKS_FILE=dev_jwks.json so auth.py verifies it against that key set.
     """
-    
+
     payload = {
         "sub": user_id,
         "email": email,
@@ -17,18 +48,17 @@ def generate_test_token(user_id="user_test123", email="test@example.com", name="
         "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
         "iat": datetime.datetime.utcnow()
     }
-    
-    # Using HS256 algorithm and 'secret' key as per the fallback in auth.py
-    token = jwt.encode(payload, "secret", algorithm="HS256")
+
+    token = jwt.encode(payload, load_or_create_signing_key(), algorithm="RS256", headers={"kid": KEY_ID})
     return token
 
 if __name__ == "__main__":
     # Allow command line args: python generate_token.py [user_id] [email]
     uid = sys.argv[1] if len(sys.argv) > 1 else "user_test123"
     email = sys.argv[2] if len(sys.argv) > 2 else "test@example.com"
-    
+
     token = generate_test_token(uid, email)
-    
+
     print("\n" + "="*60)
     print("🔑 GENERATED TEST TOKEN")
     print("="*60)
@@ -37,6 +67,7 @@ if __name__ == "__main__":
     print("-" * 60)
     print(token)
     print("="*60 + "\n")
+    print(f"Start the backend with CLERK_JWKS_FILE={JWKS_FILE} to accept this token.")
     print("Usage in cURL:")
     print(f"-H 'Authorization: Bearer {token}'")
     print("\n")
@@ -0,0 +1,21 @@
+-- Create indicator_cache table
+
+CREATE TABLE indicator_cache (
+	cache_key VARCHAR(64) NOT NULL, 
+	asset VARCHAR(20) NOT NULL, 
+	timeframe VARCHAR(10) NOT NULL, 
+	fingerprint VARCHAR(64) NOT NULL, 
+	indicator VARCHAR(100) NOT NULL, 
+	params JSONB, 
+	series DOUBLE PRECISION[] NOT NULL, 
+	id UUID DEFAULT gen_random_uuid() NOT NULL, 
+	created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT uq_indicator_cache_key UNIQUE (cache_key)
+)
+
+;
+
+-- Index: idx_indicator_cache_lookup
+CREATE INDEX idx_indicator_cache_lookup ON indicator_cache (asset, timeframe, fingerprint);
@@ -0,0 +1,19 @@
+-- Add prompt_format column to agents table
+
+-- Add prompt_format column if it doesn't exist
+ALTER TABLE agents
+ADD COLUMN IF NOT EXISTS prompt_format VARCHAR(10) DEFAULT 'json' NOT NULL;
+
+-- Add check constraint for prompt_format values
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint 
+        WHERE conname = 'check_prompt_format_values' 
+        AND conrelid = 'agents'::regclass
+    ) THEN
+        ALTER TABLE agents 
+        ADD CONSTRAINT check_prompt_format_values 
+        CHECK (prompt_format IN ('json', 'compact'));
+    END IF;
+END $$;
@@ -0,0 +1,7 @@
+-- Add timings column to test_results table
+-- Per-stage candle pipeline timings (p50/p95/p99) and LLM call tags, see services/trading/tracing.py
+
+ALTER TABLE test_results
+ADD COLUMN IF NOT EXISTS timings JSONB;
+
+COMMENT ON COLUMN test_results.timings IS 'Candle pipeline stage timings and LLM call stats';
@@ -0,0 +1,30 @@
+-- Create user_stats table
+-- Per-user running totals over test_results, maintained by ResultService (dashboard counters)
+
+CREATE TABLE IF NOT EXISTS user_stats (
+	user_id UUID NOT NULL, 
+	tests_run INTEGER DEFAULT '0' NOT NULL, 
+	profitable_tests INTEGER DEFAULT '0' NOT NULL, 
+	best_pnl DECIMAL(10, 4), 
+	win_rate_sum DECIMAL(15, 2) DEFAULT '0' NOT NULL, 
+	id UUID DEFAULT gen_random_uuid() NOT NULL, 
+	created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL, 
+	PRIMARY KEY (id), 
+	UNIQUE (user_id), 
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+)
+
+;
+
+-- Backfill from existing results
+INSERT INTO user_stats (user_id, tests_run, profitable_tests, best_pnl, win_rate_sum)
+SELECT
+	user_id,
+	COUNT(*),
+	COUNT(*) FILTER (WHERE total_pnl_pct >= 0),
+	MAX(total_pnl_pct),
+	COALESCE(SUM(win_rate), 0)
+FROM test_results
+GROUP BY user_id
+ON CONFLICT (user_id) DO NOTHING;
@@ -0,0 +1,7 @@
+-- Indexes for keyset (cursor) pagination of result listings
+-- /api/results orders by (created_at DESC, id DESC); /api/results/{id}/trades by trade_number.
+-- /api/results/{id}/reasoning uses the existing idx_thoughts_session_candle.
+
+CREATE INDEX IF NOT EXISTS idx_results_date_id ON test_results USING btree (user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_trades_session_number ON trades (session_id, trade_number);
@@ -0,0 +1,5 @@
+-- Persist export options so queued jobs can be processed by the export worker
+
+ALTER TABLE exports ADD COLUMN IF NOT EXISTS include JSONB DEFAULT '{}' NOT NULL;
+
+COMMENT ON COLUMN exports.include IS 'Data types to include (agents, results, trades, settings, reasoning_traces)';
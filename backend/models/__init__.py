@@ -23,10 +23,10 @@ from models.agent import Agent
 from models.arena import TestSession, Trade, AiThought
 
 # Result domain models
-from models.result import TestResult, Certificate
+from models.result import TestResult, Certificate, UserStats
 
 # Activity domain models
-from models.activity import Notification, ActivityLog, MarketDataCache
+from models.activity import Notification, ActivityLog, MarketDataCache, IndicatorCacheEntry
 
 # Export domain models
 from models.export import Export
@@ -54,11 +54,13 @@ __all__ = [
     # Result models
     "TestResult",
     "Certificate",
+    "UserStats",
     
     # Activity models
     "Notification",
     "ActivityLog",
     "MarketDataCache",
+    "IndicatorCacheEntry",
     
     # Export models
     "Export",
@@ -5,6 +5,7 @@ This module contains models related to user activity tracking and data caching:
 - Notification: User notifications for test events and alerts
 - ActivityLog: Dashboard activity feed tracking user actions
 - MarketDataCache: Historical OHLCV data with pre-calculated indicators
+- IndicatorCacheEntry: Persisted indicator series keyed by candle range fingerprint
 """
 from datetime import datetime
 from decimal import Decimal
@@ -12,7 +13,7 @@ from typing import List, Optional
 import uuid
 
 from sqlalchemy import (
-    Boolean, CheckConstraint, DECIMAL, ForeignKey, Index, 
+    Boolean, CheckConstraint, DECIMAL, Float, ForeignKey, Index, 
     Integer, String, Text, DateTime, UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
@@ -335,3 +336,74 @@ class MarketDataCache(Base, UUIDMixin, TimestampMixin):
     
     def __repr__(self) -> str:
         return f"<MarketDataCache(asset={self.asset}, timeframe={self.timeframe}, timestamp={self.timestamp}, close={self.close})>"
+
+
+class IndicatorCacheEntry(Base, UUIDMixin, TimestampMixin):
+    """
+    Persisted indicator series for the shared indicator cache.
+    
+    Each row holds one full indicator series computed over an exact candle
+    range. Values depend on the whole range (EMA warm-up, cumulative OBV),
+    so rows are keyed by a fingerprint of the candles rather than stored per
+    timestamp in MarketDataCache.indicators.
+    
+    Example:
+        entry = IndicatorCacheEntry(
+            cache_key="9f2c...",
+            asset="BTC/USDT",
+            timeframe="1h",
+            fingerprint="4be1...",
+            indicator="rsi",
+            params={"window": 14},
+            series=[float("nan"), ..., 61.2]
+        )
+    """
+    __tablename__ = "indicator_cache"
+    __table_args__ = (
+        UniqueConstraint('cache_key', name='uq_indicator_cache_key'),
+        Index('idx_indicator_cache_lookup', 'asset', 'timeframe', 'fingerprint'),
+    )
+    
+    cache_key: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="SHA256 of (asset, timeframe, fingerprint, indicator, params)"
+    )
+    
+    asset: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Trading asset (e.g., 'BTC/USDT')"
+    )
+    
+    timeframe: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        comment="Candlestick timeframe (e.g., '1h')"
+    )
+    
+    fingerprint: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Content fingerprint of the candle range"
+    )
+    
+    indicator: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Indicator id (e.g., 'rsi', 'ema_200')"
+    )
+    
+    params: Mapped[Optional[dict]] = mapped_column(
+        JSONB,
+        comment="Parameters the indicator was computed with"
+    )
+    
+    series: Mapped[List[float]] = mapped_column(
+        ARRAY(Float),
+        nullable=False,
+        comment="Indicator values, one per candle (NaN during warm-up)"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<IndicatorCacheEntry(asset={self.asset}, timeframe={self.timeframe}, indicator={self.indicator})>"
@@ -55,6 +55,10 @@ class Agent(Base, UUIDMixin, TimestampMixin):
             "mode IN ('monk', 'omni')",
             name="check_mode_values"
         ),
+        CheckConstraint(
+            "prompt_format IN ('json', 'compact')",
+            name="check_prompt_format_values"
+        ),
     )
     
     # Foreign Keys
@@ -111,6 +115,13 @@ class Agent(Base, UUIDMixin, TimestampMixin):
         comment="Trading strategy instructions for the AI agent"
     )
     
+    prompt_format: Mapped[str] = mapped_column(
+        String(10),
+        server_default="json",
+        nullable=False,
+        comment="Market state encoding in LLM prompts: 'json' or 'compact' (columnar, fewer tokens)"
+    )
+    
     # Computed Statistics (updated by database trigger after test completion)
     tests_run: Mapped[int] = mapped_column(
         Integer,
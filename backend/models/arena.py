@@ -314,6 +314,7 @@ class Trade(Base, UUIDMixin):
     __table_args__ = (
         Index('idx_trades_session', 'session_id'),
         Index('idx_trades_session_time', 'session_id', 'entry_time'),
+        Index('idx_trades_session_number', 'session_id', 'trade_number'),
         CheckConstraint(
             "type IN ('long', 'short')",
             name="check_trade_type_values"
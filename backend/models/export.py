@@ -12,6 +12,7 @@ from sqlalchemy import (
     CheckConstraint, DECIMAL, ForeignKey, Index, 
     Integer, String, Text, DateTime
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, UUIDMixin, TimestampMixin
@@ -22,10 +23,10 @@ class Export(Base, UUIDMixin, TimestampMixin):
     Data export job tracking model.
     
     Tracks the status of user data export requests. When a user requests
-    an export, a job is created with status "processing". A background task
-    collects all requested data (agents, results, trades, settings) and
-    packages it into a downloadable archive. Once complete, the download_url
-    is populated and status changes to "ready".
+    an export, a job is created with status "processing" and queued on the
+    export worker (services/export_worker.py), which streams all requested
+    data (agents, results, trades, settings) into a downloadable archive.
+    Once complete, the download_url is populated and status changes to "ready".
     
     Export packages expire after a configurable time period (default 24 hours)
     to avoid storage bloat.
@@ -75,6 +76,13 @@ class Export(Base, UUIDMixin, TimestampMixin):
         comment="Export format: 'json' or 'zip'"
     )
     
+    include: Mapped[dict] = mapped_column(
+        JSONB,
+        server_default="{}",
+        nullable=False,
+        comment="Data types to include (agents, results, trades, settings, reasoning_traces)"
+    )
+    
     # Job Status
     status: Mapped[str] = mapped_column(
         String(20),
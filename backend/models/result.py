@@ -4,6 +4,7 @@ Result domain models for finalized test metrics and certificates.
 This module contains models related to test results and shareable certificates:
 - TestResult: Finalized test metrics with comprehensive performance data
 - Certificate: Shareable performance certificates with verification codes
+- UserStats: Per-user running totals over test results (dashboard counters)
 """
 from datetime import datetime
 from decimal import Decimal
@@ -17,7 +18,7 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, UUIDMixin
+from .base import Base, TimestampMixin, UUIDMixin
 
 
 class TestResult(Base, UUIDMixin):
@@ -61,6 +62,7 @@ class TestResult(Base, UUIDMixin):
         Index('idx_results_profitable', 'user_id', 'is_profitable'),
         Index('idx_results_type', 'user_id', 'type'),
         Index('idx_results_date', 'user_id', 'created_at', postgresql_using='btree', postgresql_ops={'created_at': 'DESC'}),
+        Index('idx_results_date_id', 'user_id', 'created_at', 'id', postgresql_using='btree', postgresql_ops={'created_at': 'DESC', 'id': 'DESC'}),
         CheckConstraint(
             "type IN ('backtest', 'forward')",
             name="check_result_type_values"
@@ -237,6 +239,12 @@ class TestResult(Base, UUIDMixin):
         comment="Sampled equity curve points for charting: [{time, value, drawdown}]"
     )
     
+    # Candle pipeline timings (JSONB)
+    timings: Mapped[Optional[dict]] = mapped_column(
+        JSONB,
+        comment="Candle pipeline stage timings and LLM call stats"
+    )
+    
     # AI Analysis Summary
     ai_summary: Mapped[Optional[str]] = mapped_column(
         Text,
@@ -496,3 +504,62 @@ class Certificate(Base, UUIDMixin):
     
     def __repr__(self) -> str:
         return f"<Certificate(id={self.id}, code={self.verification_code}, pnl={self.pnl_pct}%)>"
+
+
+class UserStats(Base, UUIDMixin, TimestampMixin):
+    """
+    Per-user running totals over test results.
+    
+    Maintained incrementally by ResultService when a result is persisted
+    (and rebuilt from test_results when results are deleted with an
+    agent), so the dashboard reads one row instead of aggregating all of a
+    user's results on every load.
+    
+    Average win rate is win_rate_sum / tests_run.
+    
+    Example:
+        stats = UserStats(
+            user_id=user.id,
+            tests_run=12,
+            profitable_tests=7,
+            best_pnl=Decimal("24.50"),
+            win_rate_sum=Decimal("660.00")
+        )
+    """
+    __tablename__ = "user_stats"
+    
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+        comment="Reference to user"
+    )
+    
+    tests_run: Mapped[int] = mapped_column(
+        Integer,
+        server_default="0",
+        nullable=False,
+        comment="Number of test results"
+    )
+    
+    profitable_tests: Mapped[int] = mapped_column(
+        Integer,
+        server_default="0",
+        nullable=False,
+        comment="Number of results with total_pnl_pct >= 0"
+    )
+    
+    best_pnl: Mapped[Optional[Decimal]] = mapped_column(
+        DECIMAL(10, 4),
+        comment="Best total_pnl_pct across results"
+    )
+    
+    win_rate_sum: Mapped[Decimal] = mapped_column(
+        DECIMAL(15, 2),
+        server_default="0",
+        nullable=False,
+        comment="Sum of result win rates (for the average)"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<UserStats(user_id={self.user_id}, tests_run={self.tests_run}, best_pnl={self.best_pnl})>"
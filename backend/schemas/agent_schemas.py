@@ -27,6 +27,7 @@ class AgentBase(BaseModel):
     indicators: List[str] = Field(..., min_items=1)
     custom_indicators: Optional[List[CustomIndicator]] = []
     strategy_prompt: str = Field(..., min_length=50, max_length=4000)
+    prompt_format: str = Field("json", pattern="^(json|compact)$")
 
 class AgentCreate(AgentBase):
     api_key_id: UUID
@@ -38,6 +39,7 @@ class AgentUpdate(BaseModel):
     indicators: Optional[List[str]] = Field(None, min_items=1)
     custom_indicators: Optional[List[CustomIndicator]] = None
     strategy_prompt: Optional[str] = Field(None, min_length=50, max_length=4000)
+    prompt_format: Optional[str] = Field(None, pattern="^(json|compact)$")
     api_key_id: Optional[UUID] = None
     is_archived: Optional[bool] = None
 
@@ -21,6 +21,7 @@ class BacktestStartRequest(BaseModel):
     decision_mode: str = "every_candle"
     decision_interval_candles: int = Field(1, ge=1, description="Interval used with every_n_candles")
     indicator_readiness_threshold: Optional[float] = Field(80.0, ge=50.0, le=100.0, description="Minimum percentage of indicators that must be ready before trading starts (50-100%)")
+    max_llm_calls_per_window: Optional[int] = Field(None, ge=1, description="Optional cap on LLM calls per DECISION_BUDGET_WINDOW candles (default window: 100)")
 
     @validator('date_preset')
     def validate_preset(cls, v):
@@ -85,6 +86,8 @@ class BacktestStatusResponse(BaseModel):
     trades_count: int
     win_rate: float
     open_position: Optional[OpenPosition] = None
+    llm_stats: Optional[Dict[str, Any]] = None  # Prompt cache/latency stats (active sessions only)
+    decision_gating: Optional[Dict[str, Any]] = None  # LLM calls skipped/forced by reason (active sessions only)
 
 class BacktestStatusWrapper(BaseModel):
     session: BacktestStatusResponse
@@ -121,6 +124,7 @@ class ForwardStartRequest(BaseModel):
     allow_leverage: bool = False
     decision_mode: str = "every_candle"
     decision_interval_candles: int = Field(1, ge=1, description="Interval used with every_n_candles")
+    max_llm_calls_per_window: Optional[int] = Field(None, ge=1, description="Optional cap on LLM calls per DECISION_BUDGET_WINDOW candles (default window: 100)")
     
     @validator('decision_mode')
     def validate_decision_mode(cls, v):
@@ -178,6 +182,8 @@ class ForwardStatusResponse(BaseModel):
     win_rate: float
     next_candle_eta: Optional[int] = None
     open_position: Optional[OpenPosition] = None
+    llm_stats: Optional[Dict[str, Any]] = None  # Prompt cache/latency stats (active sessions only)
+    decision_gating: Optional[Dict[str, Any]] = None  # LLM calls skipped/forced by reason (active sessions only)
 
 class ForwardStatusWrapper(BaseModel):
     session: ForwardStatusResponse
@@ -94,3 +94,28 @@ class CertificateVerifyResponse(BaseModel):
         default=None,
         description="Certificate data if verified (subset of fields for public display)"
     )
+
+
+class CertificateJobResponse(BaseModel):
+    """
+    Schema for background certificate generation status.
+    
+    Returned by POST /api/certificates/jobs and polled through
+    GET /api/certificates/jobs/{job_id} until status is 'ready' or 'failed'.
+    """
+    job_id: UUID = Field(
+        ...,
+        description="Job identifier (the certificate ID)"
+    )
+    status: str = Field(
+        ...,
+        description="Job status: 'pending', 'rendering', 'uploading', 'ready', or 'failed'"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Error message if status is 'failed'"
+    )
+    certificate: CertificateResponse = Field(
+        ...,
+        description="Certificate record (asset URLs are set once status is 'ready')"
+    )
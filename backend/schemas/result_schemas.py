@@ -23,8 +23,10 @@ class ResultListItem(BaseModel):
 class Pagination(BaseModel):
     page: int
     limit: int
-    total: int
-    total_pages: int
+    total: Optional[int] = None  # None when requested with include_total=false
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page (keyset)
+    has_more: bool = False
 
 class ResultListResponse(BaseModel):
     results: List[ResultListItem]
@@ -84,6 +86,7 @@ class ResultDetail(BaseModel):
     avg_holding_time_display: Optional[str] = None
     equity_curve: Optional[List[Dict[str, Any]]] = None
     ai_summary: Optional[str] = None
+    timings: Optional[Dict[str, Any]] = None
     trades: List[TradeSchema]
 
 class ResultDetailResponse(BaseModel):
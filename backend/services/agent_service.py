@@ -21,6 +21,7 @@ from typing import List, Optional, Dict, Any
 
 from models import Agent, ApiKey
 from schemas.agent_schemas import AgentCreate, AgentUpdate
+from services.result_service import ResultService
 
 class AgentService:
     def __init__(self, db: AsyncSession):
@@ -136,6 +137,9 @@ class AgentService:
 
         if hard_delete:
             await self.db.delete(agent)
+            # The agent's results are deleted with it (ON DELETE CASCADE)
+            await self.db.flush()
+            await ResultService(self.db).rebuild_user_stats(user_id)
         else:
             agent.is_archived = True
         
@@ -182,7 +186,8 @@ class AgentService:
             model=agent.model,
             indicators=agent.indicators,
             custom_indicators=agent.custom_indicators,
-            strategy_prompt=agent.strategy_prompt
+            strategy_prompt=agent.strategy_prompt,
+            prompt_format=agent.prompt_format
         )
         
         self.db.add(new_agent)
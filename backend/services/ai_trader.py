@@ -18,17 +18,26 @@ Usage:
     decision = await trader.get_decision(candle, indicators, position, equity)
 """
 import asyncio
+import copy
+import hashlib
 import json
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from openai import AsyncOpenAI
+from typing import Optional, Dict, Any, List, Deque, Tuple, Callable, Awaitable
 
 from config import settings
 from exceptions import OpenRouterAPIError, TimeoutError as AlphaLabTimeoutError
 from utils.retry import retry_with_backoff, CircuitBreaker, with_timeout
 from services.trading.position_manager import Position
+from services.prompt_encoding import encode_market_context
+from services.llm_client import llm_client_registry
+from services.llm_scheduler import llm_scheduler
+from services.decision_batcher import decision_batcher
+from services.streaming_json import StreamingObjectParser
+from services.metrics import llm_request_seconds, llm_queue_wait_seconds
 
 
 logger = logging.getLogger(__name__)
@@ -73,13 +82,252 @@ class AIDecision:
     candle_index: Optional[int] = None
 
 
+# Structured output schema for trading decisions. Module-level and never
+# mutated so every request sends byte-identical schema text.
+DECISION_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trading_decision",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "description": "Trading action to take",
+                    "enum": ["LONG", "SHORT", "CLOSE", "HOLD"],
+                },
+                "reasoning": {
+                    "type": "string",
+                    "description": "Explanation for the decision based on indicators and market context",
+                },
+                "entry_price": {
+                    "type": "number",
+                    "description": "Desired entry price. If omitted, enter at current close.",
+                },
+                "stop_loss_price": {
+                    "type": "number",
+                    "description": "Absolute stop loss price level. Optional; can be omitted.",
+                },
+                "take_profit_price": {
+                    "type": "number",
+                    "description": "Absolute take profit price level. Optional; can be omitted.",
+                },
+                "size_percentage": {
+                    "type": "number",
+                    "description": "Fraction of capital to use between 0.0 and 1.0",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                },
+                "leverage": {
+                    "type": "integer",
+                    "description": "Leverage multiplier between 1 and 5",
+                    "minimum": 1,
+                    "maximum": 5,
+                },
+            },
+            "required": ["action", "reasoning", "size_percentage", "leverage"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Static decision instructions; part of the cacheable system prefix
+DECISION_INSTRUCTIONS = """You must respond with a valid JSON object in the following format:
+{
+    "action": "LONG" | "SHORT" | "CLOSE" | "HOLD",
+    "reasoning": "Your detailed explanation for this decision",
+    "stop_loss_price": <absolute price level for stop loss, optional>,
+    "take_profit_price": <absolute price level for take profit, optional>,
+    "size_percentage": <percentage of capital to use, 0.0 to 1.0>,
+    "leverage": <leverage multiplier, 1 to 5, default 1>
+}
+
+Rules:
+- action: Must be one of LONG (buy), SHORT (sell), CLOSE (close position), or HOLD (do nothing)
+- reasoning: Explain your decision based on indicators and market conditions
+- stop_loss_price: Absolute price level (not percentage). For LONG, should be below entry. For SHORT, should be above entry.
+- take_profit_price: Absolute price level (not percentage). For LONG, should be above entry. For SHORT, should be below entry.
+- size_percentage: How much of your capital to use (0.0 to 1.0). For example, 0.5 means use 50% of capital.
+- leverage: Multiplier for position size, within the limit stated with the market state.
+- If you have an open position, you can only CLOSE or HOLD
+- If you don't have a position, you can LONG, SHORT, or HOLD"""
+
+# Models that need explicit cache_control breakpoints for prompt caching.
+# OpenAI, DeepSeek and most other providers cache stable prefixes automatically.
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+# Order fields the engine can act on before the reasoning text arrives
+ORDER_FIELDS = ("action", "entry_price", "stop_loss_price", "take_profit_price", "size_percentage", "leverage")
+# Order fields the schema requires; the price fields may be left out
+REQUIRED_ORDER_FIELDS = ("action", "size_percentage", "leverage")
+
+# Streaming mode: same schema with reasoning last, so the order fields are
+# complete early in the stream and the reasoning can be shown as it arrives
+_STREAMING_DECISION_SCHEMA: Dict[str, Any] = copy.deepcopy(DECISION_RESPONSE_FORMAT["json_schema"]["schema"])
+_STREAMING_DECISION_SCHEMA["properties"] = {
+    name: _STREAMING_DECISION_SCHEMA["properties"][name]
+    for name in (*ORDER_FIELDS, "reasoning")
+}
+STREAMING_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trading_decision",
+        "strict": True,
+        "schema": _STREAMING_DECISION_SCHEMA,
+    },
+}
+
+STREAMING_INSTRUCTIONS = """Write the JSON fields in this order: action, entry_price, stop_loss_price,
+take_profit_price, size_percentage, leverage, and reasoning last."""
+
+# Market context fields that are identical for every agent deciding on the
+# same candle; position, equity and decision_context are per agent
+SHARED_CONTEXT_FIELDS = ("candle", "indicators", "recent_candles", "recent_indicators")
+
+_BATCH_DECISION_SCHEMA: Dict[str, Any] = copy.deepcopy(DECISION_RESPONSE_FORMAT["json_schema"]["schema"])
+_BATCH_DECISION_SCHEMA["properties"] = {
+    "agent_id": {"type": "integer", "description": "Id of the agent this decision is for"},
+    **_BATCH_DECISION_SCHEMA["properties"],
+}
+_BATCH_DECISION_SCHEMA["required"] = ["agent_id"] + _BATCH_DECISION_SCHEMA["required"]
+
+# Structured output schema for batched decisions (one entry per agent)
+BATCH_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trading_decision_batch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "decisions": {"type": "array", "items": _BATCH_DECISION_SCHEMA},
+            },
+            "required": ["decisions"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Static system message for batched requests
+BATCH_SYSTEM_MESSAGE = f"""You are a panel of independent AI trading agents that share the same market data.
+Each agent has its own strategy, position and equity. Decide for every agent separately,
+using only that agent's strategy and state; agents do not influence each other.
+
+Respond with a JSON object {{"decisions": [...]}} containing exactly one decision per agent,
+each with the agent's "agent_id" plus the fields below.
+
+{DECISION_INSTRUCTIONS}"""
+
+
+class PromptCacheStats:
+    """
+    Per-session LLM request statistics: prompt cache hits, latency and
+    time spent waiting in the LLM scheduler queue.
+    
+    Cached token counts come from usage.prompt_tokens_details.cached_tokens,
+    which OpenRouter reports for providers with prompt caching.
+    """
+    
+    def __init__(self, max_samples: int = 500):
+        self.requests = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.batched_decisions = 0
+        self.queue_wait_total_ms = 0.0
+        self.latencies_ms: Deque[float] = deque(maxlen=max_samples)
+        self.queue_waits_ms: Deque[float] = deque(maxlen=max_samples)
+        self.time_to_action_ms: Deque[float] = deque(maxlen=max_samples)
+    
+    def record(self, latency_ms: float, usage: Any = None) -> None:
+        """Record one successful request and its token usage (if reported)"""
+        self.requests += 1
+        self.latencies_ms.append(latency_ms)
+        llm_request_seconds.observe(latency_ms / 1000)
+        
+        prompt_tokens = _usage_int(usage, "prompt_tokens")
+        completion_tokens = _usage_int(usage, "completion_tokens")
+        cached_tokens = _usage_int(getattr(usage, "prompt_tokens_details", None), "cached_tokens")
+        
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_prompt_tokens += cached_tokens
+        if cached_tokens > 0:
+            self.cache_hits += 1
+    
+    def record_queue_wait(self, wait_ms: float) -> None:
+        """Record how long one request waited for a scheduler slot"""
+        self.queue_wait_total_ms += wait_ms
+        self.queue_waits_ms.append(wait_ms)
+        llm_queue_wait_seconds.observe(wait_ms / 1000)
+    
+    def record_time_to_action(self, elapsed_ms: float) -> None:
+        """Record when a streamed decision's order fields were complete"""
+        self.time_to_action_ms.append(elapsed_ms)
+    
+    def usage_totals(self) -> Dict[str, float]:
+        """Cumulative token and queue wait counters (diffed by timing spans per call)"""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "queue_wait_ms": self.queue_wait_total_ms,
+        }
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot"""
+        latencies = sorted(self.latencies_ms)
+        queue_waits = sorted(self.queue_waits_ms)
+        times_to_action = sorted(self.time_to_action_ms)
+        
+        def percentile(fraction: float, samples: List[float] = latencies) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))], 1)
+        
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": (self.cache_hits / self.requests) if self.requests else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "cached_token_ratio": (
+                self.cached_prompt_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+            ),
+            "completion_tokens": self.completion_tokens,
+            "batched_decisions": self.batched_decisions,
+            "latency_avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+            "queue_wait_avg_ms": round(sum(queue_waits) / len(queue_waits), 1) if queue_waits else None,
+            "queue_wait_p95_ms": percentile(0.95, queue_waits),
+            "time_to_action_p50_ms": percentile(0.50, times_to_action),
+            "time_to_action_p95_ms": percentile(0.95, times_to_action),
+        }
+
+
+def _usage_int(usage: Any, field: str) -> int:
+    """Read an integer usage field, treating missing/non-numeric values as 0"""
+    value = getattr(usage, field, None) if usage is not None else None
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+def _leverage_rule(decision_context: Optional[Dict[str, Any]]) -> str:
+    """Describe the leverage limit from the decision context"""
+    allow_leverage = decision_context.get("allow_leverage", False) if decision_context else False
+    max_leverage = decision_context.get("max_leverage", 1) if decision_context else 1
+    return f"allowed up to {max_leverage}x" if allow_leverage else "locked at 1x (no leverage allowed)"
+
+
 class AITrader:
     """
     AI Trader service for getting trading decisions from OpenRouter API.
     
     Handles:
     - OpenRouter API integration with streaming
-    - Prompt building with market context
+    - Prompt building with market context (stable cacheable prefix + market state suffix)
     - JSON response parsing and validation
     - Retry logic and error handling
     - Circuit breaker for API failures
@@ -90,7 +338,13 @@ class AITrader:
         api_key: str,
         model: str,
         strategy_prompt: str,
-        mode: str
+        mode: str,
+        prompt_format: str = "json",
+        prompt_precision: Optional[int] = None,
+        session_id: Optional[str] = None,
+        priority: str = "backtest",
+        batching: bool = False,
+        streaming: bool = False
     ):
         """
         Initialize AI Trader.
@@ -100,21 +354,37 @@ class AITrader:
             model: Model identifier (e.g., "anthropic/claude-3.5-sonnet")
             strategy_prompt: Trading strategy instructions
             mode: Agent mode - "monk" or "omni"
+            prompt_format: Market state encoding - "json" (indented JSON) or
+                           "compact" (columnar table, see services.prompt_encoding)
+            prompt_precision: Significant digits for numbers in the compact format
+                              (defaults to settings.PROMPT_PRECISION)
+            session_id: Session issuing the decisions (fair queuing unit in the LLM scheduler)
+            priority: LLM scheduler priority class - "forward" (live) or "backtest"
+            batching: Share one LLM request with other batching traders on the same
+                      API key, model and market context (see services.decision_batcher)
+            streaming: Stream the response and hand order fields to the caller
+                       before the reasoning text is complete (see get_decision)
         """
         self.api_key = api_key
         self.model = model
         self.strategy_prompt = strategy_prompt
         self.mode = mode
+        self.prompt_format = prompt_format
+        self.prompt_precision = prompt_precision or settings.PROMPT_PRECISION
+        self.session_id = session_id
+        self.priority = priority
+        self.batching = batching
+        self.streaming = streaming
+        if batching:
+            decision_batcher.join(self._batch_group(), self)
         
-        # Initialize AsyncOpenAI client with OpenRouter base URL
-        self.client = AsyncOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-            default_headers={
-                "HTTP-Referer": settings.OPENROUTER_HTTP_REFERER,
-                "X-Title": settings.OPENROUTER_X_TITLE
-            }
-        )
+        # Stable request prefix, built once so every decision request starts
+        # with identical text and provider-side prompt caching can reuse it
+        self.system_message = self._build_system_message()
+        self.prompt_stats = PromptCacheStats()
+        
+        # Shared per-key client on the process-wide connection pool
+        self.client = llm_client_registry.get_client(api_key)
         
         # Initialize circuit breaker for API calls
         self.circuit_breaker = CircuitBreaker(
@@ -128,6 +398,7 @@ class AITrader:
             extra={
                 "model": model,
                 "mode": mode,
+                "prompt_format": prompt_format,
                 "strategy_length": len(strategy_prompt)
             }
         )
@@ -141,6 +412,8 @@ class AITrader:
         recent_candles: Optional[List[Dict[str, Any]]] = None,
         recent_indicators: Optional[List[Dict[str, Any]]] = None,
         decision_context: Optional[Dict[str, Any]] = None,
+        on_action: Optional[Callable[[AIDecision], Awaitable[None]]] = None,
+        on_reasoning: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> AIDecision:
         """
         Get trading decision from AI model with retry logic.
@@ -148,19 +421,27 @@ class AITrader:
         Implements exponential backoff retry (up to 3 attempts) and returns
         HOLD decision on failure with error reasoning.
         
+        In streaming mode, on_action is awaited with a provisional decision
+        (empty reasoning) as soon as the order fields are complete, and
+        on_reasoning with each new piece of reasoning text. Once on_action has
+        been called the request is not retried, and the returned decision has
+        the same order fields. Neither callback is used when the decision
+        comes from a batch or the stream fails before the order fields arrive.
+        
         Args:
             candle: Current candle data
             indicators: Dictionary of calculated indicator values
             position_state: Current open position (if any)
             equity: Current account equity
+            on_action: Streaming only - called once with the provisional decision
+            on_reasoning: Streaming only - called with reasoning text deltas
             
         Returns:
             AIDecision object with action, reasoning, and order parameters.
             Returns HOLD decision if all retries fail.
         """
         try:
-            # Build prompt with market context
-            prompt = self._build_prompt(
+            market_context = self._build_market_context(
                 candle,
                 indicators,
                 position_state,
@@ -170,9 +451,24 @@ class AITrader:
                 decision_context=decision_context,
             )
             
+            if self.batching:
+                decision = await decision_batcher.submit(
+                    self._batch_key(market_context),
+                    (self, market_context),
+                    AITrader._request_batch,
+                    group=self._batch_group()
+                )
+                if decision is not None:
+                    return decision
+            
+            # Build prompt with market context
+            prompt = self._render_prompt(market_context)
+            
             # Make API request with retry, timeout, and circuit breaker protection
             async def make_request_with_retry():
                 async def make_request():
+                    if self.streaming:
+                        return await self._stream_api_request(prompt, on_action, on_reasoning)
                     return await self._make_api_request(prompt)
                 
                 # Apply circuit breaker
@@ -194,10 +490,10 @@ class AITrader:
                     operation_name="ai_decision"
                 )
             
-            response_text = await make_request_with_retry()
+            response = await make_request_with_retry()
             
-            # Parse and validate JSON response
-            decision = self._parse_response(response_text)
+            # Parse and validate JSON response (streamed responses arrive parsed)
+            decision = response if isinstance(response, AIDecision) else self._parse_response(response)
             
             logger.info(
                 f"AI decision received: {decision.action}",
@@ -247,6 +543,27 @@ class AITrader:
         Returns:
             Formatted prompt string
         """
+        return self._render_prompt(self._build_market_context(
+            candle,
+            indicators,
+            position_state,
+            equity,
+            recent_candles=recent_candles,
+            recent_indicators=recent_indicators,
+            decision_context=decision_context,
+        ))
+    
+    def _build_market_context(
+        self,
+        candle: Candle,
+        indicators: Dict[str, float],
+        position_state: Optional[Position],
+        equity: float,
+        recent_candles: Optional[List[Dict[str, Any]]] = None,
+        recent_indicators: Optional[List[Dict[str, Any]]] = None,
+        decision_context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Collect candle, indicators, position state and history into the market context dict"""
         # Format candle data
         candle_data = {
             "timestamp": candle.timestamp.isoformat(),
@@ -280,43 +597,89 @@ class AITrader:
             "recent_indicators": recent_indicators or [],
             "decision_context": decision_context or {},
         }
-        constraints = market_context["decision_context"]
-        allow_leverage = constraints.get("allow_leverage", False) if constraints else False
-        max_leverage = constraints.get("max_leverage", 1) if constraints else 1
-        
-        # Create user message
+        return market_context
+    
+    def _render_prompt(self, market_context: Dict[str, Any]) -> str:
+        """Render the user message for a single-agent request"""
+        # Create user message: only the per-decision part of the request.
+        # Static instructions live in the system message (see _build_system_message).
         user_message = f"""Current Market State:
-{json.dumps(market_context, indent=2)}
+{self._format_market_state(market_context)}
 
-Based on the current market state and your trading strategy, make a trading decision.
-
-You must respond with a valid JSON object in the following format:
-{{
-    "action": "LONG" | "SHORT" | "CLOSE" | "HOLD",
-    "reasoning": "Your detailed explanation for this decision",
-    "stop_loss_price": <absolute price level for stop loss, optional>,
-    "take_profit_price": <absolute price level for take profit, optional>,
-    "size_percentage": <percentage of capital to use, 0.0 to 1.0>,
-    "leverage": <leverage multiplier, 1 to 5, default 1>
-}}
-
-Rules:
-- action: Must be one of LONG (buy), SHORT (sell), CLOSE (close position), or HOLD (do nothing)
-- reasoning: Explain your decision based on indicators and market conditions
-- stop_loss_price: Absolute price level (not percentage). For LONG, should be below entry. For SHORT, should be above entry.
-- take_profit_price: Absolute price level (not percentage). For LONG, should be above entry. For SHORT, should be below entry.
-- size_percentage: How much of your capital to use (0.0 to 1.0). For example, 0.5 means use 50% of capital.
-- leverage: Multiplier for position size. Leverage is {'allowed up to ' + str(max_leverage) + 'x' if allow_leverage else 'locked at 1x (no leverage allowed)'}.
-- If you have an open position, you can only CLOSE or HOLD
-- If you don't have a position, you can LONG, SHORT, or HOLD
+Leverage is {_leverage_rule(market_context["decision_context"])}.
+Based on the current market state and your trading strategy, make a trading decision
+(LONG, SHORT, CLOSE or HOLD) and respond with the JSON object described in your instructions.
 """
         
         return user_message
     
+    def _build_system_message(self) -> str:
+        """
+        Build the static part of every request: mode, strategy and decision
+        instructions. It does not change for the lifetime of the trader.
+        """
+        instructions = DECISION_INSTRUCTIONS
+        if self.streaming:
+            instructions = f"{DECISION_INSTRUCTIONS}\n\n{STREAMING_INSTRUCTIONS}"
+        
+        return f"""You are an AI trading agent operating in {self._mode_description()}.
+
+Your Strategy:
+{self.strategy_prompt}
+
+You must analyze the market data and make trading decisions based on your strategy.
+Always respond with valid JSON in the exact format specified.
+
+{instructions}"""
+    
+    def _mode_description(self) -> str:
+        return "Monk Mode (limited indicators)" if self.mode == "monk" else "Omni Mode (all indicators)"
+    
+    def _build_messages(self, user_message: str) -> List[Dict[str, Any]]:
+        """
+        Assemble chat messages as stable prefix + variable suffix.
+        
+        For providers that need explicit breakpoints the system message is
+        marked with cache_control so OpenRouter caches the prefix.
+        """
+        if self.model.startswith(CACHE_CONTROL_MODEL_PREFIXES):
+            system_content: Any = [{
+                "type": "text",
+                "text": self.system_message,
+                "cache_control": {"type": "ephemeral"},
+            }]
+        else:
+            system_content = self.system_message
+        
+        return [
+            {"role": "system", "content": system_content},
+            {"role": "user", "content": user_message},
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return prompt cache and latency statistics for this trader's session"""
+        return self.prompt_stats.as_dict()
+    
+    def _format_market_state(self, market_context: Dict[str, Any]) -> str:
+        """
+        Render the market context in the agent's prompt format.
+        
+        The compact format sends the recent history as a single columnar table
+        and typically needs a fraction of the tokens of the JSON rendering
+        (see examples/prompt_size_benchmark.py).
+        """
+        if self.prompt_format == "compact":
+            return encode_market_context(market_context, precision=self.prompt_precision)
+        return json.dumps(market_context, indent=2)
+    
     async def _make_api_request(self, user_message: str) -> str:
         """
         Make API request to OpenRouter with timeout and retry.
         
+        The request first waits for a slot from the process-wide LLM scheduler
+        (per-key rate limit, fair share across sessions). Queue time is not
+        counted against AI_DECISION_TIMEOUT; only the request itself is.
+        
         We intentionally use the non-streaming API with OpenRouter structured
         outputs so the model is constrained to emit JSON that matches our
         trading decision schema. This keeps parsing simple and avoids most
@@ -334,77 +697,25 @@ Rules:
         """
         async def make_request():
             try:
-                # Build system message based on mode
-                mode_description = "Monk Mode (limited indicators)" if self.mode == "monk" else "Omni Mode (all indicators)"
-                system_message = f"""You are an AI trading agent operating in {mode_description}.
-
-Your Strategy:
-{self.strategy_prompt}
-
-You must analyze the market data and make trading decisions based on your strategy.
-Always respond with valid JSON in the exact format specified."""
+                started = time.perf_counter()
                 
                 # Make non-streaming request with structured outputs so we get
                 # a single JSON object that matches our schema.
                 response = await self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": user_message}
-                    ],
-                    response_format={
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": "trading_decision",
-                            "strict": True,
-                            "schema": {
-                                "type": "object",
-                                "properties": {
-                                    "action": {
-                                        "type": "string",
-                                        "description": "Trading action to take",
-                                        "enum": ["LONG", "SHORT", "CLOSE", "HOLD"],
-                                    },
-                                    "reasoning": {
-                                        "type": "string",
-                                        "description": "Explanation for the decision based on indicators and market context",
-                                    },
-                                    "entry_price": {
-                                        "type": "number",
-                                        "description": "Desired entry price. If omitted, enter at current close.",
-                                    },
-                                    "stop_loss_price": {
-                                        "type": "number",
-                                        "description": "Absolute stop loss price level. Optional; can be omitted.",
-                                    },
-                                    "take_profit_price": {
-                                        "type": "number",
-                                        "description": "Absolute take profit price level. Optional; can be omitted.",
-                                    },
-                                    "size_percentage": {
-                                        "type": "number",
-                                        "description": "Fraction of capital to use between 0.0 and 1.0",
-                                        "minimum": 0.0,
-                                        "maximum": 1.0,
-                                    },
-                                    "leverage": {
-                                        "type": "integer",
-                                        "description": "Leverage multiplier between 1 and 5",
-                                        "minimum": 1,
-                                        "maximum": 5,
-                                    },
-                                },
-                                "required": ["action", "reasoning", "size_percentage", "leverage"],
-                                "additionalProperties": False,
-                            },
-                        },
-                    },
+                    messages=self._build_messages(user_message),
+                    response_format=DECISION_RESPONSE_FORMAT,
                     # Deterministic decisions for backtest/forward so runs are reproducible
                     temperature=0,
                     # Keep max_tokens small to stay well within OpenRouter credit limits
                     # and avoid 402 errors like "requested 65535 tokens".
                     max_tokens=512,
                 )
+                
+                self.prompt_stats.record(
+                    (time.perf_counter() - started) * 1000,
+                    getattr(response, "usage", None)
+                )
 
                 # OpenAI / OpenRouter client returns the content on the first choice
                 content = response.choices[0].message.content
@@ -431,12 +742,251 @@ Always respond with valid JSON in the exact format specified."""
                 )
                 raise OpenRouterAPIError(str(e))
         
-        # Apply timeout
-        return await with_timeout(
-            make_request,
-            timeout_seconds=settings.AI_DECISION_TIMEOUT,
-            operation_name="ai_decision"
+        async with llm_scheduler.slot(self.api_key, self.session_id, priority=self.priority) as ticket:
+            self.prompt_stats.record_queue_wait(ticket.wait_ms)
+            
+            # Apply timeout
+            return await with_timeout(
+                make_request,
+                timeout_seconds=settings.AI_DECISION_TIMEOUT,
+                operation_name="ai_decision"
+            )
+    
+    async def _stream_api_request(
+        self,
+        user_message: str,
+        on_action: Optional[Callable[[AIDecision], Awaitable[None]]] = None,
+        on_reasoning: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> AIDecision:
+        """
+        Make a streaming API request and parse the decision as it arrives.
+        
+        The order fields come first in the streaming schema, so the decision
+        can be acted on as soon as the required order fields have arrived and
+        the reasoning has started (price fields the model left out are then
+        not coming), or once every order field has arrived. Models that put
+        the reasoning first are still handled: the decision is then emitted
+        once all order fields follow, or parsed from the complete object. After the decision was emitted errors no longer fail the
+        request: the provisional decision is returned with whatever
+        reasoning was received.
+        
+        Args:
+            user_message: User message with market context
+            on_action: Called once with the provisional decision
+            on_reasoning: Called with each new piece of reasoning text
+            
+        Returns:
+            Validated AIDecision
+            
+        Raises:
+            OpenRouterAPIError: If the request fails before the order fields are complete
+            AlphaLabTimeoutError: If the request times out before the order fields are complete
+        """
+        parser = StreamingObjectParser()
+        reasoning: List[str] = []
+        provisional: Dict[str, AIDecision] = {}
+        started = time.perf_counter()
+        
+        async def emit_action(reasoning_started: bool = False):
+            if provisional:
+                return
+            if not all(name in parser.fields for name in REQUIRED_ORDER_FIELDS):
+                return
+            # Optional price fields can still follow until the reasoning starts
+            if not (reasoning_started or parser.done or all(name in parser.fields for name in ORDER_FIELDS)):
+                return
+            order = {name: value for name, value in parser.fields.items() if name != "reasoning"}
+            decision = self._parse_response(json.dumps({**order, "reasoning": ""}))
+            provisional["decision"] = decision
+            self.prompt_stats.record_time_to_action((time.perf_counter() - started) * 1000)
+            if on_action is not None:
+                await on_action(decision)
+        
+        async def make_request():
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(user_message),
+                    response_format=STREAMING_RESPONSE_FORMAT,
+                    temperature=0,
+                    max_tokens=512,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                
+                usage = None
+                async for chunk in stream:
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if not content:
+                        continue
+                    
+                    for event in parser.feed(content):
+                        if event.key == "reasoning":
+                            await emit_action(reasoning_started=True)
+                            if event.kind == "text":
+                                reasoning.append(event.value)
+                                if on_reasoning is not None:
+                                    await on_reasoning(event.value)
+                        else:
+                            await emit_action()
+                    await emit_action(reasoning_started=parser.streaming_key == "reasoning")
+                
+                self.prompt_stats.record((time.perf_counter() - started) * 1000, usage)
+                if not parser.done:
+                    raise OpenRouterAPIError("Incomplete streamed response")
+                return self._parse_response(json.dumps(parser.fields))
+                
+            except Exception as e:
+                logger.error(
+                    f"OpenRouter streaming request failed: {str(e)}",
+                    extra={"error": str(e), "model": self.model}
+                )
+                raise OpenRouterAPIError(str(e))
+        
+        try:
+            async with llm_scheduler.slot(self.api_key, self.session_id, priority=self.priority) as ticket:
+                self.prompt_stats.record_queue_wait(ticket.wait_ms)
+                return await with_timeout(
+                    make_request,
+                    timeout_seconds=settings.AI_DECISION_TIMEOUT,
+                    operation_name="ai_decision"
+                )
+        except (OpenRouterAPIError, AlphaLabTimeoutError) as e:
+            decision = provisional.get("decision")
+            if decision is None:
+                raise
+            # The caller may already have acted on the order fields; keep them
+            decision.reasoning = f"{''.join(reasoning)} [reasoning stream interrupted: {str(e)}]".strip()
+            return decision
+    
+    def _batch_group(self) -> Tuple[str, ...]:
+        """Traders that can ever share a batched request: same API key, model and prompt encoding"""
+        return (
+            llm_scheduler.key_id(self.api_key),
+            self.model,
+            self.prompt_format,
+            str(self.prompt_precision),
+        )
+    
+    def _batch_key(self, market_context: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        Key under which decisions can share one batched request: same batch
+        group (see _batch_group) and shared market context.
+        """
+        shared = {name: market_context[name] for name in SHARED_CONTEXT_FIELDS}
+        digest = hashlib.sha256(json.dumps(shared, sort_keys=True, default=str).encode()).hexdigest()
+        return self._batch_group() + (digest,)
+    
+    def _format_agent_section(self, agent_id: int, market_context: Dict[str, Any]) -> str:
+        """Render one agent's strategy and state for a batched request"""
+        agent_state = {
+            "position": market_context["position"],
+            "equity": market_context["equity"],
+            "decision_context": market_context["decision_context"],
+        }
+        if self.prompt_format == "compact":
+            state_text = json.dumps(agent_state, separators=(",", ":"), default=str)
+        else:
+            state_text = json.dumps(agent_state, indent=2, default=str)
+        
+        return f"""Agent {agent_id} ({self._mode_description()}):
+Strategy:
+{self.strategy_prompt}
+State:
+{state_text}
+Leverage is {_leverage_rule(market_context["decision_context"])}."""
+    
+    @staticmethod
+    async def _request_batch(items: List[Tuple["AITrader", Dict[str, Any]]]) -> List[Optional[AIDecision]]:
+        """
+        Decide for several traders that share a batch key in one request.
+        
+        The shared market state is sent once, followed by each agent's
+        strategy and state. Decisions missing from the response or failing
+        validation come back as None so those traders fall back to their own
+        request; errors for the whole batch propagate to the batcher, which
+        falls back for every trader.
+        
+        Args:
+            items: (trader, market_context) pairs; the first trader sends the request
+            
+        Returns:
+            One AIDecision (or None) per item
+        """
+        lead, lead_context = items[0]
+        shared = {name: lead_context[name] for name in SHARED_CONTEXT_FIELDS}
+        sections = [f"Shared Market State:\n{lead._format_market_state(shared)}"]
+        sections.extend(
+            trader._format_agent_section(agent_id, market_context)
+            for agent_id, (trader, market_context) in enumerate(items)
+        )
+        sections.append(
+            f"Make one trading decision for each of the {len(items)} agents "
+            f"(agent_id 0 to {len(items) - 1}) and respond with the JSON object described in your instructions."
+        )
+        messages = [
+            {"role": "system", "content": BATCH_SYSTEM_MESSAGE},
+            {"role": "user", "content": "\n\n".join(sections)},
+        ]
+        priority = "forward" if any(trader.priority == "forward" for trader, _ in items) else "backtest"
+        
+        async def make_request():
+            started = time.perf_counter()
+            response = await lead.client.chat.completions.create(
+                model=lead.model,
+                messages=messages,
+                response_format=BATCH_RESPONSE_FORMAT,
+                temperature=0,
+                max_tokens=512 * len(items),
+            )
+            lead.prompt_stats.record(
+                (time.perf_counter() - started) * 1000,
+                getattr(response, "usage", None)
+            )
+            return response.choices[0].message.content
+        
+        async with llm_scheduler.slot(lead.api_key, lead.session_id, priority=priority) as ticket:
+            lead.prompt_stats.record_queue_wait(ticket.wait_ms)
+            content = await with_timeout(
+                make_request,
+                timeout_seconds=settings.AI_DECISION_TIMEOUT,
+                operation_name="ai_decision_batch"
+            )
+        
+        data = json.loads(content) if isinstance(content, str) else content
+        entries: Dict[int, Dict[str, Any]] = {}
+        for entry in (data or {}).get("decisions") or []:
+            if isinstance(entry, dict) and isinstance(entry.get("agent_id"), int):
+                entries.setdefault(entry["agent_id"], entry)
+        
+        results: List[Optional[AIDecision]] = []
+        for agent_id, (trader, _) in enumerate(items):
+            decision = None
+            entry = entries.get(agent_id)
+            if entry is not None:
+                try:
+                    decision = trader._parse_response(json.dumps(entry))
+                except OpenRouterAPIError as e:
+                    logger.warning(
+                        f"Invalid batched decision for agent {agent_id}: {str(e)}",
+                        extra={"error": str(e), "model": trader.model}
+                    )
+            if decision is not None:
+                trader.prompt_stats.batched_decisions += 1
+            results.append(decision)
+        
+        logger.info(
+            f"Batched AI decisions received",
+            extra={
+                "model": lead.model,
+                "batch_size": len(items),
+                "decisions": sum(1 for decision in results if decision is not None)
+            }
         )
+        return results
     
     def _parse_response(self, response_text: str) -> AIDecision:
         """
@@ -0,0 +1,122 @@
+"""
+Certificate Rendering Pool for AlphaLab.
+
+Purpose:
+    Renders certificate assets (PDF via reportlab, PNG via PIL, QR code) in
+    a process pool so CPU-bound drawing never runs on the event loop. Each
+    worker process keeps its own PDFGenerator and CertificateImageGenerator
+    (with their cached fonts and static layers), and the QR code is
+    generated once per certificate and shared by all three assets.
+
+    CERTIFICATE_RENDER_WORKERS sets the pool size; 0 renders in the default
+    thread pool instead (tests, single-core deployments).
+
+Usage:
+    from services.certificate_renderer import render_certificate_assets, render_pool
+
+    assets = await render_pool.run(render_certificate_assets, fields)
+    assets.pdf, assets.image, assets.qr
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import multiprocessing
+
+from config import settings
+from utils.image_generator import CertificateImageGenerator
+from utils.pdf_generator import PDFGenerator
+from utils.qr_code import generate_qr_image, qr_png_bytes
+
+logger = logging.getLogger(__name__)
+
+# Per-process generators (created on first render in each worker)
+_generators: Optional[Tuple[PDFGenerator, CertificateImageGenerator]] = None
+
+
+@dataclass
+class CertificateAssets:
+    """Rendered certificate files"""
+    pdf: bytes
+    image: bytes
+    qr: bytes
+
+
+def _get_generators() -> Tuple[PDFGenerator, CertificateImageGenerator]:
+    global _generators
+    if _generators is None:
+        _generators = (PDFGenerator(), CertificateImageGenerator())
+    return _generators
+
+
+def render_pdf(fields: Dict[str, Any]) -> bytes:
+    """Render the certificate PDF from the certificate's display fields"""
+    return _get_generators()[0].generate_certificate(**fields)
+
+
+def render_image(fields: Dict[str, Any]) -> bytes:
+    """Render the certificate PNG from the certificate's display fields"""
+    return _get_generators()[1].generate_certificate_image(**fields)
+
+
+def render_certificate_assets(fields: Dict[str, Any]) -> CertificateAssets:
+    """
+    Render PDF, PNG and QR code for a certificate (runs in a pool worker).
+
+    Args:
+        fields: Keyword arguments of PDFGenerator.generate_certificate
+            (agent_name, model, ..., verification_code, share_url, issued_at)
+    """
+    pdf_generator, image_generator = _get_generators()
+    qr_image = generate_qr_image(fields["share_url"])
+    return CertificateAssets(
+        pdf=pdf_generator.generate_certificate(**fields, qr_image=qr_image),
+        image=image_generator.generate_certificate_image(**fields, qr_image=qr_image),
+        qr=qr_png_bytes(qr_image),
+    )
+
+
+class CertificateRenderPool:
+    """Lazily started process pool for certificate rendering"""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            workers: Worker processes (default: settings.CERTIFICATE_RENDER_WORKERS;
+                0 uses the event loop's default thread pool)
+        """
+        self.workers = workers if workers is not None else settings.CERTIFICATE_RENDER_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._executor is None and self.workers > 0:
+            # spawn: never fork a process that has a running event loop and DB pool
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a module-level render function in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); start a fresh pool for the next render
+            logger.error("Certificate render pool broke, restarting it")
+            self.shutdown()
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared pool used by CertificateService
+render_pool = CertificateRenderPool()
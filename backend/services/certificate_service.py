@@ -11,6 +11,9 @@ Data Flow:
         - Validates test results are profitable
         - Generates unique verification codes
         - Creates certificate records in database
+        - Renders PDF/PNG/QR assets in the render pool (services/certificate_renderer.py)
+          and uploads them concurrently
+        - Tracks background asset generation jobs for status polling
         - Manages certificate retrieval and verification
     - Outgoing: SQLAlchemy Certificate model instances returned to API layer
 """
@@ -18,20 +21,25 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.orm import joinedload
 from uuid import UUID
-from typing import Optional, Dict, Any
-from datetime import datetime
-from io import BytesIO
+from typing import Optional, Dict, Any, Callable, Set
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
 import secrets
 import string
 
-import qrcode
-
+from database import async_session_maker
 from models import Certificate, TestResult, Agent
 from utils.storage import StorageClient
-from utils.pdf_generator import PDFGenerator
-from utils.image_generator import CertificateImageGenerator
+from services.certificate_renderer import render_certificate_assets, render_image, render_pdf, render_pool
 from config import settings
 
+logger = logging.getLogger(__name__)
+
+# Stages of background asset generation; "ready" and "failed" are final
+CERTIFICATE_JOB_ACTIVE = ("pending", "rendering", "uploading")
+
 
 class CertificateService:
     """Service for managing certificates."""
@@ -45,8 +53,6 @@ class CertificateService:
         """
         self.db = db
         self._storage = None  # Lazy initialization
-        self.pdf_generator = PDFGenerator()
-        self.image_generator = CertificateImageGenerator()
     
     @property
     def storage(self) -> StorageClient:
@@ -62,23 +68,54 @@ class CertificateService:
         frontend_base_url: Optional[str] = None
     ) -> Certificate:
         """
-        Generate a certificate for a test result.
+        Generate a certificate for a test result, including its assets.
         
         Validates that:
         - Result exists and belongs to user
         - Result is profitable
-        - Certificate doesn't already exist for this result
+        
+        An existing certificate for the result is returned instead of a new
+        one (its assets are generated if an earlier attempt did not finish).
         
         Args:
             user_id: ID of the user requesting certificate
             result_id: ID of the test result to certify
+            frontend_base_url: Frontend base URL for the share link
             
         Returns:
-            Certificate: Newly created certificate
+            Certificate: Certificate with pdf_url, image_url and qr_code_url set
             
         Raises:
-            ValueError: If result not found, not owned by user, not profitable,
-                       or certificate already exists
+            ValueError: If result not found, not owned by user, or not profitable
+        """
+        certificate = await self.create_certificate_record(user_id, result_id, frontend_base_url)
+        if not certificate.pdf_url:
+            await self.generate_assets(certificate)
+        return certificate
+    
+    async def create_certificate_record(
+        self, 
+        user_id: UUID, 
+        result_id: UUID,
+        frontend_base_url: Optional[str] = None
+    ) -> Certificate:
+        """
+        Create (or return the existing) certificate row for a test result.
+        
+        Only validation and the database insert happen here; assets are
+        produced by generate_assets(), either inline or as a background job
+        (certificate_jobs.submit).
+        
+        Args:
+            user_id: ID of the user requesting certificate
+            result_id: ID of the test result to certify
+            frontend_base_url: Frontend base URL for the share link
+            
+        Returns:
+            Certificate: New or existing certificate (assets may be missing)
+            
+        Raises:
+            ValueError: If result not found, not owned by user, or not profitable
         """
         # Fetch the test result with related data
         result = await self.db.execute(
@@ -147,86 +184,63 @@ class CertificateService:
             view_count=0
         )
         
-        # Generate and upload assets
-        pdf_bytes = self._build_pdf_bytes(
-            agent_name=new_certificate.agent_name,
-            model=new_certificate.model,
-            mode=new_certificate.mode,
-            test_type=new_certificate.test_type,
-            asset=new_certificate.asset,
-            pnl_pct=new_certificate.pnl_pct,
-            win_rate=new_certificate.win_rate,
-            total_trades=new_certificate.total_trades,
-            max_drawdown_pct=new_certificate.max_drawdown_pct,
-            sharpe_ratio=new_certificate.sharpe_ratio,
-            duration_display=new_certificate.duration_display,
-            test_period=new_certificate.test_period,
-            verification_code=new_certificate.verification_code,
-            share_url=new_certificate.share_url,
-            issued_at=datetime.utcnow(),
-        )
-        image_bytes = self.image_generator.generate_certificate_image(
-            agent_name=new_certificate.agent_name,
-            model=new_certificate.model,
-            mode=new_certificate.mode,
-            test_type=new_certificate.test_type,
-            asset=new_certificate.asset,
-            pnl_pct=new_certificate.pnl_pct,
-            win_rate=new_certificate.win_rate,
-            total_trades=new_certificate.total_trades,
-            max_drawdown_pct=new_certificate.max_drawdown_pct,
-            sharpe_ratio=new_certificate.sharpe_ratio,
-            duration_display=new_certificate.duration_display,
-            test_period=new_certificate.test_period,
-            verification_code=new_certificate.verification_code,
-            share_url=new_certificate.share_url,
-            issued_at=datetime.utcnow(),
-        )
-        qr_bytes = self._generate_qr_code(new_certificate.share_url)
-
-        # Save certificate first to get the ID
+        # Save certificate first to get the ID (asset paths use it)
         self.db.add(new_certificate)
         await self.db.commit()
         await self.db.refresh(new_certificate)
         
-        # Now we have the certificate ID, build file paths
-        asset_prefix = f"{new_certificate.user_id}/{new_certificate.id}"
-        pdf_path = f"{asset_prefix}/certificate.pdf"
-        image_path = f"{asset_prefix}/certificate.png"
-        qr_path = f"{asset_prefix}/qr.png"
-
-        # Upload files to storage
-        pdf_url = await self.storage.upload_file(
-            bucket=settings.CERTIFICATE_BUCKET,
-            file_name=pdf_path,
-            file_data=pdf_bytes,
-            content_type="application/pdf",
-            upsert=True,
-        )
-        image_url = await self.storage.upload_file(
-            bucket=settings.CERTIFICATE_BUCKET,
-            file_name=image_path,
-            file_data=image_bytes,
-            content_type="image/png",
-            upsert=True,
-        )
-        qr_url = await self.storage.upload_file(
-            bucket=settings.CERTIFICATE_BUCKET,
-            file_name=qr_path,
-            file_data=qr_bytes,
-            content_type="image/png",
-            upsert=True,
+        return new_certificate
+    
+    async def generate_assets(
+        self,
+        certificate: Certificate,
+        on_stage: Optional[Callable[[str], None]] = None
+    ) -> Certificate:
+        """
+        Render and upload the PDF, PNG and QR code of a certificate.
+        
+        Rendering runs in the render pool, off the event loop; the three
+        uploads run concurrently, so the call takes about one upload's time
+        after rendering.
+        
+        Args:
+            certificate: Persisted certificate
+            on_stage: Called with "rendering" and "uploading" as work progresses
+            
+        Returns:
+            Certificate: The certificate with storage URLs set
+        """
+        if on_stage:
+            on_stage("rendering")
+        assets = await render_pool.run(render_certificate_assets, self.certificate_fields(certificate))
+        
+        if on_stage:
+            on_stage("uploading")
+        asset_prefix = f"{certificate.user_id}/{certificate.id}"
+        pdf_url, image_url, qr_url = await asyncio.gather(
+            self._upload_asset(f"{asset_prefix}/certificate.pdf", assets.pdf, "application/pdf"),
+            self._upload_asset(f"{asset_prefix}/certificate.png", assets.image, "image/png"),
+            self._upload_asset(f"{asset_prefix}/qr.png", assets.qr, "image/png"),
         )
-
+        
         # Update certificate with storage URLs
-        new_certificate.pdf_url = pdf_url
-        new_certificate.image_url = image_url
-        new_certificate.qr_code_url = qr_url
+        certificate.pdf_url = pdf_url
+        certificate.image_url = image_url
+        certificate.qr_code_url = qr_url
         
         await self.db.commit()
-        await self.db.refresh(new_certificate)
+        await self.db.refresh(certificate)
         
-        return new_certificate
+        return certificate
+    
+    async def _upload_asset(self, path: str, data: bytes, content_type: str) -> str:
+        return await self.storage.upload_file(
+            bucket=settings.CERTIFICATE_BUCKET,
+            file_name=path,
+            file_data=data,
+            content_type=content_type,
+            upsert=True,
+        )
     
     async def get_certificate(
         self, 
@@ -311,45 +325,34 @@ class CertificateService:
             "qr_code_url": certificate.qr_code_url
         }
     
-    def build_pdf_for_certificate(self, certificate: Certificate) -> bytes:
+    @staticmethod
+    def certificate_fields(certificate: Certificate) -> Dict[str, Any]:
+        """Display fields passed to the PDF and image generators"""
+        return {
+            "agent_name": certificate.agent_name,
+            "model": certificate.model,
+            "mode": certificate.mode,
+            "test_type": certificate.test_type,
+            "asset": certificate.asset,
+            "pnl_pct": certificate.pnl_pct,
+            "win_rate": certificate.win_rate,
+            "total_trades": certificate.total_trades,
+            "max_drawdown_pct": certificate.max_drawdown_pct,
+            "sharpe_ratio": certificate.sharpe_ratio,
+            "duration_display": certificate.duration_display,
+            "test_period": certificate.test_period,
+            "verification_code": certificate.verification_code,
+            "share_url": certificate.share_url,
+            "issued_at": certificate.issued_at,
+        }
+    
+    async def build_pdf_for_certificate(self, certificate: Certificate) -> bytes:
         """Regenerate the certificate PDF for download endpoints."""
-        return self.pdf_generator.generate_certificate(
-            agent_name=certificate.agent_name,
-            model=certificate.model,
-            mode=certificate.mode,
-            test_type=certificate.test_type,
-            asset=certificate.asset,
-            pnl_pct=certificate.pnl_pct,
-            win_rate=certificate.win_rate,
-            total_trades=certificate.total_trades,
-            max_drawdown_pct=certificate.max_drawdown_pct,
-            sharpe_ratio=certificate.sharpe_ratio,
-            duration_display=certificate.duration_display,
-            test_period=certificate.test_period,
-            verification_code=certificate.verification_code,
-            share_url=certificate.share_url,
-            issued_at=certificate.issued_at,
-        )
+        return await render_pool.run(render_pdf, self.certificate_fields(certificate))
     
-    def build_image_for_certificate(self, certificate: Certificate) -> bytes:
+    async def build_image_for_certificate(self, certificate: Certificate) -> bytes:
         """Regenerate the certificate PNG for download endpoints."""
-        return self.image_generator.generate_certificate_image(
-            agent_name=certificate.agent_name,
-            model=certificate.model,
-            mode=certificate.mode,
-            test_type=certificate.test_type,
-            asset=certificate.asset,
-            pnl_pct=certificate.pnl_pct,
-            win_rate=certificate.win_rate,
-            total_trades=certificate.total_trades,
-            max_drawdown_pct=certificate.max_drawdown_pct,
-            sharpe_ratio=certificate.sharpe_ratio,
-            duration_display=certificate.duration_display,
-            test_period=certificate.test_period,
-            verification_code=certificate.verification_code,
-            share_url=certificate.share_url,
-            issued_at=certificate.issued_at,
-        )
+        return await render_pool.run(render_image, self.certificate_fields(certificate))
     
     async def _generate_verification_code(self) -> str:
         """
@@ -429,9 +432,6 @@ class CertificateService:
         Returns:
             Full URL to the verification page (e.g., http://localhost:3000/verify/abc123)
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
         if frontend_base_url:
             base = frontend_base_url.rstrip("/")
             # Ensure it includes /verify path
@@ -444,55 +444,88 @@ class CertificateService:
             logger.warning(f"Using fallback settings URL: {base}/{verification_code}")
         
         return f"{base}/{verification_code}"
+
+
+class CertificateJobs:
+    """
+    In-process tracking of background certificate asset generation.
     
-    def _build_pdf_bytes(
-        self,
-        *,
-        agent_name: str,
-        model: str,
-        mode: str,
-        test_type: str,
-        asset: str,
-        pnl_pct,
-        win_rate,
-        total_trades,
-        max_drawdown_pct,
-        sharpe_ratio,
-        duration_display: str,
-        test_period: str,
-        verification_code: str,
-        share_url: str,
-        issued_at: datetime,
-    ) -> bytes:
-        return self.pdf_generator.generate_certificate(
-            agent_name=agent_name,
-            model=model,
-            mode=mode,
-            test_type=test_type,
-            asset=asset,
-            pnl_pct=pnl_pct,
-            win_rate=win_rate,
-            total_trades=total_trades,
-            max_drawdown_pct=max_drawdown_pct,
-            sharpe_ratio=sharpe_ratio,
-            duration_display=duration_display,
-            test_period=test_period,
-            verification_code=verification_code,
-            share_url=share_url,
-            issued_at=issued_at,
-        )
+    Jobs are keyed by certificate ID. Each runs generate_assets() with a
+    session of its own and moves through pending -> rendering -> uploading
+    -> ready (or failed). Only the most recent max_entries jobs are kept;
+    a certificate's stored URLs remain the source of truth for "ready".
     
-    def _generate_qr_code(self, url: str) -> bytes:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        qr.add_data(url)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="#00D4FF", back_color="#0A0A0F")
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer.getvalue()
+    Job state lives in this process only. A poll served by another process
+    (or after a restart) finds no job: certificates issued within
+    CERTIFICATE_JOB_GRACE_SECONDS then report "pending", older ones "failed".
+    """
+    
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._jobs: "OrderedDict[UUID, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def submit(self, certificate_id: UUID) -> Dict[str, Any]:
+        """Start asset generation for a certificate unless it is already running"""
+        job = self._jobs.get(certificate_id)
+        if job and job["status"] in CERTIFICATE_JOB_ACTIVE:
+            return job
+        
+        job = {"status": "pending", "error": None}
+        self._jobs[certificate_id] = job
+        self._jobs.move_to_end(certificate_id)
+        while len(self._jobs) > self.max_entries:
+            self._jobs.popitem(last=False)
+        
+        task = asyncio.create_task(self._run(certificate_id, job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+    
+    def status(self, certificate: Certificate) -> Dict[str, Any]:
+        """
+        Job status for a certificate.
+        
+        Returns:
+            {"status": ..., "error": ...}; a certificate without assets and
+            without a tracked job reports "pending" while recently issued
+            (its job may run in another process), otherwise "failed"
+        """
+        if certificate.pdf_url:
+            return {"status": "ready", "error": None}
+        job = self._jobs.get(certificate.id)
+        if job:
+            return dict(job)
+        if self._recently_issued(certificate):
+            return {"status": "pending", "error": None}
+        return {"status": "failed", "error": "Certificate generation was interrupted, please retry"}
+    
+    @staticmethod
+    def _recently_issued(certificate: Certificate) -> bool:
+        issued_at = certificate.issued_at
+        if issued_at is None:
+            return True
+        if issued_at.tzinfo is None:
+            issued_at = issued_at.replace(tzinfo=timezone.utc)
+        grace = timedelta(seconds=settings.CERTIFICATE_JOB_GRACE_SECONDS)
+        return datetime.now(timezone.utc) - issued_at < grace
+    
+    async def _run(self, certificate_id: UUID, job: Dict[str, Any]) -> None:
+        def on_stage(stage: str) -> None:
+            job["status"] = stage
+        
+        try:
+            async with async_session_maker() as db:
+                certificate = (await db.execute(
+                    select(Certificate).where(Certificate.id == certificate_id)
+                )).scalar_one()
+                await CertificateService(db).generate_assets(certificate, on_stage=on_stage)
+            job["status"] = "ready"
+        except Exception as e:
+            logger.exception(f"Certificate {certificate_id} asset generation failed")
+            job["status"] = "failed"
+            job["error"] = str(e)
+
+
+# Shared job tracker used by the certificate API
+certificate_jobs = CertificateJobs()
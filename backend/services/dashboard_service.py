@@ -8,21 +8,22 @@ Purpose:
 Data Flow:
     - Incoming: User ID and query parameters from API layer
     - Processing:
-        - Aggregates statistics from agents, test_results, and test_sessions
+        - Aggregates statistics from agents, test_results and the user_stats
+          summary row in one statement
         - Calculates trends by comparing current vs previous periods
         - Retrieves recent activity from activity_logs
         - Determines quick-start onboarding progress
     - Outgoing: Dictionaries with dashboard data returned to API layer
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, func, and_, or_, desc, true
 from sqlalchemy.orm import joinedload
 from uuid import UUID
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from models import Agent, TestResult, ActivityLog, Certificate, TestSession
+from models import Agent, TestResult, ActivityLog, Certificate, TestSession, UserStats
 
 
 class DashboardService:
@@ -38,117 +39,65 @@ class DashboardService:
         self.db = db
     
     async def get_stats(self, user_id: UUID) -> Dict[str, Any]:
-        total_agents = await self._count_active_agents(user_id)
-        tests_run = await self._count_tests(user_id)
-        best_pnl = await self._best_pnl(user_id)
-        avg_win_rate = await self._avg_win_rate(user_id)
-        trends = await self._build_trends(user_id)
-        best_agent = await self._get_best_agent(user_id)
+        """
+        Get dashboard overview statistics in a single statement.
+        
+        Lifetime counters come from the user's UserStats row (maintained by
+        ResultService); agent counts, windowed trends and the best agent are
+        conditional aggregates in CTEs of the same query.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dictionary with totals, trends and the best agent
+        """
+        result = await self.db.execute(self._stats_query(user_id, datetime.utcnow()))
+        row = result.one()
+        
+        tests_run = row.tests_run or 0
+        avg_win_rate = row.win_rate_sum / tests_run if tests_run else None
         
         return {
-            "total_agents": total_agents,
+            "total_agents": row.total_agents,
             "tests_run": tests_run,
-            "best_pnl": float(best_pnl) if best_pnl is not None else None,
+            "best_pnl": float(row.best_pnl) if row.best_pnl is not None else None,
             "avg_win_rate": float(avg_win_rate) if avg_win_rate is not None else None,
-            "trends": trends,
-            "best_agent": best_agent,
+            "trends": {
+                "agents_this_week": row.agents_this_week,
+                "tests_today": row.tests_today,
+                "win_rate_change": self._win_rate_change(row.current_win_rate, row.previous_win_rate),
+            },
+            "best_agent": {"id": row.best_agent_id, "name": row.best_agent_name} if row.best_agent_id else None,
         }
     
-    async def _build_trends(self, user_id: UUID) -> Dict[str, Any]:
-        now = datetime.utcnow()
+    @staticmethod
+    def _stats_query(user_id: UUID, now: datetime):
         seven_days_ago = now - timedelta(days=7)
         start_of_day = datetime(now.year, now.month, now.day)
-        agents_this_week = await self._count_new_agents(user_id, seven_days_ago)
-        tests_today = await self._count_tests_since(user_id, start_of_day)
-        win_rate_change = await self._win_rate_change(user_id)
-        return {
-            "agents_this_week": agents_this_week,
-            "tests_today": tests_today,
-            "win_rate_change": win_rate_change,
-        }
-
-    async def _win_rate_change(self, user_id: UUID) -> Optional[float]:
-        now = datetime.utcnow()
         current_start = now - timedelta(days=30)
         previous_start = now - timedelta(days=60)
-        current_win_rate = await self._avg_win_rate(user_id, current_start)
-        previous_win_rate = await self._avg_win_rate(user_id, previous_start, current_start)
-        if current_win_rate is None or previous_win_rate in (None, 0):
-            return None
-        previous = float(previous_win_rate)
-        if previous == 0:
-            return None
-        current = float(current_win_rate)
-        return round(((current - previous) / abs(previous)) * 100, 2)
-
-    async def _count_active_agents(self, user_id: UUID) -> int:
-        result = await self.db.execute(
-            select(func.count(Agent.id)).where(
-                Agent.user_id == user_id,
-                Agent.is_archived == False,
-            )
-        )
-        return result.scalar_one()
-
-    async def _count_tests(self, user_id: UUID) -> int:
-        result = await self.db.execute(
-            select(func.count(TestResult.id)).where(TestResult.user_id == user_id)
-        )
-        return result.scalar_one()
-
-    async def _best_pnl(self, user_id: UUID) -> Optional[Decimal]:
-        result = await self.db.execute(
-            select(func.max(TestResult.total_pnl_pct)).where(TestResult.user_id == user_id)
-        )
-        return result.scalar_one()
-
-    async def _avg_win_rate(
-        self,
-        user_id: UUID,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-    ) -> Optional[Decimal]:
-        query = select(func.avg(TestResult.win_rate)).where(TestResult.user_id == user_id)
-        if start_date:
-            query = query.where(TestResult.created_at >= start_date)
-        if end_date:
-            query = query.where(TestResult.created_at < end_date)
-        result = await self.db.execute(query)
-        return result.scalar_one()
-
-    async def _count_new_agents(self, user_id: UUID, since: datetime) -> int:
-        result = await self.db.execute(
-            select(func.count(Agent.id)).where(
-                Agent.user_id == user_id,
-                Agent.created_at >= since,
+        
+        agent_stats = (
+            select(
+                func.count(Agent.id).filter(Agent.is_archived == False).label("total_agents"),
+                func.count(Agent.id).filter(Agent.created_at >= seven_days_ago).label("agents_this_week"),
             )
+            .where(Agent.user_id == user_id)
+            .cte("agent_stats")
         )
-        return result.scalar_one()
-
-    async def _count_tests_since(self, user_id: UUID, since: datetime) -> int:
-        result = await self.db.execute(
-            select(func.count(TestResult.id)).where(
-                TestResult.user_id == user_id,
-                TestResult.created_at >= since,
+        # Only the last 60 days of results are scanned (idx_results_date)
+        window_stats = (
+            select(
+                func.count(TestResult.id).filter(TestResult.created_at >= start_of_day).label("tests_today"),
+                func.avg(TestResult.win_rate).filter(TestResult.created_at >= current_start).label("current_win_rate"),
+                func.avg(TestResult.win_rate).filter(TestResult.created_at < current_start).label("previous_win_rate"),
             )
+            .where(TestResult.user_id == user_id, TestResult.created_at >= previous_start)
+            .cte("window_stats")
         )
-        return result.scalar_one()
-    
-    async def _get_best_agent(
-        self,
-        user_id: UUID
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Get the best performing agent based on best_pnl.
-        
-        Args:
-            user_id: ID of the user
-            
-        Returns:
-            Dictionary with best agent data, or None if no agents
-        """
-        result = await self.db.execute(
-            select(Agent)
+        best_agent = (
+            select(Agent.id, Agent.name)
             .where(
                 Agent.user_id == user_id,
                 Agent.is_archived == False,
@@ -156,16 +105,39 @@ class DashboardService:
             )
             .order_by(desc(Agent.best_pnl))
             .limit(1)
+            .cte("best_agent")
         )
-        agent = result.scalar_one_or_none()
         
-        if not agent:
+        return (
+            select(
+                agent_stats.c.total_agents,
+                agent_stats.c.agents_this_week,
+                window_stats.c.tests_today,
+                window_stats.c.current_win_rate,
+                window_stats.c.previous_win_rate,
+                UserStats.tests_run,
+                UserStats.best_pnl,
+                UserStats.win_rate_sum,
+                best_agent.c.id.label("best_agent_id"),
+                best_agent.c.name.label("best_agent_name"),
+            )
+            .select_from(
+                agent_stats
+                .join(window_stats, true())
+                .outerjoin(UserStats, UserStats.user_id == user_id)
+                .outerjoin(best_agent, true())
+            )
+        )
+    
+    @staticmethod
+    def _win_rate_change(current_win_rate: Optional[Decimal], previous_win_rate: Optional[Decimal]) -> Optional[float]:
+        if current_win_rate is None or previous_win_rate in (None, 0):
             return None
-        
-        return {
-            "id": agent.id,
-            "name": agent.name,
-        }
+        previous = float(previous_win_rate)
+        if previous == 0:
+            return None
+        current = float(current_win_rate)
+        return round(((current - previous) / abs(previous)) * 100, 2)
     
     async def get_activity(
         self,
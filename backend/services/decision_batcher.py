@@ -0,0 +1,187 @@
+"""
+Decision Batcher for AlphaLab AI Trader.
+
+Purpose:
+    Collects decision requests that can share one LLM call (same API key,
+    model and market context) for a short window and hands them to a batch
+    runner together. Used by AITrader when decision batching is enabled so
+    arena runs with several agents on the same model, asset and candle send
+    one request per candle instead of one per agent.
+
+    The batcher is transport-agnostic: the runner decides how to build the
+    request and returns one result per item. A result of None means "not
+    served by the batch" and the caller falls back to its single request.
+
+    Callers that may batch with each other join a group (e.g. same API key
+    and model). A window only stays open while group members that have not
+    submitted yet could still join it, so a lone trader never waits.
+
+Usage:
+    from services.decision_batcher import decision_batcher
+
+    decision_batcher.join(group, trader)
+    result = await decision_batcher.submit(batch_key, item, run_batch, group=group)
+    if result is None:
+        result = await single_request(item)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+import asyncio
+import logging
+import weakref
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+BatchRunner = Callable[[List[Any]], Awaitable[List[Optional[Any]]]]
+
+
+@dataclass
+class _PendingBatch:
+    """Items collected for one batch key during the current window"""
+    runner: BatchRunner
+    items: List[Any] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class DecisionBatcher:
+    """
+    Time-window batcher keyed by request compatibility.
+
+    The first item for a key opens a window of `window_ms`; the batch is sent
+    when the window closes, `max_batch` items are pending, or every member of
+    the item's group has submitted, whichever is first.
+    """
+
+    def __init__(self, window_ms: Optional[int] = None, max_batch: Optional[int] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            window_ms: How long to wait for more items after the first (default: from settings)
+            max_batch: Maximum items per batch (default: from settings)
+        """
+        self.window_ms = window_ms if window_ms is not None else settings.AI_BATCH_WINDOW_MS
+        self.max_batch = max_batch or settings.AI_BATCH_MAX_SIZE
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._groups: Dict[Hashable, "weakref.WeakSet[Any]"] = {}
+        self._tasks: set = set()
+        self.batches = 0
+        self.batched_items = 0
+
+    def join(self, group: Hashable, member: Any) -> None:
+        """
+        Register a member that may submit items for keys of `group`.
+
+        Members are held weakly and leave the group when garbage collected.
+        """
+        self._groups.setdefault(group, weakref.WeakSet()).add(member)
+
+    def _expected_items(self, group: Optional[Hashable]) -> int:
+        """Most items a batch of `group` can collect (max_batch if the group is unknown)"""
+        members = self._groups.get(group) if group is not None else None
+        if not members:
+            return self.max_batch
+        return min(len(members), self.max_batch)
+
+    async def submit(
+        self,
+        key: Hashable,
+        item: Any,
+        runner: BatchRunner,
+        group: Optional[Hashable] = None
+    ) -> Optional[Any]:
+        """
+        Add an item to the batch for `key` and wait for its result.
+
+        Args:
+            key: Compatibility key; items with equal keys may share a request
+            item: Opaque item passed to the runner
+            runner: Coroutine taking the batch items and returning one result per item
+            group: Group joined by the submitter (see join()); the batch is sent
+                   as soon as every member has submitted
+
+        Returns:
+            The runner's result for this item, or None if the item must be
+            handled individually (single-item batch or batch failure)
+        """
+        expected = self._expected_items(group)
+        batch = self._pending.get(key)
+        if batch is None and expected <= 1:
+            # No other member could join the batch; don't wait for the window
+            return None
+
+        loop = asyncio.get_running_loop()
+        if batch is None:
+            batch = _PendingBatch(runner=runner)
+            self._pending[key] = batch
+            batch.timer = loop.call_later(self.window_ms / 1000, self._flush, key)
+
+        future: asyncio.Future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+
+        if len(batch.items) >= expected:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        """Close the window for `key` and run its batch in the background"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        results: List[Optional[Any]] = [None] * len(batch.items)
+        try:
+            if len(batch.items) == 1:
+                # Nothing to share; the caller sends its normal request
+                return
+
+            try:
+                results = await batch.runner(batch.items)
+                if len(results) != len(batch.items):
+                    raise ValueError(f"Batch runner returned {len(results)} results for {len(batch.items)} items")
+            except Exception as e:
+                logger.warning(
+                    f"Decision batch failed, falling back to individual requests: {str(e)}",
+                    extra={"error": str(e), "batch_size": len(batch.items)}
+                )
+                results = [None] * len(batch.items)
+
+            self.batches += 1
+            self.batched_items += sum(1 for result in results if result is not None)
+        finally:
+            # Release every caller, also when this task is cancelled mid-request
+            _resolve(batch.futures, results)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counters and configuration"""
+        return {
+            "window_ms": self.window_ms,
+            "max_batch": self.max_batch,
+            "pending_batches": len(self._pending),
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+        }
+
+
+def _resolve(futures: List[asyncio.Future], results: List[Optional[Any]]) -> None:
+    for future, result in zip(futures, results):
+        # Callers that timed out or were cancelled have already gone away
+        if not future.done():
+            future.set_result(result)
+
+
+# Process-wide batcher shared by all AI traders with batching enabled
+decision_batcher = DecisionBatcher()
@@ -0,0 +1,194 @@
+"""
+Columnar (Parquet) Export Encoding for AlphaLab.
+
+Purpose:
+    Writes trades, AI thoughts and equity curves as Parquet files for offline
+    analysis in pandas, Polars or DuckDB. Record chunks from
+    services/export_stream.iter_records() are buffered into row groups of
+    EXPORT_PARQUET_ROW_GROUP_ROWS and each row group is yielded as soon as
+    it is written, so files of any size stream with bounded memory.
+
+    Thoughts are flattened: every indicator in `indicator_values` becomes its
+    own `ind_<name>` float column instead of a nested JSON blob. Values that
+    are not numbers (labels, booleans, nested objects) are null in their
+    float column and kept in the `indicators_non_numeric` column, a JSON
+    object of those values per row.
+
+    pyarrow is listed in requirements.txt. The import is still guarded so a
+    server installed without it starts normally: PARQUET_AVAILABLE is False
+    and callers should reject the format (the results API answers 501).
+
+Usage:
+    from services.export_columnar import encode_parquet, trade_row, trade_schema
+
+    body = encode_parquet(iter_records(session, trades_query, trade_row), trade_schema())
+"""
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence
+import json
+
+from config import settings
+from models import AiThought, Trade
+from services.export_stream import ChunkSink, Record
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_AVAILABLE = False
+
+
+INDICATOR_COLUMN_PREFIX = "ind_"
+NON_NUMERIC_INDICATORS_COLUMN = "indicators_non_numeric"
+
+
+def trade_schema() -> "pa.Schema":
+    return pa.schema([
+        ("trade_number", pa.int32()),
+        ("type", pa.string()),
+        ("entry_time", pa.timestamp("us", tz="UTC")),
+        ("exit_time", pa.timestamp("us", tz="UTC")),
+        ("entry_price", pa.float64()),
+        ("exit_price", pa.float64()),
+        ("size", pa.float64()),
+        ("leverage", pa.int32()),
+        ("pnl_amount", pa.float64()),
+        ("pnl_pct", pa.float64()),
+        ("exit_type", pa.string()),
+        ("entry_reasoning", pa.string()),
+        ("exit_reasoning", pa.string()),
+    ])
+
+
+def thought_schema(indicator_names: Sequence[str]) -> "pa.Schema":
+    """
+    Schema for flattened AI thoughts.
+
+    Args:
+        indicator_names: Indicator keys found in the session's thoughts
+            (one float64 column each, plus the non-numeric fallback column)
+    """
+    fields = [
+        ("candle_number", pa.int32()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("decision", pa.string()),
+        ("reasoning", pa.string()),
+    ]
+    fields.extend((INDICATOR_COLUMN_PREFIX + name, pa.float64()) for name in indicator_names)
+    fields.append((NON_NUMERIC_INDICATORS_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def equity_schema() -> "pa.Schema":
+    return pa.schema([
+        ("time", pa.timestamp("us", tz="UTC")),
+        ("value", pa.float64()),
+        ("drawdown", pa.float64()),
+    ])
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def trade_row(trade: Trade) -> Record:
+    return {
+        "trade_number": trade.trade_number,
+        "type": trade.type,
+        "entry_time": trade.entry_time,
+        "exit_time": trade.exit_time,
+        "entry_price": _float(trade.entry_price),
+        "exit_price": _float(trade.exit_price),
+        "size": _float(trade.size),
+        "leverage": trade.leverage,
+        "pnl_amount": _float(trade.pnl_amount),
+        "pnl_pct": _float(trade.pnl_pct),
+        "exit_type": trade.exit_type,
+        "entry_reasoning": trade.entry_reasoning,
+        "exit_reasoning": trade.exit_reasoning,
+    }
+
+
+def thought_row(thought: AiThought) -> Record:
+    row = {
+        "candle_number": thought.candle_number,
+        "timestamp": thought.timestamp,
+        "decision": thought.decision,
+        "reasoning": thought.reasoning,
+    }
+    non_numeric = {}
+    for name, value in (thought.indicator_values or {}).items():
+        number = _float(value)
+        row[INDICATOR_COLUMN_PREFIX + name] = number
+        if number is None and value is not None:
+            non_numeric[name] = value
+    row[NON_NUMERIC_INDICATORS_COLUMN] = (
+        json.dumps(non_numeric, sort_keys=True, default=str) if non_numeric else None
+    )
+    return row
+
+
+def equity_rows(equity_curve: Optional[List[Dict[str, Any]]]) -> List[Record]:
+    """Equity curve points ({time, value, drawdown}) as Parquet rows"""
+    return [
+        {
+            "time": _timestamp(point.get("time")),
+            "value": _float(point.get("value")),
+            "drawdown": _float(point.get("drawdown")),
+        }
+        for point in equity_curve or []
+        if isinstance(point, dict)
+    ]
+
+
+async def encode_parquet(
+    chunks: AsyncIterable[List[Record]],
+    schema: "pa.Schema",
+    row_group_rows: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Encode record chunks as a Parquet file, one row group at a time.
+
+    Keys missing from a record are written as nulls; keys not in the
+    schema are ignored.
+
+    Args:
+        chunks: Record chunks (e.g. from iter_records)
+        schema: Arrow schema of the file
+        row_group_rows: Rows per row group (default: settings.EXPORT_PARQUET_ROW_GROUP_ROWS)
+    """
+    row_group_rows = row_group_rows or settings.EXPORT_PARQUET_ROW_GROUP_ROWS
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=settings.EXPORT_PARQUET_COMPRESSION)
+    buffered: List[Record] = []
+
+    async for records in chunks:
+        buffered.extend(records)
+        while len(buffered) >= row_group_rows:
+            writer.write_table(pa.Table.from_pylist(buffered[:row_group_rows], schema=schema))
+            buffered = buffered[row_group_rows:]
+            data = sink.drain()
+            if data:
+                yield data
+
+    if buffered:
+        writer.write_table(pa.Table.from_pylist(buffered, schema=schema))
+    writer.close()
+    yield sink.drain()
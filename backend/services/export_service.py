@@ -8,38 +8,36 @@ Purpose:
 Data Flow:
     - Incoming: User ID and export configuration from API layer
     - Processing:
-        - Creates export job record (or tracks in-memory if no Export model)
-        - Collects user data from multiple tables (agents, results, trades, settings)
-        - Packages data as JSON or ZIP archive
-        - Generates download URL with expiration
+        - Creates an Export job row, which the export worker
+          (services/export_worker.py) picks up from its queue
+        - Streams user data from multiple tables (agents, results, trades, settings)
+          in chunks through server-side cursors
+        - Packages data as a JSON document or a ZIP of JSON Lines files,
+          written incrementally to a temporary file
+        - Uploads the file in chunks and generates a download URL with expiration
+        - Persists progress and the outcome on the Export row
     - Outgoing: Export status and download information returned to API layer
-
-Note:
-    This implementation uses an in-memory tracking approach since the Export model
-    doesn't exist yet. For production, implement task 16 to add the Export model.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import joinedload
-from uuid import UUID, uuid4
-from typing import Dict, Any, List, Optional
+from sqlalchemy.sql import Select
+from uuid import UUID
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
-import zipfile
-import io
+import tempfile
 
+from database import async_session_maker
 from models import (
     User, UserSettings, Agent, TestResult, TestSession, 
-    Trade, Certificate, Notification, ActivityLog, ApiKey
+    Trade, Certificate, Notification, ActivityLog, ApiKey, Export
 )
 from utils.storage import StorageClient
+from services.export_stream import encode_jsonl, iter_records, single, stream_json_document, stream_zip
 from config import settings
 
 
-# In-memory export tracking (replace with database model in production)
-_export_jobs: Dict[UUID, Dict[str, Any]] = {}
-
-
 class ExportService:
     """Service for generating user data export packages."""
     
@@ -70,8 +68,8 @@ class ExportService:
         Create a data export job for a user.
         
         Initiates an export job that will collect and package user data
-        based on the specified inclusions. The actual export generation
-        should be run as a background task.
+        based on the specified inclusions. The job should then be queued on
+        the export worker (export_worker.submit).
         
         Args:
             user_id: ID of the user requesting export
@@ -96,30 +94,22 @@ class ExportService:
         if format not in ['json', 'zip']:
             raise ValueError(f"Invalid format '{format}'. Must be 'json' or 'zip'")
         
-        # Create export job
-        export_id = uuid4()
-        export_job = {
-            'export_id': export_id,
-            'user_id': user_id,
-            'include': include,
-            'format': format,
-            'status': 'processing',
-            'progress_pct': 0.0,
-            'download_url': None,
-            'expires_at': None,
-            'size_mb': None,
-            'error': None,
-            'created_at': datetime.utcnow()
-        }
-        
-        # Store in memory (replace with database insert in production)
-        _export_jobs[export_id] = export_job
+        export = Export(
+            user_id=user_id,
+            include=include,
+            format=format,
+            status='processing',
+            progress_pct=0
+        )
+        self.db.add(export)
+        await self.db.commit()
+        await self.db.refresh(export)
         
         return {
-            'export_id': str(export_id),
-            'status': 'processing',
-            'progress_pct': 0.0,
-            'created_at': export_job['created_at'].isoformat()
+            'export_id': str(export.id),
+            'status': export.status,
+            'progress_pct': float(export.progress_pct),
+            'created_at': export.created_at.isoformat()
         }
     
     async def get_export_status(
@@ -145,25 +135,23 @@ class ExportService:
                 - error: Error message if failed
                 - created_at: Job creation timestamp
         """
-        # Retrieve from memory (replace with database query in production)
-        export_job = _export_jobs.get(export_id)
+        result = await self.db.execute(
+            select(Export).where(Export.id == export_id, Export.user_id == user_id)
+        )
+        export = result.scalar_one_or_none()
         
-        if not export_job:
-            return None
-        
-        # Validate ownership
-        if export_job['user_id'] != user_id:
+        if not export:
             return None
         
         return {
-            'export_id': str(export_job['export_id']),
-            'status': export_job['status'],
-            'progress_pct': export_job['progress_pct'],
-            'download_url': export_job['download_url'],
-            'expires_at': export_job['expires_at'].isoformat() if export_job['expires_at'] else None,
-            'size_mb': export_job['size_mb'],
-            'error': export_job['error'],
-            'created_at': export_job['created_at'].isoformat()
+            'export_id': str(export.id),
+            'status': export.status,
+            'progress_pct': float(export.progress_pct),
+            'download_url': export.download_url,
+            'expires_at': export.expires_at.isoformat() if export.expires_at else None,
+            'size_mb': float(export.size_mb) if export.size_mb is not None else None,
+            'error': export.error_message,
+            'created_at': export.created_at.isoformat()
         }
     
     async def generate_export_package(
@@ -171,11 +159,13 @@ class ExportService:
         export_id: UUID
     ) -> None:
         """
-        Background task to generate the export package.
+        Generate the export package for a queued job.
         
-        This method should be called as a background task after create_export().
-        It collects all requested data, packages it, and updates the export job
-        status with the download URL.
+        Run by the export worker with its own session. All requested data is
+        streamed into a temporary file (rows are read in chunks through
+        server-side cursors, see services/export_stream.py); the database
+        connection is released before the file is uploaded in chunks. Progress
+        and the outcome are persisted on the Export row.
         
         Args:
             export_id: ID of the export job to process
@@ -184,47 +174,58 @@ class ExportService:
             ValueError: If export job not found
             Exception: If export generation fails
         """
-        # Retrieve export job
-        export_job = _export_jobs.get(export_id)
+        result = await self.db.execute(select(Export).where(Export.id == export_id))
+        export = result.scalar_one_or_none()
         
-        if not export_job:
+        if not export:
             raise ValueError(f"Export job {export_id} not found")
         
+        user_id = export.user_id
+        include = export.include or {}
+        format = export.format
+        
         try:
-            user_id = export_job['user_id']
-            include = export_job['include']
-            format = export_job['format']
-            
             # Update progress: Starting data collection
-            export_job['progress_pct'] = 10.0
-            
-            # Collect user data
-            user_data = await self._collect_user_data(user_id, include)
-            
-            # Update progress: Data collected
-            export_job['progress_pct'] = 60.0
+            await self.update_job(export_id, progress_pct=10)
             
-            # Package data
-            if format == 'zip':
-                file_data, size_bytes = await self._create_zip_archive(user_data)
-            else:  # json
-                file_data = json.dumps(user_data, indent=2, default=str).encode('utf-8')
-                size_bytes = len(file_data)
+            counts: Dict[str, int] = {}
+            sections = await self._export_sections(export_id, user_id, include, counts)
             
-            # Update progress: Package created
-            export_job['progress_pct'] = 80.0
-            
-            file_extension = "zip" if format == "zip" else "json"
-            file_name = f"{user_id}/{export_id}.{file_extension}"
-            content_type = "application/zip" if format == "zip" else "application/json"
-            
-            await self.storage.upload_file(
-                bucket=settings.EXPORT_BUCKET,
-                file_name=file_name,
-                file_data=file_data,
-                content_type=content_type,
-                upsert=True,
-            )
+            with tempfile.TemporaryFile() as package:
+                # Package data (collection and packaging are one streaming pass)
+                if format == 'zip':
+                    chunks = stream_zip(self._zip_members(sections, counts))
+                else:  # json
+                    chunks = stream_json_document(sections)
+                async for chunk in chunks:
+                    package.write(chunk)
+                size_bytes = package.tell()
+                
+                # End the read transaction: no connection is held during the upload
+                await self.db.commit()
+                
+                if size_bytes > settings.MAX_EXPORT_SIZE_MB * 1024 * 1024:
+                    raise ValueError(
+                        f"Export is {size_bytes / (1024 * 1024):.0f} MB, "
+                        f"over the {settings.MAX_EXPORT_SIZE_MB} MB limit. Exclude some data and try again."
+                    )
+                
+                # Update progress: Package created
+                await self.update_job(export_id, progress_pct=80)
+                
+                file_extension = "zip" if format == "zip" else "json"
+                file_name = f"{user_id}/{export_id}.{file_extension}"
+                content_type = "application/zip" if format == "zip" else "application/json"
+                
+                package.seek(0)
+                await self.storage.upload_fileobj(
+                    bucket=settings.EXPORT_BUCKET,
+                    file_name=file_name,
+                    fp=package,
+                    size=size_bytes,
+                    content_type=content_type,
+                    upsert=True,
+                )
             
             expires_at = datetime.utcnow() + timedelta(hours=settings.EXPORT_EXPIRY_HOURS)
             signed_url = self.storage.get_signed_url(
@@ -233,163 +234,149 @@ class ExportService:
                 expires_in=settings.EXPORT_EXPIRY_HOURS * 3600,
             )
             
-            # Update export job with success
-            export_job['status'] = 'ready'
-            export_job['progress_pct'] = 100.0
-            export_job['download_url'] = signed_url
-            export_job['expires_at'] = expires_at
-            export_job['size_mb'] = round(size_bytes / (1024 * 1024), 2)
+            await self.update_job(
+                export_id,
+                status='ready',
+                progress_pct=100,
+                download_url=signed_url,
+                expires_at=expires_at,
+                size_mb=round(size_bytes / (1024 * 1024), 2),
+            )
             
         except Exception as e:
-            # Update export job with failure
-            export_job['status'] = 'failed'
-            export_job['error'] = str(e)
+            await self.db.rollback()
+            await self.update_job(export_id, status='failed', error_message=str(e))
             raise
     
-    async def _collect_user_data(
+    @staticmethod
+    async def update_job(export_id: UUID, **values: Any) -> None:
+        """
+        Persist fields of an Export job.
+        
+        Uses a short-lived session of its own: the worker's session keeps a
+        server-side cursor open while streaming, and committing it mid-way
+        would close that cursor.
+        """
+        async with async_session_maker() as db:
+            await db.execute(update(Export).where(Export.id == export_id).values(**values))
+            await db.commit()
+    
+    @staticmethod
+    async def heartbeat(export_ids: List[UUID]) -> None:
+        """
+        Refresh updated_at on jobs this process still owns.
+        
+        updated_at is the job heartbeat: fail_interrupted only fails
+        'processing' jobs whose heartbeat has gone stale.
+        """
+        if not export_ids:
+            return
+        async with async_session_maker() as db:
+            await db.execute(
+                update(Export)
+                .where(Export.id.in_(export_ids), Export.status == 'processing')
+                .values(updated_at=func.now())
+            )
+            await db.commit()
+    
+    @staticmethod
+    async def fail_interrupted(stale_after: timedelta, error_message: str) -> int:
+        """
+        Mark export jobs whose worker stopped heartbeating as failed.
+        
+        Compared against the database clock, so instances with skewed clocks
+        never fail each other's live jobs.
+        
+        Args:
+            stale_after: Jobs in 'processing' whose updated_at is older than
+                         this are considered interrupted
+            error_message: Message stored on the failed jobs
+            
+        Returns:
+            Number of jobs marked failed
+        """
+        async with async_session_maker() as db:
+            result = await db.execute(
+                update(Export)
+                .where(Export.status == 'processing', Export.updated_at < func.now() - stale_after)
+                .values(status='failed', error_message=error_message)
+            )
+            await db.commit()
+            return result.rowcount
+    
+    async def _export_sections(
         self,
+        export_id: UUID,
         user_id: UUID,
-        include: Dict[str, bool]
-    ) -> Dict[str, Any]:
+        include: Dict[str, bool],
+        counts: Dict[str, int]
+    ) -> List[Tuple[str, Any]]:
         """
-        Collect all requested user data from the database.
+        Build the export sections for a user.
+        
+        Small sections are plain values; agents, test results and trades are
+        lazy streams of record chunks that are only read while packaging.
         
         Args:
             user_id: ID of the user
             include: Dictionary specifying what data to include
+            export_id: Job whose progress_pct is advanced per section
+            counts: Filled with the number of records written per section
             
         Returns:
-            Dictionary with all collected data organized by category
+            List of (section name, value or chunk stream)
         """
-        data = {
-            'export_metadata': {
+        sections: List[Tuple[str, Any]] = [
+            ('export_metadata', {
                 'user_id': str(user_id),
                 'exported_at': datetime.utcnow().isoformat(),
                 'version': '1.0'
-            }
-        }
+            })
+        ]
+        streams: List[Tuple[str, Select, Callable[[Any], Dict[str, Any]]]] = []
         
         # Collect agents
         if include.get('agents', True):
-            agents_result = await self.db.execute(
+            streams.append((
+                'agents',
                 select(Agent)
                 .where(Agent.user_id == user_id)
-                .order_by(Agent.created_at.desc())
-            )
-            agents = agents_result.scalars().all()
-            
-            data['agents'] = [
-                {
-                    'id': str(agent.id),
-                    'name': agent.name,
-                    'mode': agent.mode,
-                    'model': agent.model,
-                    'indicators': agent.indicators,
-                    'custom_indicators': agent.custom_indicators,
-                    'strategy_prompt': agent.strategy_prompt,
-                    'tests_run': agent.tests_run,
-                    'best_pnl': float(agent.best_pnl) if agent.best_pnl else None,
-                    'total_profitable_tests': agent.total_profitable_tests,
-                    'avg_win_rate': float(agent.avg_win_rate) if agent.avg_win_rate else None,
-                    'avg_drawdown': float(agent.avg_drawdown) if agent.avg_drawdown else None,
-                    'is_archived': agent.is_archived,
-                    'created_at': agent.created_at.isoformat(),
-                    'updated_at': agent.updated_at.isoformat()
-                }
-                for agent in agents
-            ]
+                .order_by(Agent.created_at.desc()),
+                self._agent_record
+            ))
         
         # Collect test results
         if include.get('results', True):
-            results_result = await self.db.execute(
+            streams.append((
+                'test_results',
                 select(TestResult)
                 .options(joinedload(TestResult.agent))
                 .where(TestResult.user_id == user_id)
-                .order_by(TestResult.created_at.desc())
-            )
-            results = results_result.scalars().all()
-            
-            data['test_results'] = [
-                {
-                    'id': str(result.id),
-                    'agent_id': str(result.agent_id),
-                    'agent_name': result.agent.name,
-                    'type': result.type,
-                    'asset': result.asset,
-                    'mode': result.mode,
-                    'timeframe': result.timeframe,
-                    'start_date': result.start_date.isoformat(),
-                    'end_date': result.end_date.isoformat(),
-                    'duration_seconds': result.duration_seconds,
-                    'duration_display': result.duration_display,
-                    'starting_capital': float(result.starting_capital),
-                    'ending_capital': float(result.ending_capital),
-                    'total_pnl_amount': float(result.total_pnl_amount),
-                    'total_pnl_pct': float(result.total_pnl_pct),
-                    'total_trades': result.total_trades,
-                    'winning_trades': result.winning_trades,
-                    'losing_trades': result.losing_trades,
-                    'win_rate': float(result.win_rate),
-                    'max_drawdown_pct': float(result.max_drawdown_pct) if result.max_drawdown_pct else None,
-                    'sharpe_ratio': float(result.sharpe_ratio) if result.sharpe_ratio else None,
-                    'profit_factor': float(result.profit_factor) if result.profit_factor else None,
-                    'avg_trade_pnl': float(result.avg_trade_pnl) if result.avg_trade_pnl else None,
-                    'best_trade_pnl': float(result.best_trade_pnl) if result.best_trade_pnl else None,
-                    'worst_trade_pnl': float(result.worst_trade_pnl) if result.worst_trade_pnl else None,
-                    'avg_holding_time_seconds': result.avg_holding_time_seconds,
-                    'avg_holding_time_display': result.avg_holding_time_display,
-                    'equity_curve': result.equity_curve,
-                    'ai_summary': result.ai_summary,
-                    'is_profitable': result.is_profitable,
-                    'created_at': result.created_at.isoformat()
-                }
-                for result in results
-            ]
+                .order_by(TestResult.created_at.desc()),
+                self._result_record
+            ))
         
         # Collect trade history
         if include.get('trades', True):
-            # Get all test sessions for the user
-            sessions_result = await self.db.execute(
-                select(TestSession.id)
+            include_reasoning = include.get('reasoning_traces', False)
+            streams.append((
+                'trades',
+                select(Trade)
+                .join(TestSession, TestSession.id == Trade.session_id)
                 .where(TestSession.user_id == user_id)
-            )
-            session_ids = [row[0] for row in sessions_result.all()]
-            
-            if session_ids:
-                trades_result = await self.db.execute(
-                    select(Trade)
-                    .where(Trade.session_id.in_(session_ids))
-                    .order_by(Trade.entry_time.desc())
-                )
-                trades = trades_result.scalars().all()
-                
-                data['trades'] = [
-                    {
-                        'id': str(trade.id),
-                        'session_id': str(trade.session_id),
-                        'trade_number': trade.trade_number,
-                        'type': trade.type,
-                        'entry_price': float(trade.entry_price),
-                        'entry_time': trade.entry_time.isoformat(),
-                        'entry_candle': trade.entry_candle,
-                        'entry_reasoning': trade.entry_reasoning if include.get('reasoning_traces', False) else None,
-                        'exit_price': float(trade.exit_price) if trade.exit_price else None,
-                        'exit_time': trade.exit_time.isoformat() if trade.exit_time else None,
-                        'exit_candle': trade.exit_candle,
-                        'exit_type': trade.exit_type,
-                        'exit_reasoning': trade.exit_reasoning if include.get('reasoning_traces', False) else None,
-                        'size': float(trade.size),
-                        'leverage': trade.leverage,
-                        'pnl_amount': float(trade.pnl_amount) if trade.pnl_amount else None,
-                        'pnl_pct': float(trade.pnl_pct) if trade.pnl_pct else None,
-                        'stop_loss': float(trade.stop_loss) if trade.stop_loss else None,
-                        'take_profit': float(trade.take_profit) if trade.take_profit else None,
-                        'created_at': trade.created_at.isoformat()
-                    }
-                    for trade in trades
-                ]
-            else:
-                data['trades'] = []
+                .order_by(Trade.entry_time.desc()),
+                lambda trade: self._trade_record(trade, include_reasoning)
+            ))
+        
+        step = 70.0 / max(len(streams), 1)
+        progress = [10.0]
+        
+        async def advance() -> None:
+            progress[0] += step
+            await self.update_job(export_id, progress_pct=int(min(progress[0], 80.0)))
+        
+        for name, stmt, to_record in streams:
+            sections.append((name, self._tracked(name, iter_records(self.db, stmt, to_record), counts, advance)))
         
         # Collect user settings
         if include.get('settings', True):
@@ -397,98 +384,189 @@ class ExportService:
                 select(UserSettings)
                 .where(UserSettings.user_id == user_id)
             )
-            settings = settings_result.scalar_one_or_none()
-            
-            if settings:
-                data['settings'] = {
-                    'theme': settings.theme,
-                    'accent_color': settings.accent_color,
-                    'sidebar_collapsed': settings.sidebar_collapsed,
-                    'chart_grid_lines': settings.chart_grid_lines,
-                    'chart_crosshair': settings.chart_crosshair,
-                    'chart_candle_colors': settings.chart_candle_colors,
-                    'email_notifications': settings.email_notifications,
-                    'inapp_notifications': settings.inapp_notifications,
-                    'default_asset': settings.default_asset,
-                    'default_timeframe': settings.default_timeframe,
-                    'default_capital': float(settings.default_capital),
-                    'default_playback_speed': settings.default_playback_speed,
-                    'safety_mode_default': settings.safety_mode_default,
-                    'allow_leverage_default': settings.allow_leverage_default,
-                    'max_position_size_pct': settings.max_position_size_pct,
-                    'max_leverage': settings.max_leverage,
-                    'max_loss_per_trade_pct': float(settings.max_loss_per_trade_pct),
-                    'max_daily_loss_pct': float(settings.max_daily_loss_pct),
-                    'max_total_drawdown_pct': float(settings.max_total_drawdown_pct)
-                }
-            else:
-                data['settings'] = None
+            user_settings = settings_result.scalar_one_or_none()
+            sections.append(('settings', self._settings_record(user_settings) if user_settings else None))
         
-        return data
+        return sections
+    
+    @staticmethod
+    async def _tracked(
+        name: str,
+        chunks: AsyncIterator[List[Dict[str, Any]]],
+        counts: Dict[str, int],
+        on_done: Callable[[], Awaitable[None]]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Count a section's records and report progress when it is done"""
+        counts[name] = 0
+        async for records in chunks:
+            counts[name] += len(records)
+            yield records
+        await on_done()
     
-    async def _create_zip_archive(
+    def _zip_members(
         self,
-        user_data: Dict[str, Any]
-    ) -> tuple[bytes, int]:
+        sections: List[Tuple[str, Any]],
+        counts: Dict[str, int]
+    ) -> Iterator[Tuple[str, AsyncIterator[bytes]]]:
         """
-        Create a ZIP archive containing the user data.
-        
-        Creates a ZIP file with:
-        - data.json: All user data in JSON format
-        - README.txt: Information about the export
+        ZIP members for the export sections.
         
-        Args:
-            user_data: Dictionary with all collected user data
-            
-        Returns:
-            Tuple of (zip_bytes, size_in_bytes)
+        Streamed sections become JSON Lines files, the others small JSON
+        files; README.txt comes last so it can report record counts.
         """
-        # Create in-memory ZIP file
-        zip_buffer = io.BytesIO()
+        for name, value in sections:
+            if hasattr(value, '__aiter__'):
+                yield f"{name}.jsonl", encode_jsonl(value)
+            else:
+                yield f"{name}.json", single(json.dumps(value, indent=2, default=str).encode('utf-8'))
         
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add data.json
-            data_json = json.dumps(user_data, indent=2, default=str)
-            zip_file.writestr('data.json', data_json)
-            
-            # Add README.txt
-            readme_content = f"""AlphaLab Data Export
+        metadata = sections[0][1]
+        yield 'README.txt', self._readme(metadata, [name for name, _ in sections], counts)
+    
+    @staticmethod
+    async def _readme(
+        metadata: Dict[str, Any],
+        section_names: List[str],
+        counts: Dict[str, int]
+    ) -> AsyncIterator[bytes]:
+        readme_content = f"""AlphaLab Data Export
 =====================
 
-Export Date: {user_data['export_metadata']['exported_at']}
-User ID: {user_data['export_metadata']['user_id']}
-Version: {user_data['export_metadata']['version']}
+Export Date: {metadata['exported_at']}
+User ID: {metadata['user_id']}
+Version: {metadata['version']}
 
 Contents:
 ---------
-- data.json: All your AlphaLab data in JSON format
+- export_metadata.json: Export information
+- agents.jsonl, test_results.jsonl, trades.jsonl: One JSON record per line
+- settings.json: User preferences
 
 Data Included:
 --------------
 """
-            if 'agents' in user_data:
-                readme_content += f"- Agents: {len(user_data['agents'])} agent configurations\n"
-            if 'test_results' in user_data:
-                readme_content += f"- Test Results: {len(user_data['test_results'])} completed tests\n"
-            if 'trades' in user_data:
-                readme_content += f"- Trades: {len(user_data['trades'])} trade records\n"
-            if 'settings' in user_data and user_data['settings']:
-                readme_content += "- Settings: User preferences and configuration\n"
-            
-            readme_content += """
+        if 'agents' in counts:
+            readme_content += f"- Agents: {counts['agents']} agent configurations\n"
+        if 'test_results' in counts:
+            readme_content += f"- Test Results: {counts['test_results']} completed tests\n"
+        if 'trades' in counts:
+            readme_content += f"- Trades: {counts['trades']} trade records\n"
+        if 'settings' in section_names:
+            readme_content += "- Settings: User preferences and configuration\n"
+        
+        readme_content += """
 How to Use:
 -----------
 1. Extract this ZIP file to a folder
-2. Open data.json in any text editor or JSON viewer
+2. Open the .jsonl files in any text editor, or load them with
+   pandas.read_json(path, lines=True) / DuckDB read_json_auto
 3. Import into other tools or analyze as needed
 
 For questions or support, visit: https://alphalab.io/support
 """
-            
-            zip_file.writestr('README.txt', readme_content)
-        
-        # Get ZIP bytes
-        zip_bytes = zip_buffer.getvalue()
-        size_bytes = len(zip_bytes)
-        
-        return zip_bytes, size_bytes
+        yield readme_content.encode('utf-8')
+    
+    @staticmethod
+    def _agent_record(agent: Agent) -> Dict[str, Any]:
+        return {
+            'id': str(agent.id),
+            'name': agent.name,
+            'mode': agent.mode,
+            'model': agent.model,
+            'indicators': agent.indicators,
+            'custom_indicators': agent.custom_indicators,
+            'strategy_prompt': agent.strategy_prompt,
+            'tests_run': agent.tests_run,
+            'best_pnl': float(agent.best_pnl) if agent.best_pnl else None,
+            'total_profitable_tests': agent.total_profitable_tests,
+            'avg_win_rate': float(agent.avg_win_rate) if agent.avg_win_rate else None,
+            'avg_drawdown': float(agent.avg_drawdown) if agent.avg_drawdown else None,
+            'is_archived': agent.is_archived,
+            'created_at': agent.created_at.isoformat(),
+            'updated_at': agent.updated_at.isoformat()
+        }
+    
+    @staticmethod
+    def _result_record(result: TestResult) -> Dict[str, Any]:
+        return {
+            'id': str(result.id),
+            'agent_id': str(result.agent_id),
+            'agent_name': result.agent.name,
+            'type': result.type,
+            'asset': result.asset,
+            'mode': result.mode,
+            'timeframe': result.timeframe,
+            'start_date': result.start_date.isoformat(),
+            'end_date': result.end_date.isoformat(),
+            'duration_seconds': result.duration_seconds,
+            'duration_display': result.duration_display,
+            'starting_capital': float(result.starting_capital),
+            'ending_capital': float(result.ending_capital),
+            'total_pnl_amount': float(result.total_pnl_amount),
+            'total_pnl_pct': float(result.total_pnl_pct),
+            'total_trades': result.total_trades,
+            'winning_trades': result.winning_trades,
+            'losing_trades': result.losing_trades,
+            'win_rate': float(result.win_rate),
+            'max_drawdown_pct': float(result.max_drawdown_pct) if result.max_drawdown_pct else None,
+            'sharpe_ratio': float(result.sharpe_ratio) if result.sharpe_ratio else None,
+            'profit_factor': float(result.profit_factor) if result.profit_factor else None,
+            'avg_trade_pnl': float(result.avg_trade_pnl) if result.avg_trade_pnl else None,
+            'best_trade_pnl': float(result.best_trade_pnl) if result.best_trade_pnl else None,
+            'worst_trade_pnl': float(result.worst_trade_pnl) if result.worst_trade_pnl else None,
+            'avg_holding_time_seconds': result.avg_holding_time_seconds,
+            'avg_holding_time_display': result.avg_holding_time_display,
+            'equity_curve': result.equity_curve,
+            'ai_summary': result.ai_summary,
+            'is_profitable': result.is_profitable,
+            'created_at': result.created_at.isoformat()
+        }
+    
+    @staticmethod
+    def _trade_record(trade: Trade, include_reasoning: bool) -> Dict[str, Any]:
+        return {
+            'id': str(trade.id),
+            'session_id': str(trade.session_id),
+            'trade_number': trade.trade_number,
+            'type': trade.type,
+            'entry_price': float(trade.entry_price),
+            'entry_time': trade.entry_time.isoformat(),
+            'entry_candle': trade.entry_candle,
+            'entry_reasoning': trade.entry_reasoning if include_reasoning else None,
+            'exit_price': float(trade.exit_price) if trade.exit_price else None,
+            'exit_time': trade.exit_time.isoformat() if trade.exit_time else None,
+            'exit_candle': trade.exit_candle,
+            'exit_type': trade.exit_type,
+            'exit_reasoning': trade.exit_reasoning if include_reasoning else None,
+            'size': float(trade.size),
+            'leverage': trade.leverage,
+            'pnl_amount': float(trade.pnl_amount) if trade.pnl_amount else None,
+            'pnl_pct': float(trade.pnl_pct) if trade.pnl_pct else None,
+            'stop_loss': float(trade.stop_loss) if trade.stop_loss else None,
+            'take_profit': float(trade.take_profit) if trade.take_profit else None,
+            'created_at': trade.created_at.isoformat()
+        }
+    
+    @staticmethod
+    def _settings_record(settings: UserSettings) -> Dict[str, Any]:
+        return {
+            'theme': settings.theme,
+            'accent_color': settings.accent_color,
+            'sidebar_collapsed': settings.sidebar_collapsed,
+            'chart_grid_lines': settings.chart_grid_lines,
+            'chart_crosshair': settings.chart_crosshair,
+            'chart_candle_colors': settings.chart_candle_colors,
+            'email_notifications': settings.email_notifications,
+            'inapp_notifications': settings.inapp_notifications,
+            'default_asset': settings.default_asset,
+            'default_timeframe': settings.default_timeframe,
+            'default_capital': float(settings.default_capital),
+            'default_playback_speed': settings.default_playback_speed,
+            'safety_mode_default': settings.safety_mode_default,
+            'allow_leverage_default': settings.allow_leverage_default,
+            'max_position_size_pct': settings.max_position_size_pct,
+            'max_leverage': settings.max_leverage,
+            'max_loss_per_trade_pct': float(settings.max_loss_per_trade_pct),
+            'max_daily_loss_pct': float(settings.max_daily_loss_pct),
+            'max_total_drawdown_pct': float(settings.max_total_drawdown_pct)
+        }
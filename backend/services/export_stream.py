@@ -0,0 +1,176 @@
+"""
+Streaming Export Encoding for AlphaLab.
+
+Purpose:
+    Builds export files incrementally so memory stays constant regardless of
+    how many trades or AI thoughts a result has:
+
+    - iter_records() reads rows through a server-side cursor in chunks of
+      EXPORT_CHUNK_ROWS and converts each chunk to plain dicts.
+    - encode_jsonl() / encode_csv() turn record chunks into bytes.
+    - stream_zip() compresses members on the fly and yields ZIP bytes as
+      they are produced (entries use data descriptors, so the archive never
+      has to be seeked or held in memory).
+    - stream_json_document() writes one JSON object whose array sections
+      are streamed the same way.
+
+Usage:
+    from services.export_stream import encode_jsonl, iter_records, stream_zip
+
+    members = [("trades.jsonl", encode_jsonl(iter_records(session, stmt, trade_record)))]
+    return StreamingResponse(stream_zip(members), media_type="application/zip")
+"""
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import csv
+import io
+import json
+import time
+import zipfile
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from config import settings
+
+
+Record = Dict[str, Any]
+
+
+# Members that are already compressed are stored rather than deflated again
+STORED_SUFFIXES = (".parquet",)
+
+
+class ChunkSink(io.RawIOBase):
+    """Unseekable file object collecting what a writer produces until drained"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_records(
+    session: AsyncSession,
+    stmt: Select,
+    to_record: Callable[[Any], Record],
+    chunk_size: Optional[int] = None
+) -> AsyncIterator[List[Record]]:
+    """
+    Stream ORM rows through a server-side cursor as chunks of records.
+
+    Args:
+        session: Database session (kept open while iterating)
+        stmt: Select of one ORM entity
+        to_record: Converts one entity to a JSON-serializable dict
+        chunk_size: Rows per chunk (default: settings.EXPORT_CHUNK_ROWS)
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_ROWS
+    result = await session.stream_scalars(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions(chunk_size):
+        yield [to_record(row) for row in partition]
+
+
+async def encode_jsonl(chunks: AsyncIterable[List[Record]]) -> AsyncIterator[bytes]:
+    """Encode record chunks as JSON Lines"""
+    async for records in chunks:
+        if records:
+            yield "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+
+
+async def encode_csv(chunks: AsyncIterable[List[Record]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """
+    Encode record chunks as CSV with a header row.
+
+    Nested values (dicts, lists) are written as JSON strings.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+
+    async for records in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for record in records:
+            writer.writerow({
+                key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                for key, value in record.items()
+            })
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def single(data: Any) -> AsyncIterator[Any]:
+    """Something already in memory as a one-item stream (a small member body or record chunk)"""
+    yield data
+
+
+async def stream_zip(members: Iterable[Tuple[str, AsyncIterable[bytes]]]) -> AsyncIterator[bytes]:
+    """
+    Yield a ZIP archive of the given members as it is compressed.
+
+    Args:
+        members: (file name, body chunks) pairs, consumed in order. Bodies
+            are only iterated when their entry is written, so lazily built
+            members may depend on earlier ones (e.g. a README with counts).
+    """
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, body in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED if name.endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+            with archive.open(info, "w", force_zip64=True) as entry:
+                async for chunk in body:
+                    entry.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # Central directory
+    yield sink.drain()
+
+
+async def stream_json_document(
+    sections: Iterable[Tuple[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Yield one JSON object section by section.
+
+    Args:
+        sections: (key, value) pairs. A value that is an async iterable of
+            record chunks is written as a streamed JSON array; anything else
+            is serialized as-is.
+    """
+    yield b"{"
+    for index, (key, value) in enumerate(sections):
+        prefix = "," if index else ""
+        if hasattr(value, "__aiter__"):
+            yield f"{prefix}{json.dumps(key)}:[".encode("utf-8")
+            first = True
+            async for records in value:
+                if not records:
+                    continue
+                body = ",".join(json.dumps(record, default=str) for record in records)
+                yield (body if first else "," + body).encode("utf-8")
+                first = False
+            yield b"]"
+        else:
+            yield f"{prefix}{json.dumps(key)}:{json.dumps(value, default=str)}".encode("utf-8")
+    yield b"}"
@@ -0,0 +1,162 @@
+"""
+Export Job Worker for AlphaLab.
+
+Purpose:
+    Runs data export jobs off the request path. POST /api/export creates an
+    Export row and submits its id here; EXPORT_WORKERS tasks take jobs from a
+    queue bounded at EXPORT_QUEUE_SIZE and run
+    ExportService.generate_export_package with a session of their own, so a
+    request never waits on (or holds a connection for) an export.
+
+    When the queue is full, submit() raises ExportQueueFull and the API
+    answers 503 instead of piling up work. Jobs still running at shutdown
+    are marked failed so clients stop polling them.
+
+    Several instances may share the exports table, so a job is only
+    recovered by its heartbeat: every EXPORT_HEARTBEAT_SECONDS each worker
+    refreshes updated_at on the jobs it holds (queued or running) and fails
+    'processing' jobs nobody refreshed for EXPORT_STALE_AFTER_SECONDS, i.e.
+    jobs whose instance crashed or was stopped without its shutdown hook.
+
+Usage:
+    from services.export_worker import export_worker
+
+    export_worker.start()            # in the app lifespan
+    export_worker.submit(export_id)  # after ExportService.create_export
+    await export_worker.stop()
+"""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+
+from config import settings
+from database import async_session_maker
+from services.export_service import ExportService
+
+logger = logging.getLogger(__name__)
+
+INTERRUPTED_MESSAGE = "Export interrupted by a server restart, please retry"
+
+
+class ExportQueueFull(Exception):
+    """Raised by ExportWorker.submit when no more jobs can be queued"""
+
+
+class ExportWorker:
+    """Bounded queue of export jobs processed by a fixed number of tasks"""
+
+    def __init__(self, concurrency: Optional[int] = None, queue_size: Optional[int] = None):
+        """
+        Initialize the worker.
+
+        Args:
+            concurrency: Jobs processed at the same time (default: settings.EXPORT_WORKERS)
+            queue_size: Jobs that may wait in the queue (default: settings.EXPORT_QUEUE_SIZE)
+        """
+        self.concurrency = concurrency or settings.EXPORT_WORKERS
+        self.queue_size = queue_size or settings.EXPORT_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._monitor: Optional[asyncio.Task] = None
+        self._running: Set[UUID] = set()
+        self._owned: Set[UUID] = set()  # Queued or running here, kept alive by the heartbeat
+        self.heartbeat_interval = settings.EXPORT_HEARTBEAT_SECONDS
+        self.stale_after = timedelta(seconds=settings.EXPORT_STALE_AFTER_SECONDS)
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"export-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        self._monitor = asyncio.create_task(self._heartbeat(), name="export-worker-heartbeat")
+        logger.info(f"Export worker started ({self.concurrency} tasks, queue size {self.queue_size})")
+
+    async def stop(self) -> None:
+        tasks = self._tasks + ([self._monitor] if self._monitor is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._monitor = None
+
+        interrupted = list(self._running)
+        if self._queue is not None:
+            while not self._queue.empty():
+                interrupted.append(self._queue.get_nowait())
+        for export_id in interrupted:
+            try:
+                await ExportService.update_job(export_id, status='failed', error_message=INTERRUPTED_MESSAGE)
+            except Exception as e:
+                logger.warning(f"Could not mark export {export_id} as failed: {e}")
+        self._running.clear()
+        self._owned.clear()
+        self._queue = None
+
+    async def _heartbeat(self) -> None:
+        """Keep this worker's jobs alive and fail the ones whose instance went away"""
+        while True:
+            try:
+                # Refresh our own jobs first so the sweep below can never pick them up
+                await ExportService.heartbeat(list(self._owned))
+                count = await ExportService.fail_interrupted(self.stale_after, INTERRUPTED_MESSAGE)
+                if count:
+                    logger.info(f"Marked {count} interrupted export(s) as failed")
+            except Exception as e:
+                logger.warning(f"Export heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+
+    def submit(self, export_id: UUID) -> None:
+        """
+        Queue an export job.
+
+        Raises:
+            ExportQueueFull: If the worker is not running or the queue is full
+        """
+        if self._queue is None:
+            raise ExportQueueFull("Export worker is not running")
+        try:
+            self._queue.put_nowait(export_id)
+        except asyncio.QueueFull:
+            raise ExportQueueFull("Too many exports in progress, please try again in a few minutes")
+        self._owned.add(export_id)
+
+    def is_full(self) -> bool:
+        return self._queue is None or self._queue.full()
+
+    async def _work(self) -> None:
+        while True:
+            export_id = await self._queue.get()
+            self._running.add(export_id)
+            try:
+                async with async_session_maker() as db:
+                    await ExportService(db).generate_export_package(export_id)
+                self.completed += 1
+            except asyncio.CancelledError:
+                # Stays in _running so stop() marks the job failed
+                raise
+            except Exception:
+                self.failed += 1
+                logger.exception(f"Export {export_id} failed")
+            self._running.discard(export_id)
+            self._owned.discard(export_id)
+            self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# Shared worker used by the export API
+export_worker = ExportWorker()
@@ -0,0 +1,135 @@
+"""
+LLM Client Registry for AlphaLab.
+
+Purpose:
+    Process-wide pool of OpenRouter clients. All LLM traffic (AI traders in
+    every backtest/forward session and the /api/openrouter/chat proxy) shares
+    one keep-alive HTTP connection pool, and AsyncOpenAI clients are reused
+    per API key instead of being created per session.
+
+    HTTP/2 is used when the optional `h2` package is installed (multiplexing
+    many concurrent decisions over a few connections); otherwise the pool
+    falls back to HTTP/1.1 keep-alive.
+
+Usage:
+    from services.llm_client import llm_client_registry
+
+    client = llm_client_registry.get_client(api_key)
+    response = await client.chat.completions.create(...)
+
+    # Raw requests on the same pool
+    http = llm_client_registry.http_client()
+"""
+from typing import Dict, Optional
+import hashlib
+import logging
+import threading
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def openrouter_headers() -> Dict[str, str]:
+    """Attribution headers OpenRouter expects on every request"""
+    return {
+        "HTTP-Referer": settings.OPENROUTER_HTTP_REFERER,
+        "X-Title": settings.OPENROUTER_X_TITLE,
+    }
+
+
+class LLMClientRegistry:
+    """
+    Shares one HTTP connection pool across per-API-key AsyncOpenAI clients.
+
+    Clients are keyed by a SHA256 digest of the API key so plaintext keys
+    are not used as dictionary keys.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, AsyncOpenAI] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def http_client(self) -> httpx.AsyncClient:
+        """Return the shared pooled HTTP client, creating it on first use"""
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                self._http_client = self._create_http_client()
+                # Clients bound to a closed pool must be rebuilt
+                self._clients.clear()
+            return self._http_client
+
+    def get_client(self, api_key: str) -> AsyncOpenAI:
+        """
+        Return the AsyncOpenAI client for an API key (created once per key).
+
+        Args:
+            api_key: OpenRouter API key
+
+        Returns:
+            AsyncOpenAI client using the shared connection pool
+        """
+        http_client = self.http_client()
+        key = hashlib.sha256(api_key.encode()).hexdigest()
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = AsyncOpenAI(
+                    base_url=OPENROUTER_BASE_URL,
+                    api_key=api_key,
+                    default_headers=openrouter_headers(),
+                    http_client=http_client,
+                )
+                self._clients[key] = client
+            return client
+
+    def stats(self) -> Dict[str, object]:
+        """Return registry size and pool configuration"""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "http2": settings.LLM_HTTP2 and HTTP2_AVAILABLE,
+                "max_connections": settings.LLM_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            }
+
+    async def aclose(self) -> None:
+        """Close the shared pool (application shutdown)"""
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            self._clients.clear()
+        if http_client is not None and not http_client.is_closed:
+            await http_client.aclose()
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        http2 = settings.LLM_HTTP2 and HTTP2_AVAILABLE
+        if settings.LLM_HTTP2 and not HTTP2_AVAILABLE:
+            logger.info("h2 not installed; LLM connection pool using HTTP/1.1 keep-alive")
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            follow_redirects=True,
+        )
+
+
+# Process-wide registry shared by AI traders and the OpenRouter proxy
+llm_client_registry = LLMClientRegistry()
@@ -0,0 +1,309 @@
+"""
+LLM Request Scheduler for AlphaLab.
+
+Purpose:
+    Coordinates LLM calls from every backtest and forward session so one
+    API key is driven at a steady rate instead of in bursts that end in 429s.
+
+    - Per API key: a token bucket (sustained requests/second plus burst) and a
+      cap on in-flight requests
+    - Across sessions sharing a key: weighted fair queuing (start-time fair
+      queuing on virtual finish tags), so a fast instant-speed backtest cannot
+      starve the others
+    - Priority classes: forward (live) decisions are always dispatched before
+      queued backtest decisions
+
+Usage:
+    from services.llm_scheduler import llm_scheduler
+
+    async with llm_scheduler.slot(api_key, session_id, priority="forward") as ticket:
+        response = await client.chat.completions.create(...)
+    ticket.wait_ms  # time spent queued
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import time
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, lower value dispatched first
+PRIORITY_CLASSES: Dict[str, int] = {
+    "forward": 0,
+    "backtest": 1,
+}
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take one token if available.
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+@dataclass
+class SlotTicket:
+    """Grant handed to a caller once its request may run"""
+    key_id: str
+    session_id: str
+    priority: str
+    enqueued_at: float
+    wait_ms: float = 0.0
+    # Held back by the token bucket at least once while queued
+    throttled: bool = False
+
+
+@dataclass
+class _KeyState:
+    """Queues and limits for one API key"""
+    bucket: TokenBucket
+    max_in_flight: int
+    queue: List[Tuple[int, float, int, asyncio.Future, SlotTicket, float]] = field(default_factory=list)
+    in_flight: int = 0
+    virtual_time: float = 0.0
+    session_finish: Dict[str, float] = field(default_factory=dict)
+    timer: Optional[asyncio.TimerHandle] = None
+    granted: int = 0
+    throttled: int = 0
+
+
+class LLMScheduler:
+    """
+    Async admission scheduler for LLM requests.
+
+    Requests are granted in (priority class, virtual finish tag) order. A
+    session's finish tag advances by 1/weight per request, so a session with
+    weight 2 gets twice the share of one with weight 1 when both are backlogged.
+    """
+
+    def __init__(
+        self,
+        rate_per_key: Optional[float] = None,
+        burst_per_key: Optional[int] = None,
+        max_in_flight_per_key: Optional[int] = None,
+        wait_samples: int = 1000
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate_per_key: Sustained requests per second per API key (default: from settings)
+            burst_per_key: Token bucket capacity per API key (default: from settings)
+            max_in_flight_per_key: Concurrent requests per API key (default: from settings)
+            wait_samples: Recent queue wait samples kept per priority class
+        """
+        self.rate_per_key = rate_per_key if rate_per_key is not None else settings.LLM_RATE_LIMIT_PER_KEY
+        self.burst_per_key = burst_per_key or settings.LLM_BURST_PER_KEY
+        self.max_in_flight_per_key = max_in_flight_per_key or settings.LLM_MAX_IN_FLIGHT_PER_KEY
+        self._keys: Dict[str, _KeyState] = {}
+        self._sequence = itertools.count()
+        self._waits: Dict[str, Deque[float]] = {
+            name: deque(maxlen=wait_samples) for name in PRIORITY_CLASSES
+        }
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """Short non-reversible identifier for an API key (safe for metrics/logs)"""
+        return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        api_key: str,
+        session_id: Optional[str] = None,
+        priority: str = "backtest",
+        weight: float = 1.0
+    ) -> AsyncIterator[SlotTicket]:
+        """
+        Wait for permission to send one LLM request and hold it while the request runs.
+
+        Args:
+            api_key: API key the request is sent with (rate limits are per key)
+            session_id: Session issuing the request (fair queuing unit)
+            priority: "forward" or "backtest"
+            weight: Relative share among sessions of the same priority class
+
+        Yields:
+            SlotTicket with the time spent queued
+        """
+        ticket = await self.acquire(api_key, session_id, priority, weight)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    async def acquire(
+        self,
+        api_key: str,
+        session_id: Optional[str] = None,
+        priority: str = "backtest",
+        weight: float = 1.0
+    ) -> SlotTicket:
+        """Queue a request and wait until it is granted (pair with release())"""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown LLM priority '{priority}'. Use one of: {', '.join(PRIORITY_CLASSES)}")
+
+        key_id = self.key_id(api_key)
+        state = self._keys.get(key_id)
+        if state is None:
+            state = _KeyState(
+                bucket=TokenBucket(self.rate_per_key, self.burst_per_key),
+                max_in_flight=self.max_in_flight_per_key,
+            )
+            self._keys[key_id] = state
+
+        session = session_id or "anonymous"
+        ticket = SlotTicket(key_id, session, priority, time.monotonic())
+
+        # Start-time fair queuing: a session's next tag continues from its last
+        # tag, or from the current virtual time if it has been idle
+        start = max(state.virtual_time, state.session_finish.get(session, 0.0))
+        finish = start + 1.0 / max(weight, 1e-6)
+        state.session_finish[session] = finish
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            state.queue,
+            (PRIORITY_CLASSES[priority], finish, next(self._sequence), future, ticket, start)
+        )
+        self._dispatch(key_id)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller was cancelled: give the slot back
+                self.release(ticket)
+            elif session in state.session_finish:
+                # Never served: don't charge the session for it
+                state.session_finish[session] -= finish - start
+            raise
+
+        ticket.wait_ms = (time.monotonic() - ticket.enqueued_at) * 1000
+        self._waits[priority].append(ticket.wait_ms)
+        return ticket
+
+    def release(self, ticket: SlotTicket) -> None:
+        """Return the in-flight slot of a finished request"""
+        state = self._keys.get(ticket.key_id)
+        if state is None:
+            return
+        state.in_flight = max(0, state.in_flight - 1)
+        self._dispatch(ticket.key_id)
+
+    def _dispatch(self, key_id: str) -> None:
+        """Grant queued requests while concurrency and rate limits allow"""
+        state = self._keys[key_id]
+        while state.queue and state.in_flight < state.max_in_flight:
+            # Drop requests whose callers gave up (e.g. timeouts)
+            if state.queue[0][3].done():
+                heapq.heappop(state.queue)
+                continue
+
+            wait = state.bucket.try_acquire()
+            if wait > 0:
+                ticket = state.queue[0][4]
+                if not ticket.throttled:
+                    ticket.throttled = True
+                    state.throttled += 1
+                if state.timer is None:
+                    loop = asyncio.get_running_loop()
+                    state.timer = loop.call_later(wait, self._on_timer, key_id)
+                return
+
+            _, _, _, future, _, start = heapq.heappop(state.queue)
+            # Virtual time follows the start tag of the request in service
+            state.virtual_time = max(state.virtual_time, start)
+            state.in_flight += 1
+            state.granted += 1
+            future.set_result(None)
+
+        if not state.queue and state.in_flight == 0:
+            # Idle key: forget per-session tags so they don't grow unbounded
+            state.session_finish.clear()
+            state.virtual_time = 0.0
+
+    def _on_timer(self, key_id: str) -> None:
+        self._keys[key_id].timer = None
+        self._dispatch(key_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return queue depth, in-flight counts and queue wait statistics.
+
+        Returns:
+            Dict with per-key state and per-priority wait percentiles (ms)
+        """
+        keys = {}
+        for key_id, state in self._keys.items():
+            depth = {name: 0 for name in PRIORITY_CLASSES}
+            for _, _, _, future, ticket, _ in state.queue:
+                if not future.done():
+                    depth[ticket.priority] += 1
+            keys[key_id] = {
+                "queue_depth": depth,
+                "in_flight": state.in_flight,
+                "granted": state.granted,
+                "throttled": state.throttled,
+                "tokens": round(state.bucket.tokens, 2),
+            }
+
+        waits = {}
+        for name, samples in self._waits.items():
+            ordered = sorted(samples)
+            waits[name] = {
+                "samples": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered), 1) if ordered else None,
+                "p50_ms": _percentile(ordered, 0.50),
+                "p95_ms": _percentile(ordered, 0.95),
+                "max_ms": round(ordered[-1], 1) if ordered else None,
+            }
+
+        return {
+            "rate_per_key": self.rate_per_key,
+            "burst_per_key": self.burst_per_key,
+            "max_in_flight_per_key": self.max_in_flight_per_key,
+            "keys": keys,
+            "queue_wait": waits,
+        }
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+# Process-wide scheduler shared by all AI traders
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,232 @@
+"""
+Event Loop Lag Monitor for AlphaLab.
+
+Purpose:
+    Measures how late the event loop runs a periodic wakeup. Any lag means a
+    callback held the loop (blocking I/O, CPU-heavy work) and every WebSocket,
+    request and engine on the process waited with it.
+
+    Samples are exported as the alphalabs_event_loop_lag_seconds histogram.
+
+    Debug mode (LOOP_BLOCK_DEBUG) adds a watchdog thread: while the loop has
+    not run a heartbeat for LOOP_BLOCK_THRESHOLD_MS it logs the loop thread's
+    stack once per stall, so the blocking call is named. Stalls are counted
+    per call site (alphalabs_event_loop_blocked_total{site}) and their
+    durations recorded (alphalabs_event_loop_block_seconds).
+
+Usage:
+    from services.loop_monitor import loop_monitor
+
+    loop_monitor.start()      # in the app lifespan, on the running loop
+    loop_monitor.stats()      # last/max lag, blocking call sites
+    await loop_monitor.stop()
+"""
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from config import settings
+from services.metrics import event_loop_blocked, event_loop_block_seconds, event_loop_lag_seconds
+
+logger = logging.getLogger(__name__)
+
+# Frames under this directory (and outside site-packages) are application code
+APP_ROOT = str(Path(__file__).resolve().parents[1])
+_THIS_FILE = str(Path(__file__).resolve())
+
+# Distinct blocking sites kept in stats()
+MAX_TRACKED_SITES = 50
+
+
+def blocking_site(frame: Optional[FrameType]) -> str:
+    """
+    Name the application code responsible for a stack.
+
+    Returns the innermost frame in the backend's own code as
+    "path/relative/to/backend.py:function", or "unknown".
+    """
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT) and "site-packages" not in filename:
+            if filename != _THIS_FILE:
+                relative = filename[len(APP_ROOT):].lstrip("/\\")
+                return f"{relative}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class BlockingCallDetector:
+    """
+    Watchdog thread logging stacks of callbacks that block the loop.
+
+    The loop runs a heartbeat every threshold/2 seconds; the thread checks
+    the heartbeat at the same rate and captures the loop thread's current
+    frame via sys._current_frames() when it is stale.
+    """
+
+    def __init__(self, threshold: float):
+        """
+        Initialize detector.
+
+        Args:
+            threshold: Seconds the loop may be held before a stall is reported
+        """
+        self.threshold = threshold
+        self.tick = threshold / 2
+        self.stalls = 0
+        self.sites: Dict[str, int] = {}
+        self._last_beat = time.perf_counter()
+        self._reported = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._handle = loop.call_later(self.tick, self._heartbeat)
+        self._thread = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self._thread.start()
+        logger.info(f"Blocking call detector started (threshold={self.threshold * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _heartbeat(self) -> None:
+        now = time.perf_counter()
+        held = now - self._last_beat - self.tick
+        if held >= self.threshold:
+            event_loop_block_seconds.observe(held)
+        self._last_beat = now
+        self._reported = False
+        if not self._stop.is_set():
+            self._handle = self._loop.call_later(self.tick, self._heartbeat)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.tick):
+            stalled = time.perf_counter() - self._last_beat - self.tick
+            if stalled < self.threshold or self._reported:
+                continue
+            self._reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            self.report(stalled, frame)
+
+    def report(self, stalled: float, frame: Optional[FrameType]) -> None:
+        """Log and count one stall with the loop thread's stack"""
+        site = blocking_site(frame)
+        self.stalls += 1
+        if site in self.sites or len(self.sites) < MAX_TRACKED_SITES:
+            self.sites[site] = self.sites.get(site, 0) + 1
+        event_loop_blocked.inc(site=site)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+        logger.warning(
+            f"Event loop blocked for {stalled * 1000:.0f}ms+ in {site}\n{stack}",
+            extra={"site": site, "blocked_ms": round(stalled * 1000, 1)}
+        )
+
+    def top_sites(self, limit: int = 10) -> List[Dict[str, Any]]:
+        ranked = sorted(self.sites.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{"site": site, "stalls": count} for site, count in ranked]
+
+
+class LoopLagMonitor:
+    """Samples event loop lag every `interval` seconds"""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        debug: Optional[bool] = None,
+        block_threshold_ms: Optional[int] = None
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            interval: Seconds between samples (default: settings.LOOP_LAG_SAMPLE_INTERVAL)
+            debug: Run the blocking call detector (default: settings.LOOP_BLOCK_DEBUG)
+            block_threshold_ms: Stall threshold for the detector
+                (default: settings.LOOP_BLOCK_THRESHOLD_MS)
+        """
+        self.interval = interval or settings.LOOP_LAG_SAMPLE_INTERVAL
+        self.debug = settings.LOOP_BLOCK_DEBUG if debug is None else debug
+        threshold_ms = block_threshold_ms or settings.LOOP_BLOCK_THRESHOLD_MS
+        self.detector = BlockingCallDetector(threshold_ms / 1000) if self.debug else None
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop (no-op if already running)"""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._run())
+        if self.detector is not None:
+            self.detector.start(loop)
+        logger.info(f"Event loop lag monitor started (interval={self.interval}s)")
+
+    async def stop(self) -> None:
+        if self.detector is not None:
+            self.detector.stop()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample in seconds"""
+        lag = max(lag, 0.0)
+        self.samples += 1
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        event_loop_lag_seconds.observe(lag)
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(time.perf_counter() - expected)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_s": self.interval,
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "blocking_detector": {
+                "threshold_ms": round(self.detector.threshold * 1000),
+                "stalls": self.detector.stalls,
+                "top_sites": self.detector.top_sites(),
+            } if self.detector is not None else None,
+        }
+
+
+# Process-wide monitor, started in the app lifespan
+loop_monitor = LoopLagMonitor()
@@ -40,6 +40,7 @@ import yfinance as yf
 from models import MarketDataCache
 from config import settings
 from utils.retry import retry_with_backoff
+from services.metrics import cache_lookups
 
 logger = logging.getLogger(__name__)
 
@@ -379,18 +380,22 @@ class MarketDataService:
         
         # 1. Check in-memory cache
         if cache_key in self.memory_cache:
+            cache_lookups.inc(cache="market_data", tier="memory", result="hit")
             logger.info(
                 f"Cache hit (memory): {asset} {timeframe} "
                 f"{start_date.date()} to {end_date.date()}"
             )
             return self.memory_cache[cache_key]
         
+        cache_lookups.inc(cache="market_data", tier="memory", result="miss")
+        
         # 2. Check database cache
         db_candles = await self._load_from_db_cache(
             asset, timeframe, start_date, end_date
         )
         
         if db_candles:
+            cache_lookups.inc(cache="market_data", tier="database", result="hit")
             logger.info(
                 f"Cache hit (database): {asset} {timeframe} "
                 f"{start_date.date()} to {end_date.date()} "
@@ -400,6 +405,8 @@ class MarketDataService:
             self.memory_cache[cache_key] = db_candles
             return db_candles
         
+        cache_lookups.inc(cache="market_data", tier="database", result="miss")
+        
         # 3. Fetch from external API with retry logic
         logger.info(
             f"Cache miss: Fetching from API: {asset} {timeframe} "
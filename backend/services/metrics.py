@@ -0,0 +1,431 @@
+"""
+In-process Metrics Registry for AlphaLab.
+
+Purpose:
+    Counters, gauges and histograms rendered in the Prometheus text
+    exposition format (version 0.0.4) by GET /metrics, which is guarded by the
+    X-Internal-Token header since scheduler series are labelled per API key.
+    Implemented in-process with no client library or push gateway, so it
+    works (and is testable) without any network dependency.
+
+    Instrumented code updates the metric objects below. State that already
+    lives elsewhere (engine sessions, WebSocket connections, the DB pool,
+    scheduler queues, cache counters, circuit breakers) is read at scrape
+    time by collectors registered with `registry.register_collector`.
+
+    Candles/sec is `rate(alphalabs_candles_processed_total[1m])`; cache hit
+    ratios are exported directly as gauges.
+
+Usage:
+    from services.metrics import candles_processed, registry
+
+    candles_processed.inc(engine="backtest")
+    with db_commit_seconds.time():
+        await session.commit()
+
+    registry.render()  # text/plain exposition
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import bisect
+import logging
+import math
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus client default buckets (seconds)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LLM_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+LAG_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelValues = Tuple[str, ...]
+
+
+@dataclass
+class MetricFamily:
+    """Samples produced by a collector at scrape time (gauges and counters)"""
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics; children are keyed by label values"""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> List[Tuple[Dict[str, str], float]]:
+        """Snapshot of (labels, value) pairs"""
+        with self._lock:
+            return [(self._labels(key), value) for key, value in self._values.items()]
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in self.items()]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in items]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        # Per label set: [count per bucket (+Inf last)], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def time(self, **labels: str) -> _Timer:
+        """Context manager observing the elapsed seconds"""
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        lines = []
+        for key, counts, total in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """Owns metric objects and scrape-time collectors"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Collector) -> Collector:
+        """Add a callable returning MetricFamily objects, evaluated on every scrape"""
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                # One broken collector must not take the whole endpoint down
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for family in families:
+                lines.append(f"# HELP {family.name} {_escape(family.help)}")
+                lines.append(f"# TYPE {family.name} {family.type}")
+                for labels, value in family.samples:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and built-in metrics
+registry = MetricsRegistry()
+
+candles_processed = registry.counter(
+    "alphalabs_candles_processed_total", "Candles processed by the trading engines", ["engine"]
+)
+candle_processing_seconds = registry.histogram(
+    "alphalabs_candle_processing_seconds", "Wall time to process one candle", ["engine"]
+)
+llm_request_seconds = registry.histogram(
+    "alphalabs_llm_request_seconds", "Latency of successful LLM decision requests", buckets=LLM_BUCKETS
+)
+llm_queue_wait_seconds = registry.histogram(
+    "alphalabs_llm_queue_wait_seconds", "Time LLM requests waited for a scheduler slot", buckets=LLM_BUCKETS
+)
+db_commit_seconds = registry.histogram(
+    "alphalabs_db_commit_seconds", "Database commit latency"
+)
+db_pool_checkout_seconds = registry.histogram(
+    "alphalabs_db_pool_checkout_seconds", "Time spent waiting for a database pool connection"
+)
+websocket_sends_in_flight = registry.gauge(
+    "alphalabs_websocket_sends_in_flight", "WebSocket messages currently being sent (send queue depth)"
+)
+cache_lookups = registry.counter(
+    "alphalabs_cache_lookups_total", "Cache lookups by cache, tier and result (hit/miss)", ["cache", "tier", "result"]
+)
+event_loop_lag_seconds = registry.histogram(
+    "alphalabs_event_loop_lag_seconds", "Delay of the event loop lag sampler's wakeups", buckets=LAG_BUCKETS
+)
+event_loop_blocked = registry.counter(
+    "alphalabs_event_loop_blocked_total", "Event loop stalls over the debug threshold by blocking call site", ["site"]
+)
+event_loop_block_seconds = registry.histogram(
+    "alphalabs_event_loop_block_seconds", "Duration of event loop stalls over the debug threshold", buckets=LAG_BUCKETS
+)
+
+
+# Scrape-time collectors. Imports are local: database, the engines and the
+# WebSocket manager import this module for instrumentation.
+
+def _collect_engines() -> List[MetricFamily]:
+    # Engines only exist once engine_factory has created them
+    engine_factory = sys.modules.get("services.trading.engine_factory")
+    engines = {
+        "backtest": getattr(engine_factory, "_backtest_engine", None),
+        "forward": getattr(engine_factory, "_forward_engine", None),
+    }
+    samples = [
+        ({"engine": name}, len(engine.active_sessions) if engine else 0)
+        for name, engine in engines.items()
+    ]
+    return [MetricFamily("alphalabs_active_sessions", "gauge", "Sessions running in each engine", samples)]
+
+
+def _collect_websockets() -> List[MetricFamily]:
+    from websocket.manager import websocket_manager
+
+    return [
+        MetricFamily(
+            "alphalabs_websocket_connections", "gauge", "Open WebSocket connections",
+            [({}, len(websocket_manager.active_connections))]
+        ),
+        MetricFamily(
+            "alphalabs_websocket_sessions", "gauge", "Sessions with at least one WebSocket connection",
+            [({}, len(websocket_manager.session_connections))]
+        ),
+    ]
+
+
+def _collect_db_pool() -> List[MetricFamily]:
+    from database import engine
+
+    pool = engine.sync_engine.pool
+    return [
+        MetricFamily("alphalabs_db_pool_size", "gauge", "Configured database pool size", [({}, pool.size())]),
+        MetricFamily(
+            "alphalabs_db_pool_checked_out", "gauge", "Database connections currently checked out",
+            [({}, pool.checkedout())]
+        ),
+        MetricFamily("alphalabs_db_pool_overflow", "gauge", "Database pool overflow connections", [({}, max(pool.overflow(), 0))]),
+    ]
+
+
+def _collect_llm_scheduler() -> List[MetricFamily]:
+    from services.llm_scheduler import llm_scheduler
+
+    keys = llm_scheduler.stats()["keys"]
+    depth, in_flight, granted, throttled = [], [], [], []
+    for key_id, state in keys.items():
+        for priority, queued in state["queue_depth"].items():
+            depth.append(({"key": key_id, "priority": priority}, queued))
+        in_flight.append(({"key": key_id}, state["in_flight"]))
+        granted.append(({"key": key_id}, state["granted"]))
+        throttled.append(({"key": key_id}, state["throttled"]))
+    return [
+        MetricFamily("alphalabs_llm_queue_depth", "gauge", "LLM requests waiting for a scheduler slot", depth),
+        MetricFamily("alphalabs_llm_in_flight", "gauge", "LLM requests in flight", in_flight),
+        MetricFamily("alphalabs_llm_granted_total", "counter", "LLM scheduler slots granted", granted),
+        MetricFamily(
+            "alphalabs_llm_throttled_total", "counter", "LLM requests delayed by the per-key rate limit", throttled
+        ),
+    ]
+
+
+def _collect_circuit_breakers() -> List[MetricFamily]:
+    from utils.retry import circuit_breaker_states
+
+    return [
+        MetricFamily(
+            "alphalabs_circuit_breakers", "gauge", "Circuit breakers by service and state",
+            [({"service": service, "state": state}, count) for (service, state), count in circuit_breaker_states().items()]
+        )
+    ]
+
+
+def _collect_cache_hit_ratio() -> List[MetricFamily]:
+    from services.trading.indicator_cache import indicator_cache
+
+    totals: Dict[Tuple[str, str], Dict[str, float]] = {}
+    for labels, value in cache_lookups.items():
+        counts = totals.setdefault((labels["cache"], labels["tier"]), {})
+        counts[labels["result"]] = counts.get(labels["result"], 0.0) + value
+    indicator_stats = indicator_cache.stats()
+    totals[("indicator", "memory")] = {"hit": indicator_stats["hits"], "miss": indicator_stats["misses"]}
+
+    samples = []
+    for (cache, tier), counts in sorted(totals.items()):
+        lookups = counts.get("hit", 0.0) + counts.get("miss", 0.0)
+        samples.append(({"cache": cache, "tier": tier}, counts.get("hit", 0.0) / lookups if lookups else 0.0))
+    return [
+        MetricFamily(
+            "alphalabs_indicator_cache_bytes", "gauge", "Bytes held by the shared indicator cache",
+            [({}, indicator_stats["bytes"])]
+        ),
+        MetricFamily("alphalabs_cache_hit_ratio", "gauge", "Cache hit ratio per cache tier", samples),
+    ]
+
+
+for _collector in (
+    _collect_engines,
+    _collect_websockets,
+    _collect_db_pool,
+    _collect_llm_scheduler,
+    _collect_circuit_breakers,
+    _collect_cache_hit_ratio,
+):
+    registry.register_collector(_collector)
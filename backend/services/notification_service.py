@@ -12,17 +12,30 @@ Data Flow:
         - Retrieves notifications with pagination and filtering
         - Updates notification read status
         - Manages notification lifecycle
+        - Keeps the cached unread count (services/unread_counter.py) in step
     - Outgoing: SQLAlchemy Notification model instances returned to API layer
+
+    serialize_notifications() resolves the action URLs of a whole page with
+    one TestSession query instead of one query per session notification.
+
+    Changes are pushed to the user's notification channel (/ws/notifications,
+    see WebSocketManager.connect_user): notification_created for new
+    notifications and notification_unread_count with the count delta, so
+    open dashboard tabs do not have to poll.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete, func
-from sqlalchemy.orm import selectinload
 from uuid import UUID
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime
+import logging
 
 from models import Notification
 from models.arena import TestSession
+from schemas.notification_schemas import NotificationItem
+from services.unread_counter import unread_counter
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationService:
@@ -93,6 +106,8 @@ class NotificationService:
         self.db.add(new_notification)
         await self.db.commit()
         await self.db.refresh(new_notification)
+        unread_counter.adjust(user_id, +1)
+        await self.publish(user_id, delta=+1, notification=new_notification)
         
         return new_notification
     
@@ -108,8 +123,11 @@ class NotificationService:
         if unread_only:
             base_filters.append(Notification.is_read == False)
         
-        count_query = select(func.count(Notification.id)).where(*base_filters)
-        total = (await self.db.execute(count_query)).scalar_one()
+        if unread_only:
+            total = await self.get_unread_count(user_id)
+        else:
+            count_query = select(func.count(Notification.id)).where(*base_filters)
+            total = (await self.db.execute(count_query)).scalar_one()
         
         query = (
             select(Notification)
@@ -129,21 +147,16 @@ class NotificationService:
         """
         Get count of unread notifications for a user.
         
+        Served from the process-wide unread counter; the database is only
+        counted when the user's entry is missing or expired.
+        
         Args:
             user_id: ID of the user
             
         Returns:
             int: Number of unread notifications
         """
-        result = await self.db.execute(
-            select(func.count(Notification.id))
-            .where(
-                Notification.user_id == user_id,
-                Notification.is_read == False
-            )
-        )
-        count = result.scalar_one()
-        return count
+        return await unread_counter.get(self.db, user_id)
     
     async def mark_as_read(
         self,
@@ -175,12 +188,17 @@ class NotificationService:
         if not notification:
             return None
         
+        was_unread = not notification.is_read
+        
         # Update read status
         notification.is_read = True
         notification.read_at = datetime.utcnow()
         
         await self.db.commit()
         await self.db.refresh(notification)
+        if was_unread:
+            unread_counter.adjust(user_id, -1)
+            await self.publish(user_id, delta=-1)
         
         return notification
     
@@ -212,6 +230,9 @@ class NotificationService:
         
         updated_ids = result.scalars().all()
         await self.db.commit()
+        unread_counter.set(user_id, 0)
+        if updated_ids:
+            await self.publish(user_id, delta=-len(updated_ids), count=0)
         
         return len(updated_ids)
     
@@ -236,25 +257,86 @@ class NotificationService:
         
         deleted_ids = result.scalars().all()
         await self.db.commit()
+        previous_unread = unread_counter.peek(user_id)
+        unread_counter.set(user_id, 0)
+        if deleted_ids:
+            await self.publish(user_id, delta=-(previous_unread or 0), count=0)
         
         return len(deleted_ids)
 
+    async def publish(
+        self,
+        user_id: UUID,
+        delta: int,
+        notification: Optional[Notification] = None,
+        count: Optional[int] = None
+    ) -> None:
+        """
+        Push a notification change to the user's open notification channels.
+        
+        Best effort: nothing is serialized when the user has no channel open,
+        and send errors are logged, never raised to the caller.
+        
+        Args:
+            user_id: ID of the notified user
+            delta: Change of the unread count
+            notification: Newly created notification to push, if any
+            count: Absolute unread count (default: the cached count, if any)
+        """
+        # Imported here: the websocket package imports the trading engines, which import this module
+        from websocket.events import create_notification_event, create_unread_count_event
+        from websocket.manager import websocket_manager
+        
+        channel = str(user_id)
+        if not websocket_manager.get_user_connections(channel):
+            return
+        
+        try:
+            if notification is not None:
+                item = NotificationItem(**await self.serialize_notification(notification))
+                await websocket_manager.broadcast_to_user(
+                    channel, create_notification_event(item.model_dump(mode="json"))
+                )
+            if count is None:
+                count = unread_counter.peek(user_id)
+            await websocket_manager.broadcast_to_user(channel, create_unread_count_event(delta, count))
+        except Exception as exc:
+            logger.warning("Failed to push notification update to user %s: %s", user_id, exc)
+
     async def serialize_notification(self, notification: Notification) -> Dict[str, Any]:
-        category = self._map_category(notification.type)
-        presentation_type = self._map_presentational_type(notification.type)
-        action_url = await self._resolve_action_url(notification)
-        return {
-            "id": notification.id,
-            "type": presentation_type,
-            "category": category,
-            "title": notification.title,
-            "message": notification.message,
-            "action_url": action_url,
-            "session_id": notification.session_id,
-            "result_id": notification.result_id,
-            "is_read": notification.is_read,
-            "created_at": notification.created_at,
-        }
+        return (await self.serialize_notifications([notification]))[0]
+
+    async def serialize_notifications(self, notifications: List[Notification]) -> List[Dict[str, Any]]:
+        """
+        Serialize a page of notifications for the API.
+        
+        Sessions referenced by notifications without a result are loaded
+        with a single IN (...) query and action URLs are built in memory.
+        
+        Args:
+            notifications: Notifications to serialize
+            
+        Returns:
+            List of NotificationItem-shaped dicts in the same order
+        """
+        session_types = await self._load_session_types(
+            n.session_id for n in notifications if n.session_id and not n.result_id
+        )
+        return [
+            {
+                "id": notification.id,
+                "type": self._map_presentational_type(notification.type),
+                "category": self._map_category(notification.type),
+                "title": notification.title,
+                "message": notification.message,
+                "action_url": self._build_action_url(notification, session_types),
+                "session_id": notification.session_id,
+                "result_id": notification.result_id,
+                "is_read": notification.is_read,
+                "created_at": notification.created_at,
+            }
+            for notification in notifications
+        ]
 
     def _map_category(self, notification_type: str) -> str:
         mapping = {
@@ -273,50 +355,34 @@ class NotificationService:
             return "info"
         return "success"
 
-    async def _resolve_action_url(self, notification: Notification) -> Optional[str]:
+    async def _load_session_types(self, session_ids: Iterable[UUID]) -> Dict[UUID, str]:
+        """Map session ids to their type ('backtest' or 'forward') in one query"""
+        ids = set(session_ids)
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(TestSession.id, TestSession.type)
+            .where(TestSession.id.in_(ids))
+        )
+        return {session_id: session_type for session_id, session_type in result.all()}
+
+    def _build_action_url(self, notification: Notification, session_types: Dict[UUID, str]) -> Optional[str]:
         """
-        Resolve the action URL for a notification.
+        Build the action URL for a notification.
         
         Logic:
         - If result_id exists: route to results page
-        - If session_id exists: 
-          - Query session to get type (backtest/forward) and status
-          - If session is running/paused: route to live arena view
-          - If session is completed: route to results if result_id exists, otherwise arena view
+        - If session_id exists: route to the arena view for the session type
+          (live while running, completed state otherwise)
+        - If the session no longer exists: no action URL
         """
-        # If result_id exists, always route to results (completed test)
         if notification.result_id:
             return f"/dashboard/results/{notification.result_id}"
         
-        # If session_id exists, check session type and status
         if notification.session_id:
-            # Query the session to get its type and status
-            result = await self.db.execute(
-                select(TestSession)
-                .where(TestSession.id == notification.session_id)
-            )
-            session = result.scalar_one_or_none()
-            
-            if not session:
-                # Session not found, can't determine route
+            arena_type = session_types.get(notification.session_id)
+            if arena_type is None:
                 return None
-            
-            # Determine arena type based on session.type
-            arena_type = session.type  # 'backtest' or 'forward'
-            
-            # If session is still running or paused, route to live view
-            if session.status in ('running', 'paused', 'initializing'):
-                return f"/dashboard/arena/{arena_type}/{notification.session_id}"
-            
-            # If session is completed, check if we have a result_id
-            # (This shouldn't happen often since completed tests should have result_id,
-            # but handle it just in case)
-            if session.status in ('completed', 'stopped', 'failed'):
-                # If notification has result_id, it would have been handled above
-                # Otherwise, route to arena view (which will show completed state)
-                return f"/dashboard/arena/{arena_type}/{notification.session_id}"
-            
-            # Default: route to arena view
             return f"/dashboard/arena/{arena_type}/{notification.session_id}"
         
         return None
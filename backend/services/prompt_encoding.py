@@ -0,0 +1,197 @@
+"""
+Prompt Encoding for AlphaLab AI Trader.
+
+Purpose:
+    Compact, token-efficient rendering of the market context sent to the LLM.
+    The default JSON rendering (json.dumps(indent=2)) repeats every indicator
+    name on every historical bar and spells out ISO timestamps; the compact
+    format emits recent candles and indicators as one columnar table with the
+    header written once, numbers rounded to a fixed number of significant
+    digits and timestamps relative to the current candle.
+
+Usage:
+    from services.prompt_encoding import encode_market_context
+
+    text = encode_market_context(market_context, precision=6)
+
+Example output:
+    candle: t=2024-01-13T11:00:00 open=54000.6 high=54053 low=53952.5 close=54026.4 volume=1.36912e+06
+    indicators: rsi=62.2233 macd=141.469
+    position: none
+    equity: 10000
+    recent (t in h relative to current candle, "-" = missing):
+    t|open|high|low|close|volume|rsi|macd
+    -1|53889.8|53942.2|53841.7|53915.6|1.36789e+06|60.3272|114.575
+    0|54000.6|54053|53952.5|54026.4|1.36912e+06|62.2233|141.469
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import math
+
+
+# Default significant digits for numbers in the compact format
+DEFAULT_PRECISION = 6
+
+# Placeholder for missing values
+MISSING = "-"
+
+CANDLE_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Units used for relative timestamps, largest first
+_TIME_UNITS = (("d", 86400), ("h", 3600), ("m", 60), ("s", 1))
+
+
+def format_number(value: Any, precision: int = DEFAULT_PRECISION) -> str:
+    """
+    Render a value with `precision` significant digits and no trailing zeros.
+
+    None/NaN become "-", booleans and strings are passed through.
+    """
+    if value is None:
+        return MISSING
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, float) and math.isnan(value):
+        return MISSING
+    return f"{value:.{precision}g}"
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _relative_times(timestamps: Sequence[Any], reference: Any) -> Optional[List[str]]:
+    """
+    Express timestamps as offsets from reference in the largest unit that
+    represents all of them exactly. Returns None if any cannot be parsed.
+    """
+    ref = _parse_timestamp(reference)
+    parsed = [_parse_timestamp(t) for t in timestamps]
+    if ref is None or any(t is None for t in parsed):
+        return None
+
+    try:
+        offsets = [int(round((t - ref).total_seconds())) for t in parsed]
+    except TypeError:
+        # Mixed naive/aware timestamps
+        return None
+
+    for unit, seconds in _TIME_UNITS:
+        if all(offset % seconds == 0 for offset in offsets):
+            return [unit] + [str(offset // seconds) for offset in offsets]
+    return None
+
+
+def _key_values(values: Dict[str, Any], precision: int) -> str:
+    return " ".join(f"{key}={format_number(value, precision)}" for key, value in values.items())
+
+
+def encode_history_table(
+    recent_candles: List[Dict[str, Any]],
+    recent_indicators: List[Dict[str, Any]],
+    current_timestamp: Any,
+    precision: int = DEFAULT_PRECISION,
+) -> str:
+    """
+    Encode recent candles and their indicator values as one columnar table.
+
+    Rows are aligned from the most recent bar backwards, so histories of
+    different lengths still line up with the current candle.
+
+    Args:
+        recent_candles: Dicts with timestamp and OHLCV fields (oldest first)
+        recent_indicators: Dicts of {"candle_index", "values": {...}} (oldest first)
+        current_timestamp: Timestamp of the current candle (relative time origin)
+        precision: Significant digits for numbers
+
+    Returns:
+        Table text with a single header line, or "" if there is no history
+    """
+    rows = max(len(recent_candles), len(recent_indicators))
+    if rows == 0:
+        return ""
+
+    candles: List[Optional[Dict[str, Any]]] = [None] * (rows - len(recent_candles)) + list(recent_candles)
+    indicator_rows: List[Optional[Dict[str, Any]]] = (
+        [None] * (rows - len(recent_indicators))
+        + [row.get("values") or {} for row in recent_indicators]
+    )
+
+    # Indicator columns in first-seen order
+    indicator_columns: List[str] = []
+    seen = set()
+    for values in indicator_rows:
+        for name in values or {}:
+            if name not in seen:
+                seen.add(name)
+                indicator_columns.append(name)
+
+    times = _relative_times(
+        [c.get("timestamp") if c else None for c in candles], current_timestamp
+    )
+    if times is not None:
+        unit, offsets = times[0], times[1:]
+        title = f"recent (t in {unit} relative to current candle, \"{MISSING}\" = missing):"
+    else:
+        offsets = [str(i - rows + 1) for i in range(rows)]
+        title = f"recent (t in bars relative to current candle, \"{MISSING}\" = missing):"
+
+    candle_columns = list(CANDLE_FIELDS) if recent_candles else []
+    lines = [title, "|".join(["t"] + candle_columns + indicator_columns)]
+    for offset, candle, values in zip(offsets, candles, indicator_rows):
+        cells = [offset]
+        cells.extend(format_number(candle.get(f) if candle else None, precision) for f in candle_columns)
+        cells.extend(format_number((values or {}).get(name), precision) for name in indicator_columns)
+        lines.append("|".join(cells))
+    return "\n".join(lines)
+
+
+def encode_market_context(market_context: Dict[str, Any], precision: int = DEFAULT_PRECISION) -> str:
+    """
+    Render the AITrader market context in the compact format.
+
+    Args:
+        market_context: Dict with candle, indicators, position, equity,
+                        recent_candles, recent_indicators and decision_context
+        precision: Significant digits for numbers
+
+    Returns:
+        Compact multi-line text
+    """
+    candle = market_context.get("candle") or {}
+    timestamp = candle.get("timestamp")
+
+    candle_values = {"t": timestamp}
+    candle_values.update({field: candle.get(field) for field in CANDLE_FIELDS})
+    lines = [f"candle: {_key_values(candle_values, precision)}"]
+
+    indicators = market_context.get("indicators") or {}
+    lines.append(f"indicators: {_key_values(indicators, precision) if indicators else 'none'}")
+
+    # Position and equity are absent from the shared part of a batched request
+    if "position" in market_context:
+        position = market_context.get("position")
+        lines.append(f"position: {_key_values(position, precision) if position else 'none'}")
+    if "equity" in market_context:
+        lines.append(f"equity: {format_number(market_context.get('equity'), precision)}")
+
+    decision_context = market_context.get("decision_context") or {}
+    if decision_context:
+        lines.append(f"decision_context: {_key_values(decision_context, precision)}")
+
+    table = encode_history_table(
+        market_context.get("recent_candles") or [],
+        market_context.get("recent_indicators") or [],
+        timestamp,
+        precision,
+    )
+    if table:
+        lines.append(table)
+    return "\n".join(lines)
@@ -4,7 +4,7 @@ Result Service for AlphaLab Trading Platform.
 Purpose:
     Aggregate completed session performance and persist `TestResult`
     records with full trading analytics, equity curves, notifications,
-    and agent/session stat updates.
+    and agent/session/user stat updates.
 
 Usage:
     service = ResultService(db_session)
@@ -20,13 +20,16 @@ from statistics import pstdev
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, func, update
+from sqlalchemy import literal, select, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.agent import Agent
 from models.arena import TestSession, Trade
-from models.result import TestResult
+from models.result import TestResult, UserStats
 from models.activity import ActivityLog, Notification
+from services.notification_service import NotificationService
+from services.unread_counter import unread_counter
 from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
@@ -40,12 +43,13 @@ class ResultService:
         - Derive metrics (PnL, drawdown, sharpe, profit factor, holding time)
         - Persist `TestResult` row
         - Update session runtime fields (elapsed time, open position)
-        - Increment agent stats
+        - Increment agent stats and the user's dashboard totals (`UserStats`)
         - Emit activity + notification rows
     """
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self._completion_notification: Optional[Notification] = None
 
     async def create_from_session(
         self,
@@ -54,6 +58,7 @@ class ResultService:
         equity_curve: Optional[List[Dict[str, float]]] = None,
         ai_summary: Optional[str] = None,
         forced_stop: bool = False,
+        timings: Optional[Dict[str, Any]] = None,
     ) -> UUID:
         """
         Build and persist a `TestResult` for a completed `TestSession`.
@@ -64,12 +69,19 @@ class ResultService:
             equity_curve: Optional per-candle equity samples.
             ai_summary: Optional AI-generated post mortem.
             forced_stop: Whether user stopped the run early.
+            timings: Optional candle pipeline timing summary (CandleTracer.summary()).
 
         Returns:
             UUID of the newly created `TestResult`.
         """
-        result = await self._calculate_and_persist(session_id, stats, equity_curve, ai_summary, forced_stop)
+        result = await self._calculate_and_persist(session_id, stats, equity_curve, ai_summary, forced_stop, timings)
         await self.db.commit()
+        # The completion notification was inserted directly, not via NotificationService
+        unread_counter.invalidate(result.user_id)
+        if self._completion_notification is not None:
+            await NotificationService(self.db).publish(
+                result.user_id, delta=+1, notification=self._completion_notification
+            )
         logger.info("Created TestResult %s for session %s", result.id, session_id)
         return result.id
 
@@ -80,6 +92,7 @@ class ResultService:
         equity_curve: Optional[List[Dict[str, float]]],
         ai_summary: Optional[str],
         forced_stop: bool,
+        timings: Optional[Dict[str, Any]],
     ) -> TestResult:
         session: TestSession = await self._get_session(session_id)
         trades: Sequence[Trade] = await self._get_trades(session_id)
@@ -132,11 +145,13 @@ class ResultService:
             avg_holding_time_display=holding_display,
             equity_curve=self._truncate_equity_curve(equity_points),
             ai_summary=ai_summary,
+            timings=timings,
         )
 
         self.db.add(result)
         await self._update_session_runtime(session.id, current_equity, pnl_pct)
         await self._update_agent_stats(session.agent_id, result)
+        await self._update_user_stats(session.user_id, result)
         await self._log_completion(session, result, forced_stop)
         return result
 
@@ -189,6 +204,64 @@ class ResultService:
             )
         )
 
+    async def _update_user_stats(self, user_id: UUID, result: TestResult) -> None:
+        stmt = insert(UserStats).values(
+            user_id=user_id,
+            tests_run=1,
+            profitable_tests=1 if result.total_pnl_pct >= 0 else 0,
+            best_pnl=result.total_pnl_pct,
+            win_rate_sum=result.win_rate,
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    "tests_run": UserStats.tests_run + 1,
+                    "profitable_tests": UserStats.profitable_tests + stmt.excluded.profitable_tests,
+                    "best_pnl": func.greatest(UserStats.best_pnl, stmt.excluded.best_pnl),
+                    "win_rate_sum": UserStats.win_rate_sum + stmt.excluded.win_rate_sum,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def rebuild_user_stats(self, user_id: UUID) -> None:
+        """
+        Recompute a user's `UserStats` row from test_results.
+
+        Running totals cannot be decremented for best_pnl, so callers that
+        delete results (e.g. hard-deleting an agent) rebuild the row instead.
+        Does not commit.
+        """
+        totals = select(
+            func.count(TestResult.id).label("tests_run"),
+            func.count(TestResult.id).filter(TestResult.total_pnl_pct >= 0).label("profitable_tests"),
+            func.max(TestResult.total_pnl_pct).label("best_pnl"),
+            func.coalesce(func.sum(TestResult.win_rate), 0).label("win_rate_sum"),
+        ).where(TestResult.user_id == user_id).subquery()
+        stmt = insert(UserStats).from_select(
+            ["user_id", "tests_run", "profitable_tests", "best_pnl", "win_rate_sum"],
+            select(
+                literal(user_id, UserStats.user_id.type),
+                totals.c.tests_run,
+                totals.c.profitable_tests,
+                totals.c.best_pnl,
+                totals.c.win_rate_sum,
+            ),
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    "tests_run": stmt.excluded.tests_run,
+                    "profitable_tests": stmt.excluded.profitable_tests,
+                    "best_pnl": stmt.excluded.best_pnl,
+                    "win_rate_sum": stmt.excluded.win_rate_sum,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
     async def _log_completion(
         self,
         session: TestSession,
@@ -223,6 +296,7 @@ class ResultService:
             message=description,
         )
         self.db.add_all([activity, notification])
+        self._completion_notification = notification
 
     def _compute_duration(self, session: TestSession) -> Tuple[int, str]:
         if session.started_at and session.completed_at:
@@ -0,0 +1,225 @@
+"""
+Incremental JSON Object Parser for streamed LLM output.
+
+Purpose:
+    Parses a flat JSON object (the AI trader's structured decision) as it
+    arrives in chunks, so fields can be acted on as soon as their values are
+    complete instead of after the whole response. String values are decoded
+    while they stream, which lets long text fields (reasoning) be forwarded
+    to the UI incrementally.
+
+    Nested objects/arrays are skipped over and returned as parsed values once
+    complete; text before the opening brace (e.g. a markdown fence) is ignored.
+
+Usage:
+    from services.streaming_json import StreamingObjectParser
+
+    parser = StreamingObjectParser()
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            if event.kind == "field":
+                ...  # event.key, event.value complete
+            elif event.kind == "text":
+                ...  # event.key, event.value = newly decoded part of a string value
+    parser.done  # True once the closing brace was seen
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import json
+
+
+# Sentinel for the closing quote of a string
+_END = object()
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Parser states
+_BEFORE_OBJECT = "before_object"
+_BEFORE_KEY = "before_key"
+_IN_KEY = "in_key"
+_BEFORE_COLON = "before_colon"
+_BEFORE_VALUE = "before_value"
+_IN_STRING = "in_string"
+_IN_SCALAR = "in_scalar"
+_IN_NESTED = "in_nested"
+_AFTER_VALUE = "after_value"
+_DONE = "done"
+
+
+@dataclass
+class StreamEvent:
+    """A completed field ("field") or newly decoded text of a string value ("text")"""
+    kind: str
+    key: str
+    value: Any
+
+
+class StreamingObjectParser:
+    """Event-based incremental parser for one top-level JSON object"""
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.state = _BEFORE_OBJECT
+        self._key: List[str] = []
+        self._current_key: Optional[str] = None
+        self._value: List[str] = []
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._depth = 0
+        self._nested_in_string = False
+
+    @property
+    def done(self) -> bool:
+        return self.state == _DONE
+
+    @property
+    def streaming_key(self) -> Optional[str]:
+        """Key whose string value is currently being received, if any"""
+        return self._current_key if self.state == _IN_STRING else None
+
+    def feed(self, chunk: str) -> List[StreamEvent]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            Events produced by this chunk, in order
+
+        Raises:
+            ValueError: If the text is not a valid flat JSON object
+        """
+        events: List[StreamEvent] = []
+        text: List[str] = []
+
+        for char in chunk:
+            state = self.state
+
+            if state == _IN_STRING:
+                decoded = self._string_char(char)
+                if decoded is None:
+                    continue
+                if decoded is _END:
+                    if text:
+                        events.append(StreamEvent("text", self._current_key, "".join(text)))
+                        text = []
+                    self._complete("".join(self._value), events)
+                    continue
+                self._value.append(decoded)
+                text.append(decoded)
+            elif state == _IN_KEY:
+                decoded = self._string_char(char)
+                if decoded is None:
+                    continue
+                if decoded is _END:
+                    self._current_key = "".join(self._key)
+                    self.state = _BEFORE_COLON
+                    continue
+                self._key.append(decoded)
+            elif state == _IN_SCALAR:
+                if char in ",}" or char.isspace():
+                    self._complete(self._parse_scalar(), events)
+                    self._after_value(char)
+                else:
+                    self._value.append(char)
+            elif state == _IN_NESTED:
+                self._nested_char(char, events)
+            elif char.isspace():
+                continue
+            elif state == _BEFORE_OBJECT:
+                if char == "{":
+                    self.state = _BEFORE_KEY
+            elif state == _BEFORE_KEY:
+                if char == '"':
+                    self._key = []
+                    self.state = _IN_KEY
+                elif char == "}" and not self.fields:
+                    self.state = _DONE
+                else:
+                    raise ValueError(f"Expected object key, got {char!r}")
+            elif state == _BEFORE_COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':', got {char!r}")
+                self.state = _BEFORE_VALUE
+            elif state == _BEFORE_VALUE:
+                self._value = []
+                if char == '"':
+                    self.state = _IN_STRING
+                elif char in "{[":
+                    self._value.append(char)
+                    self._depth = 1
+                    self._nested_in_string = False
+                    self.state = _IN_NESTED
+                else:
+                    self._value.append(char)
+                    self.state = _IN_SCALAR
+            elif state == _AFTER_VALUE:
+                self._after_value(char)
+            # _DONE: ignore trailing text (closing fences etc.)
+
+        if text and self.state == _IN_STRING:
+            events.append(StreamEvent("text", self._current_key, "".join(text)))
+        return events
+
+    def _string_char(self, char: str):
+        """Decode one character inside a string; returns None while an escape is pending"""
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) < 4:
+                return None
+            code, self._unicode = self._unicode, None
+            return chr(int(code, 16))
+        if self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+                return None
+            if char not in _ESCAPES:
+                raise ValueError(f"Invalid escape \\{char}")
+            return _ESCAPES[char]
+        if char == "\\":
+            self._escape = True
+            return None
+        if char == '"':
+            return _END
+        return char
+
+    def _nested_char(self, char: str, events: List[StreamEvent]) -> None:
+        self._value.append(char)
+        if self._nested_in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._nested_in_string = False
+            return
+        if char == '"':
+            self._nested_in_string = True
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._complete(json.loads("".join(self._value)), events)
+
+    def _parse_scalar(self) -> Any:
+        raw = "".join(self._value)
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON value {raw!r}")
+
+    def _complete(self, value: Any, events: List[StreamEvent]) -> None:
+        self.fields[self._current_key] = value
+        events.append(StreamEvent("field", self._current_key, value))
+        self.state = _AFTER_VALUE
+
+    def _after_value(self, char: str) -> None:
+        if char == ",":
+            self.state = _BEFORE_KEY
+        elif char == "}":
+            self.state = _DONE
+        elif not char.isspace():
+            raise ValueError(f"Expected ',' or '}}', got {char!r}")
@@ -38,9 +38,13 @@ from sqlalchemy.orm import selectinload
 from models.agent import Agent
 from services.market_data_service import MarketDataService
 from services.trading.indicator_calculator import IndicatorCalculator
+from services.trading.indicator_cache import indicator_cache
 from services.trading.position_manager import PositionManager
 from services.ai_trader import AITrader
+from services.trading.decision_gating import DecisionGate
+from services.metrics import candles_processed, candle_processing_seconds
 from websocket.manager import WebSocketManager
+from config import settings
 from exceptions import ValidationError
 from services.trading.backtest_engine.session_state import SessionState
 from services.trading.backtest_engine.broadcaster import EventBroadcaster
@@ -108,6 +112,7 @@ class BacktestEngine:
         decision_interval_candles: int = 1,
         indicator_readiness_threshold: float = 80.0,
         user_id: str = "",
+        max_llm_calls_per_window: Optional[int] = None,
     ) -> None:
         """
         Start a backtest session.
@@ -124,6 +129,8 @@ class BacktestEngine:
             end_date: Backtest end date
             starting_capital: Initial capital amount
             safety_mode: Whether to enforce safety mode (-2% stop loss)
+            max_llm_calls_per_window: Optional LLM call budget per
+                settings.DECISION_BUDGET_WINDOW candles
             
         Raises:
             ValidationError: If parameters are invalid
@@ -184,15 +191,28 @@ class BacktestEngine:
             # Update session with total candles
             async with self.session_factory() as db:
                 await self.database_manager.update_session_total_candles(db, session_id, len(candles))
+                
+                # Warm the shared indicator cache with persisted results
+                if settings.INDICATOR_CACHE_PERSIST:
+                    await indicator_cache.load_from_db(
+                        db,
+                        IndicatorCalculator.build_cache_keys(candles, agent.indicators, asset, timeframe)
+                    )
             
-            # Initialize indicator calculator
+            # Initialize indicator calculator (shares results with other sessions on the same candles)
             indicator_calculator = IndicatorCalculator(
                 candles=candles,
                 enabled_indicators=agent.indicators,
                 mode=agent.mode,
                 custom_indicators=agent.custom_indicators,
+                asset=asset,
+                timeframe=timeframe,
             )
             
+            if settings.INDICATOR_CACHE_PERSIST and indicator_calculator.computed_cache_keys:
+                async with self.session_factory() as db:
+                    await indicator_cache.save_to_db(db, indicator_calculator.computed_cache_keys)
+            
             # Initialize position manager
             position_manager = PositionManager(
                 starting_capital=starting_capital,
@@ -212,7 +232,11 @@ class BacktestEngine:
                 api_key=api_key,
                 model=agent.model,
                 strategy_prompt=agent.strategy_prompt,
-                mode=agent.mode
+                mode=agent.mode,
+                prompt_format=agent.prompt_format,
+                session_id=str(session_id),
+                priority="backtest",
+                batching=settings.AI_DECISION_BATCHING
             )
             
             # Compute when it's safe to start asking the LLM for decisions.
@@ -247,6 +271,7 @@ class BacktestEngine:
                 user_id=user_id,
                 asset=asset,
                 timeframe=timeframe,
+                decision_gate=DecisionGate.from_settings(max_calls_per_window=max_llm_calls_per_window),
             )
             
             # Store session state
@@ -406,15 +431,18 @@ class BacktestEngine:
                     candle = session_state.candles[session_state.current_index]
                     
                     # Process this candle using processor
-                    await self.processor.process_candle(db, session_id, session_state, candle)
+                    with session_state.tracer.span("candle"), candle_processing_seconds.time(engine="backtest"):
+                        await self.processor.process_candle(db, session_id, session_state, candle)
+                    candles_processed.inc(engine="backtest")
                     
                     # Move to next candle
                     session_state.current_index += 1
                     
                     # Update session current_candle in database
-                    await self.database_manager.update_session_current_candle(
-                        db, session_id, session_state.current_index
-                    )
+                    with session_state.tracer.span("db_current_candle"):
+                        await self.database_manager.update_session_current_candle(
+                            db, session_id, session_state.current_index
+                        )
                     
                     # Apply playback speed delay (except for instant)
                     if session_state.playback_speed != "instant":
@@ -613,7 +641,8 @@ class BacktestEngine:
             session_id=session_id,
             stats=stats,
             equity_curve=session_state.equity_curve,
-            forced_stop=force_stop
+            forced_stop=force_stop,
+            timings=session_state.tracer.summary() if session_state.tracer.enabled else None
         )
         
         # Broadcast session completed event
@@ -634,6 +663,10 @@ class BacktestEngine:
             f"final_equity={stats['current_equity']}, "
             f"pnl={stats['total_pnl_pct']}%"
         )
+        logger.info(
+            f"Decision gating for session {session_id}",
+            extra={"session_id": session_id, "decision_gating": session_state.decision_gate.stats()}
+        )
         
         return result_id
     
@@ -36,6 +36,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from services.market_data_service import Candle
 from services.ai_trader import AIDecision
 from services.trading.position_manager import Position
+from services.trading.decision_gating import GateContext
 from services.trading.backtest_engine.broadcaster import EventBroadcaster
 from services.trading.backtest_engine.position_handler import PositionHandler
 from services.trading.backtest_engine.database import DatabaseManager
@@ -50,14 +51,6 @@ MIN_HISTORY_WINDOW = 10  # Reduced history when no position and market is stable
 INITIAL_READINESS_THRESHOLD = 0.8  # 80% for initial decision_start_index calculation
 RUNTIME_READINESS_THRESHOLD = 0.7  # 70% for runtime indicator readiness checks
 
-# Position-aware forcing thresholds
-FORCE_DECISION_SL_TP_PROXIMITY_PCT = 1.0  # Force if within 1% of stop-loss or take-profit
-FORCE_DECISION_SIGNIFICANT_PNL_PCT = 2.0  # Force if unrealized PnL > 2% of position size
-FORCE_DECISION_EXTENDED_PERIOD = 50  # Force if position open for 50+ candles without review
-
-# Volatility-based skipping thresholds
-LOW_VOLATILITY_THRESHOLD = 0.5  # Skip if current volatility < 50% of recent average
-
 
 class CandleProcessor:
     """
@@ -110,6 +103,7 @@ class CandleProcessor:
             candle: Current candle to process
         """
         candle_index = session_state.current_index
+        tracer = session_state.tracer
         
         self.logger.debug(
             f"Processing candle {candle_index + 1}/{len(session_state.candles)}: "
@@ -117,131 +111,122 @@ class CandleProcessor:
         )
         
         # Calculate indicators for current candle
-        indicators = session_state.indicator_calculator.calculate_all(candle_index)
+        with tracer.span("indicators"):
+            indicators = session_state.indicator_calculator.calculate_all(candle_index)
         
         # Broadcast candle event with indicators
-        await self.broadcaster.broadcast_candle(session_id, candle, indicators, candle_index)
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_candle(session_id, candle, indicators, candle_index)
         
         # Update open position if exists
         if session_state.position_manager.has_open_position():
-            close_reason = await session_state.position_manager.update_position(
-                candle_high=candle.high,
-                candle_low=candle.low,
-                current_price=candle.close
-            )
-            
-            # If position was closed by stop-loss or take-profit
-            if close_reason:
-                closed_trade = session_state.position_manager.get_closed_trades()[-1]
-                await self.position_handler.handle_position_closed(
-                    db,
-                    session_id,
-                    session_state,
-                    closed_trade,
-                    candle_index,
-                    candle.timestamp
+            with tracer.span("position_update"):
+                close_reason = await session_state.position_manager.update_position(
+                    candle_high=candle.high,
+                    candle_low=candle.low,
+                    current_price=candle.close
                 )
+                
+                # If position was closed by stop-loss or take-profit
+                if close_reason:
+                    closed_trade = session_state.position_manager.get_closed_trades()[-1]
+                    await self.position_handler.handle_position_closed(
+                        db,
+                        session_id,
+                        session_state,
+                        closed_trade,
+                        candle_index,
+                        candle.timestamp
+                    )
         
         # Process any pending order (limit-like entry) before asking the AI
         # for a new decision. This simulates placing an order at a prior
         # candle and having it fill only when price actually reaches the
         # requested entry level.
         if session_state.pending_order and not session_state.position_manager.has_open_position():
-            po = session_state.pending_order
-            entry_price = po.get("entry_price")
-            action = po.get("action")
-            size_pct = po.get("size_percentage", 0.0)
-            stop_loss = po.get("stop_loss_price")
-            take_profit = po.get("take_profit_price")
-            leverage = po.get("leverage", 1)
+            with tracer.span("pending_order"):
+                po = session_state.pending_order
+                entry_price = po.get("entry_price")
+                action = po.get("action")
+                size_pct = po.get("size_percentage", 0.0)
+                stop_loss = po.get("stop_loss_price")
+                take_profit = po.get("take_profit_price")
+                leverage = po.get("leverage", 1)
 
-            if entry_price is not None:
-                # Check if this candle's high/low touched the entry price.
-                if candle.low <= entry_price <= candle.high:
-                    self.logger.info(
-                        f"Filling pending {action} order at {entry_price} on candle {candle_index}"
-                    )
-                    success = await session_state.position_manager.open_position(
-                        action=action.lower(),
-                        entry_price=entry_price,
-                        size_percentage=size_pct,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        leverage=leverage,
-                    )
-                    if success:
-                        position = session_state.position_manager.get_position()
-                        await self.position_handler.handle_position_opened(
-                            db,
-                            session_id,
-                            session_state,
-                            position,
-                            candle_index,
-                            candle.timestamp,
-                            po.get("reasoning", "Pending order filled"),
+                if entry_price is not None:
+                    # Check if this candle's high/low touched the entry price.
+                    if candle.low <= entry_price <= candle.high:
+                        self.logger.info(
+                            f"Filling pending {action} order at {entry_price} on candle {candle_index}"
+                        )
+                        success = await session_state.position_manager.open_position(
+                            action=action.lower(),
+                            entry_price=entry_price,
+                            size_percentage=size_pct,
+                            stop_loss=stop_loss,
+                            take_profit=take_profit,
+                            leverage=leverage,
                         )
-                    # Either way, clear the pending order after this candle.
-                    session_state.pending_order = None
+                        if success:
+                            position = session_state.position_manager.get_position()
+                            await self.position_handler.handle_position_opened(
+                                db,
+                                session_id,
+                                session_state,
+                                position,
+                                candle_index,
+                                candle.timestamp,
+                                po.get("reasoning", "Pending order filled"),
+                            )
+                        # Either way, clear the pending order after this candle.
+                        session_state.pending_order = None
 
         # Get AI decision
         position_state = session_state.position_manager.get_position()
         equity = session_state.position_manager.get_total_equity()
 
-        # Check if indicators are actually ready at runtime (safety check)
-        # This ensures we don't call the LLM with mostly None indicators
-        indicators_ready = session_state.indicator_calculator.check_indicator_readiness(
-            candle_index, 
-            min_ready_percentage=RUNTIME_READINESS_THRESHOLD
-        )
+        with tracer.span("gate"):
+            # Check if indicators are actually ready at runtime (safety check)
+            # This ensures we don't call the LLM with mostly None indicators
+            indicators_ready = session_state.indicator_calculator.check_indicator_readiness(
+                candle_index, 
+                min_ready_percentage=RUNTIME_READINESS_THRESHOLD
+            )
 
-        # Priority-based LLM triggering logic
-        # Priority 1: Force conditions (position needs attention)
-        force_decision, force_reason = self._should_force_llm_call(
-            session_state, candle_index, position_state, candle
-        )
-        
-        # Initialize skip_reason for use in else block
-        skip_reason: Optional[str] = None
-        
-        # Priority 2: Normal cadence check (if not forced)
-        if not force_decision:
-            # Check volatility-based skipping (only if no position)
-            if not position_state:
-                skip_volatility, volatility_reason = self._should_skip_due_to_low_volatility(
-                    session_state, candle_index, indicators
-                )
-                if skip_volatility:
-                    should_run_ai = False
-                    skip_reason = f"SKIPPED (volatility): {volatility_reason}"
-                else:
-                    # Normal cadence check
-                    should_run_ai = (
-                        candle_index >= session_state.decision_start_index
-                        and indicators_ready
-                        and self._is_decision_candle(session_state, candle_index)
-                    )
+            # Gate the LLM call: force detectors override cadence, skip detectors
+            # and the per-session budget drop low-value calls
+            if candle_index < session_state.decision_start_index:
+                blocked_by = "warmup"
+            elif not indicators_ready:
+                blocked_by = "indicators_not_ready"
+            elif not self._is_decision_candle(session_state, candle_index):
+                blocked_by = "cadence"
             else:
-                # Normal cadence check when position exists
-                should_run_ai = (
-                    candle_index >= session_state.decision_start_index
-                    and indicators_ready
-                    and self._is_decision_candle(session_state, candle_index)
-                )
-                skip_reason = None
-        else:
-            # Force decision - override normal cadence
-            should_run_ai = True
-            skip_reason = None
+                blocked_by = None
+            
+            gate_context = GateContext(
+                candle_index=candle_index,
+                candle=candle,
+                indicators=indicators,
+                position=position_state,
+                candles=session_state.candles,
+                indicators_at=session_state.indicator_calculator.calculate_all,
+            )
+            verdict = session_state.decision_gate.evaluate(gate_context, blocked_by=blocked_by)
+        should_run_ai = verdict.run
+        force_decision = verdict.forced
 
         if should_run_ai:
             # Broadcast AI thinking event
-            await self.broadcaster.broadcast_ai_thinking(session_id)
+            with tracer.span("broadcast"):
+                await self.broadcaster.broadcast_ai_thinking(session_id)
 
             # Use adaptive history window based on position state
             force_full_history = force_decision  # Always use full history when forced
-            recent_candles, recent_indicators = self._build_decision_history(
-                session_state, candle_index, force_full_history=force_full_history
-            )
+            with tracer.span("history"):
+                recent_candles, recent_indicators = self._build_decision_history(
+                    session_state, candle_index, force_full_history=force_full_history
+                )
             
             decision_context = {
                 "mode": session_state.decision_mode,
@@ -250,19 +235,21 @@ class CandleProcessor:
                 "allow_leverage": session_state.allow_leverage,
                 "max_leverage": 5 if session_state.allow_leverage else 1,
                 "forced_decision": force_decision,
-                "force_reason": force_reason if force_decision else None,
+                "force_reason": verdict.reason if force_decision else None,
             }
 
-            decision = await session_state.ai_trader.get_decision(
-                candle=candle,
-                indicators=indicators,
-                position_state=position_state,
-                equity=equity,
-                recent_candles=recent_candles,
-                recent_indicators=recent_indicators,
-                decision_context=decision_context,
-            )
+            with tracer.llm_span(candle_index, session_state.ai_trader.prompt_stats):
+                decision = await session_state.ai_trader.get_decision(
+                    candle=candle,
+                    indicators=indicators,
+                    position_state=position_state,
+                    equity=equity,
+                    recent_candles=recent_candles,
+                    recent_indicators=recent_indicators,
+                    decision_context=decision_context,
+                )
             decision.candle_index = candle_index
+            session_state.decision_gate.record_call(gate_context)
         else:
             # Build skip reasoning
             if candle_index < session_state.decision_start_index:
@@ -278,8 +265,10 @@ class CandleProcessor:
                     f"Skipping AI decision for candle {candle_index} because "
                     f"insufficient indicators are ready ({ready_count}/{total_count} ready)."
                 )
+            elif verdict.reason:
+                reasoning = f"SKIPPED ({verdict.source}): {verdict.reason}"
             else:
-                reasoning = skip_reason or (
+                reasoning = (
                     f"Decision cadence ({session_state.decision_mode}) skipped candle {candle_index}"
                 )
             decision = AIDecision(
@@ -316,33 +305,37 @@ class CandleProcessor:
         session_state.ai_thoughts.append(ai_thought)
         
         # Broadcast AI decision event
-        await self.broadcaster.broadcast_ai_decision(session_id, decision)
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_ai_decision(session_id, decision)
         
         # Execute AI decision
-        await self.execute_decision(
-            db,
-            session_id,
-            session_state,
-            decision,
-            candle,
-            candle_index
-        )
+        with tracer.span("execute"):
+            await self.execute_decision(
+                db,
+                session_id,
+                session_state,
+                decision,
+                candle,
+                candle_index
+            )
         
         # Broadcast stats update
         stats = session_state.position_manager.get_stats()
         self._record_equity_point(session_state, candle.timestamp, stats["current_equity"])
-        await self.broadcaster.broadcast_stats_update(session_id, stats)
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_stats_update(session_id, stats)
 
-        await self.database_manager.update_session_runtime_stats(
-            db=db,
-            session_id=session_id,
-            current_equity=stats["current_equity"],
-            current_pnl_pct=stats["equity_change_pct"],
-            max_drawdown_pct=session_state.max_drawdown_pct,
-            elapsed_seconds=self._compute_elapsed_seconds(session_state),
-            open_position=self._serialize_position(session_state.position_manager.get_position()),
-            current_candle=candle_index + 1,
-        )
+        with tracer.span("db_runtime_stats"):
+            await self.database_manager.update_session_runtime_stats(
+                db=db,
+                session_id=session_id,
+                current_equity=stats["current_equity"],
+                current_pnl_pct=stats["equity_change_pct"],
+                max_drawdown_pct=session_state.max_drawdown_pct,
+                elapsed_seconds=self._compute_elapsed_seconds(session_state),
+                open_position=self._serialize_position(session_state.position_manager.get_position()),
+                current_candle=candle_index + 1,
+            )
     
     async def execute_decision(
         self,
@@ -548,118 +541,6 @@ class CandleProcessor:
 
         return recent_candles, recent_indicators
 
-    def _should_force_llm_call(
-        self, 
-        session_state: Any, 
-        candle_index: int, 
-        position: Optional[Position], 
-        candle: Candle
-    ) -> tuple[bool, Optional[str]]:
-        """
-        Determine if LLM call should be forced due to position conditions.
-        
-        Forces decision when:
-        1. Position is near stop-loss or take-profit (within threshold)
-        2. Position has significant unrealized PnL (> threshold % of position size)
-        3. Position has been open for extended period without review
-        
-        Args:
-            session_state: Session state object
-            candle_index: Current candle index
-            position: Current open position (None if no position)
-            candle: Current candle data
-            
-        Returns:
-            Tuple of (should_force, reason_string)
-        """
-        if not position:
-            return False, None
-        
-        current_price = candle.close
-        
-        # Check 1: Position near stop-loss or take-profit
-        if position.stop_loss:
-            distance_to_sl_pct = abs(position.stop_loss - current_price) / current_price * 100
-            if distance_to_sl_pct < FORCE_DECISION_SL_TP_PROXIMITY_PCT:
-                return True, f"Position near stop-loss (within {FORCE_DECISION_SL_TP_PROXIMITY_PCT}%)"
-        
-        if position.take_profit:
-            distance_to_tp_pct = abs(position.take_profit - current_price) / current_price * 100
-            if distance_to_tp_pct < FORCE_DECISION_SL_TP_PROXIMITY_PCT:
-                return True, f"Position near take-profit (within {FORCE_DECISION_SL_TP_PROXIMITY_PCT}%)"
-        
-        # Check 2: Significant unrealized PnL
-        if position.size > 0:
-            pnl_pct_of_position = abs(position.unrealized_pnl) / position.size * 100
-            if pnl_pct_of_position > FORCE_DECISION_SIGNIFICANT_PNL_PCT:
-                return True, f"Significant unrealized PnL ({pnl_pct_of_position:.2f}% of position size)"
-        
-        # Check 3: Position open for extended period
-        # Find when position was opened by checking recent AI thoughts
-        entry_candle_index = None
-        for thought in reversed(session_state.ai_thoughts[-20:]):  # Check last 20 thoughts
-            if thought.get("decision") in ["LONG", "SHORT"]:
-                entry_candle_index = thought.get("candle_number")
-                break
-        
-        if entry_candle_index is not None:
-            candles_since_entry = candle_index - entry_candle_index
-            if candles_since_entry > FORCE_DECISION_EXTENDED_PERIOD:
-                return True, f"Position open for {candles_since_entry} candles without review"
-        
-        return False, None
-
-    def _should_skip_due_to_low_volatility(
-        self, 
-        session_state: Any, 
-        candle_index: int, 
-        indicators: Dict[str, Optional[float]]
-    ) -> tuple[bool, Optional[str]]:
-        """
-        Determine if LLM call should be skipped due to low volatility.
-        
-        Skips when current volatility is significantly below recent average.
-        Uses ATR if available, otherwise uses price range.
-        
-        Args:
-            session_state: Session state object
-            candle_index: Current candle index
-            indicators: Current indicator values
-            
-        Returns:
-            Tuple of (should_skip, reason_string)
-        """
-        # Need at least a few candles to compare volatility
-        if candle_index < 5:
-            return False, None
-        
-        # Method 1: Use ATR if available
-        if 'atr' in indicators and indicators['atr'] is not None:
-            current_atr = indicators['atr']
-            # Get average ATR from recent candles
-            recent_atrs = []
-            for idx in range(max(0, candle_index - 5), candle_index):
-                recent_indicators = session_state.indicator_calculator.calculate_all(idx)
-                if 'atr' in recent_indicators and recent_indicators['atr'] is not None:
-                    recent_atrs.append(recent_indicators['atr'])
-            
-            if len(recent_atrs) >= 3:
-                avg_atr = sum(recent_atrs) / len(recent_atrs)
-                if avg_atr > 0 and current_atr < avg_atr * LOW_VOLATILITY_THRESHOLD:
-                    return True, f"Low volatility (ATR {current_atr:.2f} < {LOW_VOLATILITY_THRESHOLD*100}% of avg {avg_atr:.2f})"
-        
-        # Method 2: Use price range as fallback
-        if candle_index >= 5:
-            recent_candles = session_state.candles[max(0, candle_index - 5):candle_index + 1]
-            price_ranges = [c.high - c.low for c in recent_candles]
-            avg_range = sum(price_ranges[:-1]) / len(price_ranges[:-1]) if len(price_ranges) > 1 else price_ranges[0]
-            current_range = price_ranges[-1]
-            
-            if avg_range > 0 and current_range < avg_range * LOW_VOLATILITY_THRESHOLD:
-                return True, f"Low volatility (price range {current_range:.2f} < {LOW_VOLATILITY_THRESHOLD*100}% of avg {avg_range:.2f})"
-        
-        return False, None
-
     def _compute_elapsed_seconds(self, session_state: Any) -> int:
         if not session_state.started_at:
             return 0
@@ -17,6 +17,8 @@ from services.market_data_service import Candle
 from services.trading.indicator_calculator import IndicatorCalculator
 from services.trading.position_manager import PositionManager
 from services.ai_trader import AITrader
+from services.trading.decision_gating import DecisionGate
+from services.trading.tracing import CandleTracer
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +73,10 @@ class SessionState:
     timeframe: str = ""
     # Playback speed: 'slow' (1000ms), 'normal' (500ms), 'fast' (200ms), 'instant' (0ms)
     playback_speed: str = "normal"
+    # Decides which candles get an LLM call (detectors, budget, skip/force stats)
+    decision_gate: Optional[DecisionGate] = None
+    # Per-stage timing spans for the candle pipeline
+    tracer: Optional[CandleTracer] = None
     
     def __post_init__(self):
         """
@@ -91,3 +97,7 @@ class SessionState:
             self.started_at = datetime.now(timezone.utc)
         if not self.peak_equity:
             self.peak_equity = self.position_manager.starting_capital
+        if self.decision_gate is None:
+            self.decision_gate = DecisionGate.from_settings()
+        if self.tracer is None:
+            self.tracer = CandleTracer(self.session_id)
@@ -2,13 +2,22 @@
 Custom Indicator Engine
 
 This module provides a secure JSON-based custom indicator engine that allows users
-to define custom indicators without uploading Python code. Uses recursive formula
-evaluation with strict validation and safety checks.
+to define custom indicators without uploading Python code. Rules are validated and
+compiled once into a straight-line NumPy program (shared sub-expressions computed
+once) that is evaluated over the whole indicator matrix or a single bar.
+
+Window operators (mean, sum, min, max, std, ema, lag, diff) and crossover keep
+streaming state (see rolling_window), so a forward test can continue the
+program bar by bar after evaluating the history.
 """
 
-from typing import Dict, List, Optional, Set, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
+import numpy as np
 import pandas as pd
 
+from .rolling_window import WINDOW_OPERATORS, Crossover, window_warmup
+
 
 class CustomIndicatorError(Exception):
     """Base exception for custom indicator errors"""
@@ -25,13 +34,123 @@ class CustomIndicatorError(Exception):
         return f"[{self.error_code}] {self.message}"
 
 
+# NumPy implementations of the whitelisted binary operators
+_BINARY_OPS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+}
+
+# Operators whose operands can be swapped without changing the result
+_COMMUTATIVE_OPS = {'+', '*'}
+
+# Largest lookback accepted for window operators
+MAX_WINDOW = 1000
+
+
+@dataclass(frozen=True)
+class CompiledFormulaSet:
+    """
+    Compiled form of a set of custom indicator rules.
+    
+    Slots 0..len(inputs)-1 hold input columns, followed by constants, followed
+    by one slot per instruction. Instructions are in topological order and
+    identical sub-expressions (across all rules) appear only once.
+    
+    Window instructions carry their window length in place of a right slot
+    and, like crossover, read and advance a per-instruction streaming state
+    (see new_state()).
+    
+    Attributes:
+        inputs: Names of the base indicators read from the indicator matrix (column order)
+        constants: Constant operand values
+        instructions: (operator, left_slot, right_slot_or_window) tuples
+        outputs: Rule name -> slot holding its value, in dependency order
+    """
+    inputs: Tuple[str, ...]
+    constants: Tuple[float, ...]
+    instructions: Tuple[Tuple[str, int, int], ...]
+    outputs: Dict[str, int]
+    
+    def new_state(self) -> Dict[int, Any]:
+        """Create fresh streaming state for every window/crossover instruction"""
+        state: Dict[int, Any] = {}
+        for index, (operator, _, right) in enumerate(self.instructions):
+            if operator in WINDOW_OPERATORS:
+                state[index] = WINDOW_OPERATORS[operator](right)
+            elif operator == 'crossover':
+                state[index] = Crossover()
+        return state
+    
+    def _run(self, columns: Sequence[Any], state: Dict[int, Any], bars: Optional[int] = None) -> List[Any]:
+        # bars is None for a single-row evaluation, which advances state by one bar
+        slots: List[Any] = list(columns)
+        slots.extend(np.float64(c) for c in self.constants)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for index, (operator, left, right) in enumerate(self.instructions):
+                if operator in WINDOW_OPERATORS:
+                    if bars is None:
+                        value = state[index].update(slots[left])
+                    else:
+                        value = state[index].apply(np.broadcast_to(slots[left], (bars,)))
+                elif operator == 'crossover':
+                    if bars is None:
+                        value = state[index].update(slots[left], slots[right])
+                    else:
+                        value = state[index].apply(
+                            np.broadcast_to(slots[left], (bars,)),
+                            np.broadcast_to(slots[right], (bars,))
+                        )
+                else:
+                    value = _BINARY_OPS[operator](slots[left], slots[right])
+                slots.append(value)
+        return slots
+    
+    def evaluate(self, matrix: np.ndarray, state: Optional[Dict[int, Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every rule over all bars at once.
+        
+        Args:
+            matrix: Array of shape (bars, len(inputs)) in input column order
+            state: Streaming state to advance (fresh state if None)
+            
+        Returns:
+            Rule name -> float64 array of length bars
+        """
+        bars = matrix.shape[0]
+        if state is None:
+            state = self.new_state()
+        slots = self._run([matrix[:, i] for i in range(len(self.inputs))], state, bars)
+        return {
+            name: np.broadcast_to(slots[slot], (bars,)).astype(np.float64)
+            for name, slot in self.outputs.items()
+        }
+    
+    def evaluate_row(self, row: Sequence[float], state: Optional[Dict[int, Any]] = None) -> Dict[str, float]:
+        """
+        Evaluate every rule for a single bar (e.g. the latest forward-test candle).
+        
+        Args:
+            row: Input values in input column order
+            state: Streaming state to advance by one bar (fresh state if None)
+            
+        Returns:
+            Rule name -> value
+        """
+        if state is None:
+            state = self.new_state()
+        slots = self._run([np.float64(v) for v in row], state)
+        return {name: float(slots[slot]) for name, slot in self.outputs.items()}
+
+
 class CustomIndicatorEngine:
     """
     Engine for calculating custom indicators from JSON-based rule definitions.
     
     Provides secure, code-free custom indicator calculation using:
     - JSON rule parsing and validation
-    - Recursive formula evaluation
+    - One-time compilation into a NumPy program (see compile())
     - Circular dependency detection
     - Type-safe numeric operations
     
@@ -50,8 +169,11 @@ class CustomIndicatorEngine:
         >>> result = engine.calculate("price_momentum")
     """
     
-    # Whitelist of allowed operators
-    ALLOWED_OPERATORS = ['+', '-', '*', '/']
+    # Whitelist of allowed binary operators
+    ALLOWED_OPERATORS = ['+', '-', '*', '/', 'crossover']
+    
+    # Whitelist of window operators ({"operator", "operand", "window"})
+    ALLOWED_WINDOW_OPERATORS = list(WINDOW_OPERATORS)
     
     # Valid indicator types
     VALID_TYPES = ['composite', 'derived']
@@ -69,6 +191,11 @@ class CustomIndicatorEngine:
         self.available_indicators = available_indicators.copy()
         self.custom_indicators: Dict[str, Dict] = {}
         self.calculation_cache: Dict[str, pd.Series] = {}
+        self._compiled: Optional[CompiledFormulaSet] = None
+        # Window/crossover state positioned after the last evaluated bar
+        self._stream_state: Optional[Dict[int, Any]] = None
+        # Rules that failed to compile or evaluate; left out of the program
+        self.rule_errors: Dict[str, CustomIndicatorError] = {}
     
     def add_rule(self, rule: Dict[str, Any]) -> None:
         """
@@ -105,13 +232,20 @@ class CustomIndicatorEngine:
         # Validate formula structure
         self._validate_formula(rule['formula'], name)
         
-        # Store the rule
+        # Store the rule (invalidates any previously compiled program)
         self.custom_indicators[name] = rule
+        self._compiled = None
+        self._stream_state = None
+        self.rule_errors.clear()
     
     def calculate(self, name: str) -> pd.Series:
         """
         Calculate a custom indicator by name.
         
+        The first call compiles and evaluates all rules together, so
+        subsequent calls are served from the calculation cache. A failing
+        rule only fails its own calculation (and that of rules using it).
+        
         Args:
             name: Name of the custom indicator to calculate
             
@@ -130,39 +264,131 @@ class CustomIndicatorEngine:
             )
         
         # Check cache first
-        if name in self.calculation_cache:
-            return self.calculation_cache[name]
+        if name not in self.calculation_cache and name not in self.rule_errors:
+            self.calculate_all()
         
-        # Check for circular dependencies before calculation
-        self._check_circular_dependencies(name, set())
+        if name in self.rule_errors:
+            raise self.rule_errors[name]
+        return self.calculation_cache[name]
+    
+    def calculate_all(self) -> Dict[str, pd.Series]:
+        """
+        Calculate every custom indicator in a single pass over the indicator matrix.
         
-        # Get the rule
-        rule = self.custom_indicators[name]
+        Rules that fail to compile or evaluate are left out and recorded in
+        rule_errors (calculate(name) raises their error); the other rules are
+        still calculated.
+        
+        Returns:
+            Mapping of custom indicator name to pandas Series (successful rules only)
+        """
+        compiled = self.compile()
+        state = compiled.new_state()
         
-        # Evaluate the formula
         try:
-            result = self._evaluate_formula(rule['formula'], name)
-        except Exception as e:
-            if isinstance(e, CustomIndicatorError):
-                raise
-            raise CustomIndicatorError(
-                'CALCULATION_ERROR',
-                f"Error calculating indicator: {str(e)}",
-                name
-            )
+            results = compiled.evaluate(self._build_matrix(compiled.inputs), state)
+        except Exception:
+            # Find the failing rules one by one, then run the program without them
+            self._isolate_failing_rules(compiled)
+            compiled = self.compile()
+            state = compiled.new_state()
+            results = compiled.evaluate(self._build_matrix(compiled.inputs), state)
+        
+        for name, values in results.items():
+            self.calculation_cache[name] = pd.Series(values, index=self.df.index)
+        self._stream_state = state
+        
+        return {name: self.calculation_cache[name] for name in results}
+    
+    def calculate_row(self, values: Dict[str, float]) -> Dict[str, float]:
+        """
+        Evaluate all custom indicators for a single bar.
         
-        # Validate result is a pandas Series
-        if not isinstance(result, pd.Series):
-            raise CustomIndicatorError(
-                'INVALID_RESULT_TYPE',
-                f"Calculation must return pandas Series, got {type(result)}",
-                name
-            )
+        Cheap per-bar path for forward tests: only the latest values of the
+        referenced base indicators are needed, not their full history. Window
+        and crossover operators continue from the previous bar (the last bar
+        of calculate_all(), or the previous calculate_row() call).
+        
+        Args:
+            values: Latest values of the base indicators (None treated as NaN)
+            
+        Returns:
+            Mapping of custom indicator name to value (NaN if inputs missing)
+        """
+        compiled = self.compile()
+        if self._stream_state is None:
+            self._stream_state = compiled.new_state()
+        row = [
+            np.nan if values.get(name) is None else values[name]
+            for name in compiled.inputs
+        ]
+        return compiled.evaluate_row(row, self._stream_state)
+    
+    def compile(self) -> CompiledFormulaSet:
+        """
+        Validate the rule DAG and compile all rules into one NumPy program.
         
-        # Cache the result
-        self.calculation_cache[name] = result
+        Resolves references, detects circular dependencies, orders rules
+        topologically, folds constant sub-expressions and shares identical
+        sub-expressions across rules. The result is cached until a rule is added.
         
-        return result
+        Returns:
+            CompiledFormulaSet for all registered rules
+            
+        Raises:
+            CustomIndicatorError: On missing references or circular dependencies
+        """
+        if self._compiled is not None:
+            return self._compiled
+        
+        compiler = _FormulaCompiler(self.available_indicators, self.custom_indicators, self.rule_errors)
+        for name in self.custom_indicators:
+            if name in self.rule_errors:
+                continue
+            try:
+                compiler.compile_rule(name, [])
+            except CustomIndicatorError as e:
+                self.rule_errors[name] = self._rule_error(name, e)
+        
+        self._compiled = compiler.build()
+        return self._compiled
+    
+    def _isolate_failing_rules(self, compiled: CompiledFormulaSet) -> None:
+        """Evaluate each rule on its own and record the ones that fail"""
+        for name in compiled.outputs:
+            compiler = _FormulaCompiler(self.available_indicators, self.custom_indicators)
+            compiler.compile_rule(name, [])
+            compiler.outputs = {name: compiler.outputs[name]}
+            single = compiler.build()
+            try:
+                single.evaluate(self._build_matrix(single.inputs))
+            except Exception as e:
+                self.rule_errors[name] = CustomIndicatorError(
+                    'CALCULATION_ERROR',
+                    f"Error calculating indicator: {str(e)}",
+                    name
+                )
+        self._compiled = None
+    
+    @staticmethod
+    def _rule_error(name: str, error: CustomIndicatorError) -> CustomIndicatorError:
+        """Attribute a compile error to the rule being compiled"""
+        if error.rule_name in (None, name):
+            return CustomIndicatorError(error.error_code, error.message, name)
+        return CustomIndicatorError(
+            error.error_code,
+            f"Depends on custom indicator '{error.rule_name}': {error.message}",
+            name
+        )
+    
+    def _build_matrix(self, inputs: Sequence[str]) -> np.ndarray:
+        """Stack referenced base indicators into a (bars, inputs) float matrix"""
+        if not inputs:
+            return np.empty((len(self.df), 0), dtype=np.float64)
+        return np.column_stack([
+            np.asarray(self.available_indicators[name], dtype=np.float64)
+            for name in inputs
+        ])
     
     def _validate_rule_structure(self, rule: Dict[str, Any]) -> None:
         """
@@ -286,11 +512,17 @@ class CustomIndicatorEngine:
         
         operator = formula['operator']
         
+        # Window operator with a single operand and a lookback length
+        if operator in self.ALLOWED_WINDOW_OPERATORS:
+            self._validate_window_formula(formula, rule_name)
+            return
+        
         # Validate operator
         if operator not in self.ALLOWED_OPERATORS:
+            allowed = self.ALLOWED_OPERATORS + self.ALLOWED_WINDOW_OPERATORS
             raise CustomIndicatorError(
                 'INVALID_OPERATOR',
-                f"Operator '{operator}' is not allowed. Use one of: {', '.join(self.ALLOWED_OPERATORS)}",
+                f"Operator '{operator}' is not allowed. Use one of: {', '.join(allowed)}",
                 rule_name
             )
         
@@ -313,49 +545,45 @@ class CustomIndicatorEngine:
         self._validate_formula(formula['left'], rule_name)
         self._validate_formula(formula['right'], rule_name)
     
-    def _check_circular_dependencies(
-        self, 
-        name: str, 
-        visited: Set[str],
-        path: Optional[List[str]] = None
-    ) -> None:
+    def _validate_window_formula(self, formula: Dict[str, Any], rule_name: str) -> None:
         """
-        Check for circular dependencies in custom indicator references.
+        Validate a window operator formula ({"operator", "operand", "window"}).
         
-        Args:
-            name: Name of the indicator to check
-            visited: Set of indicators already visited in this path
-            path: List of indicator names in the current dependency path
-            
         Raises:
-            CustomIndicatorError: If circular dependency is detected
+            CustomIndicatorError: If operand or window is missing or invalid
         """
-        if path is None:
-            path = []
-        
-        # Check if we've seen this indicator in the current path
-        if name in visited:
-            # Build circular path string
-            cycle_start = path.index(name)
-            cycle = ' → '.join(path[cycle_start:] + [name])
+        operator = formula['operator']
+        
+        if 'operand' not in formula:
             raise CustomIndicatorError(
-                'CIRCULAR_DEPENDENCY',
-                f"Circular dependency detected: {cycle}",
-                name
+                'INVALID_FORMULA_STRUCTURE',
+                f"Window operator '{operator}' must have 'operand'",
+                rule_name
             )
         
-        # If this is a custom indicator, check its dependencies
-        if name in self.custom_indicators:
-            rule = self.custom_indicators[name]
-            visited.add(name)
-            path.append(name)
-            
-            # Get all indicator references in the formula
-            referenced_indicators = self._get_referenced_indicators(rule['formula'])
-            
-            # Recursively check each referenced indicator
-            for ref_name in referenced_indicators:
-                self._check_circular_dependencies(ref_name, visited.copy(), path.copy())
+        if 'window' not in formula:
+            raise CustomIndicatorError(
+                'INVALID_FORMULA_STRUCTURE',
+                f"Window operator '{operator}' must have 'window'",
+                rule_name
+            )
+        
+        window = formula['window']
+        if not isinstance(window, int) or isinstance(window, bool):
+            raise CustomIndicatorError(
+                'INVALID_OPERAND_TYPE',
+                f"Window must be an integer, got {type(window)}",
+                rule_name
+            )
+        
+        if not 1 <= window <= MAX_WINDOW:
+            raise CustomIndicatorError(
+                'INVALID_OPERAND_VALUE',
+                f"Window must be between 1 and {MAX_WINDOW}, got {window}",
+                rule_name
+            )
+        
+        self._validate_formula(formula['operand'], rule_name)
     
     def _get_referenced_indicators(self, formula: Dict[str, Any]) -> List[str]:
         """
@@ -378,6 +606,10 @@ class CustomIndicatorEngine:
         if 'value' in formula:
             return references
         
+        # Recursive case: window operator
+        if 'operand' in formula:
+            return self._get_referenced_indicators(formula['operand'])
+        
         # Recursive case: operator with left and right
         if 'operator' in formula:
             references.extend(self._get_referenced_indicators(formula['left']))
@@ -385,97 +617,215 @@ class CustomIndicatorEngine:
         
         return references
     
-    def _evaluate_formula(self, formula: Dict[str, Any], rule_name: str) -> pd.Series:
+    def get_custom_indicator_names(self) -> List[str]:
         """
-        Recursively evaluate a formula to produce a pandas Series.
+        Get list of all custom indicator names.
+        
+        Returns:
+            List of custom indicator names
+        """
+        return list(self.custom_indicators.keys())
+    
+    def clear_cache(self) -> None:
+        """Clear the calculation cache."""
+        self.calculation_cache.clear()
+    
+    @staticmethod
+    def derive_min_history(
+        rules: List[Dict[str, Any]],
+        base_min_history: Dict[str, int],
+        default: int = 0
+    ) -> Dict[str, int]:
+        """
+        Derive how many bars each custom indicator needs before it is non-null.
+        
+        Binary operators need the longer of their operands, crossover one more
+        bar than that, and window operators add their lookback on top of the
+        operand's warm-up. Unknown or circular references fall back to default.
         
         Args:
-            formula: Formula dictionary to evaluate
-            rule_name: Name of the rule (for error messages)
+            rules: Custom indicator rule definitions
+            base_min_history: Warm-up of built-in indicators (e.g. INDICATOR_MIN_HISTORY)
+            default: Warm-up assumed for base columns not in base_min_history
             
         Returns:
-            pandas Series with calculated values
-            
-        Raises:
-            CustomIndicatorError: If evaluation fails
+            Mapping of custom indicator name to required bars
         """
-        # Base case: indicator reference
+        formulas = {
+            rule['name']: rule['formula']
+            for rule in rules
+            if isinstance(rule, dict) and 'name' in rule and isinstance(rule.get('formula'), dict)
+        }
+        resolved: Dict[str, int] = {}
+        
+        def node_history(formula: Any, path: List[str]) -> int:
+            if not isinstance(formula, dict):
+                return default
+            if 'indicator' in formula:
+                name = formula['indicator']
+                if name in formulas:
+                    return rule_history(name, path)
+                return base_min_history.get(name, default)
+            if 'value' in formula:
+                return 0
+            operator = formula.get('operator')
+            if operator in WINDOW_OPERATORS:
+                window = formula.get('window')
+                if not isinstance(window, int):
+                    return default
+                return node_history(formula.get('operand'), path) + window_warmup(operator, window)
+            required = max(
+                node_history(formula.get('left'), path),
+                node_history(formula.get('right'), path)
+            )
+            return required + 1 if operator == 'crossover' else required
+        
+        def rule_history(name: str, path: List[str]) -> int:
+            if name in resolved:
+                return resolved[name]
+            if name in path:
+                return default
+            resolved[name] = node_history(formulas[name], path + [name])
+            return resolved[name]
+        
+        for name in formulas:
+            rule_history(name, [])
+        return resolved
+
+
+class _FormulaCompiler:
+    """
+    Builds a CompiledFormulaSet from rule formulas.
+    
+    Each distinct node (input, constant or operation) is assigned one slot;
+    re-encountering an identical node reuses the slot, which eliminates
+    common sub-expressions within and across rules.
+    """
+    
+    def __init__(
+        self,
+        available_indicators: Dict[str, pd.Series],
+        rules: Dict[str, Dict],
+        failed: Optional[Dict[str, CustomIndicatorError]] = None
+    ):
+        self.available_indicators = available_indicators
+        self.rules = rules
+        # Rules known to fail; referencing one fails the referencing rule
+        self.failed = failed if failed is not None else {}
+        self.inputs: List[str] = []
+        self.constants: List[float] = []
+        self.instructions: List[Tuple[str, Union[str, int], Union[str, int]]] = []
+        self.outputs: Dict[str, Tuple[str, int]] = {}
+        self._node_ids: Dict[Tuple, Tuple[str, int]] = {}
+    
+    def compile_rule(self, name: str, path: List[str]) -> Tuple[str, int]:
+        """Compile a rule (and its dependencies first), returning its node ref"""
+        if name in self.outputs:
+            return self.outputs[name]
+        
+        if name in self.failed:
+            raise self.failed[name]
+        
+        if name in path:
+            cycle = ' → '.join(path[path.index(name):] + [name])
+            raise CustomIndicatorError(
+                'CIRCULAR_DEPENDENCY',
+                f"Circular dependency detected: {cycle}",
+                name
+            )
+        
+        ref = self._compile_node(self.rules[name]['formula'], name, path + [name])
+        self.outputs[name] = ref
+        return ref
+    
+    def _intern(self, key: Tuple, kind: str, register) -> Tuple[str, int]:
+        ref = self._node_ids.get(key)
+        if ref is None:
+            ref = (kind, register())
+            self._node_ids[key] = ref
+        return ref
+    
+    def _compile_node(self, formula: Dict[str, Any], rule_name: str, path: List[str]) -> Tuple[str, int]:
+        # Indicator reference: base indicator input or another custom rule
         if 'indicator' in formula:
             indicator_name = formula['indicator']
             
-            # Check if indicator exists in available indicators
-            if indicator_name in self.available_indicators:
-                return self.available_indicators[indicator_name]
+            if indicator_name in self.rules:
+                return self.compile_rule(indicator_name, path)
             
-            # Check if it's a custom indicator
-            if indicator_name in self.custom_indicators:
-                # Recursively calculate custom indicator
-                return self.calculate(indicator_name)
+            if indicator_name in self.available_indicators:
+                def add_input():
+                    self.inputs.append(indicator_name)
+                    return len(self.inputs) - 1
+                return self._intern(('input', indicator_name), 'input', add_input)
             
-            # Indicator not found
             raise CustomIndicatorError(
                 'INDICATOR_NOT_FOUND',
                 f"Referenced indicator '{indicator_name}' does not exist",
                 rule_name
             )
         
-        # Base case: constant value
+        # Constant value
         if 'value' in formula:
-            value = formula['value']
-            # Create Series with constant value, aligned with DataFrame index
-            return pd.Series([value] * len(self.df), index=self.df.index, dtype=float)
+            value = float(formula['value'])
+            return self._constant(value)
         
-        # Recursive case: operator with left and right operands
         operator = formula['operator']
         
-        # Evaluate left and right operands
-        left = self._evaluate_formula(formula['left'], rule_name)
-        right = self._evaluate_formula(formula['right'], rule_name)
-        
-        # Ensure both are pandas Series
-        if not isinstance(left, pd.Series) or not isinstance(right, pd.Series):
-            raise CustomIndicatorError(
-                'INVALID_OPERAND_TYPE',
-                "Operands must evaluate to pandas Series",
-                rule_name
-            )
-        
-        # Apply operator
-        try:
-            if operator == '+':
-                result = left + right
-            elif operator == '-':
-                result = left - right
-            elif operator == '*':
-                result = left * right
-            elif operator == '/':
-                # Division by zero will produce NaN (handled gracefully)
-                result = left / right
-            else:
-                # Should never reach here due to validation
-                raise CustomIndicatorError(
-                    'INVALID_OPERATOR',
-                    f"Unsupported operator: {operator}",
-                    rule_name
+        # Window operation: (operator, operand, window); never folded, since
+        # even a constant operand is NaN until the window has filled
+        if operator in WINDOW_OPERATORS:
+            operand = self._compile_node(formula['operand'], rule_name, path)
+            window = formula['window']
+            
+            def add_window():
+                self.instructions.append((operator, operand, window))
+                return len(self.instructions) - 1
+            return self._intern(('win', operator, operand, window), 'op', add_window)
+        
+        # Binary operation
+        left = self._compile_node(formula['left'], rule_name, path)
+        right = self._compile_node(formula['right'], rule_name, path)
+        
+        # Fold arithmetic on two constants at compile time
+        if operator in _BINARY_OPS and left[0] == 'const' and right[0] == 'const':
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                folded = _BINARY_OPS[operator](
+                    np.float64(self.constants[left[1]]), np.float64(self.constants[right[1]])
                 )
-        except Exception as e:
-            raise CustomIndicatorError(
-                'CALCULATION_ERROR',
-                f"Error applying operator '{operator}': {str(e)}",
-                rule_name
-            )
+            return self._constant(float(folded))
         
-        return result
-    
-    def get_custom_indicator_names(self) -> List[str]:
-        """
-        Get list of all custom indicator names.
+        operands = (left, right)
+        if operator in _COMMUTATIVE_OPS:
+            operands = tuple(sorted(operands))
         
-        Returns:
-            List of custom indicator names
-        """
-        return list(self.custom_indicators.keys())
+        def add_instruction():
+            self.instructions.append((operator, left, right))
+            return len(self.instructions) - 1
+        return self._intern(('op', operator) + operands, 'op', add_instruction)
     
-    def clear_cache(self) -> None:
-        """Clear the calculation cache."""
-        self.calculation_cache.clear()
+    def _constant(self, value: float) -> Tuple[str, int]:
+        # repr() keeps NaN/-0.0 distinct while still sharing equal constants
+        def add_constant():
+            self.constants.append(value)
+            return len(self.constants) - 1
+        return self._intern(('const', repr(value)), 'const', add_constant)
+    
+    def build(self) -> CompiledFormulaSet:
+        """Resolve node refs to flat slot indices"""
+        const_base = len(self.inputs)
+        op_base = const_base + len(self.constants)
+        bases = {'input': 0, 'const': const_base, 'op': op_base}
+        
+        def slot(ref: Tuple[str, int]) -> int:
+            return bases[ref[0]] + ref[1]
+        
+        return CompiledFormulaSet(
+            inputs=tuple(self.inputs),
+            constants=tuple(self.constants),
+            instructions=tuple(
+                (operator, slot(left), right if operator in WINDOW_OPERATORS else slot(right))
+                for operator, left, right in self.instructions
+            ),
+            outputs={name: slot(ref) for name, ref in self.outputs.items()},
+        )
@@ -0,0 +1,448 @@
+"""
+Decision Gating for AlphaLab Trading Engines.
+
+Purpose:
+    Decides, per candle, whether an LLM decision is worth its cost. Shared by
+    the backtest and forward candle processors.
+
+    - Force detectors request a decision even off-cadence (position near
+      SL/TP, large unrealized PnL, position not reviewed for a long time,
+      market regime change, large indicator move)
+    - Skip detectors drop low-value calls (low volatility, nothing changed
+      since the last decision)
+    - An optional per-session budget caps LLM calls per N candles
+    - Every outcome is counted by reason, so skip/force rates can be compared
+      against decision quality
+
+Usage:
+    from services.trading.decision_gating import DecisionGate, GateContext
+
+    gate = DecisionGate.from_settings(max_calls_per_window=20)
+    verdict = gate.evaluate(GateContext(...), blocked_by=None)
+    if verdict.run:
+        decision = await ai_trader.get_decision(...)
+        gate.record_call(context)
+"""
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Position-aware forcing thresholds
+FORCE_DECISION_SL_TP_PROXIMITY_PCT = 1.0  # Force if within 1% of stop-loss or take-profit
+FORCE_DECISION_SIGNIFICANT_PNL_PCT = 2.0  # Force if unrealized PnL > 2% of position size
+FORCE_DECISION_EXTENDED_PERIOD = 50  # Force if position open for 50+ candles without review
+
+# Volatility-based skipping thresholds
+LOW_VOLATILITY_THRESHOLD = 0.5  # Skip if current volatility < 50% of recent average
+LOW_VOLATILITY_LOOKBACK = 5
+
+# Indicator delta thresholds (relative change since the last LLM decision)
+INDICATOR_DELTA_MIN_CHANGE_PCT = 1.0  # Skip if nothing moved more than this
+INDICATOR_DELTA_FORCE_CHANGE_PCT = 25.0  # Force if anything moved more than this
+
+# Trend reference indicators for regime detection, first available wins
+REGIME_REFERENCE_INDICATORS = ("ema_50", "sma_50", "ema_20", "sma_20")
+
+FORCE = "force"
+SKIP = "skip"
+
+
+@dataclass
+class GateContext:
+    """Everything a detector may look at for the current candle"""
+    candle_index: int
+    candle: Any  # Candle
+    indicators: Dict[str, Optional[float]]
+    position: Any  # Optional[Position]
+    candles: Sequence[Any]  # Candle history, candles[candle_index] is the current candle
+    indicators_at: Callable[[int], Dict[str, Optional[float]]]
+
+
+@dataclass
+class GateVerdict:
+    """Outcome of gating one candle"""
+    run: bool
+    forced: bool = False
+    source: Optional[str] = None  # Detector or rule that decided
+    reason: Optional[str] = None
+
+
+@dataclass
+class GateMemory:
+    """What the gate remembers about the last LLM decision"""
+    last_call_index: Optional[int] = None
+    last_call_close: Optional[float] = None
+    last_call_indicators: Optional[Dict[str, Optional[float]]] = None
+    last_call_regime: Optional[str] = None
+    position_since: Optional[int] = None
+
+
+class GateDetector:
+    """
+    Base class for gating detectors.
+
+    Subclasses set `name` and `kind` and implement check(), returning a reason
+    string when the detector fires.
+    """
+    name = "detector"
+    kind = SKIP
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        raise NotImplementedError
+
+
+class SlTpProximityDetector(GateDetector):
+    """Force when price is within `threshold_pct` of the position's stop-loss or take-profit"""
+    name = "sl_tp_proximity"
+    kind = FORCE
+
+    def __init__(self, threshold_pct: float = FORCE_DECISION_SL_TP_PROXIMITY_PCT):
+        self.threshold_pct = threshold_pct
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        position = ctx.position
+        price = ctx.candle.close
+        if not position or not price:
+            return None
+        if position.stop_loss and abs(position.stop_loss - price) / price * 100 < self.threshold_pct:
+            return f"Position near stop-loss (within {self.threshold_pct}%)"
+        if position.take_profit and abs(position.take_profit - price) / price * 100 < self.threshold_pct:
+            return f"Position near take-profit (within {self.threshold_pct}%)"
+        return None
+
+
+class UnrealizedPnlDetector(GateDetector):
+    """Force when unrealized PnL exceeds `threshold_pct` of the position size"""
+    name = "unrealized_pnl"
+    kind = FORCE
+
+    def __init__(self, threshold_pct: float = FORCE_DECISION_SIGNIFICANT_PNL_PCT):
+        self.threshold_pct = threshold_pct
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        position = ctx.position
+        if not position or position.size <= 0:
+            return None
+        pnl_pct = abs(position.unrealized_pnl) / position.size * 100
+        if pnl_pct > self.threshold_pct:
+            return f"Significant unrealized PnL ({pnl_pct:.2f}% of position size)"
+        return None
+
+
+class PositionReviewDetector(GateDetector):
+    """Force when a position has gone `max_candles` candles without an LLM review"""
+    name = "position_review"
+    kind = FORCE
+
+    def __init__(self, max_candles: int = FORCE_DECISION_EXTENDED_PERIOD):
+        self.max_candles = max_candles
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        if not ctx.position or memory.position_since is None:
+            return None
+        last_review = max(memory.position_since, memory.last_call_index or 0)
+        unreviewed = ctx.candle_index - last_review
+        if unreviewed > self.max_candles:
+            return f"Position open for {unreviewed} candles without review"
+        return None
+
+
+class RegimeChangeDetector(GateDetector):
+    """
+    Force when the trend regime (close above/below a moving average) flipped
+    since the last LLM decision.
+    """
+    name = "regime_change"
+    kind = FORCE
+
+    def __init__(self, reference_indicators: Sequence[str] = REGIME_REFERENCE_INDICATORS):
+        self.reference_indicators = tuple(reference_indicators)
+
+    def regime(self, ctx: GateContext) -> Optional[str]:
+        for name in self.reference_indicators:
+            reference = ctx.indicators.get(name)
+            if reference is not None:
+                return f"{'above' if ctx.candle.close >= reference else 'below'} {name}"
+        return None
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        current = self.regime(ctx)
+        previous = memory.last_call_regime
+        if current is None or previous is None or current == previous:
+            return None
+        return f"Regime change (close moved from {previous} to {current})"
+
+
+class IndicatorDeltaDetector(GateDetector):
+    """
+    Compare price and indicators with their values at the last LLM decision.
+
+    Skips when nothing moved by at least `min_change_pct` (no new information)
+    and no position is open; forces when anything moved by more than
+    `force_change_pct`.
+    """
+    name = "indicator_delta"
+    kind = SKIP
+
+    def __init__(
+        self,
+        min_change_pct: float = INDICATOR_DELTA_MIN_CHANGE_PCT,
+        force_change_pct: Optional[float] = INDICATOR_DELTA_FORCE_CHANGE_PCT
+    ):
+        self.min_change_pct = min_change_pct
+        self.force_change_pct = force_change_pct
+
+    def max_change(self, ctx: GateContext, memory: GateMemory) -> Optional[Tuple[str, float]]:
+        if memory.last_call_indicators is None:
+            return None
+        previous = dict(memory.last_call_indicators)
+        previous["close"] = memory.last_call_close
+        current = dict(ctx.indicators)
+        current["close"] = ctx.candle.close
+
+        largest: Optional[Tuple[str, float]] = None
+        for name, value in current.items():
+            before = previous.get(name)
+            if value is None or before is None:
+                continue
+            change = abs(value - before) / abs(before) * 100 if before else (0.0 if value == before else float("inf"))
+            if largest is None or change > largest[1]:
+                largest = (name, change)
+        return largest
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        largest = self.max_change(ctx, memory)
+        if largest is None or ctx.position:
+            return None
+        name, change = largest
+        if change < self.min_change_pct:
+            return f"No indicator moved more than {self.min_change_pct}% since last decision (largest: {name} {change:.2f}%)"
+        return None
+
+    def check_force(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        if self.force_change_pct is None:
+            return None
+        largest = self.max_change(ctx, memory)
+        if largest is None:
+            return None
+        name, change = largest
+        if change > self.force_change_pct:
+            return f"Large move in {name} ({change:.2f}% since last decision)"
+        return None
+
+
+class LowVolatilityDetector(GateDetector):
+    """
+    Skip when there is no position and volatility is well below its recent
+    average. Uses ATR if available, otherwise the candle range.
+    """
+    name = "low_volatility"
+    kind = SKIP
+
+    def __init__(self, threshold: float = LOW_VOLATILITY_THRESHOLD, lookback: int = LOW_VOLATILITY_LOOKBACK):
+        self.threshold = threshold
+        self.lookback = lookback
+
+    def check(self, ctx: GateContext, memory: GateMemory) -> Optional[str]:
+        index = ctx.candle_index
+        if ctx.position or index < self.lookback:
+            return None
+
+        # Method 1: Use ATR if available
+        current_atr = ctx.indicators.get("atr")
+        if current_atr is not None:
+            recent_atrs = []
+            for idx in range(max(0, index - self.lookback), index):
+                atr = ctx.indicators_at(idx).get("atr")
+                if atr is not None:
+                    recent_atrs.append(atr)
+            if len(recent_atrs) >= 3:
+                avg_atr = sum(recent_atrs) / len(recent_atrs)
+                if avg_atr > 0 and current_atr < avg_atr * self.threshold:
+                    return f"Low volatility (ATR {current_atr:.2f} < {self.threshold*100}% of avg {avg_atr:.2f})"
+
+        # Method 2: Use price range as fallback
+        recent_candles = ctx.candles[max(0, index - self.lookback):index + 1]
+        price_ranges = [c.high - c.low for c in recent_candles]
+        avg_range = sum(price_ranges[:-1]) / len(price_ranges[:-1]) if len(price_ranges) > 1 else price_ranges[0]
+        current_range = price_ranges[-1]
+        if avg_range > 0 and current_range < avg_range * self.threshold:
+            return f"Low volatility (price range {current_range:.2f} < {self.threshold*100}% of avg {avg_range:.2f})"
+        return None
+
+
+# Detector registry used by DECISION_GATE_DETECTORS
+DETECTORS: Dict[str, Callable[[], GateDetector]] = {
+    SlTpProximityDetector.name: SlTpProximityDetector,
+    UnrealizedPnlDetector.name: UnrealizedPnlDetector,
+    PositionReviewDetector.name: PositionReviewDetector,
+    RegimeChangeDetector.name: RegimeChangeDetector,
+    IndicatorDeltaDetector.name: IndicatorDeltaDetector,
+    LowVolatilityDetector.name: LowVolatilityDetector,
+}
+
+
+class DecisionBudget:
+    """Sliding-window cap: at most `max_calls` LLM calls per `window` candles"""
+
+    def __init__(self, max_calls: int, window: int = 100):
+        self.max_calls = max_calls
+        self.window = window
+        self._calls: Deque[int] = deque()
+
+    def _expire(self, candle_index: int) -> None:
+        while self._calls and self._calls[0] <= candle_index - self.window:
+            self._calls.popleft()
+
+    def exhausted(self, candle_index: int) -> bool:
+        self._expire(candle_index)
+        return len(self._calls) >= self.max_calls
+
+    def record(self, candle_index: int) -> None:
+        self._expire(candle_index)
+        self._calls.append(candle_index)
+
+
+class DecisionGate:
+    """
+    Per-session gate combining detectors and an optional call budget.
+
+    Order of evaluation:
+    1. Force detectors: any firing runs the LLM, overriding cadence and skips
+       (forced calls still count against the budget but are never blocked)
+    2. Cadence/readiness rules from the processor (`blocked_by`)
+    3. Skip detectors
+    4. Budget
+    """
+
+    def __init__(
+        self,
+        detectors: Optional[List[GateDetector]] = None,
+        budget: Optional[DecisionBudget] = None
+    ):
+        self.detectors = detectors if detectors is not None else build_detectors(settings.DECISION_GATE_DETECTORS)
+        self.budget = budget
+        self.memory = GateMemory()
+        self.candles = 0
+        self.llm_calls = 0
+        self.forced: Counter = Counter()
+        self.skipped: Counter = Counter()
+
+    @classmethod
+    def from_settings(cls, max_calls_per_window: Optional[int] = None) -> "DecisionGate":
+        """
+        Build a gate with the detectors from settings.DECISION_GATE_DETECTORS.
+
+        Args:
+            max_calls_per_window: Optional budget of LLM calls per
+                                  settings.DECISION_BUDGET_WINDOW candles
+        """
+        budget = None
+        if max_calls_per_window:
+            budget = DecisionBudget(max_calls_per_window, settings.DECISION_BUDGET_WINDOW)
+        return cls(build_detectors(settings.DECISION_GATE_DETECTORS), budget)
+
+    def evaluate(self, ctx: GateContext, blocked_by: Optional[str] = None) -> GateVerdict:
+        """
+        Decide whether to call the LLM on this candle.
+
+        Args:
+            ctx: Current candle context
+            blocked_by: Name of the processor rule that rules this candle out
+                        ("warmup", "indicators_not_ready", "cadence"), or None
+
+        Returns:
+            GateVerdict (also counted in stats())
+        """
+        self.candles += 1
+        self._track_position(ctx)
+
+        for detector in self.detectors:
+            if detector.kind == FORCE:
+                reason = detector.check(ctx, self.memory)
+            elif isinstance(detector, IndicatorDeltaDetector):
+                reason = detector.check_force(ctx, self.memory)
+            else:
+                continue
+            if reason:
+                self.forced[detector.name] += 1
+                return GateVerdict(run=True, forced=True, source=detector.name, reason=reason)
+
+        if blocked_by:
+            self.skipped[blocked_by] += 1
+            return GateVerdict(run=False, source=blocked_by)
+
+        for detector in self.detectors:
+            if detector.kind != SKIP:
+                continue
+            reason = detector.check(ctx, self.memory)
+            if reason:
+                self.skipped[detector.name] += 1
+                return GateVerdict(run=False, source=detector.name, reason=reason)
+
+        if self.budget is not None and self.budget.exhausted(ctx.candle_index):
+            self.skipped["budget"] += 1
+            return GateVerdict(
+                run=False,
+                source="budget",
+                reason=f"LLM call budget reached ({self.budget.max_calls} per {self.budget.window} candles)"
+            )
+
+        return GateVerdict(run=True)
+
+    def record_call(self, ctx: GateContext) -> None:
+        """Remember the state at an LLM decision (baseline for delta/regime detectors)"""
+        self.llm_calls += 1
+        self.memory.last_call_index = ctx.candle_index
+        self.memory.last_call_close = ctx.candle.close
+        self.memory.last_call_indicators = dict(ctx.indicators)
+        for detector in self.detectors:
+            if isinstance(detector, RegimeChangeDetector):
+                self.memory.last_call_regime = detector.regime(ctx)
+        if self.budget is not None:
+            self.budget.record(ctx.candle_index)
+
+    def _track_position(self, ctx: GateContext) -> None:
+        if ctx.position and self.memory.position_since is None:
+            self.memory.position_since = ctx.candle_index
+        elif not ctx.position:
+            self.memory.position_since = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return candle/call counts and skip/force counts by reason"""
+        return {
+            "candles": self.candles,
+            "llm_calls": self.llm_calls,
+            "call_rate": (self.llm_calls / self.candles) if self.candles else 0.0,
+            "forced": dict(self.forced),
+            "skipped": dict(self.skipped),
+            "detectors": [detector.name for detector in self.detectors],
+            "budget": (
+                {"max_calls": self.budget.max_calls, "window": self.budget.window}
+                if self.budget is not None else None
+            ),
+        }
+
+
+def build_detectors(spec: str) -> List[GateDetector]:
+    """
+    Instantiate detectors from a comma-separated list of names.
+
+    Unknown names are logged and ignored so a typo in configuration does
+    not stop sessions from starting.
+    """
+    detectors = []
+    for name in (part.strip() for part in spec.split(",")):
+        if not name:
+            continue
+        factory = DETECTORS.get(name)
+        if factory is None:
+            logger.warning(f"Unknown decision gate detector '{name}' ignored")
+            continue
+        detectors.append(factory())
+    return detectors
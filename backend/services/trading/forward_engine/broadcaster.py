@@ -223,7 +223,8 @@ class EventBroadcaster:
                 "stop_loss_price": decision.stop_loss_price,
                 "take_profit_price": decision.take_profit_price,
                 "size_percentage": decision.size_percentage,
-                "leverage": decision.leverage
+                "leverage": decision.leverage,
+                "candle_number": decision.candle_index
             }
         )
         await self.websocket_manager.broadcast_to_session(session_id, event)
@@ -232,6 +233,33 @@ class EventBroadcaster:
             f"action={decision.action}"
         )
     
+    async def broadcast_ai_decision_partial(
+        self,
+        session_id: str,
+        candle_number: int,
+        reasoning_delta: str
+    ) -> None:
+        """
+        Broadcast a partial AI decision event with newly streamed reasoning text.
+        
+        Sent while the reasoning of a streamed decision is still arriving; the
+        complete ai_decision event follows.
+        
+        Args:
+            session_id: Session identifier
+            candle_number: Candle the decision is for
+            reasoning_delta: New reasoning text since the previous partial event
+        """
+        event = Event(
+            type=EventType.AI_DECISION,
+            data={
+                "partial": True,
+                "candle_number": candle_number,
+                "reasoning_delta": reasoning_delta
+            }
+        )
+        await self.websocket_manager.broadcast_to_session(session_id, event)
+    
     async def broadcast_stats_update(
         self,
         session_id: str,
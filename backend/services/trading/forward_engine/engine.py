@@ -44,9 +44,12 @@ from services.market_data_service import MarketDataService
 from services.trading.position_manager import PositionManager
 from services.trading.indicator_calculator import IndicatorCalculator
 from services.ai_trader import AITrader
+from services.trading.decision_gating import DecisionGate
+from services.metrics import candles_processed, candle_processing_seconds
 from websocket.manager import WebSocketManager
 from websocket.events import Event, EventType
 from exceptions import ValidationError
+from config import settings
 
 from .session_state import SessionState
 from .broadcaster import EventBroadcaster
@@ -110,13 +113,15 @@ class ForwardEngine:
     @staticmethod
     def _calculate_required_historical_candles(
         enabled_indicators: List[str],
-        timeframe: str
+        timeframe: str,
+        custom_indicators: Optional[List[Dict[str, Any]]] = None
     ) -> int:
         """
         Calculate the required number of historical candles based on enabled indicators.
         
         Strategy:
         1. Find the maximum lookback period needed by any enabled indicator
+           (including the window operators of custom indicators)
         2. Add a safety buffer (50-100 candles) for indicator stability
         3. Apply timeframe-specific minimums/maximums
         4. Ensure we have enough data for chart context
@@ -124,6 +129,7 @@ class ForwardEngine:
         Args:
             enabled_indicators: List of enabled indicator names
             timeframe: Trading timeframe (e.g., '15m', '1h', '4h', '1d')
+            custom_indicators: Optional custom indicator rule definitions
             
         Returns:
             Number of historical candles to fetch
@@ -137,6 +143,12 @@ class ForwardEngine:
                 lookback = IndicatorCalculator.INDICATOR_MIN_HISTORY[normalized]
                 max_lookback = max(max_lookback, lookback)
         
+        if custom_indicators:
+            max_lookback = max(
+                max_lookback,
+                IndicatorCalculator.compute_min_history(enabled_indicators, custom_indicators)
+            )
+        
         # If no indicators found or max_lookback is 0, use default
         if max_lookback == 0:
             max_lookback = 200  # Default to SMA_200 requirement
@@ -184,6 +196,7 @@ class ForwardEngine:
         allow_leverage: bool = False,
         decision_mode: str = "every_candle",
         decision_interval_candles: int = 1,
+        max_llm_calls_per_window: Optional[int] = None,
     ) -> None:
         """
         Start a forward test session.
@@ -200,6 +213,8 @@ class ForwardEngine:
             safety_mode: Whether to enforce safety mode (-2% stop loss)
             auto_stop_config: Auto-stop configuration dict
             email_notifications: Whether to send email notifications
+            max_llm_calls_per_window: Optional LLM call budget per
+                settings.DECISION_BUDGET_WINDOW candles
             
         Raises:
             ValidationError: If parameters are invalid
@@ -250,7 +265,12 @@ class ForwardEngine:
                     api_key=api_key,
                     model=agent.model,
                     strategy_prompt=agent.strategy_prompt,
-                    mode=agent.mode
+                    mode=agent.mode,
+                    prompt_format=agent.prompt_format,
+                    session_id=str(session_id),
+                    priority="forward",
+                    batching=settings.AI_DECISION_BATCHING,
+                    streaming=settings.AI_STREAM_DECISIONS
                 )
                 
                 # Create session state
@@ -265,6 +285,7 @@ class ForwardEngine:
                     allow_leverage=allow_leverage,
                     decision_mode=decision_mode,
                     decision_interval_candles=decision_interval_candles,
+                    decision_gate=DecisionGate.from_settings(max_calls_per_window=max_llm_calls_per_window),
                 )
                 
                 # Store session state
@@ -380,7 +401,8 @@ class ForwardEngine:
                     # Calculate required historical candles based on enabled indicators and timeframe
                     required_candles = self._calculate_required_historical_candles(
                         enabled_indicators=session_state.agent.indicators or [],
-                        timeframe=session_state.timeframe
+                        timeframe=session_state.timeframe,
+                        custom_indicators=session_state.agent.custom_indicators
                     )
                     
                     logger.info(
@@ -408,6 +430,8 @@ class ForwardEngine:
                             enabled_indicators=session_state.agent.indicators,
                             mode=session_state.agent.mode,
                             custom_indicators=session_state.agent.custom_indicators,
+                            asset=session_state.asset,
+                            timeframe=session_state.timeframe,
                         )
                         
                         # Calculate decision_start_index upfront (like backtest does)
@@ -552,13 +576,15 @@ class ForwardEngine:
                         continue
                     
                     # Process this candle (it will be added to processed list inside processor)
-                    await self.processor.process_candle(
-                        db,
-                        session_id,
-                        session_state,
-                        candle,
-                        email_notifications
-                    )
+                    with session_state.tracer.span("candle"), candle_processing_seconds.time(engine="forward"):
+                        await self.processor.process_candle(
+                            db,
+                            session_id,
+                            session_state,
+                            candle,
+                            email_notifications
+                        )
+                    candles_processed.inc(engine="forward")
 
                     # Check auto-stop conditions
                     should_stop = await self.auto_stop_manager.check_auto_stop_conditions(
@@ -867,7 +893,8 @@ class ForwardEngine:
             session_id=session_id,
             stats=stats,
             equity_curve=session_state.equity_curve,
-            forced_stop=force_stop or auto_stop
+            forced_stop=force_stop or auto_stop,
+            timings=session_state.tracer.summary() if session_state.tracer.enabled else None
         )
         
         # Broadcast session completed event
@@ -120,6 +120,35 @@ class PositionHandler:
                 position
             )
     
+    async def update_entry_reasoning(
+        self,
+        db: AsyncSession,
+        session_id: str,
+        session_state: Any,
+        reasoning: str
+    ) -> None:
+        """
+        Fill in the entry reasoning of the open position's trade record.
+        
+        Used when a streamed decision opened the position before its
+        reasoning text was complete.
+        
+        Args:
+            db: Database session
+            session_id: Session identifier
+            session_state: Session state object
+            reasoning: Complete AI reasoning
+        """
+        trade_number = len(session_state.position_manager.get_closed_trades()) + 1
+        stmt = (
+            update(Trade)
+            .where(Trade.session_id == session_id)
+            .where(Trade.trade_number == trade_number)
+            .values(entry_reasoning=reasoning)
+        )
+        await db.execute(stmt)
+        await db.commit()
+    
     async def handle_position_closed(
         self,
         db: AsyncSession,
@@ -28,6 +28,7 @@ Usage:
     )
 """
 
+import asyncio
 import logging
 from typing import Any, Optional
 from datetime import datetime
@@ -39,6 +40,7 @@ from services.trading.indicator_calculator import IndicatorCalculator
 from services.ai_trader import AIDecision
 from websocket.manager import WebSocketManager
 from services.trading.position_manager import Position
+from services.trading.decision_gating import GateContext
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +108,7 @@ class CandleProcessor:
         # Add new candle to processed list first
         session_state.candles_processed.append(candle)
         candle_number = len(session_state.candles_processed) - 1  # 0-indexed for indicator calculator
+        tracer = session_state.tracer
         
         self.logger.info(
             f"Processing candle {candle_number}: "
@@ -113,46 +116,46 @@ class CandleProcessor:
         )
         
         # Initialize indicator calculator if not already done (fallback for when historical fetch failed)
-        if session_state.indicator_calculator is None:
-            self.logger.warning(
-                f"Indicator calculator not initialized, creating with {len(session_state.candles_processed)} candles"
-            )
-            session_state.indicator_calculator = IndicatorCalculator(
-                candles=session_state.candles_processed,
-                enabled_indicators=session_state.agent.indicators,
-                mode=session_state.agent.mode,
-                custom_indicators=session_state.agent.custom_indicators,
-            )
-            
-            # Calculate decision_start_index if not already set
-            if session_state.decision_start_index == 0:
-                session_state.decision_start_index = session_state.indicator_calculator.find_first_ready_index(
-                    min_ready_percentage=INITIAL_READINESS_THRESHOLD
+        with tracer.span("indicators"):
+            if session_state.indicator_calculator is None:
+                self.logger.warning(
+                    f"Indicator calculator not initialized, creating with {len(session_state.candles_processed)} candles"
                 )
-                self.logger.info(
-                    f"Decision start index calculated: {session_state.decision_start_index} "
-                    f"(threshold: {INITIAL_READINESS_THRESHOLD * 100}%)"
+                session_state.indicator_calculator = IndicatorCalculator(
+                    candles=session_state.candles_processed,
+                    enabled_indicators=session_state.agent.indicators,
+                    mode=session_state.agent.mode,
+                    custom_indicators=session_state.agent.custom_indicators,
+                    asset=session_state.asset,
+                    timeframe=session_state.timeframe,
                 )
-        else:
-            # Update indicator calculator with new candle
-            # Recreate calculator with all candles (including the new one)
-            # This ensures indicators are calculated correctly with full history
-            session_state.indicator_calculator = IndicatorCalculator(
-                candles=session_state.candles_processed,
-                enabled_indicators=session_state.agent.indicators,
-                mode=session_state.agent.mode,
-                custom_indicators=session_state.agent.custom_indicators,
+                
+                # Calculate decision_start_index if not already set
+                if session_state.decision_start_index == 0:
+                    session_state.decision_start_index = session_state.indicator_calculator.find_first_ready_index(
+                        min_ready_percentage=INITIAL_READINESS_THRESHOLD
+                    )
+                    self.logger.info(
+                        f"Decision start index calculated: {session_state.decision_start_index} "
+                        f"(threshold: {INITIAL_READINESS_THRESHOLD * 100}%)"
+                    )
+            else:
+                # Update indicator calculator with new candle
+                # Built-in indicators are recalculated over the full history (or
+                # served from the shared cache); custom indicators advance by one bar
+                session_state.indicator_calculator = session_state.indicator_calculator.extend(
+                    session_state.candles_processed
+                )
+            
+            # Calculate indicators for the latest candle
+            indicators = session_state.indicator_calculator.calculate_all(candle_number)
+            
+            # Check indicator readiness at runtime
+            indicators_ready = session_state.indicator_calculator.check_indicator_readiness(
+                candle_number,
+                min_ready_percentage=RUNTIME_READINESS_THRESHOLD
             )
         
-        # Calculate indicators for the latest candle
-        indicators = session_state.indicator_calculator.calculate_all(candle_number)
-        
-        # Check indicator readiness at runtime
-        indicators_ready = session_state.indicator_calculator.check_indicator_readiness(
-            candle_number,
-            min_ready_percentage=RUNTIME_READINESS_THRESHOLD
-        )
-        
         # Log indicator readiness status
         ready_count = sum(1 for v in indicators.values() if v is not None)
         total_count = len(indicators)
@@ -163,51 +166,71 @@ class CandleProcessor:
         )
         
         # Broadcast indicator readiness event
-        await self.broadcaster.broadcast_indicator_readiness(
-            session_id,
-            ready_count,
-            total_count,
-            ready_pct,
-            indicators_ready
-        )
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_indicator_readiness(
+                session_id,
+                ready_count,
+                total_count,
+                ready_pct,
+                indicators_ready
+            )
         
         # Broadcast candle event with indicators
-        await self.broadcaster.broadcast_candle(session_id, candle, indicators, candle_number)
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_candle(session_id, candle, indicators, candle_number)
         
         # Update open position if exists
         if session_state.position_manager.has_open_position():
-            close_reason = await session_state.position_manager.update_position(
-                candle_high=candle.high,
-                candle_low=candle.low,
-                current_price=candle.close
-            )
-            
-            # If position was closed by stop-loss or take-profit
-            if close_reason:
-                closed_trade = session_state.position_manager.get_closed_trades()[-1]
-                await self.position_handler.handle_position_closed(
-                    db,
-                    session_id,
-                    session_state,
-                    closed_trade,
-                    candle_number,
-                    candle.timestamp,
-                    email_notifications
+            with tracer.span("position_update"):
+                close_reason = await session_state.position_manager.update_position(
+                    candle_high=candle.high,
+                    candle_low=candle.low,
+                    current_price=candle.close
                 )
+                
+                # If position was closed by stop-loss or take-profit
+                if close_reason:
+                    closed_trade = session_state.position_manager.get_closed_trades()[-1]
+                    await self.position_handler.handle_position_closed(
+                        db,
+                        session_id,
+                        session_state,
+                        closed_trade,
+                        candle_number,
+                        candle.timestamp,
+                        email_notifications
+                    )
         
         # Get AI decision
         position_state = session_state.position_manager.get_position()
         equity = session_state.position_manager.get_total_equity()
         
-        # Determine if we should run AI decision based on readiness and cadence
-        is_decision_candle = self._is_decision_candle(session_state, candle_number)
-        past_start_index = candle_number >= session_state.decision_start_index
-        
-        should_run_ai = (
-            past_start_index
-            and indicators_ready
-            and is_decision_candle
-        )
+        with tracer.span("gate"):
+            # Determine if we should run AI decision based on readiness and cadence
+            is_decision_candle = self._is_decision_candle(session_state, candle_number)
+            past_start_index = candle_number >= session_state.decision_start_index
+            
+            if not past_start_index:
+                blocked_by = "warmup"
+            elif not indicators_ready:
+                blocked_by = "indicators_not_ready"
+            elif not is_decision_candle:
+                blocked_by = "cadence"
+            else:
+                blocked_by = None
+            
+            # Gate the LLM call: force detectors override cadence, skip detectors
+            # and the per-session budget drop low-value calls
+            gate_context = GateContext(
+                candle_index=candle_number,
+                candle=candle,
+                indicators=indicators,
+                position=position_state,
+                candles=session_state.candles_processed,
+                indicators_at=session_state.indicator_calculator.calculate_all,
+            )
+            verdict = session_state.decision_gate.evaluate(gate_context, blocked_by=blocked_by)
+        should_run_ai = verdict.run
         
         # Log detailed LLM intervention decision criteria
         self.logger.info(
@@ -219,19 +242,58 @@ class CandleProcessor:
             f"  - is_decision_candle: {is_decision_candle} "
             f"(mode={getattr(session_state, 'decision_mode', 'every_candle')}, "
             f"interval={getattr(session_state, 'decision_interval_candles', 1)})\n"
+            f"  - gate: {verdict.source or 'pass'}{' (forced)' if verdict.forced else ''}\n"
             f"  - SHOULD_RUN_AI: {should_run_ai}"
         )
         
+        # Set when a streamed decision was executed before its reasoning finished
+        executed_early: Optional[AIDecision] = None
+        early_execution: Optional[asyncio.Task] = None
+        
         if should_run_ai:
             # Broadcast AI thinking event
-            await self.broadcaster.broadcast_ai_thinking(session_id)
+            with tracer.span("broadcast"):
+                await self.broadcaster.broadcast_ai_thinking(session_id)
             
-            decision = await session_state.ai_trader.get_decision(
-                candle=candle,
-                indicators=indicators,
-                position_state=position_state,
-                equity=equity
-            )
+            async def execute_early(provisional: AIDecision) -> None:
+                # Streaming: place the order as soon as the order fields are in. It runs
+                # in its own task, outside the LLM slot and the request timeout, so
+                # neither can cancel it halfway through its DB writes; executed_early
+                # is set first so the decision is never executed a second time.
+                nonlocal executed_early, early_execution
+                if executed_early is not None:
+                    return
+                executed_early = provisional
+                early_execution = asyncio.create_task(self.execute_decision(
+                    db,
+                    session_id,
+                    session_state,
+                    provisional,
+                    candle,
+                    candle_number,
+                    email_notifications
+                ))
+            
+            async def stream_reasoning(delta: str) -> None:
+                await self.broadcaster.broadcast_ai_decision_partial(session_id, candle_number, delta)
+            
+            try:
+                with tracer.llm_span(candle_number, session_state.ai_trader.prompt_stats):
+                    decision = await session_state.ai_trader.get_decision(
+                        candle=candle,
+                        indicators=indicators,
+                        position_state=position_state,
+                        equity=equity,
+                        on_action=execute_early,
+                        on_reasoning=stream_reasoning
+                    )
+            except BaseException:
+                if early_execution is not None:
+                    # Let an order that is already being placed finish its writes
+                    await asyncio.wait({early_execution})
+                raise
+            decision.candle_index = candle_number
+            session_state.decision_gate.record_call(gate_context)
         else:
             # Build skip reasoning
             if candle_number < session_state.decision_start_index:
@@ -246,6 +308,8 @@ class CandleProcessor:
                     f"insufficient indicators are ready ({ready_count}/{total_count} ready, "
                     f"need {RUNTIME_READINESS_THRESHOLD * 100}%)."
                 )
+            elif verdict.reason:
+                reasoning = f"SKIPPED ({verdict.source}): {verdict.reason}"
             else:
                 reasoning = (
                     f"Decision cadence ({session_state.decision_mode}) skipped candle {candle_number}"
@@ -256,6 +320,7 @@ class CandleProcessor:
                 reasoning=reasoning,
                 size_percentage=0.0,
                 leverage=1,
+                candle_index=candle_number,
             )
         
         # Store AI thought
@@ -282,32 +347,48 @@ class CandleProcessor:
         session_state.ai_thoughts.append(ai_thought)
         
         # Broadcast AI decision event
-        await self.broadcaster.broadcast_ai_decision(session_id, decision)
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_ai_decision(session_id, decision)
         
-        # Execute AI decision
-        await self.execute_decision(
-            db,
-            session_id,
-            session_state,
-            decision,
-            candle,
-            candle_number,
-            email_notifications
-        )
+        # Execute AI decision (unless a streamed decision was already executed)
+        with tracer.span("execute"):
+            if executed_early is None:
+                await self.execute_decision(
+                    db,
+                    session_id,
+                    session_state,
+                    decision,
+                    candle,
+                    candle_number,
+                    email_notifications
+                )
+            else:
+                # Raises if the early execution failed; it is not executed again
+                await early_execution
+                if executed_early.action in ["LONG", "SHORT"] and session_state.position_manager.has_open_position():
+                    # The trade was recorded before the reasoning had finished streaming
+                    await self.position_handler.update_entry_reasoning(
+                        db,
+                        session_id,
+                        session_state,
+                        decision.reasoning
+                    )
         
         # Broadcast stats update
         stats = session_state.position_manager.get_stats()
         self._record_equity_point(session_state, candle.timestamp, stats["current_equity"])
-        await self.broadcaster.broadcast_stats_update(session_id, stats)
-        await self.database_manager.update_session_runtime_stats(
-            db=db,
-            session_id=session_id,
-            current_equity=stats["current_equity"],
-            current_pnl_pct=stats["equity_change_pct"],
-            max_drawdown_pct=session_state.max_drawdown_pct,
-            elapsed_seconds=self._compute_elapsed_seconds(session_state),
-            open_position=self._serialize_position(session_state.position_manager.get_position()),
-        )
+        with tracer.span("broadcast"):
+            await self.broadcaster.broadcast_stats_update(session_id, stats)
+        with tracer.span("db_runtime_stats"):
+            await self.database_manager.update_session_runtime_stats(
+                db=db,
+                session_id=session_id,
+                current_equity=stats["current_equity"],
+                current_pnl_pct=stats["equity_change_pct"],
+                max_drawdown_pct=session_state.max_drawdown_pct,
+                elapsed_seconds=self._compute_elapsed_seconds(session_state),
+                open_position=self._serialize_position(session_state.position_manager.get_position()),
+            )
     
     async def execute_decision(
         self,
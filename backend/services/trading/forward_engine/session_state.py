@@ -15,6 +15,8 @@ from services.market_data_service import Candle
 from services.trading.position_manager import PositionManager
 from services.trading.indicator_calculator import IndicatorCalculator
 from services.ai_trader import AITrader
+from services.trading.decision_gating import DecisionGate
+from services.trading.tracing import CandleTracer
 
 
 @dataclass
@@ -57,6 +59,10 @@ class SessionState:
     decision_start_index: int = 0
     decision_mode: str = "every_candle"
     decision_interval_candles: int = 1
+    # Decides which candles get an LLM call (detectors, budget, skip/force stats)
+    decision_gate: Optional[DecisionGate] = None
+    # Per-stage timing spans for the candle pipeline
+    tracer: Optional[CandleTracer] = None
     
     def __post_init__(self):
         """Initialize mutable default values."""
@@ -72,6 +78,10 @@ class SessionState:
             self.equity_curve = []
         if not self.peak_equity:
             self.peak_equity = self.position_manager.starting_capital
+        if self.decision_gate is None:
+            self.decision_gate = DecisionGate.from_settings()
+        if self.tracer is None:
+            self.tracer = CandleTracer(self.session_id)
         if self.pause_event is None:
             self.pause_event = asyncio.Event()
             self.pause_event.set()  # Start unpaused
@@ -0,0 +1,269 @@
+"""
+Indicator Result Cache
+
+Content-addressed, memory-bounded cache for computed indicator series.
+Entries are keyed by (asset, timeframe, candle fingerprint, indicator id, params)
+so every backtest, forward session warm-up and /api/data/indicators call over
+the same candles pays for each standard indicator only once per process.
+
+Entries can optionally be persisted to the indicator_cache table so popular
+pairs stay warm across restarts (see IndicatorCache.load_from_db/save_to_db).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import hashlib
+import json
+import logging
+import threading
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.activity import IndicatorCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Default memory budget for the shared cache (float64 arrays, 8 bytes per bar)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class IndicatorCacheKey:
+    """Identifies one computed indicator series over one exact candle range"""
+    asset: str
+    timeframe: str
+    fingerprint: str
+    indicator: str
+    params: str = ""
+
+    @classmethod
+    def build(
+        cls,
+        asset: str,
+        timeframe: str,
+        fingerprint: str,
+        indicator: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> "IndicatorCacheKey":
+        """Build a key, canonicalising params so dict ordering doesn't matter"""
+        canonical = json.dumps(params, sort_keys=True, separators=(',', ':')) if params else ""
+        return cls(asset, timeframe, fingerprint, indicator, canonical)
+
+    def digest(self) -> str:
+        """Stable SHA256 digest of the key (used as the persisted cache key)"""
+        raw = f"{self.asset}|{self.timeframe}|{self.fingerprint}|{self.indicator}|{self.params}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def fingerprint_candles(candles: Sequence[Any]) -> str:
+    """
+    Compute a content fingerprint for a candle range.
+
+    Hashes timestamps and OHLCV values, so two requests that resolve to the
+    same candles share cache entries even if they asked for different dates.
+
+    Args:
+        candles: Candle objects (anything with timestamp/open/high/low/close/volume)
+
+    Returns:
+        Hex digest identifying the candle range
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    if not candles:
+        return hasher.hexdigest()
+
+    timestamps = np.fromiter(
+        (c.timestamp.timestamp() for c in candles), dtype=np.float64, count=len(candles)
+    )
+    ohlcv = np.array(
+        [(c.open, c.high, c.low, c.close, c.volume) for c in candles], dtype=np.float64
+    )
+    hasher.update(timestamps.tobytes())
+    hasher.update(ohlcv.tobytes())
+    return hasher.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator float arrays bounded by total bytes.
+
+    Stored arrays are marked read-only; callers wrap them in a Series aligned
+    with their own index instead of mutating them.
+
+    Example:
+        >>> cache = IndicatorCache(max_bytes=64 * 1024 * 1024)
+        >>> key = IndicatorCacheKey.build("BTC/USDT", "1h", fp, "rsi", {"window": 14})
+        >>> values = cache.get_or_compute(key, lambda: compute_rsi(df))
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget; least recently used entries are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[IndicatorCacheKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: IndicatorCacheKey) -> Optional[np.ndarray]:
+        """Return cached values for key (marking it recently used), or None"""
+        with self._lock:
+            values = self._entries.get(key)
+            if values is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+    def put(self, key: IndicatorCacheKey, values: Any) -> np.ndarray:
+        """
+        Store values for key, evicting least recently used entries if needed.
+
+        Arrays larger than the whole budget are returned but not stored.
+
+        Returns:
+            The stored read-only float64 array
+        """
+        array = np.array(values, dtype=np.float64)
+        array.setflags(write=False)
+
+        if array.nbytes > self.max_bytes:
+            return array
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            self._entries[key] = array
+            self._bytes += array.nbytes
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+        return array
+
+    def get_or_compute(self, key: IndicatorCacheKey, compute: Callable[[], Any]) -> np.ndarray:
+        """Return cached values for key, computing and storing them on a miss"""
+        values = self.get(key)
+        if values is not None:
+            return values
+        return self.put(key, compute())
+
+    def __contains__(self, key: IndicatorCacheKey) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    async def load_from_db(self, db: AsyncSession, keys: List[IndicatorCacheKey]) -> int:
+        """
+        Warm the memory cache with persisted entries for the given keys.
+
+        Keys already in memory are skipped. Failures are logged and ignored,
+        since the cache is only an optimisation.
+
+        Returns:
+            Number of entries loaded
+        """
+        missing = {key.digest(): key for key in keys if key not in self}
+        if not missing:
+            return 0
+
+        try:
+            result = await db.execute(
+                select(IndicatorCacheEntry.cache_key, IndicatorCacheEntry.series)
+                .where(IndicatorCacheEntry.cache_key.in_(list(missing.keys())))
+            )
+            rows = result.all()
+        except Exception as e:
+            logger.warning(f"Failed to load indicator cache entries: {e}")
+            return 0
+
+        for cache_key, values in rows:
+            self.put(missing[cache_key], [np.nan if v is None else v for v in values])
+
+        if rows:
+            logger.debug(f"Loaded {len(rows)} indicator cache entries from database")
+        return len(rows)
+
+    async def save_to_db(self, db: AsyncSession, keys: List[IndicatorCacheKey]) -> int:
+        """
+        Persist in-memory entries for the given keys (existing rows are kept).
+
+        Returns:
+            Number of entries written
+        """
+        rows = []
+        for key in keys:
+            with self._lock:
+                values = self._entries.get(key)
+            if values is None:
+                continue
+            rows.append({
+                "cache_key": key.digest(),
+                "asset": key.asset,
+                "timeframe": key.timeframe,
+                "fingerprint": key.fingerprint,
+                "indicator": key.indicator,
+                "params": json.loads(key.params) if key.params else None,
+                "series": values.tolist(),
+            })
+
+        if not rows:
+            return 0
+
+        try:
+            stmt = insert(IndicatorCacheEntry).values(rows).on_conflict_do_nothing(
+                index_elements=["cache_key"]
+            )
+            await db.execute(stmt)
+            await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist indicator cache entries: {e}")
+            await db.rollback()
+            return 0
+
+        return len(rows)
+
+
+# Process-wide cache shared by backtests, forward sessions and the data API
+indicator_cache = IndicatorCache()
@@ -11,9 +11,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 import logging
+import numpy as np
 import pandas as pd
 import ta
 from .custom_indicator_engine import CustomIndicatorEngine, CustomIndicatorError
+from .indicator_cache import IndicatorCache, IndicatorCacheKey, fingerprint_candles, indicator_cache
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +100,36 @@ class IndicatorCalculator:
         'zscore': 20,        # 20-period Z-score
     }
     
+    # Parameters each built-in indicator is computed with (passed straight to
+    # the ta constructors). They are part of the shared indicator cache key,
+    # so changing a value here invalidates previously cached results.
+    INDICATOR_PARAMS: Dict[str, Dict[str, Any]] = {
+        'rsi': {'window': 14},
+        'stoch': {'window': 14, 'smooth_window': 3},
+        'cci': {'window': 20},
+        'mom': {'window': 10},
+        'ao': {'window1': 5, 'window2': 34},
+        'macd': {'window_slow': 26, 'window_fast': 12, 'window_sign': 9},
+        'ema_20': {'window': 20},
+        'ema_50': {'window': 50},
+        'ema_200': {'window': 200},
+        'sma_20': {'window': 20},
+        'sma_50': {'window': 50},
+        'sma_200': {'window': 200},
+        'adx': {'window': 14},
+        'psar': {'step': 0.02, 'max_step': 0.2},
+        'bbands': {'window': 20, 'window_dev': 2},
+        'atr': {'window': 14},
+        'kc': {'window': 20, 'window_atr': 10},
+        'donchian': {'window': 20},
+        'vwap': {'window': 14},
+        'mfi': {'window': 14},
+        'cmf': {'window': 20},
+        'supertrend': {'window': 10, 'multiplier': 3.0},
+        'ichimoku': {'window1': 9, 'window2': 26, 'window3': 52},
+        'zscore': {'window': 20},
+    }
+    
     ALL_INDICATORS = (
         MOMENTUM_INDICATORS + 
         TREND_INDICATORS + 
@@ -114,7 +146,10 @@ class IndicatorCalculator:
         candles: List[Candle], 
         enabled_indicators: List[str], 
         mode: str = "omni",
-        custom_indicators: Optional[List[Dict[str, Any]]] = None
+        custom_indicators: Optional[List[Dict[str, Any]]] = None,
+        asset: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        shared_cache: Optional[IndicatorCache] = None
     ):
         """
         Initialize the indicator calculator.
@@ -124,12 +159,24 @@ class IndicatorCalculator:
             enabled_indicators: List of indicator names to calculate
             mode: "monk" or "omni" - determines available indicators
             custom_indicators: Optional list of custom indicator rule definitions
+            asset: Trading asset; together with timeframe enables the shared indicator cache
+            timeframe: Candlestick timeframe
+            shared_cache: Cache to use instead of the process-wide indicator cache
         """
         self.candles = candles
         self.mode = mode.lower()
         self.cache: Dict[str, pd.Series] = {}
         self.custom_indicator_rules = custom_indicators or []
         self.custom_engine: Optional[CustomIndicatorEngine] = None
+        self.asset = asset
+        self.timeframe = timeframe
+        self.indicator_cache: Optional[IndicatorCache] = None
+        self.fingerprint: Optional[str] = None
+        # Keys computed (cache misses) by this calculator, for persistence
+        self.computed_cache_keys: List[IndicatorCacheKey] = []
+        if asset and timeframe:
+            self.indicator_cache = shared_cache if shared_cache is not None else indicator_cache
+            self.fingerprint = fingerprint_candles(candles)
         
         # Validate mode
         if self.mode not in ['monk', 'omni']:
@@ -240,164 +287,160 @@ class IndicatorCalculator:
         Calculate all enabled indicators using ta library.
         Results are cached in self.cache for fast lookup.
         Handles insufficient data by leaving NaN values.
+        
+        When the calculator knows its asset/timeframe, results are shared
+        through the process-wide indicator cache so identical candle ranges
+        are only computed once.
         """
+        for indicator in self.enabled_indicators:
+            if self.indicator_cache is None:
+                self.cache[indicator] = self._compute_indicator(indicator)
+                continue
+            
+            key = self._cache_key(indicator)
+            values = self.indicator_cache.get(key)
+            if values is None:
+                values = self.indicator_cache.put(key, self._compute_indicator(indicator))
+                self.computed_cache_keys.append(key)
+            self.cache[indicator] = pd.Series(values, index=self.df.index, copy=False)
+    
+    def _cache_key(self, indicator: str) -> IndicatorCacheKey:
+        """Build the shared cache key for an indicator over this candle range"""
+        return IndicatorCacheKey.build(
+            self.asset,
+            self.timeframe,
+            self.fingerprint,
+            indicator,
+            self.INDICATOR_PARAMS.get(indicator),
+        )
+    
+    def _compute_indicator(self, indicator: str) -> pd.Series:
+        """
+        Compute a single built-in indicator over the full DataFrame.
+        
+        Args:
+            indicator: Normalized indicator id (e.g. 'rsi', 'ema_200')
+            
+        Returns:
+            Series aligned with self.df (NaN where history is insufficient)
+        """
+        params = self.INDICATOR_PARAMS.get(indicator, {})
+        high, low, close, volume = self.df['high'], self.df['low'], self.df['close'], self.df['volume']
+        
         # MOMENTUM INDICATORS
         
-        if 'rsi' in self.enabled_indicators:
+        if indicator == 'rsi':
             # RSI - Relative Strength Index (default period 14)
-            self.cache['rsi'] = ta.momentum.RSIIndicator(self.df['close'], window=14).rsi()
+            return ta.momentum.RSIIndicator(close, **params).rsi()
         
-        if 'stoch' in self.enabled_indicators:
+        if indicator == 'stoch':
             # Stochastic Oscillator
-            stoch_indicator = ta.momentum.StochasticOscillator(
-                self.df['high'], self.df['low'], self.df['close']
-            )
-            self.cache['stoch'] = stoch_indicator.stoch()
+            return ta.momentum.StochasticOscillator(high, low, close, **params).stoch()
         
-        if 'cci' in self.enabled_indicators:
+        if indicator == 'cci':
             # CCI - Commodity Channel Index (default period 20)
-            self.cache['cci'] = ta.trend.CCIIndicator(
-                self.df['high'], self.df['low'], self.df['close'], window=20
-            ).cci()
+            return ta.trend.CCIIndicator(high, low, close, **params).cci()
         
-        if 'mom' in self.enabled_indicators:
+        if indicator == 'mom':
             # Momentum (rate of change, default period 10)
-            self.cache['mom'] = ta.momentum.ROCIndicator(self.df['close'], window=10).roc()
+            return ta.momentum.ROCIndicator(close, **params).roc()
         
-        if 'ao' in self.enabled_indicators:
+        if indicator == 'ao':
             # Awesome Oscillator
-            self.cache['ao'] = ta.momentum.AwesomeOscillatorIndicator(
-                self.df['high'], self.df['low']
-            ).awesome_oscillator()
+            return ta.momentum.AwesomeOscillatorIndicator(high, low, **params).awesome_oscillator()
         
         # TREND INDICATORS
         
-        if 'macd' in self.enabled_indicators:
+        if indicator == 'macd':
             # MACD - Moving Average Convergence Divergence
-            macd_indicator = ta.trend.MACD(self.df['close'])
-            self.cache['macd'] = macd_indicator.macd()
-        
-        if 'ema_20' in self.enabled_indicators:
-            self.cache['ema_20'] = ta.trend.EMAIndicator(self.df['close'], window=20).ema_indicator()
+            return ta.trend.MACD(close, **params).macd()
         
-        if 'ema_50' in self.enabled_indicators:
-            self.cache['ema_50'] = ta.trend.EMAIndicator(self.df['close'], window=50).ema_indicator()
+        if indicator in ('ema_20', 'ema_50', 'ema_200'):
+            return ta.trend.EMAIndicator(close, **params).ema_indicator()
         
-        if 'ema_200' in self.enabled_indicators:
-            self.cache['ema_200'] = ta.trend.EMAIndicator(self.df['close'], window=200).ema_indicator()
+        if indicator in ('sma_20', 'sma_50', 'sma_200'):
+            return ta.trend.SMAIndicator(close, **params).sma_indicator()
         
-        if 'sma_20' in self.enabled_indicators:
-            self.cache['sma_20'] = ta.trend.SMAIndicator(self.df['close'], window=20).sma_indicator()
-        
-        if 'sma_50' in self.enabled_indicators:
-            self.cache['sma_50'] = ta.trend.SMAIndicator(self.df['close'], window=50).sma_indicator()
-        
-        if 'sma_200' in self.enabled_indicators:
-            self.cache['sma_200'] = ta.trend.SMAIndicator(self.df['close'], window=200).sma_indicator()
-        
-        if 'adx' in self.enabled_indicators:
+        if indicator == 'adx':
             # ADX - Average Directional Index
-            self.cache['adx'] = ta.trend.ADXIndicator(
-                self.df['high'], self.df['low'], self.df['close']
-            ).adx()
+            return ta.trend.ADXIndicator(high, low, close, **params).adx()
         
-        if 'psar' in self.enabled_indicators:
+        if indicator == 'psar':
             # Parabolic SAR
-            psar_indicator = ta.trend.PSARIndicator(
-                self.df['high'], self.df['low'], self.df['close']
-            )
+            psar_indicator = ta.trend.PSARIndicator(high, low, close, **params)
             # Combine up and down trends
             psar_up = psar_indicator.psar_up()
             psar_down = psar_indicator.psar_down()
-            self.cache['psar'] = psar_up.fillna(psar_down)
+            return psar_up.fillna(psar_down)
         
         # VOLATILITY INDICATORS
         
-        if 'bbands' in self.enabled_indicators:
+        if indicator == 'bbands':
             # Bollinger Bands - store middle band value
-            bbands_indicator = ta.volatility.BollingerBands(self.df['close'])
-            self.cache['bbands'] = bbands_indicator.bollinger_mavg()
+            return ta.volatility.BollingerBands(close, **params).bollinger_mavg()
         
-        if 'atr' in self.enabled_indicators:
+        if indicator == 'atr':
             # ATR - Average True Range
-            self.cache['atr'] = ta.volatility.AverageTrueRange(
-                self.df['high'], self.df['low'], self.df['close']
-            ).average_true_range()
+            return ta.volatility.AverageTrueRange(high, low, close, **params).average_true_range()
         
-        if 'kc' in self.enabled_indicators:
+        if indicator == 'kc':
             # Keltner Channels - store middle line
-            kc_indicator = ta.volatility.KeltnerChannel(
-                self.df['high'], self.df['low'], self.df['close']
-            )
-            self.cache['kc'] = kc_indicator.keltner_channel_mband()
+            return ta.volatility.KeltnerChannel(high, low, close, **params).keltner_channel_mband()
         
-        if 'donchian' in self.enabled_indicators:
+        if indicator == 'donchian':
             # Donchian Channels - store middle line
-            donchian_indicator = ta.volatility.DonchianChannel(
-                self.df['high'], self.df['low'], self.df['close']
-            )
-            self.cache['donchian'] = donchian_indicator.donchian_channel_mband()
+            return ta.volatility.DonchianChannel(high, low, close, **params).donchian_channel_mband()
         
         # VOLUME INDICATORS
         
-        if 'obv' in self.enabled_indicators:
+        if indicator == 'obv':
             # OBV - On Balance Volume
-            self.cache['obv'] = ta.volume.OnBalanceVolumeIndicator(
-                self.df['close'], self.df['volume']
-            ).on_balance_volume()
+            return ta.volume.OnBalanceVolumeIndicator(close, volume).on_balance_volume()
         
-        if 'vwap' in self.enabled_indicators:
+        if indicator == 'vwap':
             # VWAP - Volume Weighted Average Price
-            self.cache['vwap'] = ta.volume.VolumeWeightedAveragePrice(
-                self.df['high'], self.df['low'], self.df['close'], self.df['volume']
+            return ta.volume.VolumeWeightedAveragePrice(
+                high, low, close, volume, **params
             ).volume_weighted_average_price()
         
-        if 'mfi' in self.enabled_indicators:
+        if indicator == 'mfi':
             # MFI - Money Flow Index
-            self.cache['mfi'] = ta.volume.MFIIndicator(
-                self.df['high'], self.df['low'], self.df['close'], self.df['volume']
-            ).money_flow_index()
+            return ta.volume.MFIIndicator(high, low, close, volume, **params).money_flow_index()
         
-        if 'cmf' in self.enabled_indicators:
+        if indicator == 'cmf':
             # CMF - Chaikin Money Flow
-            self.cache['cmf'] = ta.volume.ChaikinMoneyFlowIndicator(
-                self.df['high'], self.df['low'], self.df['close'], self.df['volume']
+            return ta.volume.ChaikinMoneyFlowIndicator(
+                high, low, close, volume, **params
             ).chaikin_money_flow()
         
-        if 'ad_line' in self.enabled_indicators:
+        if indicator == 'ad_line':
             # Accumulation/Distribution Line
-            self.cache['ad_line'] = ta.volume.AccDistIndexIndicator(
-                self.df['high'], self.df['low'], self.df['close'], self.df['volume']
-            ).acc_dist_index()
+            return ta.volume.AccDistIndexIndicator(high, low, close, volume).acc_dist_index()
         
         # ADVANCED INDICATORS
         
-        if 'supertrend' in self.enabled_indicators:
+        if indicator == 'supertrend':
             # Supertrend - using ATR-based calculation
             # Note: ta library doesn't have supertrend, so we'll implement a simple version
             atr = ta.volatility.AverageTrueRange(
-                self.df['high'], self.df['low'], self.df['close'], window=10
+                high, low, close, window=params['window']
             ).average_true_range()
-            hl_avg = (self.df['high'] + self.df['low']) / 2
-            multiplier = 3.0
-            upper_band = hl_avg + (multiplier * atr)
-            lower_band = hl_avg - (multiplier * atr)
+            hl_avg = (high + low) / 2
             # Simplified: use lower band for uptrend, upper for downtrend
-            self.cache['supertrend'] = lower_band
+            return hl_avg - (params['multiplier'] * atr)
         
-        if 'ichimoku' in self.enabled_indicators:
+        if indicator == 'ichimoku':
             # Ichimoku Cloud - store conversion line (Tenkan-sen)
-            ichimoku_indicator = ta.trend.IchimokuIndicator(
-                self.df['high'], self.df['low']
-            )
-            self.cache['ichimoku'] = ichimoku_indicator.ichimoku_conversion_line()
+            return ta.trend.IchimokuIndicator(high, low, **params).ichimoku_conversion_line()
         
-        if 'zscore' in self.enabled_indicators:
+        if indicator == 'zscore':
             # Z-Score for mean reversion (using 20-period)
-            window = 20
-            mean = self.df['close'].rolling(window=window).mean()
-            std = self.df['close'].rolling(window=window).std()
-            self.cache['zscore'] = (self.df['close'] - mean) / std
+            window = params['window']
+            mean = close.rolling(window=window).mean()
+            std = close.rolling(window=window).std()
+            return (close - mean) / std
+        
+        raise ValueError(f"Invalid indicators: {[indicator]}")
     
     def calculate_all(self, index: int) -> Dict[str, Optional[float]]:
         """
@@ -478,13 +521,82 @@ class IndicatorCalculator:
                 # Re-raise with more context
                 raise ValueError(f"Failed to add custom indicator rule: {e}")
         
-        # Calculate all custom indicators and add to cache
-        for name in self.custom_engine.get_custom_indicator_names():
-            try:
-                self.cache[name] = self.custom_engine.calculate(name)
-            except CustomIndicatorError as e:
-                # Re-raise with more context
-                raise ValueError(f"Failed to calculate custom indicator '{name}': {e}")
+        # Calculate all custom indicators (one compiled pass) and add to cache
+        self.cache.update(self.custom_engine.calculate_all())
+        for name, error in self.custom_engine.rule_errors.items():
+            # Re-raise with more context
+            raise ValueError(f"Failed to calculate custom indicator '{name}': {error}")
+    
+    def extend(self, candles: List[Candle]) -> "IndicatorCalculator":
+        """
+        Build the calculator for the next forward-test candle.
+        
+        Built-in indicators are calculated as in the constructor (served from
+        the shared cache when possible), but custom indicators are advanced by
+        one bar with CustomIndicatorEngine.calculate_row() instead of running
+        every rule over the full history again. This calculator's custom
+        engine is handed over to the new one.
+        
+        Args:
+            candles: This calculator's candles plus the new candle
+        
+        Returns:
+            IndicatorCalculator over candles (a full rebuild if candles is not
+            exactly one bar longer than this calculator's history)
+        """
+        extends_by_one_bar = (
+            self.custom_engine is not None
+            and len(self.df) > 0
+            and len(candles) == len(self.df) + 1
+            and candles[-2].timestamp == self.df.index[-1]
+        )
+        calculator = IndicatorCalculator(
+            candles=candles,
+            enabled_indicators=self.enabled_indicators,
+            mode=self.mode,
+            custom_indicators=None if extends_by_one_bar else self.custom_indicator_rules,
+            asset=self.asset,
+            timeframe=self.timeframe,
+            shared_cache=self.indicator_cache,
+        )
+        if not extends_by_one_bar:
+            return calculator
+        
+        latest = calculator.df.iloc[-1]
+        values = {column: latest[column] for column in ('open', 'high', 'low', 'close', 'volume')}
+        values.update({name: series.iloc[-1] for name, series in calculator.cache.items()})
+        
+        engine = self.custom_engine
+        for name, value in engine.calculate_row(values).items():
+            series = pd.Series(np.append(self.cache[name].to_numpy(), value), index=calculator.df.index)
+            calculator.cache[name] = series
+            engine.calculation_cache[name] = series
+        engine.df = calculator.df
+        
+        calculator.custom_engine = engine
+        calculator.custom_indicator_rules = self.custom_indicator_rules
+        return calculator
+    
+    @classmethod
+    def build_cache_keys(
+        cls,
+        candles: List[Candle],
+        enabled_indicators: List[str],
+        asset: str,
+        timeframe: str
+    ) -> List[IndicatorCacheKey]:
+        """
+        Build the shared cache keys a calculator over these candles would use.
+        
+        Lets callers warm the cache (e.g. from the database) before
+        constructing the calculator.
+        """
+        fingerprint = fingerprint_candles(candles)
+        return [
+            IndicatorCacheKey.build(asset, timeframe, fingerprint, ind, cls.INDICATOR_PARAMS.get(ind))
+            for ind in cls._normalize_indicators(enabled_indicators)
+            if ind in cls.ALL_INDICATORS
+        ]
     
     def get_custom_indicator_names(self) -> List[str]:
         """
@@ -498,13 +610,19 @@ class IndicatorCalculator:
         return []
 
     @classmethod
-    def compute_min_history(cls, enabled_indicators: List[str]) -> int:
+    def compute_min_history(
+        cls,
+        enabled_indicators: List[str],
+        custom_indicators: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
         """
         Compute the approximate minimum number of candles required before all
         requested indicators are expected to have non-null values.
 
         This is a conservative estimate used to decide when it's reasonable to
-        start asking the LLM for trading decisions.
+        start asking the LLM for trading decisions. Custom indicators add the
+        lookback of their window operators on top of the indicators they read
+        (see CustomIndicatorEngine.derive_min_history).
         """
         normalized = cls._normalize_indicators(enabled_indicators)
         max_history = 0
@@ -512,6 +630,13 @@ class IndicatorCalculator:
             required = cls.INDICATOR_MIN_HISTORY.get(ind, 0)
             if required > max_history:
                 max_history = required
+
+        if custom_indicators:
+            # Sub-columns such as macd_signal aren't listed; assume the slowest enabled indicator
+            custom_history = CustomIndicatorEngine.derive_min_history(
+                custom_indicators, cls.INDICATOR_MIN_HISTORY, default=max_history
+            )
+            max_history = max([max_history, *custom_history.values()])
         return max_history
     
     def check_indicator_readiness(self, index: int, min_ready_percentage: float = 0.8) -> bool:
@@ -0,0 +1,357 @@
+"""
+Rolling Window Operators
+
+Streaming O(n) implementations of the window operators available to custom
+indicators (mean, sum, min, max, std, ema, lag, diff, crossover).
+
+Each operator is a small state object with two entry points:
+- apply(values) evaluates a whole array with vectorized pandas/NumPy
+  rolling operations (full-history evaluation, O(n) whatever the window)
+  and leaves the state positioned after the last bar
+- update(value) consumes one bar and returns the operator value for that
+  bar (per-bar incremental evaluation in forward tests)
+
+Every update is amortised O(1):
+- sum/mean: running sum over a ring buffer
+- std: sliding Welford (running mean and sum of squared deviations)
+- min/max: monotonic deque of candidate extremes
+
+NaN handling follows pandas rolling(window, min_periods=window): a window
+containing NaN produces NaN.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class RollingState:
+    """Base class for streaming window operators"""
+
+    def update(self, value: float) -> float:
+        raise NotImplementedError
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Feed a whole array through the operator, returning one output per bar"""
+        return np.fromiter((self.update(v) for v in values), dtype=np.float64, count=len(values))
+
+
+class _WindowState(RollingState):
+    """Keeps the last `window` values and the number of NaNs among them"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.nan_count = 0
+        self.pops_since_resync = 0
+
+    def _push(self) -> None:
+        pass
+
+    def _pop(self, value: float) -> None:
+        pass
+
+    def _resync(self) -> None:
+        """Recompute running aggregates exactly (called once per `window` pops)"""
+        pass
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        self.values.append(value)
+        self._push()
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._pop(old)
+            # Periodically recompute to stop floating point drift (amortised O(1))
+            self.pops_since_resync += 1
+            if self.pops_since_resync >= self.window and not self.nan_count:
+                self._resync()
+                self.pops_since_resync = 0
+
+        if len(self.values) < self.window or self.nan_count:
+            return math.nan
+        return self._result()
+
+    def _result(self) -> float:
+        raise NotImplementedError
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        """Operator values for every bar of series (vectorized)"""
+        raise NotImplementedError
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Evaluate a whole array with pandas rolling, continuing from the buffered bars"""
+        history = np.fromiter(self.values, dtype=np.float64, count=len(self.values))
+        series = pd.Series(np.concatenate([history, np.asarray(values, dtype=np.float64)]))
+        result = self._rolling(series)[len(history):]
+
+        # Rebuild the streaming state from the last window of bars
+        tail = series.to_numpy()[-self.window:]
+        self.__init__(self.window)
+        for value in tail:
+            self.update(value)
+        return result
+
+
+class RollingSum(_WindowState):
+    """Sum over the last `window` bars (running sum)"""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.total = 0.0
+
+    def _push(self) -> None:
+        value = self.values[-1]
+        if not math.isnan(value):
+            self.total += value
+
+    def _pop(self, value: float) -> None:
+        self.total -= value
+
+    def _resync(self) -> None:
+        self.total = math.fsum(self.values)
+
+    def _result(self) -> float:
+        return self.total
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        return series.rolling(self.window).sum().to_numpy()
+
+
+class RollingMean(RollingSum):
+    """Mean over the last `window` bars"""
+
+    def _result(self) -> float:
+        return self.total / self.window
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        return series.rolling(self.window).mean().to_numpy()
+
+
+class RollingStd(_WindowState):
+    """Sample standard deviation (ddof=1) over the last `window` bars"""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _push(self) -> None:
+        value = self.values[-1]
+        if math.isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def _pop(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+
+    def _resync(self) -> None:
+        self.count = len(self.values)
+        self.mean = math.fsum(self.values) / self.count
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in self.values)
+
+    def _result(self) -> float:
+        if self.window < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        return series.rolling(self.window).std(ddof=1).to_numpy()
+
+
+class _RollingExtreme(_WindowState):
+    """Min/max via a monotonic deque of (bar index, value) candidates"""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.index = -1
+        self.candidates: Deque[Tuple[int, float]] = deque()
+
+    def _dominates(self, new: float, old: float) -> bool:
+        raise NotImplementedError
+
+    def _push(self) -> None:
+        self.index += 1
+        value = self.values[-1]
+        if not math.isnan(value):
+            while self.candidates and self._dominates(value, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((self.index, value))
+        while self.candidates and self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+
+    def _result(self) -> float:
+        return self.candidates[0][1]
+
+
+class RollingMin(_RollingExtreme):
+    """Lowest value over the last `window` bars"""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        return series.rolling(self.window).min().to_numpy()
+
+
+class RollingMax(_RollingExtreme):
+    """Highest value over the last `window` bars"""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def _rolling(self, series: pd.Series) -> np.ndarray:
+        return series.rolling(self.window).max().to_numpy()
+
+
+class Ema(RollingState):
+    """
+    Exponential moving average with span `window` (alpha = 2 / (window + 1)).
+
+    Matches ta's EMAIndicator: seeded with the first valid value and NaN
+    until `window` valid values have been seen. NaN inputs yield NaN and
+    leave the average untouched.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+        self.value = math.nan
+        self.seen = 0
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if math.isnan(value):
+            return math.nan
+        self.seen += 1
+        if self.seen == 1:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value if self.seen >= self.window else math.nan
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Evaluate a whole array with pandas ewm, seeded with the current average"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return values.copy()
+        valid = ~np.isnan(values)
+        seeded = self.seen > 0
+        series = pd.Series(np.concatenate([[self.value], values]) if seeded else values)
+        averaged = series.ewm(alpha=self.alpha, adjust=False, ignore_na=True).mean().to_numpy()
+        if seeded:
+            averaged = averaged[1:]
+        seen = self.seen + np.cumsum(valid)
+
+        if valid.any():
+            self.value = float(averaged[valid][-1])
+        self.seen = int(seen[-1])
+        return np.where(valid & (seen >= self.window), averaged, np.nan)
+
+
+class Lag(RollingState):
+    """Value from `window` bars ago"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: Deque[float] = deque(maxlen=window + 1)
+
+    def update(self, value: float) -> float:
+        self.values.append(float(value))
+        if len(self.values) <= self.window:
+            return math.nan
+        return self.values[0]
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Shift a whole array by `window` bars, continuing from the buffered bars"""
+        history = np.fromiter(self.values, dtype=np.float64, count=len(self.values))
+        series = pd.Series(np.concatenate([history, np.asarray(values, dtype=np.float64)]))
+        self.values.extend(series.to_numpy()[-(self.window + 1):])
+        return series.shift(self.window).to_numpy()[len(history):]
+
+
+class Diff(Lag):
+    """Change versus `window` bars ago"""
+
+    def update(self, value: float) -> float:
+        return float(value) - super().update(value)
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        return np.asarray(values, dtype=np.float64) - super().apply(values)
+
+
+class Crossover:
+    """
+    Crossing of two series: 1.0 when left crosses above right, -1.0 when it
+    crosses below, 0.0 otherwise (NaN if either bar has missing inputs).
+    """
+
+    def __init__(self):
+        self.previous = math.nan
+
+    def update(self, left: float, right: float) -> float:
+        spread = float(left) - float(right)
+        previous, self.previous = self.previous, spread
+        if math.isnan(spread) or math.isnan(previous):
+            return math.nan
+        if previous <= 0 < spread:
+            return 1.0
+        if previous >= 0 > spread:
+            return -1.0
+        return 0.0
+
+    def apply(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        spread = np.asarray(left, dtype=np.float64) - np.asarray(right, dtype=np.float64)
+        if len(spread) == 0:
+            return spread
+        previous = np.concatenate([[self.previous], spread[:-1]])
+        self.previous = float(spread[-1])
+
+        signal = np.where(
+            (previous <= 0) & (spread > 0), 1.0,
+            np.where((previous >= 0) & (spread < 0), -1.0, 0.0)
+        )
+        return np.where(np.isnan(spread) | np.isnan(previous), np.nan, signal)
+
+
+# Window operators available to custom indicator formulas
+WINDOW_OPERATORS: Dict[str, Callable[[int], RollingState]] = {
+    'mean': RollingMean,
+    'sum': RollingSum,
+    'min': RollingMin,
+    'max': RollingMax,
+    'std': RollingStd,
+    'ema': Ema,
+    'lag': Lag,
+    'diff': Diff,
+}
+
+
+def window_warmup(operator: str, window: int) -> int:
+    """
+    Extra bars an operator needs on top of its operand's warm-up.
+
+    Windowed aggregates need window - 1 more bars; lag/diff look `window` bars back.
+    """
+    if operator in ('lag', 'diff'):
+        return window
+    return window - 1
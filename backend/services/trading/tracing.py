@@ -0,0 +1,233 @@
+"""
+Per-session timing spans for the candle pipeline.
+
+Purpose:
+    Records where a candle's processing time goes (indicators, broadcasts,
+    position updates, the LLM call, DB writes) so a slow session can be
+    attributed to the database, the LLM or the WebSocket layer.
+
+    Spans are plain context managers around the existing awaits. A disabled
+    tracer hands out one shared no-op span, so instrumentation costs a method
+    call per stage when CANDLE_TRACING_ENABLED is off.
+
+    LLM spans are additionally tagged with the tokens and scheduler queue wait
+    of that call (read from the trader's PromptCacheStats before and after).
+
+Usage:
+    from services.trading.tracing import CandleTracer
+
+    tracer = CandleTracer(session_id)
+    with tracer.span("indicators"):
+        indicators = calculator.calculate_all(index)
+    with tracer.llm_span(index, ai_trader.prompt_stats):
+        decision = await ai_trader.get_decision(...)
+
+    tracer.summary()  # per-stage count/avg/p50/p95/p99/max and tagged LLM calls
+"""
+import time
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import settings
+
+
+# Last N tagged LLM calls kept per session for inspection
+RECENT_LLM_CALLS = 20
+
+
+class _NoopSpan:
+    """Shared span used when tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """Times one stage and records it on exit (also on exceptions)"""
+
+    __slots__ = ("tracer", "name", "started")
+
+    def __init__(self, tracer: "CandleTracer", name: str):
+        self.tracer = tracer
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class _LLMSpan(_Span):
+    """LLM stage span tagged with the call's token usage and queue wait"""
+
+    __slots__ = ("candle_index", "prompt_stats", "usage_before")
+
+    def __init__(self, tracer: "CandleTracer", candle_index: int, prompt_stats: Any):
+        super().__init__(tracer, "llm")
+        self.candle_index = candle_index
+        self.prompt_stats = prompt_stats
+        self.usage_before: Dict[str, float] = {}
+
+    def __enter__(self):
+        self.usage_before = self.prompt_stats.usage_totals()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self.started) * 1000
+        self.tracer.record(self.name, duration_ms)
+        usage_after = self.prompt_stats.usage_totals()
+        self.tracer.record_llm_call(
+            self.candle_index,
+            duration_ms,
+            {key: usage_after[key] - self.usage_before.get(key, 0) for key in usage_after},
+        )
+        return False
+
+
+class _StageSamples:
+    """Running count/total plus a bounded window of recent durations"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "samples")
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        self.samples.append(duration_ms)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": _percentile(ordered, 0.50),
+            "p95_ms": _percentile(ordered, 0.95),
+            "p99_ms": _percentile(ordered, 0.99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+# Tracers of running sessions, for GET /api/health/timings
+_active_tracers: "weakref.WeakValueDictionary[str, CandleTracer]" = weakref.WeakValueDictionary()
+
+
+class CandleTracer:
+    """
+    Collects stage durations for one session.
+
+    Stage names are free-form; the processors use "candle" for the whole
+    candle and one name per step inside it.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        enabled: Optional[bool] = None,
+        max_samples: Optional[int] = None
+    ):
+        """
+        Initialize tracer.
+
+        Args:
+            session_id: Session identifier
+            enabled: Record spans (default: settings.CANDLE_TRACING_ENABLED)
+            max_samples: Durations kept per stage for percentiles
+                (default: settings.CANDLE_TRACING_MAX_SAMPLES)
+        """
+        self.session_id = str(session_id)
+        self.enabled = settings.CANDLE_TRACING_ENABLED if enabled is None else enabled
+        self.max_samples = max_samples or settings.CANDLE_TRACING_MAX_SAMPLES
+        self.stages: Dict[str, _StageSamples] = {}
+        self.llm_calls = 0
+        self.llm_totals: Dict[str, float] = {}
+        self.llm_queue_waits_ms: Deque[float] = deque(maxlen=self.max_samples)
+        self.recent_llm_calls: Deque[Dict[str, Any]] = deque(maxlen=RECENT_LLM_CALLS)
+        if self.enabled:
+            _active_tracers[self.session_id] = self
+
+    def span(self, name: str):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name)
+
+    def llm_span(self, candle_index: int, prompt_stats: Any):
+        """
+        Context manager timing an LLM decision and tagging it with usage.
+
+        Args:
+            candle_index: Candle the decision is for
+            prompt_stats: The trader's PromptCacheStats (provides usage_totals())
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _LLMSpan(self, candle_index, prompt_stats)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        """Record one stage duration in milliseconds"""
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _StageSamples(self.max_samples)
+        stage.add(duration_ms)
+
+    def record_llm_call(self, candle_index: int, duration_ms: float, usage: Dict[str, float]) -> None:
+        """Record the tags of one LLM decision (token and queue wait deltas)"""
+        self.llm_calls += 1
+        for key, value in usage.items():
+            self.llm_totals[key] = self.llm_totals.get(key, 0) + value
+        self.llm_queue_waits_ms.append(usage.get("queue_wait_ms", 0.0))
+        self.recent_llm_calls.append({
+            "candle_index": candle_index,
+            "duration_ms": round(duration_ms, 1),
+            **{key: round(value, 1) if isinstance(value, float) else value for key, value in usage.items()},
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of stage percentiles and LLM call tags"""
+        queue_waits = sorted(self.llm_queue_waits_ms)
+        return {
+            "enabled": self.enabled,
+            "stages": {name: stage.as_dict() for name, stage in self.stages.items()},
+            "llm_calls": {
+                "count": self.llm_calls,
+                "prompt_tokens": int(self.llm_totals.get("prompt_tokens", 0)),
+                "completion_tokens": int(self.llm_totals.get("completion_tokens", 0)),
+                "cached_prompt_tokens": int(self.llm_totals.get("cached_prompt_tokens", 0)),
+                "queue_wait_p50_ms": _percentile(queue_waits, 0.50),
+                "queue_wait_p95_ms": _percentile(queue_waits, 0.95),
+                "queue_wait_p99_ms": _percentile(queue_waits, 0.99),
+                "recent": list(self.recent_llm_calls),
+            },
+        }
+
+
+def active_tracer_summaries() -> Dict[str, Dict[str, Any]]:
+    """Timing summaries of all running sessions, keyed by session id"""
+    return {session_id: tracer.summary() for session_id, tracer in list(_active_tracers.items())}
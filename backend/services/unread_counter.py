@@ -0,0 +1,121 @@
+"""
+Unread Notification Counter for AlphaLab.
+
+Purpose:
+    Serves the notification badge count without a COUNT(*) on every poll.
+    The bell icon polls /api/notifications/unread-count from every open
+    dashboard tab, and the list endpoint reports the same number.
+
+    Counts are cached per user for NOTIFICATION_UNREAD_CACHE_TTL seconds and
+    kept exact by NotificationService: creating a notification increments
+    the cached value, marking one read decrements it, and mark-all-read or
+    clear set it to 0. Code that inserts notifications elsewhere calls
+    invalidate(); the TTL bounds staleness for writes made by other
+    processes.
+
+Usage:
+    from services.unread_counter import unread_counter
+
+    count = await unread_counter.get(db, user_id)
+    unread_counter.adjust(user_id, +1)   # after committing a new notification
+    unread_counter.invalidate(user_id)
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Notification
+from services.metrics import cache_lookups
+
+
+class UnreadCounter:
+    """LRU of unread notification counts keyed by user id, with a TTL"""
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        """
+        Initialize counter.
+
+        Args:
+            ttl: Seconds a count is served (default: settings.NOTIFICATION_UNREAD_CACHE_TTL, 0 disables)
+            max_size: Maximum cached users (default: settings.NOTIFICATION_UNREAD_CACHE_MAX_SIZE)
+        """
+        self.ttl = settings.NOTIFICATION_UNREAD_CACHE_TTL if ttl is None else ttl
+        self.max_size = max_size or settings.NOTIFICATION_UNREAD_CACHE_MAX_SIZE
+        self._entries: "OrderedDict[UUID, Tuple[float, int]]" = OrderedDict()
+
+    def _lookup(self, user_id: UUID) -> Optional[int]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, count = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return count
+
+    def set(self, user_id: UUID, count: int) -> None:
+        """Store a known count (e.g. 0 after mark-all-read)"""
+        if self.ttl <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl, max(count, 0))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> int:
+        """
+        Return the user's unread notification count.
+
+        Args:
+            db: Request database session (used on a miss)
+            user_id: ID of the user
+
+        Returns:
+            int: Number of unread notifications
+        """
+        count = self._lookup(user_id)
+        if count is not None:
+            cache_lookups.inc(cache="notification_unread", tier="memory", result="hit")
+            return count
+
+        cache_lookups.inc(cache="notification_unread", tier="memory", result="miss")
+        result = await db.execute(
+            select(func.count(Notification.id)).where(
+                Notification.user_id == user_id,
+                Notification.is_read == False
+            )
+        )
+        count = result.scalar_one()
+        self.set(user_id, count)
+        return count
+
+    def peek(self, user_id: UUID) -> Optional[int]:
+        """Return the cached count without querying (None if not cached)"""
+        return self._lookup(user_id)
+
+    def adjust(self, user_id: UUID, delta: int) -> None:
+        """Apply a change to a cached count (no-op if the user is not cached)"""
+        count = self._lookup(user_id)
+        if count is not None:
+            self._entries[user_id] = (self._entries[user_id][0], max(count + delta, 0))
+
+    def invalidate(self, user_id: Optional[UUID]) -> None:
+        """Drop a user's count (call after inserting notifications outside NotificationService)"""
+        if user_id:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide counter used by NotificationService
+unread_counter = UnreadCounter()
@@ -0,0 +1,110 @@
+"""
+User Identity Cache for AlphaLab.
+
+Purpose:
+    Resolves Clerk user ids to User rows without a database round trip on
+    every authenticated request. Dashboard pages fire several API calls in
+    parallel and each one used to run the same users lookup.
+
+    Entries are column snapshots (not ORM instances, which belong to one
+    session) and live for USER_CACHE_TTL seconds. The Clerk webhooks and the
+    profile endpoints invalidate a user explicitly when the row changes; the
+    TTL bounds staleness for changes made by other processes.
+
+Usage:
+    from services.user_cache import user_cache
+
+    user = await user_cache.get_user(db, clerk_id)   # attached to db, or None
+    user_cache.invalidate(clerk_id)                  # after updating the row
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import time
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import settings
+from models import User
+from services.metrics import cache_lookups
+
+
+class UserCache:
+    """LRU of User column snapshots keyed by clerk_id, with a TTL"""
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds a snapshot is served (default: settings.USER_CACHE_TTL, 0 disables)
+            max_size: Maximum cached users (default: settings.USER_CACHE_MAX_SIZE)
+        """
+        self.ttl = settings.USER_CACHE_TTL if ttl is None else ttl
+        self.max_size = max_size or settings.USER_CACHE_MAX_SIZE
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._columns = [attr.key for attr in inspect(User).column_attrs]
+
+    def _lookup(self, clerk_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(clerk_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[clerk_id]
+            return None
+        self._entries.move_to_end(clerk_id)
+        return snapshot
+
+    def _store(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        snapshot = {key: getattr(user, key) for key in self._columns}
+        self._entries[user.clerk_id] = (time.monotonic() + self.ttl, snapshot)
+        self._entries.move_to_end(user.clerk_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_user(self, db: AsyncSession, clerk_id: str) -> Optional[User]:
+        """
+        Return the user for a Clerk id, attached to `db`.
+
+        A cached snapshot is merged into the session without a SELECT, so
+        handlers can still modify and commit the returned instance.
+
+        Args:
+            db: Request database session
+            clerk_id: Clerk user id
+
+        Returns:
+            User or None if no such user exists (misses are not cached)
+        """
+        snapshot = self._lookup(clerk_id)
+        if snapshot is not None:
+            cache_lookups.inc(cache="user", tier="memory", result="hit")
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return await db.merge(user, load=False)
+
+        cache_lookups.inc(cache="user", tier="memory", result="miss")
+        result = await db.execute(select(User).where(User.clerk_id == clerk_id))
+        user = result.scalar_one_or_none()
+        if user is not None:
+            self._store(user)
+        return user
+
+    def invalidate(self, clerk_id: Optional[str]) -> None:
+        """Drop a user's snapshot (call after the row changes)"""
+        if clerk_id:
+            self._entries.pop(clerk_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache used by dependencies.get_current_user
+user_cache = UserCache()
@@ -670,3 +670,116 @@ class TestAITrader:
         assert "49500.0" in prompt  # low
         assert "50250.0" in prompt  # close
         assert "1000000.0" in prompt  # volume
+    
+    # Test compact prompt format
+    
+    @pytest.fixture
+    def recent_history(self):
+        """Three hourly bars ending at the sample candle"""
+        recent_candles = [
+            {
+                "timestamp": datetime(2024, 1, 1, 10 + i, 0, 0).isoformat(),
+                "open": 50000.0 + i,
+                "high": 50500.0 + i,
+                "low": 49500.0 + i,
+                "close": 50250.123456789 + i,
+                "volume": 1000000.0,
+            }
+            for i in range(3)
+        ]
+        recent_indicators = [
+            {"candle_index": i, "values": {"rsi": 50.0 + i, "macd": None if i == 0 else 1.5}}
+            for i in range(3)
+        ]
+        return recent_candles, recent_indicators
+    
+    def test_compact_prompt_writes_header_once(self, sample_candle, sample_indicators, recent_history):
+        """Test that compact format renders history as one table"""
+        trader = AITrader(
+            api_key="test-key",
+            model="test-model",
+            strategy_prompt="Test strategy",
+            mode="omni",
+            prompt_format="compact",
+            prompt_precision=6
+        )
+        recent_candles, recent_indicators = recent_history
+        
+        prompt = trader._build_prompt(
+            sample_candle, sample_indicators, None, 10000.0,
+            recent_candles=recent_candles, recent_indicators=recent_indicators
+        )
+        
+        assert "t|open|high|low|close|volume|rsi|macd" in prompt
+        assert prompt.count("rsi") == 2  # current indicators + table header
+        assert "-2|50000|50500|49500|50250.1|1e+06|50|-" in prompt
+        assert "\n0|50002|" in prompt
+        assert "t in h relative to current candle" in prompt
+        assert '"action": "LONG" | "SHORT" | "CLOSE" | "HOLD"' in trader.system_message
+    
+    def test_compact_prompt_is_smaller_than_json(self, sample_candle, sample_indicators, sample_position, recent_history):
+        """Test that compact format needs fewer characters than JSON"""
+        recent_candles, recent_indicators = recent_history
+        prompts = {}
+        for prompt_format in ("json", "compact"):
+            trader = AITrader(
+                api_key="test-key",
+                model="test-model",
+                strategy_prompt="Test strategy",
+                mode="omni",
+                prompt_format=prompt_format
+            )
+            prompts[prompt_format] = trader._build_prompt(
+                sample_candle, sample_indicators, sample_position, 10000.0,
+                recent_candles=recent_candles, recent_indicators=recent_indicators
+            )
+        
+        assert "entry_price=50000" in prompts["compact"]
+        assert len(prompts["compact"]) < len(prompts["json"])
+    
+    # Test prompt prefix caching
+    
+    def test_system_message_is_stable_prefix(self, ai_trader, sample_candle, sample_indicators):
+        """Test that static instructions are in the system message, not the per-candle prompt"""
+        prompt = ai_trader._build_prompt(sample_candle, sample_indicators, None, 10000.0)
+        
+        assert "Trade based on RSI and MACD signals" in ai_trader.system_message
+        assert "Rules:" in ai_trader.system_message
+        assert "Rules:" not in prompt
+        assert "locked at 1x" in prompt
+        
+        first = ai_trader._build_messages(prompt)
+        second = ai_trader._build_messages("different market state")
+        assert first[0] == second[0]
+    
+    def test_cache_control_only_for_explicit_cache_providers(self):
+        """Test that cache_control breakpoints are sent only where required"""
+        anthropic = AITrader(api_key="k", model="anthropic/claude-3.5-sonnet", strategy_prompt="s", mode="monk")
+        openai = AITrader(api_key="k", model="openai/gpt-4o-mini", strategy_prompt="s", mode="monk")
+        
+        anthropic_system = anthropic._build_messages("state")[0]["content"]
+        openai_system = openai._build_messages("state")[0]["content"]
+        
+        assert anthropic_system[0]["cache_control"] == {"type": "ephemeral"}
+        assert anthropic_system[0]["text"] == anthropic.system_message
+        assert openai_system == openai.system_message
+    
+    @pytest.mark.asyncio
+    async def test_prompt_stats_record_cached_tokens(self, ai_trader):
+        """Test that usage with cached prompt tokens is counted as a cache hit"""
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = '{"action": "HOLD", "reasoning": "Wait", "size_percentage": 0, "leverage": 1}'
+        response.usage.prompt_tokens = 1200
+        response.usage.completion_tokens = 40
+        response.usage.prompt_tokens_details.cached_tokens = 1000
+        
+        with patch.object(ai_trader.client.chat.completions, 'create', AsyncMock(return_value=response)):
+            await ai_trader._make_api_request("state")
+        
+        stats = ai_trader.get_stats()
+        assert stats["requests"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["cached_prompt_tokens"] == 1000
+        assert stats["cached_token_ratio"] == pytest.approx(1000 / 1200)
+        assert stats["latency_p50_ms"] is not None
@@ -0,0 +1,143 @@
+"""
+Unit tests for Clerk token verification.
+
+Tests cover:
+- Signature verification against a JWKS loaded from a local file
+- Expired, tampered and unknown-key tokens
+- Verified claims LRU (hits, exp bound, eviction)
+- Key set refresh on unknown key ids
+"""
+
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+import auth
+from auth import ClerkJWKS, VerifiedTokenCache, verify_clerk_token
+
+
+def _make_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _write_jwks(path, keys):
+    jwks = []
+    for kid, private_key in keys.items():
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+        jwks.append(jwk)
+    path.write_text(json.dumps({"keys": jwks}))
+
+
+def _token(private_key, kid="key-1", sub="user_123", expires_in=300, **claims):
+    payload = {"sub": sub, "exp": int(time.time()) + expires_in, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def signing_key(tmp_path, monkeypatch):
+    private_key = _make_key()
+    jwks_file = tmp_path / "jwks.json"
+    _write_jwks(jwks_file, {"key-1": private_key})
+    jwks = ClerkJWKS(file_path=str(jwks_file), ttl=3600, min_refresh_interval=0)
+    monkeypatch.setattr(auth, "clerk_jwks", jwks)
+    monkeypatch.setattr(auth, "verified_tokens", VerifiedTokenCache(ttl=30, max_size=100))
+    return private_key
+
+
+class TestVerifyClerkToken:
+    """Test suite for verify_clerk_token"""
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, signing_key):
+        payload = await verify_clerk_token(f"Bearer {_token(signing_key, email='a@b.c')}")
+
+        assert payload["sub"] == "user_123"
+        assert payload["email"] == "a@b.c"
+        assert auth.clerk_jwks.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_header(self, signing_key):
+        with pytest.raises(HTTPException) as exc:
+            await verify_clerk_token(None)
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_expired_token(self, signing_key):
+        with pytest.raises(HTTPException) as exc:
+            await verify_clerk_token(f"Bearer {_token(signing_key, expires_in=-60)}")
+        assert exc.value.detail == "Token has expired"
+
+    @pytest.mark.asyncio
+    async def test_token_signed_by_other_key_is_rejected(self, signing_key):
+        forged = _token(_make_key(), kid="key-1")
+
+        with pytest.raises(HTTPException) as exc:
+            await verify_clerk_token(f"Bearer {forged}")
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unsigned_token_is_rejected(self, signing_key):
+        unsigned = jwt.encode({"sub": "user_123", "exp": int(time.time()) + 60}, None, algorithm="none")
+
+        with pytest.raises(HTTPException) as exc:
+            await verify_clerk_token(f"Bearer {unsigned}")
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_key_set(self, signing_key, tmp_path):
+        rotated = _make_key()
+        await verify_clerk_token(f"Bearer {_token(signing_key)}")
+        _write_jwks(tmp_path / "jwks.json", {"key-1": signing_key, "key-2": rotated})
+
+        payload = await verify_clerk_token(f"Bearer {_token(rotated, kid='key-2', sub='user_456')}")
+
+        assert payload["sub"] == "user_456"
+        assert auth.clerk_jwks.refreshes == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_key_set_is_unavailable(self, signing_key, monkeypatch, tmp_path):
+        monkeypatch.setattr(auth, "clerk_jwks", ClerkJWKS(file_path=str(tmp_path / "missing.json")))
+
+        with pytest.raises(HTTPException) as exc:
+            await verify_clerk_token(f"Bearer {_token(signing_key)}")
+        assert exc.value.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_verified_claims_are_cached(self, signing_key, monkeypatch):
+        token = _token(signing_key)
+        await verify_clerk_token(f"Bearer {token}")
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("signature verified twice")
+
+        monkeypatch.setattr(auth.jwt, "decode", fail_decode)
+        payload = await verify_clerk_token(f"Bearer {token}")
+
+        assert payload["sub"] == "user_123"
+
+
+class TestVerifiedTokenCache:
+    """Test suite for VerifiedTokenCache"""
+
+    def test_entry_never_outlives_token_exp(self):
+        cache = VerifiedTokenCache(ttl=30, max_size=10)
+        cache.put("token", {"sub": "u", "exp": time.time() - 1})
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = VerifiedTokenCache(ttl=30, max_size=2)
+        cache.put("a", {"sub": "a"})
+        cache.put("b", {"sub": "b"})
+        cache.get("a")
+        cache.put("c", {"sub": "c"})
+
+        assert cache.get("a") == {"sub": "a"}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"sub": "c"}
@@ -0,0 +1,200 @@
+"""
+Unit tests for certificate asset generation.
+
+Tests cover:
+- Rendering PDF/PNG/QR off the event loop (thread and process pools)
+- One QR code per certificate and the cached PNG static layer
+- Concurrent uploads of the three assets
+- Background certificate jobs and their status (pending while untracked and recently issued)
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models import Certificate
+from services import certificate_renderer
+from services import certificate_service as certificate_service_module
+from services.certificate_renderer import CertificateRenderPool, render_certificate_assets
+from services.certificate_service import CertificateJobs, CertificateService
+from utils import image_generator, pdf_generator
+from utils.image_generator import CertificateImageGenerator
+from utils.qr_code import generate_qr_image
+
+
+def _certificate(**overrides):
+    fields = dict(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        result_id=uuid.uuid4(),
+        verification_code="ALX-2025-0101-ABCDE",
+        agent_name="Momentum",
+        model="openai/gpt-4o",
+        mode="monk",
+        test_type="backtest",
+        asset="BTC/USDT",
+        pnl_pct=Decimal("12.50"),
+        win_rate=Decimal("60.00"),
+        total_trades=20,
+        max_drawdown_pct=Decimal("-4.20"),
+        sharpe_ratio=Decimal("1.40"),
+        duration_display="30 days",
+        test_period="Jan 01 - Jan 31, 2025",
+        share_url="https://alphalab.io/verify/ALX-2025-0101-ABCDE",
+        issued_at=datetime(2025, 2, 1),
+        view_count=0,
+    )
+    fields.update(overrides)
+    return Certificate(**fields)
+
+
+def _service(upload):
+    service = CertificateService(AsyncMock())
+    service._storage = MagicMock(upload_file=upload)
+    return service
+
+
+class TestCertificateRendering:
+    """Test suite for the certificate render pool"""
+
+    @pytest.mark.asyncio
+    async def test_thread_pool_renders_all_assets(self):
+        fields = CertificateService.certificate_fields(_certificate())
+
+        assets = await CertificateRenderPool(workers=0).run(render_certificate_assets, fields)
+
+        assert assets.pdf.startswith(b"%PDF")
+        assert assets.image.startswith(b"\x89PNG")
+        assert assets.qr.startswith(b"\x89PNG")
+
+    @pytest.mark.asyncio
+    async def test_process_pool_renders_all_assets(self):
+        pool = CertificateRenderPool(workers=1)
+        try:
+            assets = await pool.run(render_certificate_assets, CertificateService.certificate_fields(_certificate()))
+        finally:
+            pool.shutdown()
+
+        assert assets.pdf.startswith(b"%PDF")
+
+
+class TestRenderCaching:
+    """Test suite for shared QR codes and cached generator layers"""
+
+    def test_qr_generated_once_per_certificate(self):
+        qr = MagicMock(side_effect=generate_qr_image)
+        unexpected = MagicMock(side_effect=AssertionError("QR generated again"))
+
+        with patch.object(certificate_renderer, "generate_qr_image", qr), \
+                patch.object(pdf_generator, "generate_qr_image", unexpected), \
+                patch.object(image_generator, "generate_qr_image", unexpected):
+            assets = render_certificate_assets(CertificateService.certificate_fields(_certificate()))
+
+        qr.assert_called_once()
+        assert assets.qr.startswith(b"\x89PNG")
+
+    def test_static_layer_shared_and_not_modified(self):
+        fields = CertificateService.certificate_fields(_certificate())
+        first = CertificateImageGenerator()
+        first.generate_certificate_image(**fields)
+        layer = CertificateImageGenerator._static_layer
+        snapshot = layer.tobytes()
+
+        CertificateImageGenerator().generate_certificate_image(**fields)
+
+        assert CertificateImageGenerator._static_layer is layer
+        assert layer.tobytes() == snapshot
+
+
+class TestGenerateAssets:
+    """Test suite for CertificateService.generate_assets"""
+
+    @pytest.mark.asyncio
+    async def test_uploads_run_concurrently(self):
+        in_flight = 0
+        peak = 0
+
+        async def upload(bucket, file_name, file_data, content_type, upsert):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"https://storage/{file_name}"
+
+        certificate = _certificate()
+        service = _service(upload)
+        stages = []
+
+        with patch.object(certificate_service_module, "render_pool", CertificateRenderPool(workers=0)):
+            await service.generate_assets(certificate, on_stage=stages.append)
+
+        assert peak == 3
+        assert stages == ["rendering", "uploading"]
+        assert certificate.pdf_url.endswith(f"{certificate.id}/certificate.pdf")
+        assert certificate.image_url.endswith("certificate.png")
+        assert certificate.qr_code_url.endswith("qr.png")
+        service.db.commit.assert_awaited_once()
+
+
+class TestCertificateJobs:
+    """Test suite for CertificateJobs"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_to_ready(self):
+        certificate = _certificate()
+        result = MagicMock()
+        result.scalar_one.return_value = certificate
+
+        @asynccontextmanager
+        async def session():
+            db = AsyncMock()
+            db.execute.return_value = result
+            yield db
+
+        async def generate_assets(self, cert, on_stage=None):
+            on_stage("rendering")
+            await asyncio.sleep(0)
+            cert.pdf_url = "https://storage/certificate.pdf"
+
+        jobs = CertificateJobs()
+        with patch.object(certificate_service_module, "async_session_maker", session), \
+                patch.object(CertificateService, "generate_assets", generate_assets):
+            job = jobs.submit(certificate.id)
+            assert job["status"] == "pending"
+            assert jobs.submit(certificate.id) is job
+            await asyncio.gather(*jobs._tasks)
+
+        assert job["status"] == "ready"
+        assert jobs.status(certificate) == {"status": "ready", "error": None}
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error(self):
+        certificate = _certificate()
+
+        @asynccontextmanager
+        async def session():
+            raise RuntimeError("storage down")
+            yield
+
+        jobs = CertificateJobs()
+        with patch.object(certificate_service_module, "async_session_maker", session):
+            jobs.submit(certificate.id)
+            await asyncio.gather(*jobs._tasks)
+
+        assert jobs.status(certificate) == {"status": "failed", "error": "storage down"}
+
+    def test_untracked_certificate_without_assets(self):
+        assert CertificateJobs().status(_certificate())["status"] == "failed"
+        assert CertificateJobs().status(_certificate(pdf_url="https://x"))["status"] == "ready"
+
+    def test_recent_certificate_without_local_job_is_pending(self):
+        # Issued moments ago: its job may be running in another process
+        certificate = _certificate(issued_at=datetime.now(timezone.utc) - timedelta(seconds=5))
+
+        assert CertificateJobs().status(certificate) == {"status": "pending", "error": None}
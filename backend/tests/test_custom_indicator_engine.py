@@ -8,11 +8,13 @@ Tests cover:
 - Circular dependency detection
 - Error handling for invalid JSON structures
 - Integration with IndicatorCalculator
+- Advancing custom indicators one forward-test bar at a time
 """
 
 import pytest
 from datetime import datetime, timedelta
 from typing import List
+from unittest.mock import MagicMock
 import pandas as pd
 
 from services.trading.indicator_calculator import IndicatorCalculator, Candle
@@ -589,6 +591,41 @@ class TestCustomIndicatorEngine:
         
         assert exc_info.value.error_code == 'CIRCULAR_DEPENDENCY'
     
+    def test_failing_rule_isolated(self, sample_df, available_indicators):
+        """Test that a broken rule fails only itself and the rules using it"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({"name": "good", "type": "derived",
+                         "formula": {"operator": "*", "left": {"indicator": "rsi"}, "right": {"value": 2}}})
+        engine.add_rule({"name": "broken", "type": "derived",
+                         "formula": {"operator": "+", "left": {"indicator": "nonexistent"}, "right": {"value": 1}}})
+        engine.add_rule({"name": "uses_broken", "type": "derived",
+                         "formula": {"operator": "+", "left": {"indicator": "broken"}, "right": {"value": 1}}})
+        
+        results = engine.calculate_all()
+        
+        assert list(results) == ["good"]
+        pd.testing.assert_series_equal(engine.calculate("good"), available_indicators['rsi'] * 2)
+        with pytest.raises(CustomIndicatorError) as exc_info:
+            engine.calculate("uses_broken")
+        assert exc_info.value.rule_name == "uses_broken"
+        assert "broken" in exc_info.value.message
+        assert engine.rule_errors["broken"].rule_name == "broken"
+    
+    def test_evaluation_error_isolated(self, sample_df, available_indicators):
+        """Test that a rule failing at evaluation time does not fail the others"""
+        indicators = {**available_indicators, 'label': pd.Series(['x'] * len(sample_df))}
+        engine = CustomIndicatorEngine(sample_df, indicators)
+        engine.add_rule({"name": "good", "type": "derived",
+                         "formula": {"operator": "*", "left": {"indicator": "rsi"}, "right": {"value": 2}}})
+        engine.add_rule({"name": "bad", "type": "derived",
+                         "formula": {"operator": "+", "left": {"indicator": "label"}, "right": {"value": 1}}})
+        
+        pd.testing.assert_series_equal(engine.calculate("good"), available_indicators['rsi'] * 2)
+        with pytest.raises(CustomIndicatorError) as exc_info:
+            engine.calculate("bad")
+        assert exc_info.value.error_code == 'CALCULATION_ERROR'
+        assert exc_info.value.rule_name == "bad"
+    
     # Test caching
     
     def test_calculation_caching(self, sample_df, available_indicators):
@@ -640,7 +677,208 @@ class TestCustomIndicatorEngine:
         
         assert len(engine.calculation_cache) == 0
     
-    # Test integration with IndicatorCalculator
+    # Test compilation
+    
+    def test_compile_shares_subexpressions_across_rules(self, sample_df, available_indicators):
+        """Test that identical sub-expressions are compiled once"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        
+        shared = {"operator": "+", "left": {"indicator": "rsi"}, "right": {"indicator": "macd"}}
+        swapped = {"operator": "+", "left": {"indicator": "macd"}, "right": {"indicator": "rsi"}}
+        engine.add_rule({
+            "name": "a", "type": "composite",
+            "formula": {"operator": "*", "left": shared, "right": {"value": 2}}
+        })
+        engine.add_rule({
+            "name": "b", "type": "composite",
+            "formula": {"operator": "/", "left": swapped, "right": {"indicator": "atr"}}
+        })
+        
+        compiled = engine.compile()
+        
+        # rsi+macd once, then *2 and /atr
+        assert len(compiled.instructions) == 3
+        assert set(compiled.inputs) == {"rsi", "macd", "atr"}
+        
+        expected_b = (available_indicators['rsi'] + available_indicators['macd']) / available_indicators['atr']
+        pd.testing.assert_series_equal(engine.calculate("b"), expected_b)
+    
+    def test_compile_folds_constants(self, sample_df, available_indicators):
+        """Test that constant-only sub-expressions are folded at compile time"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "scaled", "type": "derived",
+            "formula": {
+                "operator": "*",
+                "left": {"indicator": "rsi"},
+                "right": {"operator": "/", "left": {"value": 1}, "right": {"value": 100}}
+            }
+        })
+        
+        compiled = engine.compile()
+        
+        assert len(compiled.instructions) == 1
+        pd.testing.assert_series_equal(engine.calculate("scaled"), available_indicators['rsi'] * 0.01)
+    
+    def test_compile_orders_dependencies_first(self, sample_df, available_indicators):
+        """Test that rules referencing other rules are ordered after them"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "outer", "type": "composite",
+            "formula": {"operator": "-", "left": {"indicator": "inner"}, "right": {"value": 1}}
+        })
+        engine.add_rule({
+            "name": "inner", "type": "composite",
+            "formula": {"operator": "*", "left": {"indicator": "rsi"}, "right": {"value": 2}}
+        })
+        
+        assert list(engine.compile().outputs) == ["inner", "outer"]
+    
+    def test_add_rule_invalidates_compiled_program(self, sample_df, available_indicators):
+        """Test that adding a rule recompiles on next use"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "first", "type": "composite",
+            "formula": {"operator": "+", "left": {"indicator": "rsi"}, "right": {"value": 1}}
+        })
+        first_program = engine.compile()
+        
+        engine.add_rule({
+            "name": "second", "type": "composite",
+            "formula": {"operator": "+", "left": {"indicator": "macd"}, "right": {"value": 1}}
+        })
+        
+        assert engine.compile() is not first_program
+        assert "second" in engine.compile().outputs
+    
+    def test_calculate_row_matches_full_calculation(self, sample_df, available_indicators):
+        """Test that single-bar evaluation matches vectorized evaluation"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "mean_reversion", "type": "composite",
+            "formula": {
+                "operator": "/",
+                "left": {"operator": "-", "left": {"indicator": "close"}, "right": {"indicator": "sma_50"}},
+                "right": {"indicator": "atr"}
+            }
+        })
+        
+        full = engine.calculate("mean_reversion")
+        latest = {name: float(series.iloc[-1]) for name, series in available_indicators.items()}
+        row = engine.calculate_row(latest)
+        
+        assert row["mean_reversion"] == pytest.approx(full.iloc[-1])
+    
+    def test_calculate_row_missing_input_is_nan(self, sample_df, available_indicators):
+        """Test that missing inputs produce NaN rather than errors"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "rsi_plus", "type": "composite",
+            "formula": {"operator": "+", "left": {"indicator": "rsi"}, "right": {"value": 1}}
+        })
+        
+        assert pd.isna(engine.calculate_row({"rsi": None})["rsi_plus"])
+    
+    # Test window operators
+    
+    def test_window_operator_matches_pandas(self, sample_df, available_indicators):
+        """Test that a rolling mean formula matches pandas rolling()"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        engine.add_rule({
+            "name": "close_vs_mean", "type": "composite",
+            "formula": {
+                "operator": "-",
+                "left": {"indicator": "close"},
+                "right": {"operator": "mean", "operand": {"indicator": "close"}, "window": 10}
+            }
+        })
+    
+        result = engine.calculate("close_vs_mean")
+        expected = sample_df['close'] - sample_df['close'].rolling(10).mean()
+    
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+    
+    def test_window_operator_validation(self, sample_df, available_indicators):
+        """Test that window operators require an operand and a valid window"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        invalid_formulas = [
+            ({"operator": "mean", "window": 10}, 'INVALID_FORMULA_STRUCTURE'),
+            ({"operator": "mean", "operand": {"indicator": "rsi"}}, 'INVALID_FORMULA_STRUCTURE'),
+            ({"operator": "std", "operand": {"indicator": "rsi"}, "window": 2.5}, 'INVALID_OPERAND_TYPE'),
+            ({"operator": "ema", "operand": {"indicator": "rsi"}, "window": 0}, 'INVALID_OPERAND_VALUE'),
+            ({"operator": "lag", "operand": {"indicator": "rsi"}, "window": 100000}, 'INVALID_OPERAND_VALUE'),
+        ]
+    
+        for formula, error_code in invalid_formulas:
+            with pytest.raises(CustomIndicatorError) as exc_info:
+                engine.add_rule({"name": "windowed", "type": "composite", "formula": formula})
+            assert exc_info.value.error_code == error_code
+    
+    def test_identical_windows_are_shared(self, sample_df, available_indicators):
+        """Test that identical window sub-expressions compile to one instruction"""
+        engine = CustomIndicatorEngine(sample_df, available_indicators)
+        rsi_mean = {"operator": "mean", "operand": {"indicator": "rsi"}, "window": 5}
+        engine.add_rule({"name": "a", "type": "composite",
+                         "formula": {"operator": "+", "left": rsi_mean, "right": {"value": 1}}})
+        engine.add_rule({"name": "b", "type": "composite",
+                         "formula": {"operator": "*", "left": rsi_mean, "right": {"value": 2}}})
+    
+        operators = [instruction[0] for instruction in engine.compile().instructions]
+    
+        assert operators.count('mean') == 1
+    
+    def test_crossover(self, sample_df, available_indicators):
+        """Test crossover signals on the bars where the spread changes sign"""
+        df = sample_df.iloc[:6]
+        indicators = {
+            'fast': pd.Series([1.0, 2.0, 4.0, 2.0, 1.0, 1.0]),
+            'slow': pd.Series([2.0, 2.0, 3.0, 3.0, 2.0, 2.0]),
+        }
+        engine = CustomIndicatorEngine(df, indicators)
+        engine.add_rule({
+            "name": "cross", "type": "composite",
+            "formula": {"operator": "crossover", "left": {"indicator": "fast"}, "right": {"indicator": "slow"}}
+        })
+    
+        result = engine.calculate("cross").tolist()
+    
+        assert pd.isna(result[0])
+        assert result[1:] == [0.0, 1.0, -1.0, 0.0, 0.0]
+    
+    def test_calculate_row_continues_window_stream(self, sample_df, available_indicators):
+        """Test that per-bar evaluation continues window state from calculate_all()"""
+        history = sample_df.iloc[:40]
+        engine = CustomIndicatorEngine(
+            history, {name: series.iloc[:40] for name, series in available_indicators.items()}
+        )
+        engine.add_rule({
+            "name": "rsi_mean", "type": "composite",
+            "formula": {"operator": "mean", "operand": {"indicator": "rsi"}, "window": 5}
+        })
+        engine.calculate_all()
+    
+        expected = available_indicators['rsi'].rolling(5).mean()
+        for i in range(40, 50):
+            row = engine.calculate_row({"rsi": float(available_indicators['rsi'].iloc[i])})
+            assert row["rsi_mean"] == pytest.approx(expected.iloc[i])
+    
+    def test_derive_min_history(self):
+        """Test that window warm-up adds to the warm-up of the referenced indicators"""
+        rules = [
+            {"name": "rsi_mean", "type": "composite",
+             "formula": {"operator": "mean", "operand": {"indicator": "rsi"}, "window": 10}},
+            {"name": "rsi_mean_change", "type": "composite",
+             "formula": {"operator": "diff", "operand": {"indicator": "rsi_mean"}, "window": 3}},
+            {"name": "rsi_cross", "type": "composite",
+             "formula": {"operator": "crossover", "left": {"indicator": "rsi"}, "right": {"indicator": "rsi_mean"}}},
+        ]
+    
+        history = CustomIndicatorEngine.derive_min_history(rules, {"rsi": 14})
+    
+        assert history == {"rsi_mean": 23, "rsi_mean_change": 26, "rsi_cross": 24}
+        assert IndicatorCalculator.compute_min_history(['rsi'], rules) == 26
+    
+        # Test integration with IndicatorCalculator
     
     def test_integration_with_calculator(self, sample_candles):
         """Test custom indicators integrated with IndicatorCalculator"""
@@ -792,3 +1030,69 @@ class TestCustomIndicatorEngine:
                 custom_indicators=custom_rules,
                 mode='omni'
             )
+    
+    def test_failing_custom_rule_named_in_calculator(self, sample_candles):
+        """Test that the calculator error names the custom indicator that failed"""
+        custom_rules = [
+            {"name": "ok", "type": "derived",
+             "formula": {"operator": "*", "left": {"indicator": "rsi"}, "right": {"value": 2}}},
+            {"name": "missing_ref", "type": "derived",
+             "formula": {"operator": "*", "left": {"indicator": "atr"}, "right": {"value": 2}}},
+        ]
+        
+        with pytest.raises(ValueError, match="custom indicator 'missing_ref'"):
+            IndicatorCalculator(
+                candles=sample_candles,
+                enabled_indicators=['rsi'],
+                custom_indicators=custom_rules,
+                mode='omni'
+            )
+    
+    def test_extend_advances_custom_indicators_per_bar(self, sample_candles):
+        """Test that extending by one bar matches a full rebuild without re-running the rules"""
+        candles = [
+            Candle(c.timestamp, c.open, c.high, c.low, c.close + 40 * ((i * 7) % 5 - 2), c.volume)
+            for i, c in enumerate(sample_candles)
+        ]
+        custom_rules = [
+            {"name": "rsi_mean", "type": "composite",
+             "formula": {"operator": "mean", "operand": {"indicator": "rsi"}, "window": 5}},
+            {"name": "close_cross", "type": "composite",
+             "formula": {"operator": "crossover", "left": {"indicator": "close"}, "right": {"indicator": "ema_20"}}},
+        ]
+        calculator = IndicatorCalculator(
+            candles=candles[:200], enabled_indicators=['rsi', 'ema_20'], custom_indicators=custom_rules
+        )
+        
+        for end in range(201, 211):
+            engine = calculator.custom_engine
+            engine.calculate_all = MagicMock(side_effect=AssertionError("full recalculation"))
+            calculator = calculator.extend(candles[:end])
+            expected = IndicatorCalculator(
+                candles=candles[:end], enabled_indicators=['rsi', 'ema_20'], custom_indicators=custom_rules
+            )
+            
+            assert calculator.custom_engine is engine
+            assert len(calculator.df) == end
+            assert calculator.calculate_all(end - 1) == pytest.approx(expected.calculate_all(end - 1), nan_ok=True)
+            pd.testing.assert_series_equal(calculator.cache['rsi_mean'], expected.cache['rsi_mean'])
+    
+    def test_extend_rebuilds_when_history_changes(self, sample_candles):
+        """Test that extend() falls back to a full rebuild for anything but one new bar"""
+        custom_rules = [
+            {"name": "rsi_mean", "type": "composite",
+             "formula": {"operator": "mean", "operand": {"indicator": "rsi"}, "window": 5}},
+        ]
+        calculator = IndicatorCalculator(
+            candles=sample_candles[:200], enabled_indicators=['rsi'], custom_indicators=custom_rules
+        )
+        
+        extended = calculator.extend(sample_candles[10:212])
+        
+        assert extended.custom_engine is not calculator.custom_engine
+        pd.testing.assert_series_equal(
+            extended.cache['rsi_mean'],
+            IndicatorCalculator(
+                candles=sample_candles[10:212], enabled_indicators=['rsi'], custom_indicators=custom_rules
+            ).cache['rsi_mean']
+        )
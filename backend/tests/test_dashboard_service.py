@@ -0,0 +1,121 @@
+"""
+Unit tests for dashboard statistics.
+
+Tests cover:
+- get_stats issuing a single aggregate statement and mapping its row
+- Win rate change and empty-account handling
+- Incremental UserStats upserts from ResultService
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services.dashboard_service import DashboardService
+from services.result_service import ResultService
+
+
+def _db_returning(**row):
+    result = MagicMock()
+    result.one.return_value = SimpleNamespace(**row)
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestDashboardStats:
+    """Test suite for DashboardService.get_stats"""
+
+    @pytest.mark.asyncio
+    async def test_single_statement(self):
+        agent_id = uuid.uuid4()
+        db = _db_returning(
+            total_agents=3,
+            agents_this_week=1,
+            tests_today=2,
+            current_win_rate=Decimal("60"),
+            previous_win_rate=Decimal("50"),
+            tests_run=4,
+            best_pnl=Decimal("12.5"),
+            win_rate_sum=Decimal("220"),
+            best_agent_id=agent_id,
+            best_agent_name="Momentum",
+        )
+
+        stats = await DashboardService(db).get_stats(uuid.uuid4())
+
+        assert db.execute.await_count == 1
+        assert stats == {
+            "total_agents": 3,
+            "tests_run": 4,
+            "best_pnl": 12.5,
+            "avg_win_rate": 55.0,
+            "trends": {"agents_this_week": 1, "tests_today": 2, "win_rate_change": 20.0},
+            "best_agent": {"id": agent_id, "name": "Momentum"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_user_without_results(self):
+        db = _db_returning(
+            total_agents=0,
+            agents_this_week=0,
+            tests_today=0,
+            current_win_rate=None,
+            previous_win_rate=None,
+            tests_run=None,
+            best_pnl=None,
+            win_rate_sum=None,
+            best_agent_id=None,
+            best_agent_name=None,
+        )
+
+        stats = await DashboardService(db).get_stats(uuid.uuid4())
+
+        assert stats["tests_run"] == 0
+        assert stats["avg_win_rate"] is None
+        assert stats["trends"]["win_rate_change"] is None
+        assert stats["best_agent"] is None
+
+    def test_query_reads_summary_row_and_windowed_results(self):
+        sql = _sql(DashboardService._stats_query(uuid.uuid4(), datetime(2025, 6, 1, 12)))
+
+        assert sql.startswith("WITH agent_stats AS")
+        assert "LEFT OUTER JOIN user_stats" in sql
+        assert "FILTER (WHERE test_results.created_at" in sql
+
+
+class TestUserStatsMaintenance:
+    """Test suite for ResultService UserStats upserts"""
+
+    @pytest.mark.asyncio
+    async def test_result_increments_summary(self):
+        db = AsyncMock()
+        result = SimpleNamespace(total_pnl_pct=Decimal("-2.5"), win_rate=Decimal("40"))
+
+        await ResultService(db)._update_user_stats(uuid.uuid4(), result)
+
+        sql = _sql(db.execute.await_args.args[0])
+        assert "INSERT INTO user_stats" in sql
+        assert "ON CONFLICT (user_id) DO UPDATE" in sql
+        assert "tests_run = (user_stats.tests_run + " in sql
+        assert "best_pnl = greatest(user_stats.best_pnl, excluded.best_pnl)" in sql
+
+    @pytest.mark.asyncio
+    async def test_rebuild_aggregates_results(self):
+        db = AsyncMock()
+
+        await ResultService(db).rebuild_user_stats(uuid.uuid4())
+
+        sql = _sql(db.execute.await_args.args[0])
+        assert "INSERT INTO user_stats (user_id, tests_run, profitable_tests, best_pnl, win_rate_sum) SELECT" in sql
+        assert "max(test_results.total_pnl_pct)" in sql
+        assert "tests_run = excluded.tests_run" in sql
@@ -0,0 +1,227 @@
+"""
+Unit tests for multi-decision batching.
+
+Tests cover:
+- Grouping by batch key within the window
+- Single-item batches and batch failures falling back to individual requests
+- Sending without waiting once every group member has submitted
+- Releasing callers when a batch task is cancelled
+- AITrader sending one request for several agents on the same candle
+- Partial failures (missing decisions) falling back per agent
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.ai_trader import AITrader, Candle
+from services.decision_batcher import DecisionBatcher
+
+
+def _completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+class TestDecisionBatcher:
+    """Test suite for DecisionBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_items_with_same_key_share_a_batch(self):
+        batcher = DecisionBatcher(window_ms=20, max_batch=8)
+        batches = []
+
+        async def runner(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        results = await asyncio.gather(
+            batcher.submit("a", 1, runner),
+            batcher.submit("a", 2, runner),
+            batcher.submit("b", 3, runner),
+        )
+
+        assert batches == [[1, 2]]
+        # Key "b" had a single item: the caller handles it individually
+        assert results == [10, 20, None]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_flushes_early(self):
+        batcher = DecisionBatcher(window_ms=10_000, max_batch=2)
+
+        async def runner(items):
+            return list(items)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a", 1, runner), batcher.submit("a", 2, runner)),
+            timeout=1.0
+        )
+
+        assert results == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_runner_failure_falls_back_for_all(self):
+        batcher = DecisionBatcher(window_ms=10, max_batch=8)
+
+        async def runner(items):
+            raise RuntimeError("provider down")
+
+        results = await asyncio.gather(batcher.submit("a", 1, runner), batcher.submit("a", 2, runner))
+
+        assert results == [None, None]
+        assert batcher.stats()["batched_items"] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_lone_group_member_does_not_wait(self):
+        batcher = DecisionBatcher(window_ms=10_000, max_batch=8)
+        member = MagicMock()
+        batcher.join("group", member)
+
+        async def runner(items):
+            raise AssertionError("single item must not be batched")
+
+        result = await asyncio.wait_for(batcher.submit("a", 1, runner, group="group"), timeout=1.0)
+
+        assert result is None
+        assert batcher.stats()["pending_batches"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_sent_once_every_member_submitted(self):
+        batcher = DecisionBatcher(window_ms=10_000, max_batch=8)
+        members = [MagicMock(), MagicMock()]
+        for member in members:
+            batcher.join("group", member)
+
+        async def runner(items):
+            return list(items)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit("a", 1, runner, group="group"),
+                batcher.submit("a", 2, runner, group="group"),
+            ),
+            timeout=1.0
+        )
+
+        assert results == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_releases_callers(self):
+        batcher = DecisionBatcher(window_ms=10_000, max_batch=2)
+        started = asyncio.Event()
+
+        async def runner(items):
+            started.set()
+            await asyncio.sleep(10)
+
+        submitted = asyncio.gather(batcher.submit("a", 1, runner), batcher.submit("a", 2, runner))
+        await asyncio.wait_for(started.wait(), timeout=1.0)
+        for task in list(batcher._tasks):
+            task.cancel()
+
+        assert await asyncio.wait_for(submitted, timeout=1.0) == [None, None]
+
+
+class TestAITraderBatching:
+    """Test suite for batched AITrader decisions"""
+
+    @pytest.fixture
+    def sample_candle(self) -> Candle:
+        return Candle(
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+            open=50000.0,
+            high=50500.0,
+            low=49500.0,
+            close=50250.0,
+            volume=1000000.0
+        )
+
+    def _traders(self):
+        return [
+            AITrader(
+                api_key="batch-key",
+                model="openai/gpt-4o-mini",
+                strategy_prompt=f"Strategy {name}",
+                mode="monk",
+                session_id=name,
+                batching=True
+            )
+            for name in ("alpha", "beta")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_agents_on_same_candle_share_one_request(self, sample_candle):
+        traders = self._traders()
+        batch_content = json.dumps({"decisions": [
+            {"agent_id": 1, "action": "SHORT", "reasoning": "beta", "size_percentage": 0.2, "leverage": 1},
+            {"agent_id": 0, "action": "LONG", "reasoning": "alpha", "size_percentage": 0.5, "leverage": 1},
+        ]})
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return _completion(batch_content)
+
+        with patch.object(traders[0].client.chat.completions, "create", side_effect=create):
+            decisions = await asyncio.gather(*[
+                trader.get_decision(sample_candle, {"rsi": 55.0}, None, 10000.0) for trader in traders
+            ])
+
+        assert len(calls) == 1
+        assert calls[0]["response_format"]["json_schema"]["name"] == "trading_decision_batch"
+        user_message = calls[0]["messages"][1]["content"]
+        assert user_message.count("Shared Market State") == 1
+        assert "Strategy alpha" in user_message and "Strategy beta" in user_message
+        assert [d.action for d in decisions] == ["LONG", "SHORT"]
+        assert [t.get_stats()["batched_decisions"] for t in traders] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_missing_decision_falls_back_to_single_request(self, sample_candle):
+        traders = self._traders()
+        batch_content = json.dumps({"decisions": [
+            {"agent_id": 0, "action": "HOLD", "reasoning": "alpha", "size_percentage": 0.0, "leverage": 1},
+        ]})
+        single_content = json.dumps(
+            {"action": "CLOSE", "reasoning": "beta alone", "size_percentage": 0.0, "leverage": 1}
+        )
+        formats = []
+
+        async def create(**kwargs):
+            name = kwargs["response_format"]["json_schema"]["name"]
+            formats.append(name)
+            return _completion(batch_content if name == "trading_decision_batch" else single_content)
+
+        with patch.object(traders[0].client.chat.completions, "create", side_effect=create):
+            decisions = await asyncio.gather(*[
+                trader.get_decision(sample_candle, {"rsi": 55.0}, None, 10000.0) for trader in traders
+            ])
+
+        assert formats == ["trading_decision_batch", "trading_decision"]
+        assert [d.action for d in decisions] == ["HOLD", "CLOSE"]
+
+    @pytest.mark.asyncio
+    async def test_different_market_context_is_not_batched(self, sample_candle):
+        traders = self._traders()
+        single_content = json.dumps(
+            {"action": "HOLD", "reasoning": "alone", "size_percentage": 0.0, "leverage": 1}
+        )
+        formats = []
+
+        async def create(**kwargs):
+            formats.append(kwargs["response_format"]["json_schema"]["name"])
+            return _completion(single_content)
+
+        with patch.object(traders[0].client.chat.completions, "create", side_effect=create):
+            await asyncio.gather(
+                traders[0].get_decision(sample_candle, {"rsi": 55.0}, None, 10000.0),
+                traders[1].get_decision(sample_candle, {"rsi": 60.0}, None, 10000.0),
+            )
+
+        assert formats == ["trading_decision", "trading_decision"]
@@ -0,0 +1,175 @@
+"""
+Unit tests for decision gating.
+
+Tests cover:
+- Force detectors (SL/TP proximity, unrealized PnL, position review, regime change)
+- Skip detectors (low volatility, indicator delta)
+- Per-session LLM call budget
+- Skip/force statistics by reason
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from services.trading.decision_gating import (
+    DecisionBudget,
+    DecisionGate,
+    GateContext,
+    IndicatorDeltaDetector,
+    LowVolatilityDetector,
+    PositionReviewDetector,
+    RegimeChangeDetector,
+    SlTpProximityDetector,
+    UnrealizedPnlDetector,
+    build_detectors,
+)
+
+
+def _candle(i, close=100.0, spread=2.0):
+    return SimpleNamespace(
+        timestamp=datetime(2024, 1, 1) + timedelta(hours=i),
+        open=close, high=close + spread / 2, low=close - spread / 2, close=close, volume=1000.0
+    )
+
+
+def _position(stop_loss=None, take_profit=None, size=1000.0, unrealized_pnl=0.0):
+    return SimpleNamespace(stop_loss=stop_loss, take_profit=take_profit, size=size, unrealized_pnl=unrealized_pnl)
+
+
+def _context(index, candles, indicators=None, position=None, history=None):
+    history = history or {}
+    return GateContext(
+        candle_index=index,
+        candle=candles[index],
+        indicators=indicators or {},
+        position=position,
+        candles=candles,
+        indicators_at=lambda idx: history.get(idx, {}),
+    )
+
+
+class TestDetectors:
+    """Test suite for individual gating detectors"""
+
+    def test_sl_tp_proximity(self):
+        gate = DecisionGate([SlTpProximityDetector()])
+        candles = [_candle(0, close=100.0)]
+
+        verdict = gate.evaluate(_context(0, candles, position=_position(stop_loss=99.5)), blocked_by="cadence")
+
+        assert verdict.run and verdict.forced
+        assert verdict.source == "sl_tp_proximity"
+        assert "stop-loss" in verdict.reason
+
+    def test_unrealized_pnl(self):
+        gate = DecisionGate([UnrealizedPnlDetector()])
+        candles = [_candle(0)]
+
+        verdict = gate.evaluate(_context(0, candles, position=_position(unrealized_pnl=50.0)), blocked_by="cadence")
+
+        assert verdict.forced
+
+    def test_position_review_counts_from_last_call(self):
+        gate = DecisionGate([PositionReviewDetector(max_candles=3)])
+        candles = [_candle(i) for i in range(10)]
+        position = _position()
+
+        gate.evaluate(_context(0, candles, position=position))
+        gate.record_call(_context(0, candles, position=position))
+        assert not gate.evaluate(_context(3, candles, position=position), blocked_by="cadence").run
+        assert gate.evaluate(_context(4, candles, position=position), blocked_by="cadence").forced
+
+    def test_regime_change(self):
+        gate = DecisionGate([RegimeChangeDetector()])
+        candles = [_candle(0, close=100.0), _candle(1, close=100.5), _candle(2, close=95.0)]
+
+        gate.record_call(_context(0, candles, indicators={"ema_50": 98.0}))
+        assert not gate.evaluate(_context(1, candles, indicators={"ema_50": 98.0}), blocked_by="cadence").run
+        verdict = gate.evaluate(_context(2, candles, indicators={"ema_50": 98.0}), blocked_by="cadence")
+
+        assert verdict.forced
+        assert "below ema_50" in verdict.reason
+
+    def test_low_volatility_skips_without_position(self):
+        gate = DecisionGate([LowVolatilityDetector()])
+        candles = [_candle(i, spread=10.0) for i in range(6)] + [_candle(6, spread=1.0)]
+
+        verdict = gate.evaluate(_context(6, candles))
+        assert not verdict.run
+        assert verdict.source == "low_volatility"
+
+        # Never skipped while a position is open
+        assert gate.evaluate(_context(6, candles, position=_position())).run
+
+    def test_low_volatility_prefers_atr(self):
+        gate = DecisionGate([LowVolatilityDetector()])
+        candles = [_candle(i) for i in range(7)]
+        history = {idx: {"atr": 10.0} for idx in range(6)}
+
+        verdict = gate.evaluate(_context(6, candles, indicators={"atr": 2.0}, history=history))
+
+        assert not verdict.run
+        assert "ATR" in verdict.reason
+
+    def test_indicator_delta_skips_unchanged_and_forces_large_moves(self):
+        gate = DecisionGate([IndicatorDeltaDetector(min_change_pct=1.0, force_change_pct=25.0)])
+        candles = [_candle(0, close=100.0), _candle(1, close=100.2), _candle(2, close=100.2)]
+
+        gate.record_call(_context(0, candles, indicators={"rsi": 50.0}))
+        quiet = gate.evaluate(_context(1, candles, indicators={"rsi": 50.1}))
+        moved = gate.evaluate(_context(2, candles, indicators={"rsi": 70.0}), blocked_by="cadence")
+
+        assert not quiet.run and quiet.source == "indicator_delta"
+        assert moved.forced and "rsi" in moved.reason
+
+
+class TestDecisionGate:
+    """Test suite for DecisionGate"""
+
+    def test_cadence_block_is_recorded(self):
+        gate = DecisionGate([])
+        candles = [_candle(0)]
+
+        verdict = gate.evaluate(_context(0, candles), blocked_by="cadence")
+
+        assert not verdict.run
+        assert gate.stats()["skipped"] == {"cadence": 1}
+
+    def test_budget_limits_calls_per_window(self):
+        gate = DecisionGate([], budget=DecisionBudget(max_calls=2, window=5))
+        candles = [_candle(i) for i in range(12)]
+        runs = []
+
+        for i in range(12):
+            ctx = _context(i, candles)
+            verdict = gate.evaluate(ctx)
+            if verdict.run:
+                gate.record_call(ctx)
+                runs.append(i)
+
+        assert runs == [0, 1, 5, 6, 10, 11]
+        stats = gate.stats()
+        assert stats["llm_calls"] == 6
+        assert stats["skipped"]["budget"] == 6
+        assert stats["call_rate"] == pytest.approx(0.5)
+
+    def test_forced_calls_bypass_budget(self):
+        gate = DecisionGate([SlTpProximityDetector()], budget=DecisionBudget(max_calls=1, window=100))
+        candles = [_candle(0), _candle(1)]
+
+        gate.record_call(_context(0, candles))
+        verdict = gate.evaluate(_context(1, candles, position=_position(take_profit=100.5)))
+
+        assert verdict.forced
+        assert gate.stats()["forced"] == {"sl_tp_proximity": 1}
+
+    def test_build_detectors_ignores_unknown_names(self):
+        detectors = build_detectors("sl_tp_proximity, bogus ,low_volatility")
+
+        assert [d.name for d in detectors] == ["sl_tp_proximity", "low_volatility"]
+
+    def test_from_settings_budget(self):
+        assert DecisionGate.from_settings().budget is None
+        assert DecisionGate.from_settings(max_calls_per_window=10).stats()["budget"]["max_calls"] == 10
@@ -0,0 +1,193 @@
+"""
+Unit tests for streaming export encoding.
+
+Tests cover:
+- stream_zip producing a valid archive without seeking
+- JSON Lines and CSV encoding of record chunks
+- stream_json_document producing one parseable JSON object
+- Account exports packaging streamed sections
+- Parquet row groups and stored (uncompressed) Parquet ZIP members
+- Non-numeric indicator values kept in a JSON fallback column
+"""
+
+import io
+import json
+import zipfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.export_columnar import encode_parquet, thought_row, thought_schema
+from services.export_service import ExportService
+from services.export_stream import encode_csv, encode_jsonl, single, stream_json_document, stream_zip
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestStreamZip:
+    """Test suite for stream_zip"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        records = _chunks([{"id": 1}, {"id": 2}], [], [{"id": 3}])
+        data = await _collect(stream_zip([
+            ("result.json", single(b'{"ok": true}')),
+            ("trades.jsonl", encode_jsonl(records)),
+        ]))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == ["result.json", "trades.jsonl"]
+            assert json.loads(archive.read("result.json")) == {"ok": True}
+            lines = archive.read("trades.jsonl").decode().splitlines()
+            assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_members_are_consumed_in_order(self):
+        seen = []
+
+        async def body(name):
+            seen.append(name)
+            yield name.encode()
+
+        def members():
+            yield "a.txt", body("a")
+            yield "b.txt", single(",".join(seen).encode())
+
+        data = await _collect(stream_zip(members()))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.read("b.txt") == b"a"
+
+
+class TestEncoders:
+    """Test suite for encode_csv and encode_jsonl"""
+
+    @pytest.mark.asyncio
+    async def test_csv_header_and_nested_values(self):
+        data = await _collect(encode_csv(
+            _chunks([{"id": 1, "values": {"rsi": 30}, "extra": "x"}]),
+            ["id", "values"],
+        ))
+
+        lines = data.decode().splitlines()
+        assert lines[0] == "id,values"
+        assert lines[1] == '1,"{""rsi"": 30}"'
+
+    @pytest.mark.asyncio
+    async def test_csv_without_rows(self):
+        data = await _collect(encode_csv(_chunks(), ["id"]))
+
+        assert data.decode().splitlines() == ["id"]
+
+
+class TestStreamJsonDocument:
+    """Test suite for stream_json_document"""
+
+    @pytest.mark.asyncio
+    async def test_streamed_and_plain_sections(self):
+        data = await _collect(stream_json_document([
+            ("export_metadata", {"version": "1.0"}),
+            ("agents", _chunks([{"id": 1}], [], [{"id": 2}])),
+            ("trades", _chunks()),
+            ("settings", None),
+        ]))
+
+        assert json.loads(data) == {
+            "export_metadata": {"version": "1.0"},
+            "agents": [{"id": 1}, {"id": 2}],
+            "trades": [],
+            "settings": None,
+        }
+
+
+class TestAccountExportPackaging:
+    """Test suite for ExportService ZIP members"""
+
+    @pytest.mark.asyncio
+    async def test_zip_members_with_readme_counts(self):
+        counts = {}
+        on_done = AsyncMock()
+        agents = ExportService._tracked("agents", _chunks([{"id": 1}, {"id": 2}]), counts, on_done)
+        sections = [
+            ("export_metadata", {"user_id": "u1", "exported_at": "2025-01-01T00:00:00", "version": "1.0"}),
+            ("agents", agents),
+            ("settings", {"theme": "dark"}),
+        ]
+
+        data = await _collect(stream_zip(ExportService(AsyncMock())._zip_members(sections, counts)))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == ["export_metadata.json", "agents.jsonl", "settings.json", "README.txt"]
+            assert len(archive.read("agents.jsonl").splitlines()) == 2
+            readme = archive.read("README.txt").decode()
+        assert "- Agents: 2 agent configurations" in readme
+        assert "- Settings: User preferences" in readme
+        on_done.assert_awaited_once()
+
+
+class TestParquetEncoding:
+    """Test suite for Parquet exports (skipped without pyarrow)"""
+
+    @pytest.mark.asyncio
+    async def test_row_groups_and_flattened_indicators(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        thoughts = [
+            SimpleNamespace(
+                candle_number=i, timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc), decision="hold",
+                reasoning="wait", indicator_values={"rsi_14": 50 + i, "macd": None},
+            )
+            for i in range(5)
+        ]
+        chunks = _chunks([thought_row(t) for t in thoughts[:3]], [thought_row(t) for t in thoughts[3:]])
+
+        data = await _collect(encode_parquet(chunks, thought_schema(["macd", "rsi_14"]), row_group_rows=2))
+
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.column("ind_rsi_14").to_pylist() == [50.0, 51.0, 52.0, 53.0, 54.0]
+        assert table.column("ind_macd").null_count == 5
+
+    @pytest.mark.asyncio
+    async def test_non_numeric_indicators_kept_as_json(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        thoughts = [
+            SimpleNamespace(
+                candle_number=0, timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc), decision="hold",
+                reasoning="wait", indicator_values={"rsi_14": 55.0, "trend": "up", "macd": {"signal": 1.5}},
+            ),
+            SimpleNamespace(
+                candle_number=1, timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc), decision="hold",
+                reasoning="wait", indicator_values={"rsi_14": 56.0, "trend": None},
+            ),
+        ]
+        chunks = _chunks([thought_row(t) for t in thoughts])
+
+        data = await _collect(encode_parquet(chunks, thought_schema(["macd", "rsi_14", "trend"])))
+
+        table = pq.ParquetFile(io.BytesIO(data)).read()
+        assert table.column("ind_trend").to_pylist() == [None, None]
+        assert table.column("ind_rsi_14").to_pylist() == [55.0, 56.0]
+        other = table.column("indicators_non_numeric").to_pylist()
+        assert json.loads(other[0]) == {"macd": {"signal": 1.5}, "trend": "up"}
+        assert other[1] is None
+
+    @pytest.mark.asyncio
+    async def test_parquet_members_are_stored(self):
+        data = await _collect(stream_zip([("trades.parquet", single(b"PAR1")), ("a.jsonl", single(b"{}"))]))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.getinfo("trades.parquet").compress_type == zipfile.ZIP_STORED
+            assert archive.getinfo("a.jsonl").compress_type == zipfile.ZIP_DEFLATED
@@ -0,0 +1,187 @@
+"""
+Unit tests for the export job worker.
+
+Tests cover:
+- Jobs submitted to the worker being generated with a session of their own
+- The bounded queue rejecting jobs once full
+- Running jobs marked failed on shutdown
+- Heartbeats on the jobs a worker holds, and stale jobs of other
+  (crashed) instances marked failed
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services import export_worker as export_worker_module
+from services.export_service import ExportService
+from services.export_worker import ExportQueueFull, ExportWorker
+
+
+@asynccontextmanager
+async def _session():
+    yield AsyncMock()
+
+
+@pytest.fixture
+def fail_interrupted():
+    with patch.object(export_worker_module.ExportService, "fail_interrupted", AsyncMock(return_value=0)) as fail:
+        yield fail
+
+
+@pytest.fixture
+def heartbeat():
+    with patch.object(export_worker_module.ExportService, "heartbeat", AsyncMock()) as beat:
+        yield beat
+
+
+@pytest.mark.usefixtures("fail_interrupted", "heartbeat")
+class TestExportWorker:
+    """Test suite for ExportWorker"""
+
+    @pytest.mark.asyncio
+    async def test_processes_submitted_jobs(self):
+        export_id = uuid.uuid4()
+        generate = AsyncMock()
+        worker = ExportWorker(concurrency=1, queue_size=5)
+
+        with patch.object(export_worker_module, "async_session_maker", _session), \
+                patch.object(export_worker_module.ExportService, "generate_export_package", generate):
+            worker.start()
+            worker.submit(export_id)
+            await asyncio.wait_for(worker._queue.join(), timeout=1)
+            await worker.stop()
+
+        generate.assert_awaited_once_with(export_id)
+        assert worker.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_bounded_queue(self):
+        worker = ExportWorker(concurrency=1, queue_size=1)
+        with pytest.raises(ExportQueueFull):
+            worker.submit(uuid.uuid4())
+
+        worker._queue = asyncio.Queue(maxsize=1)
+        worker.submit(uuid.uuid4())
+
+        assert worker.is_full()
+        with pytest.raises(ExportQueueFull):
+            worker.submit(uuid.uuid4())
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_running_and_queued_jobs(self):
+        running, queued = uuid.uuid4(), uuid.uuid4()
+        started = asyncio.Event()
+
+        async def generate(self, export_id):
+            started.set()
+            await asyncio.sleep(60)
+
+        update_job = AsyncMock()
+        worker = ExportWorker(concurrency=1, queue_size=5)
+        with patch.object(export_worker_module, "async_session_maker", _session), \
+                patch.object(export_worker_module.ExportService, "generate_export_package", generate), \
+                patch.object(export_worker_module.ExportService, "update_job", update_job):
+            worker.start()
+            worker.submit(running)
+            await started.wait()
+            worker.submit(queued)
+            await worker.stop()
+
+        failed = {call.args[0] for call in update_job.await_args_list}
+        assert failed == {running, queued}
+        assert update_job.await_args.kwargs["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_start_fails_stale_jobs(self, fail_interrupted):
+        swept = asyncio.Event()
+        fail_interrupted.side_effect = lambda *args: swept.set() or 0
+        worker = ExportWorker(concurrency=1, queue_size=5)
+
+        worker.start()
+        await asyncio.wait_for(swept.wait(), timeout=1)
+        await worker.stop()
+
+        stale_after, message = fail_interrupted.await_args.args
+        assert stale_after == worker.stale_after
+        assert "interrupted" in message
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_covers_owned_jobs_only(self, heartbeat, fail_interrupted):
+        export_id = uuid.uuid4()
+        started = asyncio.Event()
+        beats = []
+
+        async def generate(self, export_id):
+            started.set()
+            await asyncio.sleep(60)
+
+        async def beat(export_ids):
+            beats.append(export_ids)
+
+        heartbeat.side_effect = beat
+        worker = ExportWorker(concurrency=1, queue_size=5)
+        worker.heartbeat_interval = 0.01
+        with patch.object(export_worker_module, "async_session_maker", _session), \
+                patch.object(export_worker_module.ExportService, "generate_export_package", generate), \
+                patch.object(export_worker_module.ExportService, "update_job", AsyncMock()):
+            worker.start()
+            worker.submit(export_id)
+            await started.wait()
+            await asyncio.sleep(0.05)
+            await worker.stop()
+
+        assert [export_id] in beats
+        # The heartbeat runs before each sweep, so a live job is refreshed before it can go stale
+        assert fail_interrupted.await_count >= 2
+        assert worker.stats()["running"] == 0 and not worker._owned
+
+
+class TestFailInterrupted:
+    """Test suite for ExportService.fail_interrupted"""
+
+    @pytest.mark.asyncio
+    async def test_interrupted_jobs_limited_to_stale_processing_rows(self):
+        db = AsyncMock()
+        db.execute.return_value = MagicMock(rowcount=2)
+
+        @asynccontextmanager
+        async def session():
+            yield db
+
+        stale_after = timedelta(seconds=180)
+        with patch("services.export_service.async_session_maker", session):
+            count = await ExportService.fail_interrupted(stale_after, "interrupted")
+
+        statement = db.execute.await_args.args[0]
+        compiled = statement.compile()
+        assert count == 2
+        assert "exports.status = :status_1" in str(compiled)
+        assert "exports.updated_at < now() - :now_1" in str(compiled)
+        assert compiled.params["status_1"] == "processing"
+        assert compiled.params["now_1"] == stale_after
+        assert compiled.params["status"] == "failed"
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_refreshes_processing_rows(self):
+        db = AsyncMock()
+        export_ids = [uuid.uuid4(), uuid.uuid4()]
+
+        @asynccontextmanager
+        async def session():
+            yield db
+
+        with patch("services.export_service.async_session_maker", session):
+            await ExportService.heartbeat([])
+            db.execute.assert_not_awaited()
+            await ExportService.heartbeat(export_ids)
+
+        compiled = db.execute.await_args.args[0].compile()
+        assert str(compiled).startswith("UPDATE exports SET updated_at=now()")
+        assert compiled.params["id_1"] == export_ids
+        assert compiled.params["status_1"] == "processing"
@@ -0,0 +1,167 @@
+"""
+Unit tests for the forward test CandleProcessor.
+
+Tests cover:
+- Streamed decisions executed once, outside the LLM request
+- Early executions that fail are not executed again
+- Early executions finishing even when the LLM request is cancelled
+- Per-candle indicator calculators using the shared indicator cache
+- Existing calculators extended by the new candle instead of rebuilt
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.ai_trader import AIDecision
+from services.market_data_service import Candle
+from services.trading.forward_engine import processor as processor_module
+from services.trading.forward_engine.processor import CandleProcessor
+
+
+def _candle():
+    return Candle(
+        timestamp=datetime(2025, 1, 1, 12), open=100.0, high=101.0, low=99.0, close=100.5, volume=10.0
+    )
+
+
+def _long(reasoning=""):
+    return AIDecision(
+        action="LONG", reasoning=reasoning, stop_loss_price=95.0, take_profit_price=110.0,
+        size_percentage=0.5, leverage=1
+    )
+
+
+def _session_state(get_decision):
+    state = MagicMock()
+    state.asset = "BTC/USDT"
+    state.timeframe = "1h"
+    state.candles_processed = []
+    state.decision_start_index = 0
+    state.ai_thoughts = []
+    state.decision_gate.evaluate.return_value = MagicMock(run=True, forced=False, source=None, reason=None)
+    state.position_manager.has_open_position.return_value = False
+    state.position_manager.get_stats.return_value = {"current_equity": 10000.0, "equity_change_pct": 0.0}
+    state.ai_trader.get_decision = get_decision
+    return state
+
+
+def _processor():
+    processor = CandleProcessor(
+        broadcaster=AsyncMock(),
+        position_handler=AsyncMock(),
+        database_manager=AsyncMock(),
+        auto_stop_manager=AsyncMock(),
+    )
+    processor._is_decision_candle = MagicMock(return_value=True)
+    processor._record_equity_point = MagicMock()
+    processor._compute_elapsed_seconds = MagicMock(return_value=0)
+    processor._serialize_position = MagicMock(return_value=None)
+    return processor
+
+
+@pytest.fixture(autouse=True)
+def indicator_calculator():
+    with patch.object(processor_module, "IndicatorCalculator") as calculator:
+        calculator.return_value.calculate_all.return_value = {"rsi": 30.0}
+        calculator.return_value.check_indicator_readiness.return_value = True
+        calculator.return_value.find_first_ready_index.return_value = 0
+        yield calculator
+
+
+class TestEarlyExecution:
+    """Test suite for executing streamed decisions before the reasoning ends"""
+
+    @pytest.mark.asyncio
+    async def test_provisional_decision_executed_once(self):
+        provisional = _long()
+
+        async def get_decision(on_action=None, on_reasoning=None, **kwargs):
+            await on_action(provisional)
+            await on_action(provisional)
+            await asyncio.sleep(0)
+            return _long("RSI oversold")
+
+        processor = _processor()
+        processor.execute_decision = AsyncMock()
+        state = _session_state(get_decision)
+        state.position_manager.has_open_position.side_effect = [False, True, True]
+
+        await processor.process_candle(MagicMock(), "session-1", state, _candle(), False)
+
+        processor.execute_decision.assert_awaited_once()
+        assert processor.execute_decision.await_args.args[3] is provisional
+        processor.position_handler.update_entry_reasoning.assert_awaited_once()
+        assert processor.position_handler.update_entry_reasoning.await_args.args[3] == "RSI oversold"
+
+    @pytest.mark.asyncio
+    async def test_failed_early_execution_not_retried(self):
+        async def get_decision(on_action=None, on_reasoning=None, **kwargs):
+            await on_action(_long())
+            return _long("done")
+
+        processor = _processor()
+        processor.execute_decision = AsyncMock(side_effect=RuntimeError("db write failed"))
+
+        with pytest.raises(RuntimeError):
+            await processor.process_candle(MagicMock(), "session-1", _session_state(get_decision), _candle(), False)
+
+        processor.execute_decision.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_cancel_execution(self):
+        finished = []
+
+        async def execute_decision(*args):
+            await asyncio.sleep(0.01)
+            finished.append(args[3].action)
+
+        async def get_decision(on_action=None, on_reasoning=None, **kwargs):
+            await on_action(_long())
+            raise asyncio.CancelledError()
+
+        processor = _processor()
+        processor.execute_decision = execute_decision
+
+        with pytest.raises(asyncio.CancelledError):
+            await processor.process_candle(MagicMock(), "session-1", _session_state(get_decision), _candle(), False)
+
+        assert finished == ["LONG"]
+
+
+class TestIndicators:
+    """Test suite for per-candle indicator calculation"""
+
+    @pytest.mark.asyncio
+    async def test_calculator_uses_shared_cache(self, indicator_calculator):
+        async def get_decision(**kwargs):
+            return _long("done")
+
+        processor = _processor()
+        processor.execute_decision = AsyncMock()
+        state = _session_state(get_decision)
+        state.indicator_calculator = None
+
+        await processor.process_candle(MagicMock(), "session-1", state, _candle(), False)
+
+        kwargs = indicator_calculator.call_args.kwargs
+        assert (kwargs["asset"], kwargs["timeframe"]) == ("BTC/USDT", "1h")
+
+    @pytest.mark.asyncio
+    async def test_existing_calculator_extended_by_new_candle(self, indicator_calculator):
+        async def get_decision(**kwargs):
+            return _long("done")
+
+        processor = _processor()
+        processor.execute_decision = AsyncMock()
+        state = _session_state(get_decision)
+        previous = state.indicator_calculator
+        previous.extend.return_value = indicator_calculator.return_value
+
+        await processor.process_candle(MagicMock(), "session-1", state, _candle(), False)
+
+        previous.extend.assert_called_once_with(state.candles_processed)
+        indicator_calculator.assert_not_called()
+        assert state.indicator_calculator is indicator_calculator.return_value
@@ -0,0 +1,136 @@
+"""
+Unit tests for the shared indicator result cache.
+
+Tests cover:
+- LRU eviction bounded by bytes
+- Content-addressed fingerprints
+- IndicatorCalculator reuse of cached results
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from typing import List
+import numpy as np
+
+from services.trading.indicator_cache import IndicatorCache, IndicatorCacheKey, fingerprint_candles
+from services.trading.indicator_calculator import IndicatorCalculator, Candle
+
+
+def make_candles(count: int, offset: float = 0.0) -> List[Candle]:
+    base_time = datetime(2024, 1, 1)
+    return [
+        Candle(
+            timestamp=base_time + timedelta(hours=i),
+            open=100.0 + i + offset,
+            high=105.0 + i + offset,
+            low=95.0 + i + offset,
+            close=102.0 + i + offset,
+            volume=1000.0 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def key(indicator: str, fingerprint: str = "fp", params=None) -> IndicatorCacheKey:
+    return IndicatorCacheKey.build("BTC/USDT", "1h", fingerprint, indicator, params)
+
+
+class TestIndicatorCache:
+    """Test suite for IndicatorCache"""
+
+    def test_get_or_compute_only_computes_once(self):
+        cache = IndicatorCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [1.0, 2.0, 3.0]
+
+        first = cache.get_or_compute(key("rsi"), compute)
+        second = cache.get_or_compute(key("rsi"), compute)
+
+        assert len(calls) == 1
+        assert np.array_equal(first, second)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_stored_arrays_are_read_only(self):
+        cache = IndicatorCache()
+        values = cache.put(key("rsi"), [1.0, 2.0])
+
+        with pytest.raises(ValueError):
+            values[0] = 5.0
+
+    def test_evicts_least_recently_used_when_over_budget(self):
+        # Each entry is 10 float64 values = 80 bytes; budget fits two
+        cache = IndicatorCache(max_bytes=160)
+        cache.put(key("a"), np.zeros(10))
+        cache.put(key("b"), np.zeros(10))
+        cache.get(key("a"))  # 'a' is now most recently used
+        cache.put(key("c"), np.zeros(10))
+
+        assert key("a") in cache
+        assert key("b") not in cache
+        assert key("c") in cache
+        assert cache.stats()["bytes"] == 160
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_entries_are_not_stored(self):
+        cache = IndicatorCache(max_bytes=16)
+        values = cache.put(key("big"), np.zeros(10))
+
+        assert len(values) == 10
+        assert len(cache) == 0
+
+    def test_params_are_part_of_key(self):
+        assert key("rsi", params={"window": 14}) != key("rsi", params={"window": 21})
+        assert key("macd", params={"a": 1, "b": 2}) == key("macd", params={"b": 2, "a": 1})
+
+    def test_fingerprint_is_content_addressed(self):
+        assert fingerprint_candles(make_candles(50)) == fingerprint_candles(make_candles(50))
+        assert fingerprint_candles(make_candles(50)) != fingerprint_candles(make_candles(51))
+        assert fingerprint_candles(make_candles(50)) != fingerprint_candles(make_candles(50, offset=1.0))
+
+
+class TestIndicatorCalculatorSharedCache:
+    """IndicatorCalculator integration with the shared cache"""
+
+    def test_second_calculator_reuses_cached_indicators(self):
+        cache = IndicatorCache()
+        candles = make_candles(100)
+
+        first = IndicatorCalculator(
+            candles, ['rsi', 'ema_20'], asset="BTC/USDT", timeframe="1h", shared_cache=cache
+        )
+        second = IndicatorCalculator(
+            candles, ['rsi', 'ema_20'], asset="BTC/USDT", timeframe="1h", shared_cache=cache
+        )
+
+        assert len(first.computed_cache_keys) == 2
+        assert second.computed_cache_keys == []
+        assert cache.stats()["hits"] == 2
+        assert first.calculate_all(99) == second.calculate_all(99)
+
+    def test_cached_values_match_uncached_calculation(self):
+        cache = IndicatorCache()
+        candles = make_candles(100)
+        indicators = ['rsi', 'macd', 'bbands', 'zscore']
+
+        IndicatorCalculator(candles, indicators, asset="BTC/USDT", timeframe="1h", shared_cache=cache)
+        cached = IndicatorCalculator(candles, indicators, asset="BTC/USDT", timeframe="1h", shared_cache=cache)
+        uncached = IndicatorCalculator(candles, indicators)
+
+        for i in (30, 60, 99):
+            assert cached.calculate_all(i) == pytest.approx(uncached.calculate_all(i), nan_ok=True)
+
+    def test_build_cache_keys_matches_calculator_keys(self):
+        cache = IndicatorCache()
+        candles = make_candles(60)
+
+        calculator = IndicatorCalculator(
+            candles, ['ema'], asset="ETH/USDT", timeframe="4h", shared_cache=cache
+        )
+        keys = IndicatorCalculator.build_cache_keys(candles, ['ema'], "ETH/USDT", "4h")
+
+        assert keys == calculator.computed_cache_keys
+        assert len(keys) == 3
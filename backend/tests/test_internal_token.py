@@ -0,0 +1,46 @@
+"""
+Unit tests for the internal operator token dependency.
+
+Tests cover:
+- Operator endpoints disabled while no token is configured
+- Requests without or with a wrong X-Internal-Token rejected
+- /metrics, /api/health/llm and /api/health/timings guarded by the token
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app import app
+from config import settings
+from dependencies import require_internal_token
+
+
+class TestRequireInternalToken:
+    """Test suite for require_internal_token"""
+
+    def test_disabled_without_configured_token(self):
+        with patch.object(settings, "INTERNAL_API_TOKEN", None):
+            with pytest.raises(HTTPException) as error:
+                require_internal_token("anything")
+
+        assert error.value.status_code == 404
+
+    @pytest.mark.parametrize("header", [None, "", "wrong-token"])
+    def test_wrong_token_rejected(self, header):
+        with patch.object(settings, "INTERNAL_API_TOKEN", "ops-token"):
+            with pytest.raises(HTTPException) as error:
+                require_internal_token(header)
+
+        assert error.value.status_code == 403
+
+    def test_matching_token_accepted(self):
+        with patch.object(settings, "INTERNAL_API_TOKEN", "ops-token"):
+            assert require_internal_token("ops-token") is None
+
+    @pytest.mark.parametrize("path", ["/metrics", "/api/health/llm", "/api/health/timings"])
+    def test_health_details_guarded(self, path):
+        route = next(route for route in app.routes if getattr(route, "path", None) == path)
+
+        assert require_internal_token in [dependency.call for dependency in route.dependant.dependencies]
@@ -0,0 +1,53 @@
+"""
+Unit tests for the shared LLM client registry.
+
+Tests cover:
+- Per-API-key client reuse
+- Shared HTTP connection pool
+- Pool shutdown and recreation
+"""
+
+import pytest
+
+from services.ai_trader import AITrader
+from services.llm_client import LLMClientRegistry
+
+
+class TestLLMClientRegistry:
+    """Test suite for LLMClientRegistry"""
+    
+    def test_same_key_reuses_client(self):
+        registry = LLMClientRegistry()
+        
+        assert registry.get_client("key-a") is registry.get_client("key-a")
+        assert registry.get_client("key-a") is not registry.get_client("key-b")
+        assert registry.stats()["clients"] == 2
+    
+    def test_clients_share_connection_pool(self):
+        registry = LLMClientRegistry()
+        
+        client_a = registry.get_client("key-a")
+        client_b = registry.get_client("key-b")
+        
+        assert client_a._client is registry.http_client()
+        assert client_b._client is registry.http_client()
+    
+    @pytest.mark.asyncio
+    async def test_aclose_recreates_pool_on_next_use(self):
+        registry = LLMClientRegistry()
+        client = registry.get_client("key-a")
+        pool = registry.http_client()
+        
+        await registry.aclose()
+        
+        assert pool.is_closed
+        assert registry.http_client() is not pool
+        assert registry.get_client("key-a") is not client
+    
+    def test_ai_traders_share_client_per_key(self):
+        first = AITrader(api_key="shared-key", model="m", strategy_prompt="s", mode="monk")
+        second = AITrader(api_key="shared-key", model="m", strategy_prompt="s", mode="omni")
+        other = AITrader(api_key="other-key", model="m", strategy_prompt="s", mode="monk")
+        
+        assert first.client is second.client
+        assert first.client is not other.client
@@ -0,0 +1,225 @@
+"""
+Unit tests for the LLM request scheduler.
+
+Tests cover:
+- Token bucket rate limiting per API key
+- Concurrency cap per API key
+- Forward priority over backtest requests
+- Weighted fair queuing across sessions
+- Cancelled requests not charged to their session
+- Queue depth, wait and throttling metrics
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services.llm_scheduler import LLMScheduler, TokenBucket
+
+
+async def _hold_slot(scheduler, order, label, session_id, priority="backtest", weight=1.0, key="key-a"):
+    async with scheduler.slot(key, session_id, priority=priority, weight=weight):
+        order.append(label)
+        await asyncio.sleep(0)
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10.0, capacity=2)
+
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        wait = bucket.try_acquire()
+        assert 0.0 < wait <= 0.1
+
+    def test_zero_rate_disables_limit(self):
+        bucket = TokenBucket(rate=0.0, capacity=1)
+
+        assert all(bucket.try_acquire() == 0.0 for _ in range(10))
+
+
+class TestLLMScheduler:
+    """Test suite for LLMScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_spaces_requests(self):
+        scheduler = LLMScheduler(rate_per_key=20.0, burst_per_key=1, max_in_flight_per_key=10)
+        order = []
+
+        started = time.monotonic()
+        await asyncio.gather(*[_hold_slot(scheduler, order, i, "s1") for i in range(4)])
+        elapsed = time.monotonic() - started
+
+        # One burst token, then 3 more at 20/s
+        assert len(order) == 4
+        assert elapsed >= 0.13
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_are_per_key(self):
+        scheduler = LLMScheduler(rate_per_key=1.0, burst_per_key=1, max_in_flight_per_key=10)
+        order = []
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                _hold_slot(scheduler, order, "a", "s1", key="key-a"),
+                _hold_slot(scheduler, order, "b", "s2", key="key-b"),
+            ),
+            timeout=0.5
+        )
+
+        assert sorted(order) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=2)
+        active = 0
+        peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with scheduler.slot("key-a", "s1"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[request() for _ in range(6)])
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_forward_requests_jump_the_backtest_queue(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+        order = []
+
+        blocker = await scheduler.acquire("key-a", "bt")
+        tasks = [
+            asyncio.create_task(_hold_slot(scheduler, order, f"bt{i}", "bt")) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_hold_slot(scheduler, order, "fwd", "live", priority="forward")))
+        await asyncio.sleep(0)
+
+        scheduler.release(blocker)
+        await asyncio.gather(*tasks)
+
+        assert order[0] == "fwd"
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_fairly(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+        order = []
+
+        blocker = await scheduler.acquire("key-a", "setup")
+        # Session A queues a long backlog before session B arrives
+        tasks = [asyncio.create_task(_hold_slot(scheduler, order, "A", "A")) for _ in range(6)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(_hold_slot(scheduler, order, "B", "B")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        scheduler.release(blocker)
+        await asyncio.gather(*tasks)
+
+        # B is interleaved with A instead of waiting behind A's whole backlog
+        assert order[:6].count("B") == 3
+
+    @pytest.mark.asyncio
+    async def test_weights_scale_share(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+        order = []
+
+        blocker = await scheduler.acquire("key-a", "setup")
+        tasks = [asyncio.create_task(_hold_slot(scheduler, order, "heavy", "heavy", weight=2.0)) for _ in range(6)]
+        tasks += [asyncio.create_task(_hold_slot(scheduler, order, "light", "light")) for _ in range(6)]
+        await asyncio.sleep(0)
+
+        scheduler.release(blocker)
+        await asyncio.gather(*tasks)
+
+        assert order[:6].count("heavy") == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+
+        blocker = await scheduler.acquire("key-a", "s1")
+        waiter = asyncio.create_task(scheduler.acquire("key-a", "s2"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        scheduler.release(blocker)
+
+        ticket = await asyncio.wait_for(scheduler.acquire("key-a", "s3"), timeout=0.5)
+        scheduler.release(ticket)
+        assert scheduler.stats()["keys"][ticket.key_id]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_requests_do_not_charge_the_session(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+        order = []
+
+        blocker = await scheduler.acquire("key-a", "setup")
+        # Session A's requests time out while queued
+        abandoned = [asyncio.create_task(scheduler.acquire("key-a", "A")) for _ in range(3)]
+        await asyncio.sleep(0)
+        for task in abandoned:
+            task.cancel()
+        await asyncio.gather(*abandoned, return_exceptions=True)
+
+        tasks = [asyncio.create_task(_hold_slot(scheduler, order, "A", "A"))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_hold_slot(scheduler, order, "B", "B")))
+        await asyncio.sleep(0)
+
+        scheduler.release(blocker)
+        await asyncio.gather(*tasks)
+
+        assert order == ["A", "B"]
+
+    @pytest.mark.asyncio
+    async def test_throttled_counts_each_request_once(self):
+        scheduler = LLMScheduler(rate_per_key=20.0, burst_per_key=1, max_in_flight_per_key=10)
+
+        first = await scheduler.acquire("key-a", "s1")
+        waiter = asyncio.create_task(scheduler.acquire("key-a", "s1"))
+        await asyncio.sleep(0)
+        # Releasing re-runs dispatch while the waiter is still held back
+        scheduler.release(first)
+        ticket = await asyncio.wait_for(waiter, timeout=1.0)
+        scheduler.release(ticket)
+
+        assert ticket.throttled
+        assert scheduler.stats()["keys"][ticket.key_id]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stats_report_queue_depth_and_waits(self):
+        scheduler = LLMScheduler(rate_per_key=0.0, burst_per_key=1, max_in_flight_per_key=1)
+
+        blocker = await scheduler.acquire("secret-key", "s1", priority="forward")
+        waiter = asyncio.create_task(scheduler.acquire("secret-key", "s2"))
+        await asyncio.sleep(0)
+
+        stats = scheduler.stats()
+        key_stats = stats["keys"][blocker.key_id]
+        assert "secret-key" not in str(stats)
+        assert key_stats["in_flight"] == 1
+        assert key_stats["queue_depth"] == {"forward": 0, "backtest": 1}
+
+        scheduler.release(blocker)
+        scheduler.release(await waiter)
+
+        stats = scheduler.stats()
+        assert stats["queue_wait"]["forward"]["samples"] == 1
+        assert stats["queue_wait"]["backtest"]["samples"] == 1
+        assert stats["queue_wait"]["backtest"]["p95_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_unknown_priority_rejected(self):
+        scheduler = LLMScheduler()
+
+        with pytest.raises(ValueError):
+            await scheduler.acquire("key-a", "s1", priority="urgent")
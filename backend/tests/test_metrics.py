@@ -0,0 +1,152 @@
+"""
+Unit tests for the metrics registry and /metrics endpoint.
+
+Tests cover:
+- Counter, gauge and histogram exposition format
+- Label validation and escaping
+- Scrape-time collectors (including a failing one)
+- Event loop lag sampling and the blocking call detector
+- GET /metrics (behind the internal token)
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from config import settings
+from services.loop_monitor import LoopLagMonitor
+from services.metrics import MetricFamily, MetricsRegistry, cache_lookups, event_loop_blocked
+from utils.retry import CircuitBreaker, circuit_breaker_states
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry"""
+
+    def test_counter_and_gauge_exposition(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run", ["kind"])
+        gauge = registry.gauge("queue_depth", "Queued jobs")
+
+        counter.inc(kind="export")
+        counter.inc(2, kind="export")
+        gauge.set(4)
+        gauge.dec()
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="export"} 3.0' in text
+        assert "queue_depth 3.0" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_sum 3.65" in text
+        assert "latency_seconds_count 4" in text
+
+    def test_labels_are_validated_and_escaped(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("errors_total", "Errors", ["message"])
+
+        with pytest.raises(ValueError):
+            counter.inc(reason="x")
+        with pytest.raises(ValueError):
+            counter.inc(-1, message="x")
+        counter.inc(message='bad "quote"\nline')
+
+        assert 'errors_total{message="bad \\"quote\\"\\nline"} 1.0' in registry.render()
+
+    def test_failing_collector_is_skipped(self):
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+        registry.register_collector(lambda: [MetricFamily("up", "gauge", "Up", [({}, 1)])])
+
+        assert "up 1.0" in registry.render()
+
+    def test_circuit_breaker_states(self):
+        breaker = CircuitBreaker(service_name="metrics-test", failure_threshold=1, timeout=60)
+        breaker.state = "open"
+
+        assert circuit_breaker_states()[("metrics-test", "open")] == 1
+
+
+class TestLoopLagMonitor:
+    """Test suite for LoopLagMonitor"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_shows_up_as_lag(self):
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.02)
+
+        time.sleep(0.1)  # Block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert monitor.samples > 0
+        assert monitor.max_lag >= 0.05
+        assert not monitor.running
+
+
+class TestMetricsEndpoint:
+    """Test suite for GET /metrics"""
+
+    def test_metrics_endpoint(self):
+        cache_lookups.inc(cache="market_data", tier="memory", result="hit")
+        cache_lookups.inc(cache="market_data", tier="memory", result="miss")
+
+        with patch.object(settings, "INTERNAL_API_TOKEN", "ops-token"):
+            response = TestClient(app).get("/metrics", headers={"X-Internal-Token": "ops-token"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'alphalabs_active_sessions{engine="backtest"}' in response.text
+        assert "# TYPE alphalabs_llm_request_seconds histogram" in response.text
+        assert 'alphalabs_cache_hit_ratio{cache="market_data",tier="memory"}' in response.text
+        assert "alphalabs_db_pool_size 5.0" in response.text
+
+
+class TestBlockingCallDetector:
+    """Test suite for the LOOP_BLOCK_DEBUG blocking call detector"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_reported_with_site(self, caplog):
+        monitor = LoopLagMonitor(interval=0.01, debug=True, block_threshold_ms=40)
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        with caplog.at_level("WARNING", logger="services.loop_monitor"):
+            _block_the_loop(0.2)
+            await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        site = "tests/test_metrics.py:_block_the_loop"
+        assert monitor.detector.stalls == 1
+        assert monitor.stats()["blocking_detector"]["top_sites"][0]["site"] == site
+        assert event_loop_blocked.value(site=site) >= 1
+        assert any("_block_the_loop" in record.getMessage() for record in caplog.records)
+
+    def test_debug_off_has_no_detector(self):
+        monitor = LoopLagMonitor(interval=0.01, debug=False)
+
+        assert monitor.detector is None
+        assert monitor.stats()["blocking_detector"] is None
+
+
+def _block_the_loop(seconds):
+    time.sleep(seconds)
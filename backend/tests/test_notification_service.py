@@ -0,0 +1,219 @@
+"""
+Unit tests for NotificationService.
+
+Tests cover:
+- Batch serialization with one TestSession query per page
+- Action URL routing for result, session and orphaned notifications
+- Cached unread counter hits, misses and adjustments on create/read/clear
+- Pushing new notifications and unread deltas to the user's channel
+"""
+
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models import Notification
+from services.notification_service import NotificationService
+from services.unread_counter import UnreadCounter, unread_counter
+from websocket import manager as manager_module
+from websocket.manager import WebSocketManager
+
+
+def _notification(**overrides):
+    fields = dict(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        type="trade_executed",
+        title="Trade opened",
+        message="Opened LONG BTC/USDT",
+        session_id=None,
+        result_id=None,
+        is_read=False,
+        created_at=datetime(2025, 1, 1),
+    )
+    fields.update(overrides)
+    return Notification(**fields)
+
+
+def _count_result(count):
+    result = MagicMock()
+    result.scalar_one.return_value = count
+    return result
+
+
+@pytest.fixture(autouse=True)
+def clear_unread_counter():
+    unread_counter.clear()
+    yield
+    unread_counter.clear()
+
+
+class TestSerializeNotifications:
+    """Test suite for NotificationService.serialize_notifications"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_loaded_in_one_query(self):
+        backtest_id, forward_id, missing_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        result_id = uuid.uuid4()
+        notifications = [
+            _notification(session_id=backtest_id),
+            _notification(session_id=backtest_id),
+            _notification(session_id=forward_id),
+            _notification(session_id=missing_id),
+            _notification(session_id=uuid.uuid4(), result_id=result_id, type="test_completed"),
+            _notification(type="system_alert"),
+        ]
+        rows = MagicMock()
+        rows.all.return_value = [(backtest_id, "backtest"), (forward_id, "forward")]
+        db = AsyncMock()
+        db.execute.return_value = rows
+
+        items = await NotificationService(db).serialize_notifications(notifications)
+
+        db.execute.assert_awaited_once()
+        assert [item["action_url"] for item in items] == [
+            f"/dashboard/arena/backtest/{backtest_id}",
+            f"/dashboard/arena/backtest/{backtest_id}",
+            f"/dashboard/arena/forward/{forward_id}",
+            None,
+            f"/dashboard/results/{result_id}",
+            None,
+        ]
+        assert items[4]["category"] == "test_complete"
+        assert items[5]["type"] == "info"
+
+    @pytest.mark.asyncio
+    async def test_no_query_without_session_notifications(self):
+        db = AsyncMock()
+
+        items = await NotificationService(db).serialize_notifications([
+            _notification(result_id=uuid.uuid4(), session_id=uuid.uuid4()),
+            _notification(type="daily_summary"),
+        ])
+
+        db.execute.assert_not_awaited()
+        assert len(items) == 2
+
+
+class TestUnreadCounter:
+    """Test suite for the cached unread notification count"""
+
+    @pytest.mark.asyncio
+    async def test_count_cached_between_polls(self):
+        user_id = uuid.uuid4()
+        db = AsyncMock()
+        db.execute.return_value = _count_result(3)
+        service = NotificationService(db)
+
+        assert await service.get_unread_count(user_id) == 3
+        assert await service.get_unread_count(user_id) == 3
+
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_create_and_read_adjust_cached_count(self):
+        user_id = uuid.uuid4()
+        unread_counter.set(user_id, 2)
+        db = AsyncMock()
+        db.add = MagicMock()
+        service = NotificationService(db)
+
+        await service.create_notification(user_id, "trade_executed", "Trade", "Opened")
+        assert await service.get_unread_count(user_id) == 3
+
+        notification = _notification(user_id=user_id)
+        lookup = MagicMock()
+        lookup.scalar_one_or_none.return_value = notification
+        db.execute.return_value = lookup
+        await service.mark_as_read(notification.id, user_id)
+        await service.mark_as_read(notification.id, user_id)
+        assert unread_counter.peek(user_id) == 2
+
+    @pytest.mark.asyncio
+    async def test_mark_all_read_resets_count(self):
+        user_id = uuid.uuid4()
+        unread_counter.set(user_id, 5)
+        db = AsyncMock()
+        db.execute.return_value = MagicMock()
+
+        await NotificationService(db).mark_all_read(user_id)
+
+        assert unread_counter.peek(user_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_uncached_user_not_adjusted(self):
+        user_id = uuid.uuid4()
+        counter = UnreadCounter(ttl=60, max_size=10)
+
+        counter.adjust(user_id, +1)
+
+        assert counter._lookup(user_id) is None
+
+    def test_zero_ttl_disables_cache(self):
+        counter = UnreadCounter(ttl=0, max_size=10)
+
+        counter.set(uuid.uuid4(), 4)
+
+        assert len(counter) == 0
+
+
+class TestPublish:
+    """Test suite for pushing notification changes over the user channel"""
+
+    @pytest.mark.asyncio
+    async def test_created_notification_pushed_with_count(self):
+        user_id = uuid.uuid4()
+        unread_counter.set(user_id, 1)
+        manager = WebSocketManager()
+        manager.user_connections[str(user_id)] = {"conn"}
+        manager.broadcast_to_user = AsyncMock(return_value=1)
+        db = AsyncMock()
+        db.add = MagicMock()
+
+        async def refresh(notification):
+            notification.id = uuid.uuid4()
+            notification.created_at = datetime(2025, 1, 1)
+
+        db.refresh.side_effect = refresh
+
+        with patch.object(manager_module, "websocket_manager", manager):
+            await NotificationService(db).create_notification(user_id, "system_alert", "Maintenance", "Tonight")
+
+        (_, created), (_, count) = [c.args for c in manager.broadcast_to_user.await_args_list]
+        payload = json.loads(created.to_json())["data"]["notification"]
+        assert payload["title"] == "Maintenance"
+        assert payload["type"] == "info"
+        assert count.data == {"delta": 1, "count": 2}
+
+    @pytest.mark.asyncio
+    async def test_nothing_serialized_without_open_channel(self):
+        manager = WebSocketManager()
+        manager.broadcast_to_user = AsyncMock()
+        service = NotificationService(AsyncMock())
+        service.serialize_notification = AsyncMock()
+
+        with patch.object(manager_module, "websocket_manager", manager):
+            await service.publish(uuid.uuid4(), delta=1, notification=_notification())
+
+        service.serialize_notification.assert_not_awaited()
+        manager.broadcast_to_user.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_mark_all_read_pushes_zero(self):
+        user_id = uuid.uuid4()
+        manager = WebSocketManager()
+        manager.user_connections[str(user_id)] = {"conn"}
+        manager.broadcast_to_user = AsyncMock(return_value=1)
+        updated = MagicMock()
+        updated.scalars.return_value.all.return_value = [uuid.uuid4(), uuid.uuid4()]
+        db = AsyncMock()
+        db.execute.return_value = updated
+
+        with patch.object(manager_module, "websocket_manager", manager):
+            await NotificationService(db).mark_all_read(user_id)
+
+        event = manager.broadcast_to_user.await_args.args[1]
+        assert event.data == {"delta": -2, "count": 0}
@@ -6,62 +6,107 @@ from fastapi.testclient import TestClient
 from app import app
 from models.arena import TestSession, Trade, AiThought
 from models.agent import Agent
+from utils.pagination import encode_cursor
 
 @pytest.fixture
 def client():
     return TestClient(app)
 
+def _list_row(created_at, **overrides):
+    row = dict(
+        id=uuid4(), type="backtest", agent_id=uuid4(), agent_name="Test Agent",
+        asset="BTC/USDT", mode="monk", created_at=created_at, duration_display="30 days",
+        total_trades=4, total_pnl_pct=10.5, win_rate=50.0, max_drawdown_pct=2.0,
+        sharpe_ratio=1.1, is_profitable=True, has_certificate=False,
+    )
+    row.update(overrides)
+    return MagicMock(**row)
+
 @pytest.mark.asyncio
 async def test_list_results(client, mock_auth_dependency, mock_db_session):
     # Mock count query
-    mock_db_session.scalar.return_value = 1
+    mock_db_session.scalar.return_value = 3
     
-    # Mock sessions query
-    mock_session = MagicMock(spec=TestSession)
-    mock_session.id = uuid4()
-    mock_session.type = "backtest"
-    mock_session.agent_id = uuid4()
-    mock_session.asset = "BTC/USDT"
-    mock_session.created_at = datetime.now()
-    mock_session.current_pnl_pct = 10.5
+    # limit + 1 rows are fetched to detect a next page
+    rows = [_list_row(datetime(2025, 1, 3 - i)) for i in range(3)]
+    mock_db_session.execute.return_value = MagicMock()
+    mock_db_session.execute.return_value.all.return_value = rows
     
-    mock_db_session.execute.return_value.scalars.return_value.all.return_value = [mock_session]
+    response = client.get("/api/results?limit=2")
     
-    # Mock agent query inside loop
-    mock_agent = MagicMock(spec=Agent)
-    mock_agent.name = "Test Agent"
-    # We need to handle multiple execute calls. 
-    # The first one is for sessions, subsequent ones for agents.
-    # This is tricky with a single mock.
-    # Simplified: We can mock side_effect.
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["results"]) == 2
+    assert data["results"][0]["agent_name"] == "Test Agent"
+    assert data["pagination"]["total"] == 3
+    assert data["pagination"]["has_more"] is True
     
-    async def mock_execute(query):
-        mock_result = MagicMock()
-        if "FROM test_sessions" in str(query):
-            mock_result.scalars.return_value.all.return_value = [mock_session]
-        elif "FROM agents" in str(query):
-            mock_result.scalar_one_or_none.return_value = mock_agent
-        return mock_result
-        
-    mock_db_session.execute.side_effect = mock_execute
+    # List columns only, one statement for agent names and certificates
+    query = str(mock_db_session.execute.await_args.args[0])
+    assert "equity_curve" not in query
+    assert "LEFT OUTER JOIN agents" in query
     
-    response = client.get("/api/results/")
+    # Next page: keyset on (created_at, id), no OFFSET, no count
+    mock_db_session.scalar.reset_mock()
+    mock_db_session.execute.return_value.all.return_value = rows[2:]
+    response = client.get(
+        f"/api/results?limit=2&include_total=false&cursor={data['pagination']['next_cursor']}"
+    )
     
-    assert response.status_code == 200
     data = response.json()
-    assert "results" in data
     assert len(data["results"]) == 1
-    assert data["results"][0]["agent_name"] == "Test Agent"
+    assert data["pagination"]["total"] is None
+    assert data["pagination"]["has_more"] is False
+    assert data["pagination"]["next_cursor"] is None
+    mock_db_session.scalar.assert_not_awaited()
+    query = str(mock_db_session.execute.await_args.args[0])
+    assert "(test_results.created_at, test_results.id) <" in query
+    assert "OFFSET" not in query
+
+@pytest.mark.asyncio
+async def test_list_results_invalid_cursor(client, mock_auth_dependency, mock_db_session):
+    response = client.get("/api/results?cursor=not-a-cursor")
+    
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_get_result_reasoning_keyset(client, mock_auth_dependency, mock_db_session):
+    mock_db_session.scalar.return_value = uuid4()  # Owned result's session id
+    
+    thoughts = []
+    for candle in (10, 11, 12):
+        thought = MagicMock(spec=AiThought)
+        thought.id = uuid4()
+        thought.candle_number = candle
+        thought.timestamp = datetime(2025, 1, 1)
+        thought.decision = "HOLD"
+        thought.reasoning = "Waiting"
+        thought.indicator_values = {"rsi": 50}
+        thoughts.append(thought)
+    mock_db_session.execute.return_value = MagicMock()
+    mock_db_session.execute.return_value.scalars.return_value.all.return_value = thoughts
+    
+    cursor = encode_cursor([9, str(uuid4())])
+    response = client.get(f"/api/results/{uuid4()}/reasoning?limit=2&include_total=false&cursor={cursor}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["candle_number"] for t in data["thoughts"]] == [10, 11]
+    assert data["pagination"]["has_more"] is True
+    query = str(mock_db_session.execute.await_args.args[0])
+    assert "(ai_thoughts.candle_number, ai_thoughts.id) >" in query
+    assert "candle_data" not in query
+    assert "OFFSET" not in query
 
 @pytest.mark.asyncio
 async def test_get_result_stats(client, mock_auth_dependency, mock_db_session):
-    # Mock sessions
-    s1 = MagicMock(spec=TestSession, type="backtest", current_pnl_pct=10.0)
-    s2 = MagicMock(spec=TestSession, type="forward", current_pnl_pct=-5.0)
+    # Mock grouped aggregate rows (one per result type)
+    backtest = MagicMock(type="backtest", count=1, profitable=1, best=10.0, worst=10.0, pnl_sum=10.0)
+    forward = MagicMock(type="forward", count=1, profitable=0, best=-5.0, worst=-5.0, pnl_sum=-5.0)
     
     # Setup mock result
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = [s1, s2]
+    mock_result.all.return_value = [backtest, forward]
     
     # Configure execute to return the mock result when awaited
     mock_db_session.execute.return_value = mock_result
@@ -73,6 +118,14 @@ async def test_get_result_stats(client, mock_auth_dependency, mock_db_session):
     assert data["stats"]["total_tests"] == 2
     assert data["stats"]["profitable"] == 1
     assert data["stats"]["by_type"]["backtest"]["count"] == 1
+    assert data["stats"]["best_result"] == 10.0
+    assert data["stats"]["worst_result"] == -5.0
+    assert data["stats"]["avg_pnl"] == 2.5
+    
+    # Aggregated in SQL: no result rows or heavy columns are loaded
+    query = str(mock_db_session.execute.await_args.args[0])
+    assert "GROUP BY test_results.type" in query
+    assert "equity_curve" not in query
 
 @pytest.mark.asyncio
 async def test_get_result_detail(client, mock_auth_dependency, mock_db_session):
@@ -122,3 +175,13 @@ async def test_get_result_detail(client, mock_auth_dependency, mock_db_session):
     data = response.json()
     assert data["result"]["id"] == str(session_id)
     assert len(data["result"]["trades"]) == 1
+
+@pytest.mark.asyncio
+async def test_export_parquet_without_pyarrow(client, mock_auth_dependency, mock_db_session, monkeypatch):
+    from services import export_columnar
+    monkeypatch.setattr(export_columnar, "PARQUET_AVAILABLE", False)
+    
+    response = client.get(f"/api/results/{uuid4()}/export?format=parquet")
+    
+    assert response.status_code == 501
+    mock_db_session.execute.assert_not_called()
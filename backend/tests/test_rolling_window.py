@@ -0,0 +1,152 @@
+"""
+Unit tests for the streaming rolling window operators.
+
+Tests cover:
+- Agreement with pandas rolling/ewm/shift/diff
+- Vectorized apply() matching per-bar update() and continuing across calls
+- Full-history cost not growing with the window length
+- NaN handling inside the window
+- Crossover signals
+- Warm-up lengths
+"""
+
+import time
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from services.trading.rolling_window import (
+    WINDOW_OPERATORS,
+    Crossover,
+    Ema,
+    RollingMax,
+    RollingStd,
+    window_warmup,
+)
+from services.trading.custom_indicator_engine import MAX_WINDOW
+
+
+@pytest.fixture
+def series() -> pd.Series:
+    """Random walk with a few missing values"""
+    rng = np.random.default_rng(7)
+    values = 100.0 + rng.normal(0, 1, 300).cumsum()
+    values[[40, 41, 150]] = np.nan
+    return pd.Series(values)
+
+
+class TestRollingWindow:
+    """Test suite for rolling window operators"""
+
+    @pytest.mark.parametrize("operator", ['mean', 'sum', 'min', 'max', 'std'])
+    @pytest.mark.parametrize("window", [1, 5, 20])
+    def test_aggregates_match_pandas(self, series, operator, window):
+        result = WINDOW_OPERATORS[operator](window).apply(series.to_numpy())
+        expected = getattr(series.rolling(window), operator)().to_numpy()
+
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+    @pytest.mark.parametrize("window", [1, 3, 10])
+    def test_lag_and_diff_match_pandas(self, series, window):
+        values = series.to_numpy()
+
+        np.testing.assert_allclose(
+            WINDOW_OPERATORS['lag'](window).apply(values), series.shift(window).to_numpy(), equal_nan=True
+        )
+        np.testing.assert_allclose(
+            WINDOW_OPERATORS['diff'](window).apply(values), series.diff(window).to_numpy(), equal_nan=True
+        )
+
+    def test_ema_matches_pandas_ewm(self, series):
+        clean = series.fillna(100.0)
+        result = Ema(10).apply(clean.to_numpy())
+        expected = clean.ewm(span=10, adjust=False, min_periods=10).mean().to_numpy()
+
+        np.testing.assert_allclose(result, expected, rtol=1e-12, equal_nan=True)
+
+    def test_incremental_updates_match_batch(self, series):
+        values = series.to_numpy()
+        batch = RollingStd(14).apply(values)
+        stream = RollingStd(14)
+        incremental = [stream.update(v) for v in values]
+
+        np.testing.assert_allclose(incremental, batch, equal_nan=True)
+
+    @pytest.mark.parametrize("operator", sorted(WINDOW_OPERATORS))
+    def test_batch_matches_streaming(self, series, operator):
+        values = series.to_numpy()
+        stream = WINDOW_OPERATORS[operator](7)
+        expected = [stream.update(v) for v in values]
+
+        np.testing.assert_allclose(
+            WINDOW_OPERATORS[operator](7).apply(values), expected, rtol=1e-9, atol=1e-9, equal_nan=True
+        )
+
+    @pytest.mark.parametrize("operator", sorted(WINDOW_OPERATORS))
+    def test_apply_leaves_state_after_last_bar(self, series, operator):
+        values = series.to_numpy()
+        expected = WINDOW_OPERATORS[operator](7).apply(values)
+        state = WINDOW_OPERATORS[operator](7)
+
+        head = state.apply(values[:100])
+        middle = state.apply(values[100:200])
+        tail = [state.update(v) for v in values[200:]]
+
+        np.testing.assert_allclose(
+            np.concatenate([head, middle, tail]), expected, rtol=1e-9, atol=1e-9, equal_nan=True
+        )
+
+    def test_crossover_apply_continues_from_previous_bar(self):
+        left = np.array([1.0, 3.0, 1.0, 3.0])
+        right = np.full(4, 2.0)
+        crossover = Crossover()
+
+        result = np.concatenate([crossover.apply(left[:2], right[:2]), crossover.apply(left[2:], right[2:])])
+
+        assert np.isnan(result[0])
+        assert result[1:].tolist() == [1.0, -1.0, 1.0]
+
+    def test_extreme_expires_old_values(self):
+        result = RollingMax(3).apply(np.array([5.0, 1.0, 1.0, 1.0, 2.0]))
+
+        assert np.isnan(result[:2]).all()
+        assert result[2:].tolist() == [5.0, 1.0, 2.0]
+
+    def test_running_sum_does_not_drift(self):
+        values = np.tile([1e9, 1e-3, -1e9, 7.0], 2500)
+        result = WINDOW_OPERATORS['sum'](4).apply(values)
+        stream = WINDOW_OPERATORS['sum'](4)
+        incremental = [stream.update(v) for v in values]
+
+        # Cancellation error of one window, not accumulated over the series
+        assert result[-1] == pytest.approx(result[7], rel=1e-12)
+        assert result[-1] == pytest.approx(7.001, rel=1e-8)
+        assert incremental[-1] == pytest.approx(7.001, rel=1e-12)
+
+    def test_full_history_cost_independent_of_window(self):
+        values = np.random.default_rng(3).normal(0, 1, 200_000).cumsum()
+
+        started = time.perf_counter()
+        for operator in ['mean', 'sum', 'min', 'max', 'std']:
+            WINDOW_OPERATORS[operator](MAX_WINDOW).apply(values)
+        elapsed = time.perf_counter() - started
+
+        # O(n * window) evaluation takes several seconds per operator here
+        assert elapsed < 2.0
+
+    def test_crossover(self):
+        left = np.array([1.0, 3.0, 3.0, 1.0, np.nan, 3.0])
+        right = np.array([2.0, 2.0, 2.0, 2.0, 2.0, 2.0])
+
+        result = Crossover().apply(left, right)
+
+        assert np.isnan(result[0])
+        assert result[1:4].tolist() == [1.0, 0.0, -1.0]
+        assert np.isnan(result[4:]).all()
+
+    def test_window_warmup(self):
+        assert window_warmup('mean', 20) == 19
+        assert window_warmup('ema', 1) == 0
+        assert window_warmup('lag', 5) == 5
+        assert window_warmup('diff', 1) == 1
@@ -0,0 +1,242 @@
+"""
+Unit tests for streaming AI decisions.
+
+Tests cover:
+- Incremental JSON parsing across arbitrary chunk boundaries
+- Early hand-off of order fields before the reasoning is complete
+- Early hand-off when the optional price fields are left out
+- Reasoning-first responses (no early hand-off until the order fields arrive)
+- Reasoning deltas
+- Stream failures before and after the order fields
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.ai_trader import AITrader, Candle
+from services.streaming_json import StreamingObjectParser
+
+
+DECISION_JSON = json.dumps({
+    "action": "LONG",
+    "entry_price": None,
+    "stop_loss_price": 49000.0,
+    "take_profit_price": 52000.0,
+    "size_percentage": 0.5,
+    "leverage": 1,
+    "reasoning": "RSI \"oversold\"\nMACD turning up é",
+})
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class _Stream:
+    """Async iterator of OpenAI-style stream chunks, optionally failing midway"""
+
+    def __init__(self, pieces, fail_after=None):
+        self.pieces = pieces
+        self.fail_after = fail_after
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for i, piece in enumerate(self.pieces):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("stream reset")
+            chunk = MagicMock()
+            chunk.usage = None
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = piece
+            yield chunk
+
+
+class TestStreamingObjectParser:
+    """Test suite for StreamingObjectParser"""
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 13, 1000])
+    def test_chunk_boundaries(self, size):
+        parser = StreamingObjectParser()
+        events = []
+        for chunk in _chunks("```json\n" + DECISION_JSON + "\n```", size):
+            events.extend(parser.feed(chunk))
+
+        assert parser.done
+        assert parser.fields == json.loads(DECISION_JSON)
+        streamed = "".join(e.value for e in events if e.kind == "text" and e.key == "reasoning")
+        assert streamed == json.loads(DECISION_JSON)["reasoning"]
+
+    def test_fields_complete_before_reasoning_ends(self):
+        parser = StreamingObjectParser()
+        head = DECISION_JSON[:DECISION_JSON.index("MACD")]
+
+        parser.feed(head)
+
+        assert parser.fields["action"] == "LONG"
+        assert parser.fields["leverage"] == 1
+        assert parser.streaming_key == "reasoning"
+        assert "reasoning" not in parser.fields
+
+    def test_nested_values(self):
+        parser = StreamingObjectParser()
+
+        parser.feed('{"a": {"b": [1, "]}"]}, "c": true}')
+
+        assert parser.fields == {"a": {"b": [1, "]}"]}, "c": True}
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(ValueError):
+            StreamingObjectParser().feed('{"a" 1}')
+
+
+class TestAITraderStreaming:
+    """Test suite for streaming mode in AITrader"""
+
+    @pytest.fixture
+    def trader(self):
+        return AITrader(
+            api_key="stream-key",
+            model="openai/gpt-4o-mini",
+            strategy_prompt="Buy dips",
+            mode="monk",
+            streaming=True
+        )
+
+    @pytest.fixture
+    def sample_candle(self) -> Candle:
+        return Candle(
+            timestamp=datetime(2024, 1, 1, 12, 0, 0),
+            open=50000.0, high=50500.0, low=49500.0, close=50250.0, volume=1000000.0
+        )
+
+    def test_schema_puts_reasoning_last(self, trader):
+        from services.ai_trader import STREAMING_RESPONSE_FORMAT
+
+        properties = list(STREAMING_RESPONSE_FORMAT["json_schema"]["schema"]["properties"])
+        assert properties[-1] == "reasoning"
+        assert "reasoning last" in trader.system_message
+
+    @pytest.mark.asyncio
+    async def test_action_before_reasoning_completes(self, trader, sample_candle):
+        timeline = []
+
+        async def on_action(decision):
+            timeline.append(("action", decision.action, decision.reasoning))
+
+        async def on_reasoning(delta):
+            timeline.append(("reasoning", delta))
+
+        async def create(**kwargs):
+            assert kwargs["stream"] is True
+            return _Stream(_chunks(DECISION_JSON, 7))
+
+        with patch.object(trader.client.chat.completions, "create", side_effect=create):
+            decision = await trader.get_decision(
+                sample_candle, {"rsi": 25.0}, None, 10000.0,
+                on_action=on_action, on_reasoning=on_reasoning
+            )
+
+        assert timeline[0] == ("action", "LONG", "")
+        assert "".join(item[1] for item in timeline[1:]) == json.loads(DECISION_JSON)["reasoning"]
+        assert decision.action == "LONG"
+        assert decision.stop_loss_price == 49000.0
+        assert decision.reasoning == json.loads(DECISION_JSON)["reasoning"]
+        assert trader.get_stats()["time_to_action_p50_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_action_without_optional_prices(self, trader, sample_candle):
+        fields = json.loads(DECISION_JSON)
+        del fields["entry_price"], fields["take_profit_price"]
+        timeline = []
+
+        async def on_action(decision):
+            timeline.append(("action", decision.action, decision.take_profit_price))
+
+        async def on_reasoning(delta):
+            timeline.append(("reasoning", delta))
+
+        async def create(**kwargs):
+            return _Stream(_chunks(json.dumps(fields), 7))
+
+        with patch.object(trader.client.chat.completions, "create", side_effect=create):
+            decision = await trader.get_decision(
+                sample_candle, {"rsi": 25.0}, None, 10000.0,
+                on_action=on_action, on_reasoning=on_reasoning
+            )
+
+        # Handed off as soon as the reasoning starts, not after it ends
+        assert timeline[0] == ("action", "LONG", None)
+        assert "".join(item[1] for item in timeline[1:]) == fields["reasoning"]
+        assert decision.stop_loss_price == 49000.0
+        assert decision.entry_price is None
+
+    @pytest.mark.asyncio
+    async def test_reasoning_first_stream(self, trader, sample_candle):
+        fields = json.loads(DECISION_JSON)
+        reasoning_first = json.dumps({"reasoning": fields.pop("reasoning"), **fields})
+        timeline = []
+
+        async def on_action(decision):
+            timeline.append(("action", decision.action))
+
+        async def on_reasoning(delta):
+            timeline.append(("reasoning", delta))
+
+        async def create(**kwargs):
+            return _Stream(_chunks(reasoning_first, 7))
+
+        with patch.object(trader.client.chat.completions, "create", side_effect=create) as mock_create:
+            decision = await trader.get_decision(
+                sample_candle, {"rsi": 25.0}, None, 10000.0,
+                on_action=on_action, on_reasoning=on_reasoning
+            )
+
+        assert mock_create.call_count == 1
+        assert timeline[-1] == ("action", "LONG")
+        assert [item for item in timeline if item[0] == "action"] == [("action", "LONG")]
+        assert decision.action == "LONG"
+        assert decision.take_profit_price == 52000.0
+        assert decision.reasoning == json.loads(DECISION_JSON)["reasoning"]
+
+    @pytest.mark.asyncio
+    async def test_failure_after_action_keeps_order_fields(self, trader, sample_candle):
+        actions = []
+
+        async def on_action(decision):
+            actions.append(decision)
+
+        pieces = _chunks(DECISION_JSON, 10)
+        fail_at = next(i for i in range(len(pieces)) if "MACD" in "".join(pieces[:i]))
+
+        async def create(**kwargs):
+            return _Stream(pieces, fail_after=fail_at)
+
+        with patch.object(trader.client.chat.completions, "create", side_effect=create) as mock_create:
+            decision = await trader.get_decision(sample_candle, {"rsi": 25.0}, None, 10000.0, on_action=on_action)
+
+        # Not retried: the order may already have been placed
+        assert mock_create.call_count == 1
+        assert len(actions) == 1
+        assert decision.action == "LONG"
+        assert "reasoning stream interrupted" in decision.reasoning
+
+    @pytest.mark.asyncio
+    async def test_failure_before_action_returns_hold(self, trader, sample_candle):
+        actions = []
+
+        async def on_action(decision):
+            actions.append(decision)
+
+        async def create(**kwargs):
+            return _Stream(_chunks(DECISION_JSON, 10), fail_after=1)
+
+        with patch.object(trader.client.chat.completions, "create", side_effect=create):
+            decision = await trader.get_decision(sample_candle, {"rsi": 25.0}, None, 10000.0, on_action=on_action)
+
+        assert actions == []
+        assert decision.action == "HOLD"
@@ -0,0 +1,95 @@
+"""
+Unit tests for candle pipeline timing spans.
+
+Tests cover:
+- Stage durations and percentiles
+- Disabled tracers recording nothing
+- LLM spans tagged with token usage and queue wait
+- Registry of running sessions
+"""
+
+import gc
+import time
+
+import pytest
+
+from services.ai_trader import PromptCacheStats
+from services.trading.tracing import CandleTracer, active_tracer_summaries
+
+
+class _Usage:
+    def __init__(self, prompt_tokens, completion_tokens):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.prompt_tokens_details = None
+
+
+class TestCandleTracer:
+    """Test suite for CandleTracer"""
+
+    def test_span_records_stage_percentiles(self):
+        tracer = CandleTracer("s1", enabled=True)
+
+        for duration in range(1, 101):
+            tracer.record("db_runtime_stats", float(duration))
+        with tracer.span("indicators"):
+            time.sleep(0.002)
+
+        stages = tracer.summary()["stages"]
+        assert stages["db_runtime_stats"]["count"] == 100
+        assert stages["db_runtime_stats"]["p50_ms"] == 51.0
+        assert stages["db_runtime_stats"]["p95_ms"] == 96.0
+        assert stages["db_runtime_stats"]["p99_ms"] == 100.0
+        assert stages["indicators"]["max_ms"] >= 2.0
+
+    def test_span_records_on_exception(self):
+        tracer = CandleTracer("s2", enabled=True)
+
+        with pytest.raises(RuntimeError):
+            with tracer.span("execute"):
+                raise RuntimeError("boom")
+
+        assert tracer.summary()["stages"]["execute"]["count"] == 1
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = CandleTracer("s3", enabled=False)
+
+        with tracer.span("indicators"):
+            pass
+        with tracer.llm_span(0, PromptCacheStats()):
+            pass
+
+        summary = tracer.summary()
+        assert summary["enabled"] is False
+        assert summary["stages"] == {}
+        assert summary["llm_calls"]["count"] == 0
+        assert tracer.span("a") is tracer.span("b")
+
+    def test_llm_span_tags_usage_and_queue_wait(self):
+        tracer = CandleTracer("s4", enabled=True)
+        stats = PromptCacheStats()
+        stats.record(100.0, _Usage(500, 50))
+
+        with tracer.llm_span(7, stats):
+            stats.record_queue_wait(40.0)
+            stats.record(120.0, _Usage(800, 60))
+
+        llm = tracer.summary()["llm_calls"]
+        assert llm["count"] == 1
+        assert llm["prompt_tokens"] == 800
+        assert llm["completion_tokens"] == 60
+        assert llm["queue_wait_p50_ms"] == 40.0
+        assert llm["recent"][0]["candle_index"] == 7
+        assert llm["recent"][0]["queue_wait_ms"] == 40.0
+        assert "llm" in tracer.summary()["stages"]
+
+    def test_active_tracers_registry(self):
+        tracer = CandleTracer("running-session", enabled=True)
+        CandleTracer("disabled-session", enabled=False)
+
+        assert "running-session" in active_tracer_summaries()
+        assert "disabled-session" not in active_tracer_summaries()
+
+        del tracer
+        gc.collect()
+        assert "running-session" not in active_tracer_summaries()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the clerk_id -> User cache used by get_current_user.
+
+Tests cover:
+- Cache hits skipping the users query
+- Returned instances attached to the request session
+- TTL expiry and explicit invalidation (including the Clerk webhooks)
+- Misses not being cached
+"""
+
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+import webhooks
+from models import User
+from services.user_cache import UserCache
+
+
+def _user(clerk_id="user_abc"):
+    return User(id=uuid.uuid4(), clerk_id=clerk_id, email=f"{clerk_id}@example.com", timezone="UTC")
+
+
+def _db(user):
+    """Mock AsyncSession whose users query returns `user` and whose merge uses a real Session"""
+    session = Session()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    db = AsyncMock()
+    db.execute.return_value = result
+    db.merge.side_effect = lambda instance, load=True: session.merge(instance, load=load)
+    db.sync_session = session
+    return db
+
+
+class TestUserCache:
+    """Test suite for UserCache"""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_skips_query(self):
+        user = _user()
+        db = _db(user)
+        cache = UserCache(ttl=30, max_size=10)
+
+        first = await cache.get_user(db, "user_abc")
+        second = await cache.get_user(db, "user_abc")
+
+        assert first is user
+        assert db.execute.await_count == 1
+        assert second.id == user.id
+        assert second.email == "user_abc@example.com"
+
+    @pytest.mark.asyncio
+    async def test_cached_user_is_attached_and_tracks_changes(self):
+        db = _db(_user())
+        cache = UserCache(ttl=30, max_size=10)
+        await cache.get_user(db, "user_abc")
+
+        cached = await cache.get_user(db, "user_abc")
+        cached.timezone = "Europe/Berlin"
+
+        assert inspect(cached).persistent
+        assert cached in db.sync_session.dirty
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, monkeypatch):
+        db = _db(_user())
+        cache = UserCache(ttl=30, max_size=10)
+        await cache.get_user(db, "user_abc")
+
+        later = time.monotonic() + 31
+        monkeypatch.setattr("services.user_cache.time.monotonic", lambda: later)
+        await cache.get_user(db, "user_abc")
+
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_missing_users(self):
+        db = _db(_user())
+        cache = UserCache(ttl=30, max_size=10)
+        await cache.get_user(db, "user_abc")
+
+        cache.invalidate("user_abc")
+        assert len(cache) == 0
+
+        db.execute.return_value.scalar_one_or_none.return_value = None
+        assert await cache.get_user(db, "user_missing") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_webhooks_invalidate(self):
+        cache = UserCache(ttl=30, max_size=10)
+        await cache.get_user(_db(_user("user_1")), "user_1")
+        await cache.get_user(_db(_user("user_2")), "user_2")
+
+        with patch.object(webhooks, "user_cache", cache), \
+                patch.object(webhooks, "get_supabase_client", return_value=MagicMock()):
+            await webhooks.handle_user_updated({"data": {"id": "user_1", "first_name": "New"}})
+            await webhooks.handle_user_deleted({"data": {"id": "user_2"}})
+
+        assert len(cache) == 0
@@ -6,6 +6,7 @@ Tests:
 - Event broadcasting
 - Reconnection handling
 - Heartbeat functionality
+- User-scoped notification channels
 """
 
 import pytest
@@ -23,6 +24,7 @@ from websocket.events import (
     create_position_opened_event,
     create_stats_update_event,
     create_heartbeat_event,
+    create_unread_count_event,
 )
 
 
@@ -482,5 +484,40 @@ async def test_send_to_unknown_connection(manager):
     assert success is False
 
 
+@pytest.mark.asyncio
+async def test_user_connection_receives_user_events(manager):
+    """Test user-scoped connections are separate from session connections."""
+    user_ws_1 = MockWebSocket()
+    user_ws_2 = MockWebSocket()
+    session_ws = MockWebSocket()
+    
+    conn_id_1 = await manager.connect_user(user_ws_1, "user-1")
+    await manager.connect_user(user_ws_2, "user-1")
+    await manager.connect(session_ws, "test-session")
+    
+    assert manager.get_connection_metadata(conn_id_1)["user_id"] == "user-1"
+    assert manager.get_connection_count("test-session") == 1
+    
+    sent = await manager.broadcast_to_user("user-1", create_unread_count_event(delta=1, count=4))
+    
+    assert sent == 2
+    assert len(user_ws_1.messages) == 1
+    assert len(user_ws_2.messages) == 1
+    assert session_ws.messages == []
+    assert await manager.broadcast_to_user("user-2", create_heartbeat_event()) == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_user_connection(manager, mock_websocket):
+    """Test disconnecting a user-scoped connection clears the user mapping."""
+    conn_id = await manager.connect_user(mock_websocket, "user-1")
+    
+    await manager.disconnect(conn_id)
+    
+    assert manager.get_user_connections("user-1") == []
+    assert "user-1" not in manager.user_connections
+    assert not manager.is_connected(conn_id)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -3,14 +3,38 @@ Certificate Image Generator.
 
 Produces shareable PNG previews for certificates so the frontend can
 display lightweight thumbnails without re-rendering PDFs.
+
+Fonts and the static layer (background, title, metrics card) are built once
+per process; each certificate starts from a copy of that layer.
 """
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
-import qrcode
+
+from utils.qr_code import generate_qr_image
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    """
+    Attempt to load a truetype font, falling back to the default bitmap font.
+    """
+    font_candidates = [
+        "arialbd.ttf" if bold else "arial.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    ]
+    for path in font_candidates:
+        if not path:
+            continue
+        try:
+            return ImageFont.truetype(path, size=size)
+        except (OSError, IOError):
+            continue
+    return ImageFont.load_default()
 
 
 class CertificateImageGenerator:
@@ -23,12 +47,17 @@ class CertificateImageGenerator:
     TEXT_PRIMARY = "#FFFFFF"
     TEXT_SECONDARY = "#A1A1AA"
     CARD_BG = "#18181B"
+    CARD_BOX = (140, 360, WIDTH - 140, 360 + 360)
+    QR_SIZE = 220
+
+    # Background, title and card shared by every certificate (built on first use)
+    _static_layer: Optional[Image.Image] = None
 
     def __init__(self) -> None:
-        self.title_font = self._load_font(size=64, bold=True)
-        self.subtitle_font = self._load_font(size=32)
-        self.body_font = self._load_font(size=28)
-        self.small_font = self._load_font(size=22)
+        self.title_font = _load_font(size=64, bold=True)
+        self.subtitle_font = _load_font(size=32)
+        self.body_font = _load_font(size=28)
+        self.small_font = _load_font(size=22)
 
     def generate_certificate_image(
         self,
@@ -47,9 +76,15 @@ class CertificateImageGenerator:
         verification_code: str,
         share_url: str,
         issued_at: datetime,
+        qr_image: Optional[Image.Image] = None,
     ) -> bytes:
-        """Render certificate data into a PNG image."""
-        image = Image.new("RGB", (self.WIDTH, self.HEIGHT), self.BG_COLOR)
+        """
+        Render certificate data into a PNG image.
+
+        Pass qr_image (utils.qr_code.generate_qr_image) to reuse a QR code
+        already generated for the certificate's other assets.
+        """
+        image = self._get_static_layer().copy()
         draw = ImageDraw.Draw(image)
 
         self._draw_header(draw, agent_name)
@@ -67,21 +102,30 @@ class CertificateImageGenerator:
             test_period,
         )
         self._draw_footer(draw, verification_code, issued_at)
-        self._paste_qr(image, share_url)
+        self._paste_qr(image, qr_image or generate_qr_image(share_url))
 
         buffer = BytesIO()
         image.save(buffer, format="PNG")
         buffer.seek(0)
         return buffer.getvalue()
 
+    def _get_static_layer(self) -> Image.Image:
+        cls = type(self)
+        if cls._static_layer is None:
+            layer = Image.new("RGB", (self.WIDTH, self.HEIGHT), self.BG_COLOR)
+            draw = ImageDraw.Draw(layer)
+            draw.text(
+                (self.WIDTH / 2, 120),
+                "AlphaLab Performance Certificate",
+                font=self.subtitle_font,
+                fill=self.ACCENT,
+                anchor="mm",
+            )
+            draw.rounded_rectangle(self.CARD_BOX, radius=32, fill=self.CARD_BG)
+            cls._static_layer = layer
+        return cls._static_layer
+
     def _draw_header(self, draw: ImageDraw.ImageDraw, agent_name: str) -> None:
-        draw.text(
-            (self.WIDTH / 2, 120),
-            "AlphaLab Performance Certificate",
-            font=self.subtitle_font,
-            fill=self.ACCENT,
-            anchor="mm",
-        )
         draw.text(
             (self.WIDTH / 2, 220),
             agent_name,
@@ -113,14 +157,8 @@ class CertificateImageGenerator:
         duration_display: str,
         test_period: str,
     ) -> None:
-        card_left = 140
-        card_top = 360
-        card_right = self.WIDTH - 140
-        card_bottom = card_top + 360
-
-        draw.rounded_rectangle(
-            (card_left, card_top, card_right, card_bottom), radius=32, fill=self.CARD_BG
-        )
+        # The card itself is part of the static layer
+        card_left, card_top, card_right, _ = self.CARD_BOX
 
         draw.text(
             (card_left + 40, card_top + 40),
@@ -185,39 +223,13 @@ class CertificateImageGenerator:
             fill=self.ACCENT,
         )
 
-    def _paste_qr(self, image: Image.Image, share_url: str) -> None:
-        qr_img = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        qr_img.add_data(share_url)
-        qr_img.make(fit=True)
-        qr = qr_img.make_image(fill_color=self.ACCENT, back_color=self.BG_COLOR).convert("RGB")
-        qr = qr.resize((220, 220))
+    def _paste_qr(self, image: Image.Image, qr_image: Image.Image) -> None:
+        qr = qr_image.convert("RGB").resize((self.QR_SIZE, self.QR_SIZE))
 
-        x = self.WIDTH - 220 - 120
-        y = self.HEIGHT - 220 - 80
+        x = self.WIDTH - self.QR_SIZE - 120
+        y = self.HEIGHT - self.QR_SIZE - 80
         image.paste(qr, (x, y))
 
-    def _load_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-        """
-        Attempt to load a truetype font, falling back to the default bitmap font.
-        """
-        font_candidates = [
-            "arialbd.ttf" if bold else "arial.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        ]
-        for path in font_candidates:
-            if not path:
-                continue
-            try:
-                return ImageFont.truetype(path, size=size)
-            except (OSError, IOError):
-                continue
-        return ImageFont.load_default()
-
     def _pnl_color(self, pnl_pct: Decimal) -> str:
         return "#10B981" if pnl_pct >= 0 else "#EF4444"
 
@@ -0,0 +1,47 @@
+"""
+Keyset (Cursor) Pagination Utilities.
+
+Purpose:
+    Encode the sort key of the last row of a page into an opaque cursor so
+    the next page is fetched with `WHERE (sort_key) > (cursor)` on an index
+    instead of an OFFSET that scans and discards every earlier row.
+
+Usage:
+    from utils.pagination import encode_cursor, decode_cursor
+
+    next_cursor = encode_cursor([row.created_at.isoformat(), str(row.id)])
+    created_at, row_id = decode_cursor(cursor, 2)
+"""
+import base64
+import binascii
+import json
+from typing import Any, List
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key values of a row as a URL-safe cursor"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page's `next_cursor`
+        size: Number of sort key values the endpoint expects
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
@@ -3,14 +3,13 @@ PDF Generator Utility for Certificate Generation.
 
 This module provides the PDFGenerator class for creating styled PDF certificates
 for profitable test results. Uses ReportLab for PDF generation and includes
-QR codes for verification.
+QR codes for verification (utils/qr_code.py, shared with the PNG preview).
 """
 from datetime import datetime
 from decimal import Decimal
 from io import BytesIO
 from typing import Optional
 
-import qrcode
 from PIL import Image
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
@@ -18,6 +17,8 @@ from reportlab.lib.colors import HexColor
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 
+from utils.qr_code import generate_qr_image
+
 
 # Color Palette
 BACKGROUND = HexColor("#0A0A0F")
@@ -61,7 +62,8 @@ class PDFGenerator:
         test_period: str,
         verification_code: str,
         share_url: str,
-        issued_at: datetime
+        issued_at: datetime,
+        qr_image: Optional[Image.Image] = None
     ) -> bytes:
         """
         Generate a certificate PDF with all metrics and styling.
@@ -82,6 +84,8 @@ class PDFGenerator:
             verification_code: Unique verification code
             share_url: Public verification URL
             issued_at: Certificate issuance timestamp
+            qr_image: QR code already generated for this certificate
+                (utils.qr_code.generate_qr_image); generated from share_url if omitted
             
         Returns:
             PDF file as bytes
@@ -105,7 +109,8 @@ class PDFGenerator:
             duration_display,
             test_period
         )
-        qr_image = self._generate_qr_code(share_url)
+        if qr_image is None:
+            qr_image = generate_qr_image(share_url)
         self._draw_footer(c, verification_code, issued_at, qr_image)
         
         c.save()
@@ -271,29 +276,6 @@ class PDFGenerator:
             c.setFont(TITLE_FONT, 14)
             c.drawString(right_col_x, y - 18, value)
         
-    def _generate_qr_code(self, url: str) -> Image.Image:
-        """
-        Generate a QR code image for the verification URL.
-        
-        Args:
-            url: URL to encode in QR code
-            
-        Returns:
-            PIL Image object containing the QR code
-        """
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        qr.add_data(url)
-        qr.make(fit=True)
-        
-        # Create QR code with cyan color
-        img = qr.make_image(fill_color="#00D4FF", back_color="#0A0A0F")
-        return img
-        
     def _draw_footer(
         self,
         c: canvas.Canvas,
@@ -332,11 +314,8 @@ class PDFGenerator:
         qr_x = self.page_width - self.margin - qr_size
         qr_y = footer_y - 10
         
-        # Convert PIL image to ImageReader
-        img_buffer = BytesIO()
-        qr_image.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        img_reader = ImageReader(img_buffer)
+        # ImageReader takes the PIL image directly (no PNG round trip)
+        img_reader = ImageReader(qr_image)
         
         c.drawImage(img_reader, qr_x, qr_y, width=qr_size, height=qr_size)
         
@@ -0,0 +1,41 @@
+"""
+QR Code Utility for Certificates.
+
+Generates the verification QR code once per certificate so the PDF, the PNG
+preview and the standalone qr.png asset all reuse the same image.
+"""
+from io import BytesIO
+
+import qrcode
+from PIL import Image
+
+QR_FILL_COLOR = "#00D4FF"
+QR_BACK_COLOR = "#0A0A0F"
+
+
+def generate_qr_image(url: str) -> Image.Image:
+    """
+    Generate the verification QR code for a share URL.
+
+    Args:
+        url: URL to encode in QR code
+
+    Returns:
+        PIL RGB image (cyan on the certificate background color)
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=2,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    return qr.make_image(fill_color=QR_FILL_COLOR, back_color=QR_BACK_COLOR).get_image().convert("RGB")
+
+
+def qr_png_bytes(image: Image.Image) -> bytes:
+    """Encode a QR image as PNG"""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -11,7 +11,9 @@ Usage:
 import asyncio
 import time
 import logging
-from typing import Callable, Any, Optional, Type, Tuple
+import weakref
+from collections import Counter
+from typing import Callable, Any, Dict, Optional, Type, Tuple
 from functools import wraps
 
 from config import settings
@@ -19,6 +21,9 @@ from exceptions import CircuitBreakerOpenError, TimeoutError as AlphaLabTimeoutE
 
 logger = logging.getLogger(__name__)
 
+# Live circuit breakers, for the metrics endpoint
+_circuit_breakers: "weakref.WeakSet[CircuitBreaker]" = weakref.WeakSet()
+
 
 async def retry_with_backoff(
     func: Callable,
@@ -155,6 +160,7 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
         self.state = "closed"  # closed, open, half_open
+        _circuit_breakers.add(self)
         
         logger.info(
             f"Circuit breaker initialized for '{service_name}'",
@@ -243,6 +249,11 @@ class CircuitBreaker:
         self.last_failure_time = None
 
 
+def circuit_breaker_states() -> Dict[Tuple[str, str], int]:
+    """Count live circuit breakers by (service_name, state)"""
+    return dict(Counter((breaker.service_name, breaker.state) for breaker in list(_circuit_breakers)))
+
+
 async def with_timeout(func: Callable, timeout_seconds: int, operation_name: str) -> Any:
     """
     Execute async function with timeout.
@@ -4,6 +4,8 @@ Storage Client for Supabase Storage Operations.
 Purpose:
     Provides a unified interface for uploading, retrieving, and deleting files
     from Supabase Storage buckets. Used for storing certificates and exports.
+    Uploads use a pooled async HTTP client, so they do not block the event
+    loop and can run concurrently (asyncio.gather).
 
 Usage:
     from utils.storage import StorageClient
@@ -15,14 +17,48 @@ Usage:
         file_data=pdf_bytes,
         content_type='application/pdf'
     )
+    
+    # Large files: stream from disk in chunks (resumable upload)
+    with open(path, 'rb') as fp:
+        await storage.upload_fileobj(bucket='exports', file_name='u/e.zip', fp=fp, size=size)
 """
-from typing import Optional
+from typing import BinaryIO, Optional
 from supabase import create_client, Client
 from config import settings
+import base64
+import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared connection pool for Storage REST uploads (see _storage_http)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _storage_http() -> httpx.AsyncClient:
+    """
+    Async HTTP client for the Storage REST API.
+    
+    The supabase-py storage client is synchronous and would block the event
+    loop for the whole transfer; uploads go through this pooled client
+    instead so several can run concurrently.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.SUPABASE_URL.rstrip("/"),
+            timeout=httpx.Timeout(120.0, connect=10.0),
+        )
+    return _http_client
+
+
+async def close_storage_http() -> None:
+    """Close the shared Storage HTTP client (application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class StorageClient:
     """Client for interacting with Supabase Storage."""
@@ -67,6 +103,10 @@ class StorageClient:
             else:
                 raise
         self.storage = self.client.storage
+        self._service_key = supabase_key
+    
+    def _auth_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self._service_key}", "apikey": self._service_key}
     
     async def upload_file(
         self,
@@ -102,14 +142,16 @@ class StorageClient:
         """
         try:
             # Upload file to bucket
-            response = self.storage.from_(bucket).upload(
-                path=file_name,
-                file=file_data,
-                file_options={
-                    "content-type": content_type,
-                    "upsert": str(upsert).lower()
-                }
+            response = await _storage_http().post(
+                f"/storage/v1/object/{bucket}/{file_name}",
+                content=file_data,
+                headers={
+                    **self._auth_headers(),
+                    "Content-Type": content_type,
+                    "x-upsert": str(upsert).lower(),
+                },
             )
+            response.raise_for_status()
             
             # Get the public URL for the uploaded file
             public_url = self.get_public_url(bucket, file_name)
@@ -121,6 +163,86 @@ class StorageClient:
             logger.error(f"Failed to upload file to {bucket}/{file_name}: {str(e)}")
             raise Exception(f"Storage upload failed: {str(e)}")
     
+    async def upload_fileobj(
+        self,
+        bucket: str,
+        file_name: str,
+        fp: BinaryIO,
+        size: int,
+        content_type: str = 'application/octet-stream',
+        upsert: bool = False
+    ) -> str:
+        """
+        Upload a file object to Supabase Storage in chunks.
+        
+        Uses the TUS resumable upload endpoint, sending STORAGE_UPLOAD_CHUNK_MB
+        at a time, so only one chunk is held in memory. Files no larger than
+        one chunk go through upload_file().
+        
+        Args:
+            bucket: The storage bucket name
+            file_name: The name/path for the file in the bucket
+            fp: Binary file object positioned at the start of the data
+            size: Number of bytes to upload
+            content_type: MIME type of the file
+            upsert: If True, overwrite existing file with same name
+            
+        Returns:
+            str: The public URL of the uploaded file
+            
+        Raises:
+            Exception: If upload fails
+        """
+        chunk_size = settings.STORAGE_UPLOAD_CHUNK_MB * 1024 * 1024
+        if size <= chunk_size:
+            return await self.upload_file(bucket, file_name, fp.read(), content_type, upsert)
+        
+        def metadata(value: str) -> str:
+            return base64.b64encode(value.encode()).decode()
+        
+        headers = {**self._auth_headers(), "Tus-Resumable": "1.0.0"}
+        client = _storage_http()
+        try:
+            response = await client.post(
+                "/storage/v1/upload/resumable",
+                headers={
+                    **headers,
+                    "Upload-Length": str(size),
+                    "Upload-Metadata": ",".join([
+                        f"bucketName {metadata(bucket)}",
+                        f"objectName {metadata(file_name)}",
+                        f"contentType {metadata(content_type)}",
+                    ]),
+                    "x-upsert": str(upsert).lower(),
+                },
+            )
+            response.raise_for_status()
+            upload_url = response.headers["Location"]
+            
+            offset = 0
+            while offset < size:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    raise Exception(f"File ended at byte {offset} of {size}")
+                response = await client.patch(
+                    upload_url,
+                    content=chunk,
+                    headers={
+                        **headers,
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    },
+                )
+                response.raise_for_status()
+                offset = int(response.headers.get("Upload-Offset", offset + len(chunk)))
+            
+            logger.info(f"Successfully uploaded file to {bucket}/{file_name} ({size} bytes, chunked)")
+            return self.get_public_url(bucket, file_name)
+            
+        except Exception as e:
+            logger.error(f"Failed to upload file to {bucket}/{file_name}: {str(e)}")
+            raise Exception(f"Storage upload failed: {str(e)}")
+    
     def get_public_url(self, bucket: str, file_name: str) -> str:
         """
         Get the public URL for a file in storage.
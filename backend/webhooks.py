@@ -9,6 +9,7 @@ import hashlib
 import json
 from typing import Optional
 from database import get_supabase_client
+from services.user_cache import user_cache
 
 # Initialize webhook secret from environment
 WEBHOOK_SECRET = os.getenv("CLERK_WEBHOOK_SECRET")
@@ -121,6 +122,7 @@ async def handle_user_updated(data: dict):
         
         if update_data:
             result = supabase.table("users").update(update_data).eq("clerk_id", clerk_id).execute()
+            user_cache.invalidate(clerk_id)
             return {"success": True, "user": result.data[0] if result.data else None}
         
         return {"success": True, "message": "No updates needed"}
@@ -145,6 +147,7 @@ async def handle_user_deleted(data: dict):
         # Soft delete or hard delete user
         # Option 1: Soft delete (recommended)
         result = supabase.table("users").update({"is_active": False}).eq("clerk_id", clerk_id).execute()
+        user_cache.invalidate(clerk_id)
         
         # Option 2: Hard delete (uncomment if preferred)
         # result = supabase.table("users").delete().eq("clerk_id", clerk_id).execute()
@@ -3,7 +3,8 @@ WebSocket Package.
 
 Purpose:
     WebSocket connection management and real-time event broadcasting
-    for backtest and forward test sessions.
+    for backtest and forward test sessions, plus the per-user
+    notification channel.
 """
 
 from .manager import WebSocketManager, websocket_manager
@@ -19,12 +20,15 @@ from .events import (
     create_stats_update_event,
     create_session_completed_event,
     create_countdown_update_event,
+    create_notification_event,
+    create_unread_count_event,
     create_heartbeat_event,
     create_error_event,
 )
 from .handlers import (
     handle_backtest_websocket,
     handle_forward_websocket,
+    handle_notifications_websocket,
 )
 
 __all__ = [
@@ -44,10 +48,13 @@ __all__ = [
     "create_stats_update_event",
     "create_session_completed_event",
     "create_countdown_update_event",
+    "create_notification_event",
+    "create_unread_count_event",
     "create_heartbeat_event",
     "create_error_event",
     
     # Handlers
     "handle_backtest_websocket",
     "handle_forward_websocket",
+    "handle_notifications_websocket",
 ]
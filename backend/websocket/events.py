@@ -85,6 +85,10 @@ class EventType:
     INDICATOR_READINESS = "indicator_readiness"
     PRICE_UPDATE = "price_update"  # Real-time price updates
     
+    # User notification channel
+    NOTIFICATION_CREATED = "notification_created"
+    NOTIFICATION_UNREAD_COUNT = "notification_unread_count"
+    
     # Connection health
     HEARTBEAT = "heartbeat"
     
@@ -190,6 +194,32 @@ def create_auto_stop_event(reason: str, stats: Dict[str, Any]) -> Event:
     )
 
 
+def create_notification_event(notification: Dict[str, Any]) -> Event:
+    """Create a new notification event (user notification channel)."""
+    return Event(
+        type=EventType.NOTIFICATION_CREATED,
+        data={
+            "notification": notification
+        }
+    )
+
+
+def create_unread_count_event(delta: int, count: Optional[int] = None) -> Event:
+    """
+    Create an unread notification count change event.
+    
+    Clients apply `delta` to their badge; `count`, when known, is the
+    absolute value to resync to.
+    """
+    return Event(
+        type=EventType.NOTIFICATION_UNREAD_COUNT,
+        data={
+            "delta": delta,
+            "count": count
+        }
+    )
+
+
 def create_heartbeat_event() -> Event:
     """Create a heartbeat event."""
     return Event(
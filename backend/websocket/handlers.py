@@ -8,7 +8,7 @@ Purpose:
 
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from fastapi import WebSocket, WebSocketDisconnect, Query, HTTPException
@@ -18,9 +18,11 @@ from auth import verify_clerk_token, get_user_id_from_token
 from database import async_session_maker
 from models.arena import TestSession
 from models.user import User
-from websocket.events import create_error_event, create_heartbeat_event, Event
+from websocket.events import create_error_event, create_heartbeat_event, create_unread_count_event, Event
 from websocket.manager import websocket_manager
 from services.trading.engine_factory import get_backtest_engine, get_forward_engine
+from services.unread_counter import unread_counter
+from services.user_cache import user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -271,3 +273,75 @@ async def handle_forward_websocket(
     finally:
         if connection_id:
             await websocket_manager.disconnect(connection_id)
+
+
+async def _load_user_unread_count(clerk_user_id: str) -> Optional[Tuple[UUID, int]]:
+    """
+    Resolve the connected Clerk user and their current unread count.
+    
+    Returns:
+        (user_id, unread_count) or None if the user does not exist
+    """
+    async with async_session_maker() as db:
+        user = await user_cache.get_user(db, clerk_user_id)
+        if not user:
+            logger.warning(f"User not found for clerk_id: {clerk_user_id}")
+            return None
+        return user.id, await unread_counter.get(db, user.id)
+
+
+async def handle_notifications_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None)
+):
+    """
+    Handle the user-scoped notification channel.
+    
+    Sends the current unread count on connect, then pushes
+    notification_created and notification_unread_count events published by
+    NotificationService. Clients may send {"action": "ping"}.
+    """
+    connection_id = None
+    
+    try:
+        clerk_user_id = await authenticate_websocket(token)
+        if not clerk_user_id:
+            await websocket.close(code=1008, reason="Authentication required")
+            logger.warning("Rejected unauthenticated notification WebSocket")
+            return
+        
+        loaded = await _load_user_unread_count(clerk_user_id)
+        if not loaded:
+            await websocket.close(code=1008, reason="Unknown user")
+            return
+        user_id, unread_count = loaded
+        
+        connection_id = await websocket_manager.connect_user(websocket, str(user_id))
+        await websocket_manager.send_to_connection(
+            connection_id, create_unread_count_event(delta=0, count=unread_count)
+        )
+        
+        while True:
+            try:
+                data = await websocket.receive_text()
+            except WebSocketDisconnect:
+                logger.info(f"Client disconnected: {connection_id}")
+                break
+            
+            try:
+                payload = json.loads(data)
+            except json.JSONDecodeError:
+                payload = None
+            action = (payload.get("action") or "").lower() if isinstance(payload, dict) else ""
+            
+            if action == "ping":
+                await websocket_manager.send_to_connection(connection_id, create_heartbeat_event())
+            else:
+                await _send_error(connection_id, "UNKNOWN_COMMAND", "Notification channel only accepts 'ping'.")
+                
+    except Exception as exc:
+        logger.error(f"Error in notification WebSocket handler: {exc}")
+        await _send_error(connection_id, "WEBSOCKET_ERROR", str(exc))
+    finally:
+        if connection_id:
+            await websocket_manager.disconnect(connection_id)
@@ -4,6 +4,10 @@ WebSocket Manager for AlphaLab Trading Engine.
 Purpose:
     Manages WebSocket connections from frontend clients and broadcasts
     real-time events during backtests and forward tests.
+
+    Connections are either session-scoped (one test session's arena view)
+    or user-scoped (the notification channel every dashboard tab opens,
+    see connect_user/broadcast_to_user).
 """
 
 import asyncio
@@ -13,6 +17,8 @@ from typing import Dict, List, Optional, Set, TYPE_CHECKING
 from fastapi import WebSocket, WebSocketDisconnect
 import logging
 
+from services.metrics import websocket_sends_in_flight
+
 if TYPE_CHECKING:
     from .events import Event
 
@@ -25,8 +31,9 @@ class WebSocketManager:
     
     Supports:
     - Multiple connections per session (multi-tab support)
+    - User-scoped connections for per-user channels (notifications)
     - Connection lifecycle management
-    - Event broadcasting to session or individual connections
+    - Event broadcasting to session, user or individual connections
     - Heartbeat for connection health
     """
     
@@ -38,6 +45,9 @@ class WebSocketManager:
         # Map session_id to list of connection_ids
         self.session_connections: Dict[str, Set[str]] = {}
         
+        # Map user_id to list of user-scoped connection_ids
+        self.user_connections: Dict[str, Set[str]] = {}
+        
         # Store connection metadata
         self.connection_metadata: Dict[str, Dict] = {}
         
@@ -57,6 +67,48 @@ class WebSocketManager:
         Returns:
             connection_id: Unique identifier for this connection
         """
+        connection_id = await self._accept(websocket, {"session_id": session_id})
+        
+        # Add to session mapping
+        if session_id not in self.session_connections:
+            self.session_connections[session_id] = set()
+        self.session_connections[session_id].add(connection_id)
+        
+        logger.info(
+            f"WebSocket connected: connection_id={connection_id}, "
+            f"session_id={session_id}, "
+            f"total_connections={len(self.active_connections)}"
+        )
+        
+        return connection_id
+    
+    async def connect_user(self, websocket: WebSocket, user_id: str) -> str:
+        """
+        Accept a user-scoped WebSocket connection (not tied to a session).
+        
+        Args:
+            websocket: The WebSocket connection object
+            user_id: The user this connection receives events for
+            
+        Returns:
+            connection_id: Unique identifier for this connection
+        """
+        connection_id = await self._accept(websocket, {"user_id": user_id})
+        
+        if user_id not in self.user_connections:
+            self.user_connections[user_id] = set()
+        self.user_connections[user_id].add(connection_id)
+        
+        logger.info(
+            f"User WebSocket connected: connection_id={connection_id}, "
+            f"user_id={user_id}, "
+            f"total_connections={len(self.active_connections)}"
+        )
+        
+        return connection_id
+    
+    async def _accept(self, websocket: WebSocket, metadata: Dict) -> str:
+        """Accept a connection, register it and start its heartbeat."""
         # Accept the WebSocket connection
         await websocket.accept()
         
@@ -66,14 +118,9 @@ class WebSocketManager:
         # Store the connection
         self.active_connections[connection_id] = websocket
         
-        # Add to session mapping
-        if session_id not in self.session_connections:
-            self.session_connections[session_id] = set()
-        self.session_connections[session_id].add(connection_id)
-        
         # Store metadata
         self.connection_metadata[connection_id] = {
-            "session_id": session_id,
+            **metadata,
             "connected_at": datetime.utcnow(),
             "last_heartbeat": datetime.utcnow()
         }
@@ -84,12 +131,6 @@ class WebSocketManager:
         )
         self.heartbeat_tasks[connection_id] = heartbeat_task
         
-        logger.info(
-            f"WebSocket connected: connection_id={connection_id}, "
-            f"session_id={session_id}, "
-            f"total_connections={len(self.active_connections)}"
-        )
-        
         return connection_id
     
     async def disconnect(self, connection_id: str) -> None:
@@ -106,6 +147,7 @@ class WebSocketManager:
         # Get session_id before cleanup
         metadata = self.connection_metadata.get(connection_id, {})
         session_id = metadata.get("session_id")
+        user_id = metadata.get("user_id")
         
         # Cancel heartbeat task if exists
         if connection_id in self.heartbeat_tasks:
@@ -135,6 +177,12 @@ class WebSocketManager:
             if not self.session_connections[session_id]:
                 del self.session_connections[session_id]
         
+        # Remove from user mapping
+        if user_id and user_id in self.user_connections:
+            self.user_connections[user_id].discard(connection_id)
+            if not self.user_connections[user_id]:
+                del self.user_connections[user_id]
+        
         # Remove metadata
         self.connection_metadata.pop(connection_id, None)
         
@@ -156,6 +204,18 @@ class WebSocketManager:
         """
         return list(self.session_connections.get(session_id, set()))
     
+    def get_user_connections(self, user_id: str) -> List[str]:
+        """
+        Get all user-scoped connection IDs for a user.
+        
+        Args:
+            user_id: The user ID
+            
+        Returns:
+            List of connection IDs
+        """
+        return list(self.user_connections.get(user_id, set()))
+    
     def get_connection_count(self, session_id: Optional[str] = None) -> int:
         """
         Get the number of active connections.
@@ -199,6 +259,7 @@ class WebSocketManager:
         
         websocket = self.active_connections[connection_id]
         
+        websocket_sends_in_flight.inc()
         try:
             await websocket.send_text(event.to_json())
             logger.debug(f"Sent event {event.type} to connection {connection_id}")
@@ -211,6 +272,8 @@ class WebSocketManager:
             logger.error(f"Error sending to connection {connection_id}: {e}")
             await self.disconnect(connection_id)
             return False
+        finally:
+            websocket_sends_in_flight.dec()
     
     async def broadcast_to_session(self, session_id: str, event: "Event") -> int:
         """
@@ -228,22 +291,34 @@ class WebSocketManager:
             return 0
         
         connection_ids = list(self.session_connections[session_id])
-        successful_sends = 0
+        successful_sends = await self._send_to_many(connection_ids, event)
         
-        # Send to all connections concurrently
-        send_tasks = [
-            self.send_to_connection(conn_id, event)
-            for conn_id in connection_ids
-        ]
+        logger.debug(
+            f"Broadcast event {event.type} to session {session_id}: "
+            f"{successful_sends}/{len(connection_ids)} successful"
+        )
         
-        results = await asyncio.gather(*send_tasks, return_exceptions=True)
+        return successful_sends
+    
+    async def broadcast_to_user(self, user_id: str, event: "Event") -> int:
+        """
+        Broadcast an event to all user-scoped connections of a user.
+        
+        Args:
+            user_id: The user to broadcast to
+            event: The event to broadcast
+            
+        Returns:
+            Number of connections successfully sent to
+        """
+        connection_ids = self.get_user_connections(user_id)
+        if not connection_ids:
+            return 0
         
-        for result in results:
-            if isinstance(result, bool) and result:
-                successful_sends += 1
+        successful_sends = await self._send_to_many(connection_ids, event)
         
         logger.debug(
-            f"Broadcast event {event.type} to session {session_id}: "
+            f"Broadcast event {event.type} to user {user_id}: "
             f"{successful_sends}/{len(connection_ids)} successful"
         )
         
@@ -260,9 +335,17 @@ class WebSocketManager:
             Number of connections successfully sent to
         """
         connection_ids = list(self.active_connections.keys())
-        successful_sends = 0
+        successful_sends = await self._send_to_many(connection_ids, event)
+        
+        logger.debug(
+            f"Broadcast event {event.type} to all: "
+            f"{successful_sends}/{len(connection_ids)} successful"
+        )
         
-        # Send to all connections concurrently
+        return successful_sends
+    
+    async def _send_to_many(self, connection_ids: List[str], event: "Event") -> int:
+        """Send an event to several connections concurrently and count successes."""
         send_tasks = [
             self.send_to_connection(conn_id, event)
             for conn_id in connection_ids
@@ -270,16 +353,7 @@ class WebSocketManager:
         
         results = await asyncio.gather(*send_tasks, return_exceptions=True)
         
-        for result in results:
-            if isinstance(result, bool) and result:
-                successful_sends += 1
-        
-        logger.debug(
-            f"Broadcast event {event.type} to all: "
-            f"{successful_sends}/{len(connection_ids)} successful"
-        )
-        
-        return successful_sends
+        return sum(1 for result in results if isinstance(result, bool) and result)
     
     async def _heartbeat_loop(self, connection_id: str) -> None:
         """
@@ -362,14 +362,46 @@ export function LiveSessionView({ sessionId }: LiveSessionViewProps) {
           // Create unique ID based on candle_number to prevent duplicates
           const candleNumber = event.data?.candle_number ?? 0;
           const thoughtId = `thought-${candleNumber}`;
+          
+          // Streamed reasoning: append to the candle's thought as it arrives
+          if (event.data?.partial) {
+            const delta = event.data?.reasoning_delta ?? "";
+            scheduleUpdate(() => {
+              setThoughtsState((prev) => {
+                if (prev.some(t => t.id === thoughtId)) {
+                  return prev.map(t => (t.id === thoughtId ? { ...t, content: t.content + delta } : t));
+                }
+                const thought: AIThoughtType = {
+                  id: thoughtId,
+                  timestamp: new Date(),
+                  candle: candleNumber,
+                  type: "decision",
+                  content: delta,
+                };
+                return [thought, ...prev].slice(0, 50);
+              });
+            });
+            break;
+          }
+          
           const reasoning = event.data?.reasoning ?? "AI decision";
           
           // Batch thought updates
           scheduleUpdate(() => {
             setThoughtsState((prev) => {
-              const exists = prev.some(t => t.id === thoughtId);
-              if (exists) {
-                return prev;
+              const existing = prev.find(t => t.id === thoughtId);
+              if (existing) {
+                // Replace a streamed thought with the complete decision
+                return prev.map<AIThoughtType>(t =>
+                  t.id === thoughtId
+                    ? {
+                        ...t,
+                        type: event.data?.action ? "execution" : "decision",
+                        content: reasoning,
+                        action: event.data?.action?.toLowerCase() as AIThoughtType["action"],
+                      }
+                    : t
+                );
               }
               
               const thought: AIThoughtType = {
@@ -1,9 +1,18 @@
 "use client";
 
 import { useApiClient } from "@/lib/api";
+import { websocketManager, type WebSocketEvent } from "@/lib/websocket-manager";
+import { useAuth } from "@clerk/nextjs";
 import { useCallback, useEffect, useMemo, useState, useRef } from "react";
 import type { NotificationItem } from "@/types";
 
+// The notification channel is per user, so a single fixed key is shared by every subscriber
+const NOTIFICATION_CHANNEL_ID = "me";
+const NOTIFICATION_LIMIT = 20;
+// Fallback polling while the socket is down, and a slow resync while it is open
+const POLL_INTERVAL_MS = 30000;
+const RESYNC_INTERVAL_MS = 5 * 60 * 1000;
+
 interface NotificationListResponse {
   notifications: Array<{
     id: string;
@@ -25,6 +34,11 @@ interface UnreadCountResponse {
   count: number;
 }
 
+interface UnreadCountEvent {
+  delta: number;
+  count: number | null;
+}
+
 const mapNotification = (item: NotificationListResponse["notifications"][number]): NotificationItem => ({
   id: item.id,
   type: (item.type as NotificationItem["type"]) ?? "info",
@@ -70,6 +84,7 @@ function notificationsEqual(a: NotificationItem[], b: NotificationItem[]): boole
 
 export function useNotifications() {
   const { get, post } = useApiClient();
+  const { getToken } = useAuth();
   const [notifications, setNotifications] = useState<NotificationItem[]>([]);
   const [total, setTotal] = useState(0);
   const [unreadCount, setUnreadCount] = useState(0);
@@ -78,12 +93,14 @@ export function useNotifications() {
   const previousNotificationsRef = useRef<NotificationItem[]>([]);
   const previousTotalRef = useRef(0);
   const previousUnreadCountRef = useRef(0);
+  const lastFetchRef = useRef(0);
 
   const fetchNotifications = useCallback(async () => {
     setIsLoading(true);
     setError(null);
+    lastFetchRef.current = Date.now();
     try {
-      const data = await get<NotificationListResponse>("/api/notifications?limit=20");
+      const data = await get<NotificationListResponse>(`/api/notifications?limit=${NOTIFICATION_LIMIT}`);
       const newNotifications = data.notifications.map(mapNotification);
       
       // Only update if data actually changed (memoization)
@@ -111,12 +128,66 @@ export function useNotifications() {
     }
   }, [get]);
 
+  const handleEvent = useCallback((event: WebSocketEvent) => {
+    if (event.type === "notification_created") {
+      const item = event.data?.notification as NotificationListResponse["notifications"][number] | undefined;
+      if (!item) return;
+      const notification = mapNotification(item);
+      const previous = previousNotificationsRef.current;
+      if (previous.some((n) => n.id === notification.id)) return;
+
+      const next = [notification, ...previous].slice(0, NOTIFICATION_LIMIT);
+      previousNotificationsRef.current = next;
+      setNotifications(next);
+      previousTotalRef.current += 1;
+      setTotal(previousTotalRef.current);
+    } else if (event.type === "notification_unread_count") {
+      const { delta, count } = (event.data ?? {}) as UnreadCountEvent;
+      const next =
+        typeof count === "number"
+          ? count
+          : Math.max(0, previousUnreadCountRef.current + (delta ?? 0));
+      if (next !== previousUnreadCountRef.current) {
+        previousUnreadCountRef.current = next;
+        setUnreadCount(next);
+      }
+    }
+  }, []);
+
+  // Push updates over the user's notification channel
+  useEffect(() => {
+    let mounted = true;
+    let unsubscribe: (() => void) | null = null;
+
+    websocketManager
+      .subscribe("notifications", NOTIFICATION_CHANNEL_ID, handleEvent, getToken)
+      .then((unsub) => {
+        if (mounted) {
+          unsubscribe = unsub;
+        } else {
+          unsub();
+        }
+      })
+      .catch((err) => {
+        console.error("Failed to subscribe to notifications:", err);
+      });
+
+    return () => {
+      mounted = false;
+      unsubscribe?.();
+    };
+  }, [getToken, handleEvent]);
+
+  // Poll only while the socket is down; otherwise resync occasionally to catch missed events
   useEffect(() => {
     void fetchNotifications();
-    // Poll for new notifications every 30 seconds
     const interval = setInterval(() => {
-      void fetchNotifications();
-    }, 30000);
+      const connected = websocketManager.isConnected("notifications", NOTIFICATION_CHANNEL_ID);
+      const elapsed = Date.now() - lastFetchRef.current;
+      if (!connected || elapsed >= RESYNC_INTERVAL_MS) {
+        void fetchNotifications();
+      }
+    }, POLL_INTERVAL_MS);
     return () => clearInterval(interval);
   }, [fetchNotifications]);
 
@@ -137,12 +208,16 @@ export function useNotifications() {
         const updated = await post<NotificationListResponse["notifications"][number]>(
           `/api/notifications/${id}/read`
         );
-        setNotifications((prev) =>
-          prev.map((notification) =>
-            notification.id === id ? mapNotification(updated) : notification
-          )
+        const next = previousNotificationsRef.current.map((notification) =>
+          notification.id === id ? mapNotification(updated) : notification
         );
-        setUnreadCount((prev) => Math.max(0, prev - 1));
+        previousNotificationsRef.current = next;
+        setNotifications(next);
+        // With the socket open the server pushes the new count; only adjust locally without it
+        if (!websocketManager.isConnected("notifications", NOTIFICATION_CHANNEL_ID)) {
+          previousUnreadCountRef.current = Math.max(0, previousUnreadCountRef.current - 1);
+          setUnreadCount(previousUnreadCountRef.current);
+        }
       } catch (err) {
         const message =
           err instanceof Error ? err.message : "Failed to update notification";
@@ -155,6 +230,7 @@ export function useNotifications() {
   const refreshUnreadCount = useCallback(async () => {
     try {
       const result = await get<UnreadCountResponse>("/api/notifications/unread-count");
+      previousUnreadCountRef.current = result.count;
       setUnreadCount(result.count);
     } catch (err) {
       const message =
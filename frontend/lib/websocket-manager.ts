@@ -2,7 +2,8 @@
  * Shared WebSocket Connection Manager
  * 
  * Prevents multiple WebSocket connections to the same session by sharing
- * a single connection across all components that need it.
+ * a single connection across all components that need it. Also carries the
+ * user-scoped notification channel (/ws/notifications).
  */
 
 // No imports needed - token is passed as a function
@@ -17,11 +18,12 @@ export interface WebSocketEvent {
 
 type EventHandler = (event: WebSocketEvent) => void;
 export type SessionType = "backtest" | "forward";
+export type ChannelType = SessionType | "notifications";
 
 interface ConnectionState {
   ws: WebSocket;
   sessionId: string;
-  sessionType: SessionType;
+  sessionType: ChannelType;
   subscribers: Set<EventHandler>;
   reconnectAttempts: number;
   isConnecting: boolean;
@@ -35,16 +37,24 @@ class WebSocketManager {
   /**
    * Get connection key from session type and ID
    */
-  private getConnectionKey(sessionType: SessionType, sessionId: string): string {
+  private getConnectionKey(sessionType: ChannelType, sessionId: string): string {
     return `${sessionType}:${sessionId}`;
   }
 
+  /**
+   * Build the WebSocket URL for a channel (the notification channel is per user, not per session)
+   */
+  private getUrl(sessionType: ChannelType, sessionId: string, token: string): string {
+    const path = sessionType === "notifications" ? "/ws/notifications" : `/ws/${sessionType}/${sessionId}`;
+    return `${WS_BASE_URL}${path}?token=${encodeURIComponent(token)}`;
+  }
+
   /**
    * Subscribe to a WebSocket connection for a session
    * Returns a cleanup function to unsubscribe
    */
   async subscribe(
-    sessionType: SessionType,
+    sessionType: ChannelType,
     sessionId: string,
     onEvent: EventHandler,
     getTokenFn: () => Promise<string | null>
@@ -75,7 +85,7 @@ class WebSocketManager {
       throw new Error("Authentication required");
     }
 
-    const wsUrl = `${WS_BASE_URL}/ws/${sessionType}/${sessionId}?token=${encodeURIComponent(token)}`;
+    const wsUrl = this.getUrl(sessionType, sessionId, token);
     const ws = new WebSocket(wsUrl);
 
     const state: ConnectionState = {
@@ -141,7 +151,7 @@ class WebSocketManager {
             const token = await getTokenFn();
             if (!token) return;
 
-            const wsUrl = `${WS_BASE_URL}/ws/${sessionType}/${sessionId}?token=${encodeURIComponent(token)}`;
+            const wsUrl = this.getUrl(sessionType, sessionId, token);
             const newWs = new WebSocket(wsUrl);
 
             // Update state with new connection
@@ -201,7 +211,7 @@ class WebSocketManager {
   /**
    * Disconnect and remove a connection
    */
-  disconnect(sessionType: SessionType, sessionId: string): void {
+  disconnect(sessionType: ChannelType, sessionId: string): void {
     const connectionKey = this.getConnectionKey(sessionType, sessionId);
     const state = this.connections.get(connectionKey);
     if (!state) return;
@@ -220,7 +230,7 @@ class WebSocketManager {
   /**
    * Check if a connection exists and is connected
    */
-  isConnected(sessionType: SessionType, sessionId: string): boolean {
+  isConnected(sessionType: ChannelType, sessionId: string): boolean {
     const connectionKey = this.getConnectionKey(sessionType, sessionId);
     const state = this.connections.get(connectionKey);
     return state?.ws.readyState === WebSocket.OPEN;
@@ -229,7 +239,7 @@ class WebSocketManager {
   /**
    * Get connection state
    */
-  getConnectionState(sessionType: SessionType, sessionId: string): {
+  getConnectionState(sessionType: ChannelType, sessionId: string): {
     isConnected: boolean;
     isConnecting: boolean;
     subscriberCount: number;